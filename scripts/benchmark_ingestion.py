@@ -0,0 +1,198 @@
+"""Compare the RAG docs ingestion: sequential vs workers and batches.
+
+The generated `ingest_docs` function ingests generated docs in an
+in-memory vector db (an ephemeral chroma client or qdrant's `:memory:`),
+with a cheap (hash based) embedding function, so that the chunking and
+the inserts are measured, not the embedding model.
+
+Usage: python scripts/benchmark_ingestion.py [--vector-db qdrant]
+    [--docs 200] [--workers 4] [--batch-size 256]
+"""
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT_DIR = Path(__file__).parent.parent
+
+sys.path.insert(0, str(ROOT_DIR))
+# pylint: disable=wrong-import-position,import-outside-toplevel
+from waldiez.exporting.agents import (  # noqa: E402
+    get_ingest_docs_function_string,
+    get_ingest_docs_imports,
+)
+
+
+def _embed(texts: List[str]) -> List[List[float]]:
+    """Get a cheap (deterministic) embedding of each text.
+
+    Parameters
+    ----------
+    texts : List[str]
+        The texts.
+
+    Returns
+    -------
+    List[List[float]]
+        The embeddings.
+    """
+    return [
+        [byte / 255 for byte in hashlib.sha256(text.encode()).digest()]
+        for text in texts
+    ]
+
+
+class _EmbeddingFunction:
+    """The (chroma) embedding function."""
+
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        # pylint: disable=redefined-builtin
+        return _embed(input)
+
+
+def _get_vector_db(vector_db: str) -> Any:
+    """Get an (empty) in-memory vector db.
+
+    Parameters
+    ----------
+    vector_db : str
+        The vector db (chroma or qdrant).
+
+    Returns
+    -------
+    Any
+        The vector db.
+    """
+    if vector_db == "qdrant":
+        from autogen.agentchat.contrib.vectordb.qdrant import (  # type: ignore
+            QdrantVectorDB,
+        )
+        from qdrant_client import QdrantClient  # type: ignore
+
+        return QdrantVectorDB(
+            client=QdrantClient(location=":memory:"),
+            embedding_function=_embed,
+        )
+    import chromadb  # type: ignore
+    from autogen.agentchat.contrib.vectordb.chromadb import (  # type: ignore
+        ChromaVectorDB,
+    )
+
+    return ChromaVectorDB(
+        client=chromadb.EphemeralClient(),
+        embedding_function=_EmbeddingFunction(),
+    )
+
+
+def _count_inserts(vector_db: Any) -> List[int]:
+    """Keep the size of each batch that is inserted in the vector db.
+
+    Parameters
+    ----------
+    vector_db : Any
+        The vector db.
+
+    Returns
+    -------
+    List[int]
+        The (updated on each insert) batch sizes.
+    """
+    batches: List[int] = []
+    insert_docs = vector_db.insert_docs
+
+    def _insert_docs(docs: List[Dict[str, Any]], **kwargs: Any) -> None:
+        batches.append(len(docs))
+        insert_docs(docs=docs, **kwargs)
+
+    vector_db.insert_docs = _insert_docs
+    return batches
+
+
+def _get_ingest_docs() -> Callable[..., None]:
+    """Get the generated ingestion function.
+
+    Returns
+    -------
+    Callable[..., None]
+        The `ingest_docs` function.
+    """
+    code = "\n".join(sorted(get_ingest_docs_imports())) + "\n"
+    code += get_ingest_docs_function_string()
+    namespace: Dict[str, Any] = {}
+    exec(code, namespace)  # nosec # pylint: disable=exec-used
+    return namespace["ingest_docs"]
+
+
+def _write_docs(docs_dir: Path, count: int) -> None:
+    """Write the docs to ingest.
+
+    Parameters
+    ----------
+    docs_dir : Path
+        The directory to write the docs to.
+    count : int
+        The number of docs.
+    """
+    for index in range(count):
+        paragraphs = [
+            f"Document {index}, paragraph {paragraph}. " * 20
+            for paragraph in range(20)
+        ]
+        (docs_dir / f"{index}.txt").write_text(
+            "\n\n".join(paragraphs), encoding="utf-8"
+        )
+
+
+def main() -> None:
+    """Ingest the same docs sequentially and with workers and batches."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--vector-db", choices=["chroma", "qdrant"], default="chroma"
+    )
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+    ingest_docs = _get_ingest_docs()
+    runs: Dict[str, Dict[str, Any]] = {
+        "sequential": {},
+        f"workers={args.workers}, batch_size={args.batch_size}": {
+            "workers": args.workers,
+            "batch_size": args.batch_size,
+        },
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        docs_dir = Path(tmp_dir)
+        _write_docs(docs_dir, args.docs)
+        for index, (name, kwargs) in enumerate(runs.items()):
+            vector_db = _get_vector_db(args.vector_db)
+            batches = _count_inserts(vector_db)
+            collection_name = f"docs_{index}"
+            started = time.perf_counter()
+            ingest_docs(
+                vector_db,
+                docs_path=[str(docs_dir)],
+                manifest_path=None,
+                collection_name=collection_name,
+                overwrite=True,
+                custom_text_types=["txt"],
+                recursive=True,
+                max_tokens=100,
+                chunk_mode="multi_lines",
+                must_break_at_empty_line=True,
+                **kwargs,
+            )
+            elapsed = time.perf_counter() - started
+            chunks = sum(batches)
+            print(
+                f"{name}: {chunks} chunks in {elapsed:.2f}s "
+                f"({chunks / elapsed:.0f} chunks/s)"
+            )
+
+
+if __name__ == "__main__":
+    main()
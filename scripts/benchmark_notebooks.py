@@ -0,0 +1,64 @@
+"""Compare the notebook export: in-process vs jupytext, on the examples."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).parent.parent
+
+EXAMPLES_DIR = ROOT_DIR / "examples"
+
+sys.path.insert(0, str(ROOT_DIR))
+# pylint: disable=wrong-import-position
+from waldiez import WaldiezExporter  # noqa: E402
+
+
+def _time_export(exporter: WaldiezExporter, use_jupytext: bool) -> float:
+    """Time exporting a flow to a notebook.
+
+    Parameters
+    ----------
+    exporter : WaldiezExporter
+        The exporter to use.
+    use_jupytext : bool
+        Whether to use jupytext for the conversion.
+
+    Returns
+    -------
+    float
+        The elapsed time in seconds.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = Path(tmp_dir) / "flow.ipynb"
+        start = time.perf_counter()
+        exporter.to_ipynb(output_path, use_jupytext=use_jupytext)
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    """Export the .waldiez files in examples to .ipynb with both methods."""
+    total_native = 0.0
+    total_jupytext = 0.0
+    for example in sorted(EXAMPLES_DIR.glob("**/*.waldiez")):
+        if ".ipynb_checkpoints" in str(example):
+            continue
+        exporter = WaldiezExporter.load(example)
+        # warm up (imports, caches)
+        _time_export(exporter, use_jupytext=False)
+        native = _time_export(exporter, use_jupytext=False)
+        jupytext = _time_export(exporter, use_jupytext=True)
+        total_native += native
+        total_jupytext += jupytext
+        print(
+            f"{example.relative_to(EXAMPLES_DIR)}: "
+            f"in-process {native:.3f}s, jupytext {jupytext:.3f}s"
+        )
+    print(
+        f"Total: in-process {total_native:.3f}s, jupytext {total_jupytext:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    if EXAMPLES_DIR.exists():
+        main()
@@ -1,7 +1,6 @@
 """Export the .waldiez files in examples to {.py,ipynb} files."""
 
 import os
-import subprocess  # nosemgrep # nosec
 import sys
 from pathlib import Path
 
@@ -9,51 +8,25 @@ ROOT_DIR = Path(__file__).parent.parent
 
 EXAMPLES_DIR = ROOT_DIR / "examples"
 
+sys.path.insert(0, str(ROOT_DIR))
+# pylint: disable=wrong-import-position
+from waldiez.batch import export_batch  # noqa: E402
+
 
 def main() -> None:
     """Export the .waldiez files in examples to {.py,ipynb} files."""
     os.chdir(ROOT_DIR)
-    # do not check in .ipynb_checkpoints directories
-    for example in EXAMPLES_DIR.glob("**/*.waldiez"):
-        # do not check in .ipynb_checkpoints directories
-        if ".ipynb_checkpoints" in str(example):
-            continue
-        example_path = example.resolve()
-        example_name = example_path.stem
-        example_dir = example_path.parent
-        export_path = example_dir / f"{example_name}.ipynb"
-        # print(f"Exporting {example_path} to {export_path}")
-        subprocess.run(  # nosemgrep # nosec
-            [
-                sys.executable,
-                "-m",
-                "waldiez",
-                "convert",
-                "--file",
-                str(example_path),
-                "--output",
-                str(export_path),
-                "--force",
-            ],
-            check=True,
-        )
-        export_path = example_dir / f"{example_name}.py"
-        # print(f"Exporting {example_path} to {export_path}")
-        subprocess.run(  # nosemgrep # nosec
-            # --export, --output, --force
-            [
-                sys.executable,
-                "-m",
-                "waldiez",
-                "convert",
-                "--file",
-                str(example_path),
-                "--output",
-                str(export_path),
-                "--force",
-            ],
-            check=True,
-        )
+    # each example is parsed once and exported to both formats
+    results = export_batch(
+        [EXAMPLES_DIR],
+        formats=("ipynb", "py"),
+        force=True,
+    )
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        print(f"Failed to export {result.file}: {result.error}")
+    if failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,7 @@ EXTRAS = [
     "test",
     "docs",
     "ag2_extras",
+    "fast",
 ]
 
 # toml uses 'r' mode, tomllib uses 'rb' mode
@@ -1,5 +1,7 @@
 """Common fixtures for tests."""
 
+from pathlib import Path
+
 import pytest
 
 from waldiez.models import (
@@ -20,6 +22,30 @@ from waldiez.models import (
 )
 
 
+@pytest.fixture(autouse=True)
+def waldiez_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Path:
+    """Use a temporary directory for the waldiez cache(s).
+
+    Parameters
+    ----------
+    tmp_path_factory : pytest.TempPathFactory
+        Pytest fixture to create temporary directories.
+    monkeypatch : pytest.MonkeyPatch
+        Pytest fixture to set the environment variable.
+
+    Returns
+    -------
+    Path
+        The cache directory.
+    """
+    cache_dir = tmp_path_factory.mktemp("waldiez_cache")
+    monkeypatch.setenv("WALDIEZ_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
 def get_runnable_flow() -> WaldiezFlow:
     """Get a runnable WaldiezFlow instance.
 
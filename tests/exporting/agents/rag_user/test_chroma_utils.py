@@ -152,3 +152,42 @@ def test_get_chroma_db_custom_embeddings() -> None:
         '    return SentenceTransformerEmbeddingFunction(model_name="model")\n'
     )
     assert imports == {"chromadb", "from chromadb.config import Settings"}
+
+
+def test_get_chroma_db_args_index_options() -> None:
+    """Test get_chroma_db_args with index options."""
+    # Given
+    rag_user = WaldiezRagUser(
+        id="wa-1",
+        name="rag_user",
+        type="agent",
+        agent_type="rag_user",
+        description="description",
+        tags=[],
+        requirements=[],
+        data=WaldiezRagUserData(  # type: ignore
+            retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                collection_name="collection_name",
+                get_or_create=True,
+                vector_db="chroma",
+                db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                    model="model",
+                    metadata={"hnsw:M": 8},
+                    distance_metric="cosine",
+                    hnsw_ef_search=100,
+                ),
+            ),
+        ),
+    )
+    # When
+    _, _, _, before = get_chroma_db_args(rag_user, "rag_user")
+    # Then
+    assert before == (
+        "rag_user_client = chromadb.Client(Settings(anonymized_telemetry=False))\n"
+        'rag_user_client.get_or_create_collection("collection_name", metadata={\n'
+        '    "hnsw:space": "cosine",\n'
+        '    "hnsw:construction_ef": 30,\n'
+        '    "hnsw:M": 8,\n'
+        '    "hnsw:search_ef": 100\n'
+        "})\n"
+    )
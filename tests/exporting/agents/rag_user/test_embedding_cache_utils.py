@@ -0,0 +1,183 @@
+"""Test waldiez.exporting.agents.rag_user.embedding_cache_utils.*."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from waldiez.exporting.agents.rag_user.chroma_utils import get_chroma_db_args
+from waldiez.exporting.agents.rag_user.embedding_cache_utils import (
+    get_embedding_cache_imports,
+    get_embedding_cache_string,
+    uses_embedding_cache,
+)
+from waldiez.exporting.agents.rag_user.mongo_utils import get_mongodb_db_args
+from waldiez.exporting.agents.rag_user.qdrant_utils import get_qdrant_db_args
+from waldiez.models import (
+    WaldiezRagUser,
+    WaldiezRagUserData,
+    WaldiezRagUserRetrieveConfig,
+    WaldiezRagUserVectorDbConfig,
+)
+
+
+def _get_rag_user(vector_db: Any, cache_path: str) -> WaldiezRagUser:
+    """Get a RAG user agent with the embedding cache."""
+    return WaldiezRagUser(
+        id="wa-1",
+        name="rag_user",
+        description="A RAG user agent.",
+        type="agent",
+        agent_type="rag_user",
+        tags=[],
+        requirements=[],
+        data=WaldiezRagUserData(  # type: ignore
+            retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                vector_db=vector_db,
+                db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                    model="model",
+                    connection_url="mongodb://localhost:27017",
+                    use_embedding_cache=True,
+                    embedding_cache_path=cache_path,
+                    embedding_cache_max_size=1000,
+                ),
+            ),
+        ),
+    )
+
+
+def _get_cache_classes() -> Dict[str, Any]:
+    """Get the (generated) embedding cache classes."""
+    namespace: Dict[str, Any] = {
+        "hashlib": hashlib,
+        "np": np,
+        "os": os,
+        "sqlite3": sqlite3,
+        "threading": threading,
+        "time": time,
+    }
+    exec(  # nosec  # pylint: disable=exec-used
+        get_embedding_cache_string(), namespace
+    )
+    return namespace
+
+
+def test_embedding_cache(tmp_path: Path) -> None:
+    """Test caching the embeddings.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    embedded: List[str] = []
+
+    def _embed(texts: List[str]) -> List[List[float]]:
+        embedded.extend(texts)
+        return [[float(len(text)), 0.5] for text in texts]
+
+    factory_calls: List[int] = []
+
+    def _factory() -> Any:
+        factory_calls.append(1)
+        return _embed
+
+    cache_class = _get_cache_classes()["WaldiezEmbeddingCache"]
+    path = str(tmp_path / "cache" / "embeddings.sqlite3")
+    function = cache_class.get_embedding_function(
+        "model", _factory, path=path, max_size=1000
+    )
+    assert function(["a", "bb", "a"]) == [[1.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+    assert embedded == ["a", "bb"]
+    # shared (same model), only the missing texts are embedded
+    assert (
+        cache_class.get_embedding_function(
+            "model", _factory, path=path, max_size=1000
+        )
+        is function
+    )
+    assert function(["bb", "ccc"]) == [[2.0, 0.5], [3.0, 0.5]]
+    assert embedded == ["a", "bb", "ccc"]
+    assert len(factory_calls) == 1
+    # another model, same cache
+    other = cache_class.get_embedding_function(
+        "other", _factory, path=path, max_size=1000
+    )
+    other(["a"])
+    assert embedded == ["a", "bb", "ccc", "a"]
+    # SentenceTransformer.encode-like
+    encode = cache_class.get_embedding_function(
+        "model", _factory, path=path, max_size=1000, encode=True
+    )
+    vector = encode("a", convert_to_tensor=False)
+    assert isinstance(vector, np.ndarray) and vector.tolist() == [1.0, 0.5]
+    assert encode(["a", "bb"]).shape == (2, 2)
+    assert embedded == ["a", "bb", "ccc", "a"]
+
+
+def test_embedding_cache_eviction(tmp_path: Path) -> None:
+    """Test removing the least recently used embeddings.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    cache_class = _get_cache_classes()["WaldiezEmbeddingCache"]
+    # 8 bytes per vector
+    cache = cache_class(str(tmp_path / "embeddings.sqlite3"), max_size=24)
+
+    def _embed(texts: List[str]) -> List[List[float]]:
+        return [[1.0, 2.0] for _ in texts]
+
+    cache.embed("model", ["a", "b", "c"], _embed)
+    cache.embed("model", ["a"], _embed)
+    cache.embed("model", ["d"], _embed)
+    rows = cache.connection.execute("SELECT key FROM embeddings").fetchall()
+    keys = {hashlib.sha256(text.encode()).hexdigest(): text for text in "abcd"}
+    assert sorted(keys[row[0]] for row in rows) == ["a", "d"]
+    assert cache.size == 16
+
+
+def test_cached_embedding_function_arg(tmp_path: Path) -> None:
+    """Test the (cached) embedding function args.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    cache_path = str(tmp_path / "embeddings.sqlite3")
+    agent = _get_rag_user("chroma", cache_path)
+    assert uses_embedding_cache(agent)
+    kwargs, _, _, _ = get_chroma_db_args(agent, "rag_user")
+    assert (
+        "            embedding_function=WaldiezEmbeddingCache"
+        '.get_embedding_function("chroma:model", lambda: '
+        'SentenceTransformerEmbeddingFunction(model_name="model"), '
+        f'path=r"{cache_path}", max_size=1000, encode=False),\n'
+    ) in kwargs
+    # the same model name, a different embedder (not to be mixed)
+    agent = _get_rag_user("qdrant", cache_path)
+    kwargs, _, _ = get_qdrant_db_args(agent, "rag_user")
+    assert (
+        '.get_embedding_function("qdrant:model", lambda: '
+        'FastEmbedEmbeddingFunction(model_name="model"), '
+    ) in kwargs
+    agent = _get_rag_user("mongodb", cache_path)
+    kwargs, _, _ = get_mongodb_db_args(agent, "rag_user")
+    assert (
+        '.get_embedding_function("mongodb:model", '
+        'lambda: SentenceTransformer("model").encode, '
+        f'path=r"{cache_path}", max_size=1000, encode=True)'
+    ) in kwargs
+    agent.retrieve_config.db_config.use_embedding_cache = False
+    assert not uses_embedding_cache(agent)
+    kwargs, _, _ = get_mongodb_db_args(agent, "rag_user")
+    assert "WaldiezEmbeddingCache" not in kwargs
+    assert "import numpy as np" in get_embedding_cache_imports()
@@ -0,0 +1,477 @@
+"""Test waldiez.exporting.agents.rag_user.ingestion_utils.*."""
+
+import functools
+import glob
+import hashlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+from waldiez.exporting.agents.rag_user.ingestion_utils import (
+    get_ingest_docs_call_string,
+    get_ingest_docs_function_string,
+    uses_ingestion_pipeline,
+)
+from waldiez.exporting.agents.rag_user.rag_user import (
+    get_rag_user_retrieve_config_str,
+)
+from waldiez.models import (
+    WaldiezRagUser,
+    WaldiezRagUserData,
+    WaldiezRagUserRetrieveConfig,
+    WaldiezRagUserVectorDbConfig,
+)
+
+# pylint: disable=unused-argument
+
+
+def _get_rag_user(docs_path: str, storage_path: str) -> WaldiezRagUser:
+    """Get a RAG user agent with an ingestion manifest."""
+    return WaldiezRagUser(
+        id="wa-1",
+        name="rag_user",
+        description="A RAG user agent.",
+        type="agent",
+        agent_type="rag_user",
+        tags=[],
+        requirements=[],
+        data=WaldiezRagUserData(  # type: ignore
+            retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                vector_db="chroma",
+                docs_path=docs_path,
+                collection_name="docs",
+                chunk_token_size=100,
+                use_ingestion_manifest=True,
+                db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                    use_local_storage=True,
+                    local_storage_path=storage_path,
+                ),
+            ),
+        ),
+    )
+
+
+class _VectorDB:
+    """A vector db (in memory) with the used methods."""
+
+    type = "chroma"
+
+    def __init__(self) -> None:
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self.inserted: List[str] = []
+        self.batches: List[int] = []
+
+    def create_collection(
+        self, collection_name: str, overwrite: bool, get_or_create: bool
+    ) -> None:
+        """Create the collection."""
+        if overwrite:
+            self.docs.clear()
+
+    def delete_docs(self, ids: List[str], collection_name: str) -> None:
+        """Delete docs."""
+        for doc_id in ids:
+            self.docs.pop(doc_id)
+
+    def insert_docs(
+        self, docs: List[Dict[str, Any]], collection_name: str, upsert: bool
+    ) -> None:
+        """Insert docs."""
+        self.batches.append(len(docs))
+        for doc in docs:
+            self.docs[doc["id"]] = doc
+            self.inserted.append(doc["content"])
+
+
+def _get_files_from_dir(
+    dir_path: str, types: List[str], recursive: bool
+) -> List[str]:
+    """Get the (txt) files of a directory (twice, like ag2's with a list)."""
+    return sorted(glob.glob(os.path.join(dir_path[0], "*.txt"))) * 2
+
+
+def _split_files_to_chunks(
+    files: List[str], **kwargs: Any
+) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Split files to chunks (one per line)."""
+    chunks: List[str] = []
+    sources: List[Dict[str, str]] = []
+    for file in files:
+        lines = Path(file).read_text(encoding="utf-8").splitlines()
+        chunks.extend(lines)
+        sources.extend([{"source": file}] * len(lines))
+    return chunks, sources
+
+
+def _get_ingest_function(namespace: Dict[str, Any]) -> Any:
+    """Get the generated ingestion function."""
+    namespace.update(
+        {
+            "functools": functools,
+            "hashlib": hashlib,
+            "json": json,
+            "multiprocessing": multiprocessing,
+            "os": os,
+            "time": time,
+            "uuid": uuid,
+            "ProcessPoolExecutor": ProcessPoolExecutor,
+        }
+    )
+    exec(  # nosec  # pylint: disable=exec-used
+        get_ingest_docs_function_string(), namespace
+    )
+    return namespace["ingest_docs"]
+
+
+def _ingest(
+    vector_db: _VectorDB,
+    docs_path: Path,
+    manifest_path: Optional[Path],
+    **kwargs: Any,
+) -> Optional[Any]:
+    """Run the generated ingestion function."""
+    ingest_docs = _get_ingest_function(
+        {
+            "HASH_LENGTH": 8,
+            "get_files_from_dir": _get_files_from_dir,
+            "split_files_to_chunks": _split_files_to_chunks,
+        }
+    )
+    return ingest_docs(
+        vector_db,
+        docs_path=[str(docs_path)],
+        manifest_path=str(manifest_path) if manifest_path else None,
+        collection_name="docs",
+        overwrite=False,
+        custom_text_types=["txt"],
+        recursive=True,
+        **kwargs,
+    )
+
+
+def test_ingest_docs(tmp_path: Path) -> None:
+    """Test ingesting only the new or modified docs.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_text("one\ntwo\n", encoding="utf-8")
+    (docs / "b.txt").write_text("three\n", encoding="utf-8")
+    (docs / "c.txt").write_text("four\nfive\n", encoding="utf-8")
+    manifest_path = tmp_path / "db" / "docs.manifest.json"
+    vector_db = _VectorDB()
+    _ingest(vector_db, docs, manifest_path)
+    # each doc is chunked (and embedded) once
+    assert sorted(vector_db.inserted) == ["five", "four", "one", "three", "two"]
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert sorted(manifest) == [str(docs / f"{name}.txt") for name in "abc"]
+    assert len(manifest[str(docs / "a.txt")]["ids"]) == 2
+    # nothing changed
+    vector_db.inserted.clear()
+    _ingest(vector_db, docs, manifest_path)
+    assert not vector_db.inserted
+    # touched (same content), modified and removed
+    os.utime(docs / "a.txt", (0, 0))
+    (docs / "b.txt").write_text("three\nsix\n", encoding="utf-8")
+    (docs / "c.txt").unlink()
+    _ingest(vector_db, docs, manifest_path)
+    assert sorted(vector_db.inserted) == ["six", "three"]
+    assert sorted(doc["content"] for doc in vector_db.docs.values()) == [
+        "one",
+        "six",
+        "three",
+        "two",
+    ]
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    assert sorted(manifest) == [str(docs / "a.txt"), str(docs / "b.txt")]
+    assert manifest[str(docs / "a.txt")]["mtime"] == 0
+
+
+def test_ingest_docs_in_batches(tmp_path: Path) -> None:
+    """Test chunking in worker processes and inserting in batches.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    expected: List[str] = []
+    for index in range(10):
+        lines = [f"line {index}-{line}" for line in range(3)]
+        (docs / f"{index}.txt").write_text("\n".join(lines), encoding="utf-8")
+        expected.extend(lines)
+    vector_db = _VectorDB()
+    _ingest(vector_db, docs, None, batch_size=4, workers=2)
+    assert sorted(vector_db.inserted) == sorted(expected)
+    assert vector_db.batches == [4] * 7 + [2]
+    # no manifest: all the docs again (upserted)
+    vector_db.inserted.clear()
+    _ingest(vector_db, docs, None)
+    assert len(vector_db.inserted) == 30
+    assert len(vector_db.docs) == 30
+    assert not list(tmp_path.glob("**/*.json"))
+
+
+# a flow module, with the generated function, a custom text split function
+# (and stubs for the autogen functions and the vector db)
+FLOW_WITH_CUSTOM_SPLIT = """
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+HASH_LENGTH = 8
+
+
+def get_files_from_dir(dir_path, types, recursive):
+    return sorted(
+        os.path.join(dir_path[0], name) for name in os.listdir(dir_path[0])
+    )
+
+
+def split_files_to_chunks(files, custom_text_split_function=None):
+    chunks, sources = [], []
+    for file in files:
+        with open(file, "r", encoding="utf-8") as text_file:
+            texts = custom_text_split_function(text_file.read())
+        chunks.extend(texts)
+        sources.extend([{"source": file}] * len(texts))
+    return chunks, sources
+
+
+def custom_text_split_function_rag_user(text):
+    return text.splitlines()
+
+
+class VectorDB:
+    type = "chroma"
+
+    def __init__(self):
+        self.inserted = []
+
+    def create_collection(self, collection_name, overwrite, get_or_create):
+        pass
+
+    def insert_docs(self, docs, collection_name, upsert):
+        self.inserted.extend(doc["content"] for doc in docs)
+
+    def delete_docs(self, ids, collection_name):
+        pass
+
+
+rag_user_vector_db = VectorDB()
+"""
+
+
+# (with a pickling error, the process pool hangs instead of failing)
+@pytest.mark.timeout(60)
+def test_ingest_docs_custom_split_in_flow_module(tmp_path: Path) -> None:
+    """Test the workers with a custom split function of a runner's flow.
+
+    The runners load the flow with `module_from_spec` + `exec_module`
+    (not in `sys.modules`), so the flow's functions cannot be pickled.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for index in range(4):
+        (docs / f"{index}.txt").write_text(
+            f"line {index}-0\nline {index}-1", encoding="utf-8"
+        )
+    flow_file = tmp_path / "flow_with_custom_split.py"
+    flow_file.write_text(
+        FLOW_WITH_CUSTOM_SPLIT
+        + get_ingest_docs_function_string()
+        + "\n\ningest_docs(\n"
+        + "    rag_user_vector_db,\n"
+        + f"    docs_path=[r\"{docs}\"],\n"
+        + "    manifest_path=None,\n"
+        + '    collection_name="docs",\n'
+        + "    overwrite=False,\n"
+        + '    custom_text_types=["txt"],\n'
+        + "    recursive=True,\n"
+        + "    workers=2,\n"
+        + "    custom_text_split_function="
+        + "custom_text_split_function_rag_user,\n"
+        + ")\n",
+        encoding="utf-8",
+    )
+    # like the runner does
+    spec = importlib.util.spec_from_file_location(
+        "flow_with_custom_split", flow_file
+    )
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert sorted(module.rag_user_vector_db.inserted) == sorted(
+        f"line {index}-{line}" for index in range(4) for line in range(2)
+    )
+
+
+def test_get_ingest_docs_call_string(tmp_path: Path) -> None:
+    """Test the call of the ingestion function.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    agent = _get_rag_user("https://example.com/docs.txt", str(tmp_path))
+    manifest_path = tmp_path / "docs.manifest.json"
+    assert get_ingest_docs_call_string(agent, "rag_user", "gpt-4o", "") == (
+        "ingest_docs(\n"
+        "    rag_user_vector_db,\n"
+        "    docs_path=[\n"
+        '        "https://example.com/docs.txt"\n'
+        "    ],\n"
+        f'    manifest_path=r"{manifest_path}",\n'
+        '    collection_name="docs",\n'
+        "    overwrite=False,\n"
+        "    custom_text_types=TEXT_FORMATS,\n"
+        "    recursive=True,\n"
+        "    max_tokens=100,\n"
+        '    chunk_mode="multi_lines",\n'
+        "    must_break_at_empty_line=True,\n"
+        ")\n"
+    )
+    agent.retrieve_config.chunk_token_size = None
+    assert (
+        '    max_tokens=int(RetrieveUserProxyAgent.get_max_tokens("gpt-4o")'
+        " * 0.4),\n"
+    ) in get_ingest_docs_call_string(agent, "rag_user", "gpt-4o", "")
+    assert "    custom_text_split_function=split,\n" in (
+        get_ingest_docs_call_string(agent, "rag_user", "gpt-4o", "split")
+    )
+    agent.retrieve_config.use_ingestion_manifest = False
+    agent.retrieve_config.ingestion_batch_size = 256
+    agent.retrieve_config.ingestion_workers = 4
+    call = get_ingest_docs_call_string(agent, "rag_user", "gpt-4o", "")
+    assert "    manifest_path=None,\n" in call
+    assert "    recursive=True,\n    batch_size=256,\n    workers=4,\n" in call
+
+
+def test_rag_user_with_ingestion_manifest(tmp_path: Path) -> None:
+    """Test the retrieve config of a RAG user with an ingestion manifest.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    agent = _get_rag_user("https://example.com/docs.txt", str(tmp_path))
+    before, retrieve_arg, imports = get_rag_user_retrieve_config_str(
+        agent, "rag_user", {}
+    )
+    assert uses_ingestion_pipeline(agent)
+    assert "\nrag_user_vector_db = ChromaVectorDB(\n" in before
+    # the function is defined once per flow, not per agent
+    assert "def ingest_docs" not in before
+    assert "\ningest_docs(\n    rag_user_vector_db,\n" in before
+    # the vector db is created before the ingestion
+    assert before.index("rag_user_vector_db =") < before.index(
+        "ingest_docs(\n    rag_user_vector_db"
+    )
+    assert '"docs_path": None,' in retrieve_arg
+    assert '"vector_db": rag_user_vector_db,' in retrieve_arg
+    assert "from autogen.retrieve_utils import TEXT_FORMATS" in imports
+    # the generated content is valid python
+    compile(before, "<rag_user>", "exec")
+    agent.retrieve_config.use_ingestion_manifest = False
+    assert not uses_ingestion_pipeline(agent)
+
+
+def test_ingestion_parallel_batches(tmp_path: Path) -> None:
+    """Test the (parallel, batched) ingestion in an in-memory chroma.
+
+    Only the results are checked here, the throughput is compared
+    with `scripts/benchmark_ingestion.py`.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    chromadb = pytest.importorskip("chromadb")
+    # pylint: disable=import-outside-toplevel
+    from autogen.agentchat.contrib.vectordb.chromadb import (  # type: ignore
+        ChromaVectorDB,
+    )
+    from autogen.retrieve_utils import (  # type: ignore
+        get_files_from_dir,
+        split_files_to_chunks,
+    )
+
+    class _EmbeddingFunction:
+        """A cheap (deterministic) embedding function."""
+
+        def __call__(self, input: List[str]) -> List[List[float]]:
+            # pylint: disable=redefined-builtin
+            return [
+                [byte / 255 for byte in hashlib.sha256(text.encode()).digest()]
+                for text in input
+            ]
+
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    for index in range(200):
+        paragraphs = [
+            f"Document {index}, paragraph {paragraph}. " * 20
+            for paragraph in range(20)
+        ]
+        (docs / f"{index}.txt").write_text(
+            "\n\n".join(paragraphs), encoding="utf-8"
+        )
+    ingest_docs = _get_ingest_function(
+        {
+            "HASH_LENGTH": 8,
+            "get_files_from_dir": get_files_from_dir,
+            "split_files_to_chunks": split_files_to_chunks,
+        }
+    )
+    counts: Dict[str, int] = {}
+    for name, kwargs in {
+        "sequential": {},
+        "parallel": {"batch_size": 256, "workers": 4},
+    }.items():
+        vector_db = ChromaVectorDB(
+            client=chromadb.EphemeralClient(),
+            embedding_function=_EmbeddingFunction(),
+        )
+        ingest_docs(
+            vector_db,
+            docs_path=[str(docs)],
+            manifest_path=None,
+            collection_name=f"docs_{name}",
+            overwrite=True,
+            custom_text_types=["txt"],
+            recursive=True,
+            max_tokens=100,
+            chunk_mode="multi_lines",
+            must_break_at_empty_line=True,
+            **kwargs,
+        )
+        counts[name] = vector_db.get_collection(f"docs_{name}").count()
+    # the same chunks, whatever the batches and workers
+    assert counts["parallel"] == counts["sequential"] > 0
@@ -1,6 +1,12 @@
 """Test waldiez.exporting.agents.rag_user.mongo_utils.*."""
 
-from waldiez.exporting.agents.rag_user.mongo_utils import get_mongodb_db_args
+from typing import Any, Dict, List
+
+from waldiez.exporting.agents.rag_user.mongo_utils import (
+    get_mongodb_db_args,
+    get_mongodb_index_class_string,
+    uses_mongodb_index_options,
+)
 from waldiez.models import (
     WaldiezRagUser,
     WaldiezRagUserData,
@@ -102,3 +108,104 @@ def test_get_mongodb_db_custom_embeddings() -> None:
         '    return SentenceTransformer("model").encode\n'
     )
     assert imports == set()
+
+
+def test_get_mongodb_db_args_index_options() -> None:
+    """Test get_mongodb_db_args with index options."""
+    rag_user = WaldiezRagUser(
+        id="wa-1",
+        name="rag_user",
+        description="rag user description",
+        tags=[],
+        type="agent",
+        agent_type="rag_user",
+        requirements=[],
+        data=WaldiezRagUserData(  # type: ignore
+            retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                collection_name="collection_name",
+                vector_db="mongodb",
+                db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                    connection_url="mongodb://localhost:27017",
+                    model="model",
+                    distance_metric="ip",
+                    quantization="binary",
+                    hnsw_m=32,
+                    hnsw_ef_construction=400,
+                ),
+            ),
+        ),
+    )
+    assert uses_mongodb_index_options(rag_user)
+    kwargs, _, _ = get_mongodb_db_args(rag_user, "rag_user")
+    assert kwargs.endswith(
+        '            similarity="dotProduct",\n'
+        '            quantization="binary",\n'
+        '            hnsw_options={"maxEdges": 32, "numEdgeCandidates": 400},\n'
+    )
+    rag_user.retrieve_config.db_config.distance_metric = None
+    rag_user.retrieve_config.db_config.quantization = None
+    rag_user.retrieve_config.db_config.hnsw_m = None
+    rag_user.retrieve_config.db_config.hnsw_ef_construction = None
+    assert not uses_mongodb_index_options(rag_user)
+    kwargs, _, _ = get_mongodb_db_args(rag_user, "rag_user")
+    assert "similarity" not in kwargs
+
+
+class _FakeMongoDBAtlasVectorDB:  # pylint: disable=too-few-public-methods
+    """A fake (autogen) MongoDBAtlasVectorDB."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self.dimensions = 384
+        self._wait_until_index_ready = None
+
+
+class _FakeCollection:  # pylint: disable=too-few-public-methods
+    """A fake (pymongo) collection."""
+
+    def __init__(self) -> None:
+        self.models: List[Any] = []
+
+    def create_search_index(self, model: Any) -> None:
+        """Keep the search index model."""
+        self.models.append(model)
+
+
+def test_mongodb_index_class() -> None:
+    """Test the (generated) MongoDBAtlasVectorDB subclass."""
+    namespace: Dict[str, Any] = {
+        "MongoDBAtlasVectorDB": _FakeMongoDBAtlasVectorDB,
+        "SearchIndexModel": dict,
+    }
+    exec(  # nosec  # pylint: disable=exec-used
+        get_mongodb_index_class_string(), namespace
+    )
+    vector_db = namespace["WaldiezMongoDBAtlasVectorDB"](
+        similarity="euclidean",
+        quantization="scalar",
+        hnsw_options={"maxEdges": 32},
+        connection_string="mongodb://localhost:27017",
+    )
+    assert vector_db.kwargs == {
+        "connection_string": "mongodb://localhost:27017"
+    }
+    collection = _FakeCollection()
+    vector_db.create_vector_search_index(collection, "vector_index")
+    assert collection.models == [
+        {
+            "definition": {
+                "fields": [
+                    {
+                        "type": "vector",
+                        "numDimensions": 384,
+                        "path": "embedding",
+                        "similarity": "euclidean",
+                        "quantization": "scalar",
+                        "hnswOptions": {"maxEdges": 32},
+                    }
+                ]
+            },
+            "name": "vector_index",
+            "type": "vectorSearch",
+        }
+    ]
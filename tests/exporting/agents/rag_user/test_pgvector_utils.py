@@ -1,7 +1,12 @@
 """Test waldiez.exporting.agents.rag_user.pgvector_utils.*."""
 
+from typing import Any, Dict, List, Tuple
+
 from waldiez.exporting.agents.rag_user.pgvector_utils import (
+    get_pgvector_client_string,
     get_pgvector_db_args,
+    get_pgvector_ivfflat_class_string,
+    uses_ivfflat_index,
 )
 from waldiez.models import (
     WaldiezRagUser,
@@ -46,7 +51,7 @@ def test_get_pgvector_db_args() -> None:
     )
     # Then
     assert kwargs == (
-        '            client=psycopg.connect("http://localhost:5432"),\n'
+        '            conn=psycopg.connect("http://localhost:5432", autocommit=True),\n'
         '            embedding_function=SentenceTransformer("model").encode,\n'
     )
     assert imports == {
@@ -94,7 +99,7 @@ def test_get_pgvector_db_args_custom_embeddings() -> None:
     )
     # Then
     assert kwargs == (
-        '            client=psycopg.connect("http://localhost:5432"),\n'
+        '            conn=psycopg.connect("http://localhost:5432", autocommit=True),\n'
         "            embedding_function=custom_embedding_function_rag_user,\n"
     )
     assert imports == {
@@ -105,3 +110,159 @@ def test_get_pgvector_db_args_custom_embeddings() -> None:
         "    # type: () -> Callable[..., Any]\n"
         '    return SentenceTransformer("model").encode\n'
     )
+
+
+def _get_rag_user(**index_options: Any) -> WaldiezRagUser:
+    """Get a RAG user agent (pgvector) with index options."""
+    return WaldiezRagUser(
+        id="wa-1",
+        type="agent",
+        name="rag_user",
+        description="description",
+        agent_type="rag_user",
+        tags=[],
+        requirements=[],
+        data=WaldiezRagUserData(  # type: ignore
+            retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                collection_name="collection_name",
+                vector_db="pgvector",
+                db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                    connection_url="http://localhost:5432",
+                    model="model",
+                    **index_options,
+                ),
+            ),
+        ),
+    )
+
+
+def test_get_pgvector_db_args_index_options() -> None:
+    """Test get_pgvector_db_args with index options."""
+    rag_user = _get_rag_user(hnsw_m=32, hnsw_ef_search=100)
+    client_str, _ = get_pgvector_client_string(rag_user)
+    assert client_str == (
+        'psycopg.connect("http://localhost:5432", autocommit=True, '
+        'options="-c hnsw.ef_search=100")'
+    )
+    assert not uses_ivfflat_index(rag_user)
+    kwargs, _, _ = get_pgvector_db_args(rag_user, "rag_user")
+    assert "lists=" not in kwargs
+
+    rag_user = _get_rag_user(
+        index_type="ivfflat", ivfflat_lists=50, ivfflat_probes=5
+    )
+    client_str, _ = get_pgvector_client_string(rag_user)
+    assert client_str.endswith('options="-c ivfflat.probes=5")')
+    assert uses_ivfflat_index(rag_user)
+    kwargs, _, _ = get_pgvector_db_args(rag_user, "rag_user")
+    assert kwargs.endswith("            lists=50,\n")
+
+
+class _FakeClient:
+    """A fake (psycopg) connection, keeping the executed statements."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.indexes: List[Tuple[str, str]] = [
+            ("docs_embedding_idx", "CREATE INDEX ... USING hnsw (...)"),
+            ("docs_embedding_idx1", "CREATE INDEX ... USING hnsw (...)"),
+        ]
+        self.executed: List[str] = []
+        self.result: Any = None
+
+    def __enter__(self) -> "_FakeClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        pass
+
+    def cursor(self) -> "_FakeClient":
+        """Get a cursor (the connection itself)."""
+        return self
+
+    def execute(self, query: str, params: Any = None) -> None:
+        """Keep (and apply) a statement."""
+        self.executed.append(query)
+        if query.startswith("SELECT COUNT"):
+            self.result = (self.rows,)
+        elif query.startswith("SELECT indexname"):
+            assert params == ("docs",)
+            self.result = list(self.indexes)
+        elif query.startswith("DROP INDEX"):
+            self.indexes = [
+                index for index in self.indexes if index[0] not in query
+            ]
+        elif query.startswith("CREATE INDEX"):
+            self.indexes.append(("docs_embedding_ivfflat", query))
+
+    def fetchone(self) -> Any:
+        """Get the row count."""
+        return self.result
+
+    def fetchall(self) -> Any:
+        """Get the indexes."""
+        return self.result
+
+
+class _FakeCollection:  # pylint: disable=too-few-public-methods
+    """A fake (autogen) pgvector collection."""
+
+    name = "Docs"
+
+
+class _FakePGVectorDB:
+    """A fake (autogen) PGVectorDB."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.kwargs = kwargs
+        self.client = _FakeClient()
+
+    def create_collection(self, *args: Any, **kwargs: Any) -> Any:
+        """Create the collection (with the hnsw indexes)."""
+        return _FakeCollection()
+
+    def get_collection(self, collection_name: Any = None) -> Any:
+        """Get the collection."""
+        return _FakeCollection()
+
+    def insert_docs(
+        self, docs: List[Any], collection_name: Any = None, upsert: bool = False
+    ) -> None:
+        """Insert the docs."""
+        self.client.executed.append("INSERT")
+        self.client.rows += len(docs)
+
+
+def test_pgvector_ivfflat_class() -> None:
+    """Test the (generated) PGVectorDB subclass with an ivfflat index."""
+    namespace: Dict[str, Any] = {"PGVectorDB": _FakePGVectorDB}
+    exec(  # nosec  # pylint: disable=exec-used
+        get_pgvector_ivfflat_class_string(), namespace
+    )
+    vector_db = namespace["WaldiezPGVectorDB"](lists=50, conn="conn")
+    assert vector_db.kwargs == {"conn": "conn"}
+    executed = vector_db.client.executed
+    # not with the (empty) table
+    vector_db.create_collection("Docs", get_or_create=True)
+    vector_db.insert_docs([], "Docs")
+    assert executed == ["INSERT", "SELECT COUNT(*) FROM Docs"]
+    executed.clear()
+    # after the docs are inserted
+    vector_db.insert_docs([{}] * 10, "Docs")
+    assert [query.split(" (")[0] for query in executed] == [
+        "INSERT",
+        "SELECT COUNT(*) FROM Docs",
+        "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s",
+        'DROP INDEX IF EXISTS "docs_embedding_idx"',
+        'DROP INDEX IF EXISTS "docs_embedding_idx1"',
+        "CREATE INDEX Docs_embedding_ivfflat ON Docs USING ivfflat",
+    ]
+    assert executed[-1].endswith("WITH (lists = 50)")
+    executed.clear()
+    # not rebuilt until the collection has doubled
+    vector_db.insert_docs([{}] * 5, "Docs")
+    assert len(executed) == 3
+    executed.clear()
+    vector_db.insert_docs([{}] * 5, "Docs")
+    assert executed[-1] == 'REINDEX INDEX "docs_embedding_ivfflat"'
+    assert vector_db.indexed_rows == {"Docs": 20}
@@ -193,3 +193,52 @@ def test_get_qdrant_db_args_custom_embeddings() -> None:
     assert imports == {
         "from qdrant_client import QdrantClient",
     }
+
+
+def test_get_qdrant_db_args_index_options() -> None:
+    """Test get_qdrant_db_args with index options."""
+    # Given
+    rag_user = WaldiezRagUser(
+        id="wa-1",
+        name="rag_user",
+        type="agent",
+        agent_type="rag_user",
+        description="description",
+        tags=[],
+        requirements=[],
+        data=WaldiezRagUserData(  # type: ignore
+            retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                collection_name="collection_name",
+                vector_db="qdrant",
+                db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                    model="model",
+                    use_memory=True,
+                    hnsw_m=32,
+                    hnsw_ef_construction=200,
+                    quantization="scalar",
+                ),
+            ),
+        ),
+    )
+    # When
+    kwargs, imports, _ = get_qdrant_db_args(rag_user, "rag_user")
+    # Then
+    assert kwargs.endswith(
+        "            collection_options={\n"
+        '                "hnsw_config": models.HnswConfigDiff(m=32, ef_construct=200),\n'
+        '                "quantization_config": models.ScalarQuantization('
+        "scalar=models.ScalarQuantizationConfig("
+        "type=models.ScalarType.INT8, always_ram=True)),\n"
+        "            },\n"
+    )
+    assert "from qdrant_client import models" in imports
+    rag_user.retrieve_config.db_config.hnsw_m = None
+    rag_user.retrieve_config.db_config.hnsw_ef_construction = None
+    rag_user.retrieve_config.db_config.quantization = "binary"
+    kwargs, _, _ = get_qdrant_db_args(rag_user, "rag_user")
+    assert '"hnsw_config"' not in kwargs
+    assert "models.BinaryQuantization(" in kwargs
+    rag_user.retrieve_config.db_config.quantization = None
+    kwargs, imports, _ = get_qdrant_db_args(rag_user, "rag_user")
+    assert "collection_options" not in kwargs
+    assert "from qdrant_client import models" not in imports
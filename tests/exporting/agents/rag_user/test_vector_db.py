@@ -1,14 +1,21 @@
 """Test waldiez.exporting.agents.rag_user.vector_db.*."""
 
 import os
+from typing import List, Optional, Tuple
 
 from waldiez.exporting.agents.rag_user.vector_db import (
     get_rag_user_vector_db_string,
+    get_vector_db_classes_string,
+    get_vector_db_client_names,
+    get_vector_db_clients_string,
 )
 from waldiez.models import (
+    WaldiezAgent,
+    WaldiezAssistant,
     WaldiezRagUser,
     WaldiezRagUserData,
     WaldiezRagUserRetrieveConfig,
+    WaldiezRagUserVectorDb,
     WaldiezRagUserVectorDbConfig,
 )
 
@@ -47,8 +54,9 @@ def test_get_rag_user_vector_db_string_chroma() -> None:
     before, arg, imports = get_rag_user_vector_db_string(rag_user, agent_name)
     # Then
     local_path = os.path.join(os.getcwd(), "local_storage_path")
+    client_str = f'chromadb.PersistentClient(path=r"{local_path}", settings=Settings(anonymized_telemetry=False))'
     assert before == (
-        f'\nrag_user_client = chromadb.PersistentClient(path=r"{local_path}", settings=Settings(anonymized_telemetry=False))\n'
+        f'\nrag_user_client = {client_str}\n'
         "try:\n"
         '    rag_user_client.get_collection("collection_name")\n'
         "except ValueError:\n"
@@ -191,7 +199,7 @@ def test_get_rag_user_vector_db_string_pgvector() -> None:
     assert before == ""
     assert arg == (
         "PGVectorDB(\n"
-        '            client=psycopg.connect("connection_url"),\n'
+        '            conn=psycopg.connect("connection_url", autocommit=True),\n'
         '            embedding_function=SentenceTransformer("model").encode,\n'
         "        )"
     )
@@ -241,10 +249,11 @@ def test_get_rag_user_vector_db_string_custom_embedding() -> None:
     before, arg, imports = get_rag_user_vector_db_string(rag_user, agent_name)
     # Then
     local_path = os.path.join(os.getcwd(), "local_storage_path")
+    client_str = f'chromadb.PersistentClient(path=r"{local_path}", settings=Settings(anonymized_telemetry=False))'
     assert (
         before
         == f"""
-rag_user_client = chromadb.PersistentClient(path=r"{local_path}", settings=Settings(anonymized_telemetry=False))
+rag_user_client = {client_str}
 try:
     rag_user_client.get_collection("collection_name")
 except ValueError:
@@ -310,14 +319,20 @@ def test_get_rag_user_vector_db_string_with_metadata() -> None:
     before, arg, imports = get_rag_user_vector_db_string(rag_user, agent_name)
     # Then
     local_path = os.path.join(os.getcwd(), "local_storage_path")
+    client_str = f'chromadb.PersistentClient(path=r"{local_path}", settings=Settings(anonymized_telemetry=False))'
     assert (
         before
         == f"""
-rag_user_client = chromadb.PersistentClient(path=r"{local_path}", settings=Settings(anonymized_telemetry=False))
+rag_user_client = {client_str}
 try:
     rag_user_client.get_collection("collection_name")
 except ValueError:
-    rag_user_client.create_collection("collection_name")
+    rag_user_client.create_collection("collection_name", metadata={{
+        "hnsw:space": "ip",
+        "hnsw:construction_ef": 30,
+        "hnsw:M": 32,
+        "other": 4.2
+    }})
 """
     )
     assert arg == (
@@ -338,3 +353,150 @@ except ValueError:
         "from autogen.agentchat.contrib.vectordb.chromadb import ChromaVectorDB",
         "from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction",
     }
+
+
+def test_get_vector_db_clients_string() -> None:
+    """Test sharing a vector db client per vector db and location."""
+    # Given
+    configs: List[Tuple[WaldiezRagUserVectorDb, Optional[str]]] = [
+        ("chroma", "storage"),
+        ("chroma", "storage"),
+        ("chroma", "other_storage"),
+        ("qdrant", None),
+        ("qdrant", None),
+        ("mongodb", None),
+    ]
+    rag_users = [
+        WaldiezRagUser(
+            id=f"wa-{index}",
+            name=f"rag_user_{index}",
+            type="agent",
+            agent_type="rag_user",
+            description="description",
+            tags=[],
+            requirements=[],
+            data=WaldiezRagUserData(  # type: ignore
+                retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                    collection_name=f"collection_{index}",
+                    vector_db=vector_db,
+                    db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                        use_local_storage=local_path is not None,
+                        local_storage_path=local_path,
+                        connection_url="connection_url",
+                    ),
+                ),
+            ),
+        )
+        for index, (vector_db, local_path) in enumerate(configs)
+    ]
+    assistant = WaldiezAssistant(id="wa-6", name="assistant")  # type: ignore
+    agents: List[WaldiezAgent] = [assistant, *rag_users]
+    # When
+    clients, imports = get_vector_db_clients_string(agents)
+    # Then
+    local_path = os.path.join(os.getcwd(), "storage")
+    other_path = os.path.join(os.getcwd(), "other_storage")
+    chroma_client = (
+        f'chromadb.PersistentClient(path=r"{local_path}", '
+        "settings=Settings(anonymized_telemetry=False))"
+    )
+    other_chroma_client = (
+        f'chromadb.PersistentClient(path=r"{other_path}", '
+        "settings=Settings(anonymized_telemetry=False))"
+    )
+    # only the locations of more than one agent get a shared client
+    assert clients == (
+        f"chroma_client_1 = {chroma_client}\n"
+        'qdrant_client_1 = QdrantClient(location=":memory:")\n'
+    )
+    assert imports == {
+        "chromadb",
+        "from chromadb.config import Settings",
+        "from qdrant_client import QdrantClient",
+    }
+    client_names = get_vector_db_client_names(agents)
+    assert client_names == {
+        chroma_client: "chroma_client_1",
+        'QdrantClient(location=":memory:")': "qdrant_client_1",
+    }
+    # each agent uses the shared client, with its own collection
+    before_1, _, _ = get_rag_user_vector_db_string(
+        rag_users[0], "rag_user_0", client_names
+    )
+    before_2, _, _ = get_rag_user_vector_db_string(
+        rag_users[1], "rag_user_1", client_names
+    )
+    assert "rag_user_0_client = chroma_client_1\n" in before_1
+    assert "rag_user_1_client = chroma_client_1\n" in before_2
+    assert 'create_collection("collection_1")' in before_2
+    # the agent with its own location defines its own client
+    before_3, _, _ = get_rag_user_vector_db_string(
+        rag_users[2], "rag_user_2", client_names
+    )
+    assert f"rag_user_2_client = {other_chroma_client}\n" in before_3
+    _, qdrant_arg, _ = get_rag_user_vector_db_string(
+        rag_users[3], "rag_user_3", client_names
+    )
+    assert "            client=qdrant_client_1,\n" in qdrant_arg
+
+
+def test_get_vector_db_classes_string() -> None:
+    """Test the vector db subclasses for the index options."""
+    # Given
+    db_configs = [
+        WaldiezRagUserVectorDbConfig(  # type: ignore
+            connection_url="connection_url",
+            hnsw_m=32,
+        ),
+        WaldiezRagUserVectorDbConfig(  # type: ignore
+            connection_url="connection_url",
+            index_type="ivfflat",
+            ivfflat_lists=50,
+        ),
+    ]
+    rag_users = [
+        WaldiezRagUser(
+            id=f"wa-{index}",
+            name=f"rag_user_{index}",
+            type="agent",
+            agent_type="rag_user",
+            description="description",
+            tags=[],
+            requirements=[],
+            data=WaldiezRagUserData(  # type: ignore
+                retrieve_config=WaldiezRagUserRetrieveConfig(  # type: ignore
+                    collection_name=f"collection_{index}",
+                    vector_db="pgvector",
+                    db_config=db_config,
+                ),
+            ),
+        )
+        for index, db_config in enumerate(db_configs)
+    ]
+    agents: List[WaldiezAgent] = [*rag_users]
+    # When
+    classes, imports = get_vector_db_classes_string(agents[:1])
+    # Then
+    assert classes == ""
+    assert not imports
+    _, arg, _ = get_rag_user_vector_db_string(rag_users[0], "rag_user_0")
+    assert arg.startswith("PGVectorDB(\n")
+    assert (
+        "            metadata={\n"
+        '                "hnsw:space": "ip",\n'
+        '                "hnsw:construction_ef": 32,\n'
+        '                "hnsw:M": 32,\n'
+        "            },\n"
+    ) in arg
+    # When
+    classes, imports = get_vector_db_classes_string(agents)
+    # Then
+    assert "class WaldiezPGVectorDB(PGVectorDB):" in classes
+    assert "WaldiezMongoDBAtlasVectorDB" not in classes
+    assert imports == {
+        "from autogen.agentchat.contrib.vectordb.pgvector import PGVectorDB"
+    }
+    _, arg, _ = get_rag_user_vector_db_string(rag_users[1], "rag_user_1")
+    assert arg.startswith("WaldiezPGVectorDB(\n")
+    assert "            lists=50,\n" in arg
+    assert "metadata=" not in arg
@@ -12,19 +12,7 @@ def test_get_def_main() -> None:
     results = waldiez_chats
     runtime_logging.stop()
 
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
-    for table in [
-        "chat_completions",
-        "agents",
-        "oai_wrappers",
-        "oai_clients",
-        "version",
-        "events",
-        "function_calls",
-    ]:
-        dest = os.path.join("logs", f"{table}.csv")
-        sqlite_to_csv("flow.db", table, dest)
+    export_runtime_logs("flow.db", "logs")
 
     return results
 """
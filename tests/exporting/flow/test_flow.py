@@ -45,3 +45,6 @@ def test_export_flow() -> None:
         # passing the flow validation should be enough (to cover "export_flow")
         # we can check the (full) file contents in waldiez.exporter
         assert exported
+        # a single RAG user agent defines its own vector db client
+        assert "\nrag_user_client = chromadb.PersistentClient(" in exported
+        assert "chroma_client_1" not in exported
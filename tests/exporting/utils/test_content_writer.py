@@ -0,0 +1,51 @@
+"""Test waldiez.exporting.utils.content_writer.*."""
+
+import io
+
+from waldiez.exporting.utils.content_writer import ContentWriter
+
+
+def test_content_writer() -> None:
+    """Test ContentWriter."""
+    # Given
+    fragments = [
+        "a\n\n",
+        "\n",
+        "\nb\n\n\n\n\nc",
+        "\n\n\n\n\n\n",
+        "\n\nd\n",
+    ]
+    writer = ContentWriter()
+    # When
+    for fragment in fragments:
+        writer.write(fragment)
+    # Then
+    expected = "".join(fragments).replace("\n\n\n\n", "\n\n\n")
+    assert writer.getvalue() == expected
+
+
+def test_content_writer_ensure_newlines() -> None:
+    """Test ContentWriter.ensure_newlines."""
+    # Given
+    writer = ContentWriter()
+    writer.write("a\n")
+    # When
+    writer.ensure_newlines(2)
+    writer.write("b\n\n\n")
+    writer.ensure_newlines(2)
+    # Then
+    assert writer.getvalue() == "a\n\nb\n\n\n"
+
+
+def test_content_writer_stream() -> None:
+    """Test ContentWriter with a text stream."""
+    # Given
+    stream = io.StringIO()
+    writer = ContentWriter(stream)
+    # When
+    writer.write("a\n\n")
+    writer.write("\n\nb\n\n")
+    # Then
+    assert stream.getvalue() == "a\n\n\nb"
+    writer.close()
+    assert stream.getvalue() == "a\n\n\nb\n\n"
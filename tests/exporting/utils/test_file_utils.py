@@ -0,0 +1,50 @@
+"""Test waldiez.exporting.utils.file_utils.*."""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+from waldiez.exporting.utils import write_if_changed
+
+
+def test_write_if_changed(tmp_path: Path) -> None:
+    """Test writing a file only if its content changed.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    path = tmp_path / "file.py"
+    assert write_if_changed(path, "content\n")
+    os.utime(path, (1, 1))
+    assert not write_if_changed(path, "content\n")
+    assert path.stat().st_mtime == 1
+    assert write_if_changed(path, "other\n")
+    assert path.read_text(encoding="utf-8") == "other\n"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+def test_write_if_changed_mode(tmp_path: Path) -> None:
+    """Test that the written files follow the umask (or keep their mode).
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    path = tmp_path / "file.py"
+    umask = os.umask(0o022)
+    try:
+        assert write_if_changed(path, "content\n")
+        # like a plain open
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+        path.chmod(0o600)
+        assert write_if_changed(path, "other\n")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    finally:
+        os.umask(umask)
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,44 @@
+"""Test waldiez.exporting.utils.fragments.*."""
+
+from waldiez.exporting.utils import ExportFragments, get_fragment_hash
+
+
+def test_get_fragment_hash() -> None:
+    """Test getting the hash of a fragment's inputs."""
+    assert get_fragment_hash({"a": 1, "b": [2]}) == get_fragment_hash(
+        {"b": [2], "a": 1}
+    )
+    assert get_fragment_hash({"a": 1}) != get_fragment_hash({"a": 2})
+
+
+def test_export_fragments() -> None:
+    """Test reusing and dropping fragments."""
+    # Given
+    fragments = ExportFragments()
+    calls = []
+
+    def _generate(value: str) -> str:
+        calls.append(value)
+        return value
+
+    # When
+    fragments.get("agent", "wa-1", {"name": "a"}, lambda: _generate("a"))
+    fragments.get("agent", "wa-2", {"name": "b"}, lambda: _generate("b"))
+    fragments.commit()
+    first = fragments.get("agent", "wa-1", {"name": "a"}, lambda: "other")
+    second = fragments.get("agent", "wa-2", {"name": "c"}, lambda: "c")
+    fragments.commit()
+    # Then
+    assert first == "a"
+    assert second == "c"
+    assert calls == ["a", "b"]
+    assert fragments.hits == 1
+    assert fragments.misses == 3
+    # When (wa-2 is no longer in the flow)
+    fragments.get("agent", "wa-1", {"name": "a"}, lambda: "other")
+    fragments.commit()
+    # Then
+    assert len(fragments) == 1
+    fragments.clear()
+    assert len(fragments) == 0
+    assert fragments.hits == 0
@@ -117,3 +117,20 @@ def test_get_imports_string() -> None:
         "from sklearn import tree\n\n"
         "from waldiez_api_keys import get_model_api_key\n\n"
     )
+    # Given (stdlib imports of the agents)
+    imports = {"import json", "import hashlib", "from autogen import a"}
+    builtin_imports = {"os", "import json"}
+    # When/Then
+    assert get_imports_string(
+        imports,
+        skill_imports,
+        typing_imports,
+        builtin_imports,
+    ) == (
+        "import hashlib\n"
+        "import json\n"
+        "import os\n\n"
+        "from typing import Any, List  # noqa\n"
+        "from typing_extensions import Annotated\n\n"
+        "from autogen import a\n\n"
+    )
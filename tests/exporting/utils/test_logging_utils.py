@@ -2,9 +2,20 @@
 
 # pylint: disable=inconsistent-quotes, line-too-long
 
+import csv
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
 from waldiez.exporting.utils.logging_utils import (
+    get_export_runtime_logs_string,
     get_logging_start_string,
     get_logging_stop_string,
+    get_logs_export_imports,
+    get_sqlite_export_string,
     get_sqlite_to_csv_call_string,
     get_sqlite_to_csv_string,
 )
@@ -59,21 +70,11 @@ def test_get_sqlite_to_csv_call_string() -> None:
     # When
     result = get_sqlite_to_csv_call_string(tabs)
     # Then
-    assert result == (
-        'if not os.path.exists("logs"):\n'
-        '    os.makedirs("logs")\n'
-        "for table in [\n"
-        '    "chat_completions",\n'
-        '    "agents",\n'
-        '    "oai_wrappers",\n'
-        '    "oai_clients",\n'
-        '    "version",\n'
-        '    "events",\n'
-        '    "function_calls",\n'
-        "]:\n"
-        '    dest = os.path.join("logs", f"{table}.csv")\n'
-        '    sqlite_to_csv("flow.db", table, dest)\n'
-    )
+    assert result == 'export_runtime_logs("flow.db", "logs")\n'
+    # When
+    result = get_sqlite_to_csv_call_string(1)
+    # Then
+    assert result == '    export_runtime_logs("flow.db", "logs")\n'
 
 
 def test_get_sqlite_to_csv_string() -> None:
@@ -94,21 +95,198 @@ def test_get_sqlite_to_csv_string() -> None:
         "    csv_file : str\n"
         "        The csv file name.\n"
         '    """\n'
-        "    conn = sqlite3.connect(dbname)\n"
+        "    try:\n"
+        '        conn = sqlite3.connect(f"file:{dbname}?mode=ro", uri=True)\n'
+        "    except sqlite3.OperationalError:\n"
+        "        return\n"
         '    query = f"SELECT * FROM {table}"  # nosec\n'
         "    try:\n"
         "        cursor = conn.execute(query)\n"
         "    except sqlite3.OperationalError:\n"
         "        conn.close()\n"
         "        return\n"
-        "    rows = cursor.fetchall()\n"
         "    column_names = [description[0] for description "
         "in cursor.description]\n"
-        "    data = [dict(zip(column_names, row)) for row in rows]\n"
-        "    conn.close()\n"
         '    with open(csv_file, "w", newline="", encoding="utf-8") as file:\n'
-        "        _csv_writer = csv.DictWriter(file, fieldnames=column_names)\n"
-        "        _csv_writer.writeheader()\n"
-        "        _csv_writer.writerows(data)\n"
+        "        _csv_writer = csv.writer(file)\n"
+        "        _csv_writer.writerow(column_names)\n"
+        "        while True:\n"
+        "            rows = cursor.fetchmany(1000)\n"
+        "            if not rows:\n"
+        "                break\n"
+        "            _csv_writer.writerows(rows)\n"
+        "    conn.close()\n"
         "\n\n"
     )
+
+
+def _create_logs_db(path: Path, rows: int) -> None:
+    """Create a (runtime logging like) sqlite database.
+
+    Parameters
+    ----------
+    path : Path
+        The database's path.
+    rows : int
+        The number of rows to insert.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE chat_completions ("
+        "id INTEGER PRIMARY KEY, request TEXT, cost REAL, is_cached INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO chat_completions VALUES (?, ?, ?, ?)",
+        [
+            (index, json.dumps({"index": index}), index / 2, None)
+            for index in range(rows)
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _get_export_namespace(logs_format: str) -> Dict[str, Any]:
+    """Execute the generated logs export code.
+
+    Parameters
+    ----------
+    logs_format : str
+        The logs format.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The generated functions (by name).
+    """
+    builtin_imports, other_imports = get_logs_export_imports(logs_format)
+    code = "\n".join(sorted(builtin_imports | other_imports)) + "\n"
+    code += get_sqlite_export_string(logs_format)
+    code += get_export_runtime_logs_string(logs_format)
+    namespace: Dict[str, Any] = {}
+    exec(code, namespace)  # nosec # pylint: disable=exec-used
+    return namespace
+
+
+def _run_export(
+    logs_format: str, tmp_path: Path, table: str = "chat_completions"
+) -> Path:
+    """Run the generated sqlite export function.
+
+    Parameters
+    ----------
+    logs_format : str
+        The logs format.
+    tmp_path : Path
+        The directory with the `flow.db` database.
+    table : str, optional
+        The table to export, by default "chat_completions".
+
+    Returns
+    -------
+    Path
+        The exported file.
+    """
+    dest = tmp_path / f"{table}.{logs_format}"
+    _get_export_namespace(logs_format)[f"sqlite_to_{logs_format}"](
+        str(tmp_path / "flow.db"), table, str(dest)
+    )
+    return dest
+
+
+def test_sqlite_to_csv_and_jsonl(tmp_path: Path) -> None:
+    """Test the generated csv and jsonl exports (in batches).
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    _create_logs_db(tmp_path / "flow.db", rows=2500)
+    csv_file = _run_export("csv", tmp_path)
+    with open(csv_file, "r", newline="", encoding="utf-8") as file:
+        csv_rows = list(csv.reader(file))
+    assert csv_rows[0] == ["id", "request", "cost", "is_cached"]
+    assert len(csv_rows) == 2501
+    assert csv_rows[-1] == ["2499", '{"index": 2499}', "1249.5", ""]
+    jsonl_file = _run_export("jsonl", tmp_path)
+    lines = jsonl_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 2500
+    assert json.loads(lines[1]) == {
+        "id": 1,
+        "request": '{"index": 1}',
+        "cost": 0.5,
+        "is_cached": None,
+    }
+    # a missing table is skipped
+    assert not _run_export("csv", tmp_path, table="events").exists()
+    # the database is only read (a missing one is not created)
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    assert not _run_export("csv", other_dir).exists()
+    assert not (other_dir / "flow.db").exists()
+
+
+def test_sqlite_to_parquet(tmp_path: Path) -> None:
+    """Test the generated parquet export.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    _create_logs_db(tmp_path / "flow.db", rows=2500)
+    table = pq.read_table(_run_export("parquet", tmp_path))
+    assert table.num_rows == 2500
+    assert str(table.schema.field("cost").type) == "double"
+    assert table.column("request")[3].as_py() == '{"index": 3}'
+
+
+def test_get_sqlite_export_string() -> None:
+    """Test the logs formats' export strings."""
+    assert get_sqlite_export_string("csv") == get_sqlite_to_csv_string()
+    assert "def sqlite_to_jsonl(" in get_sqlite_export_string("jsonl")
+    assert "pq.ParquetWriter" in get_sqlite_export_string("parquet")
+    assert get_logs_export_imports("parquet")[1] == {
+        "import pyarrow as pa",
+        "import pyarrow.parquet as pq",
+    }
+    assert "sqlite_to_jsonl,\n" in get_export_runtime_logs_string("jsonl")
+    with pytest.raises(ValueError):
+        get_sqlite_export_string("xlsx")
+
+
+def test_export_runtime_logs(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test exporting all the (existing, non-empty) runtime logging tables.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    capsys : pytest.CaptureFixture[str]
+        Pytest fixture to capture stdout and stderr.
+    """
+    db_path = tmp_path / "flow.db"
+    _create_logs_db(db_path, rows=10)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE agents (id INTEGER, name TEXT)")
+    conn.execute("INSERT INTO agents VALUES (1, 'assistant')")
+    # empty (not exported)
+    conn.execute("CREATE TABLE events (id INTEGER)")
+    conn.commit()
+    conn.close()
+    export_runtime_logs = _get_export_namespace("csv")["export_runtime_logs"]
+    logs_dir = tmp_path / "logs"
+    export_runtime_logs(str(db_path), str(logs_dir))
+    assert sorted(item.name for item in logs_dir.iterdir()) == [
+        "agents.csv",
+        "chat_completions.csv",
+    ]
+    assert "Exported 2 log tables to" in capsys.readouterr().out
+    # no database (e.g. no logging): nothing to export
+    export_runtime_logs(str(tmp_path / "missing.db"), str(tmp_path / "other"))
+    assert not (tmp_path / "other").exists()
+    assert not (tmp_path / "missing.db").exists()
@@ -1,8 +1,9 @@
 """Test waldiez.exporting.utils.naming.*."""
 
-from typing import Dict
+from typing import Dict, List, Set, Tuple
 
 from waldiez.exporting.utils.naming import (
+    NameAllocator,
     get_escaped_string,
     get_valid_instance_name,
     get_valid_python_variable_name,
@@ -150,3 +151,95 @@ def test_get_valid_instance_name() -> None:
         "id4": "wa_agent_1_1",
         "id5": "wa_agent_1_2",
     }
+
+
+def test_name_allocator() -> None:
+    """Test NameAllocator."""
+    # Given
+    allocator = NameAllocator()
+    # When
+    names = allocator.allocate_all(
+        [
+            ("id1", "agent 1"),
+            ("id2", "agent 1"),
+            ("id1", "other"),
+        ]
+    )
+    names.update(
+        allocator.allocate_all(
+            [("id3", "agent 1"), ("id4", "agent 1"), ("id5", "agent 1")],
+            prefix="wa",
+        )
+    )
+    # Then
+    assert names == {
+        "id1": "agent_1",
+        "id2": "w_agent_1",
+        "id3": "wa_agent_1",
+        "id4": "wa_agent_1_1",
+        "id5": "wa_agent_1_2",
+    }
+    assert allocator.names == names
+    assert allocator.allocate("id4", "anything") == "wa_agent_1_1"
+
+
+def _get_instances(count: int) -> List[Tuple[str, str]]:
+    """Get instances with many colliding names.
+
+    Parameters
+    ----------
+    count : int
+        The number of instances.
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        The instance ids and possible names.
+    """
+    possible_names = ["agent", "agent 1", "w_agent", "agent_1", "1agent"]
+    return [
+        (f"id{index}", possible_names[index % len(possible_names)])
+        for index in range(count)
+    ]
+
+
+def test_name_allocator_same_as_get_valid_instance_name() -> None:
+    """Test NameAllocator against get_valid_instance_name."""
+    # Given
+    instances = _get_instances(300)
+    expected: Dict[str, str] = {}
+    for index, instance in enumerate(instances):
+        prefix = "wa" if index % 2 else "wm"
+        expected = get_valid_instance_name(instance, expected, prefix=prefix)
+    # When
+    allocator = NameAllocator()
+    for index, (instance_id, possible_name) in enumerate(instances):
+        prefix = "wa" if index % 2 else "wm"
+        allocator.allocate(instance_id, possible_name, prefix=prefix)
+    # Then
+    assert allocator.names == expected
+
+
+class _CountingSet(Set[str]):
+    """A set that counts its membership checks."""
+
+    probes = 0
+
+    def __contains__(self, item: object) -> bool:
+        self.probes += 1
+        return super().__contains__(item)
+
+
+def test_name_allocator_10k_instances() -> None:
+    """Test NameAllocator's cost with 10k (mostly colliding) instances."""
+    # Given
+    instances = _get_instances(10_000)
+    allocator = NameAllocator()
+    taken = _CountingSet()
+    allocator._taken = taken  # pylint: disable=protected-access
+    # When
+    names = allocator.allocate_all(instances, prefix="wa")
+    # Then
+    assert len(set(names.values())) == 10_000
+    # a few checks per instance, not one per (colliding) taken name
+    assert taken.probes <= 4 * len(instances)
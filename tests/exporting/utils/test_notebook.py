@@ -0,0 +1,95 @@
+"""Test waldiez.exporting.utils.notebook.*."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from waldiez import Waldiez, WaldiezExporter
+from waldiez.exporting.utils.notebook import (
+    get_notebook_cells,
+    get_notebook_string,
+)
+
+from ..flow_helpers import get_flow
+
+
+def test_get_notebook_cells() -> None:
+    """Test get_notebook_cells."""
+    # Given
+    content = (
+        "# # Title\n\n"
+        "# ## Section\n\n"
+        "import sys\n"
+        "# !{sys.executable} -m pip install -q pkg\n"
+        "\n\n"
+        "def func():\n"
+        '    """Doc.\n\n'
+        '    More doc."""\n'
+        "\n"
+        "    return [\n"
+        "\n"
+        "        1,\n"
+        "    ]\n"
+        "\n\n"
+        "x = func()\n"
+    )
+    # When
+    cells = get_notebook_cells(content)
+    # Then
+    assert [cell["cell_type"] for cell in cells] == [
+        "markdown",
+        "markdown",
+        "code",
+        "code",
+        "code",
+    ]
+    assert cells[0]["source"] == ["# Title"]
+    assert cells[1]["source"] == ["## Section"]
+    assert cells[2]["source"] == [
+        "import sys\n",
+        "!{sys.executable} -m pip install -q pkg",
+    ]
+    assert "".join(cells[3]["source"]) == (
+        "def func():\n"
+        '    """Doc.\n\n'
+        '    More doc."""\n'
+        "\n"
+        "    return [\n"
+        "\n"
+        "        1,\n"
+        "    ]"
+    )
+    assert cells[4]["source"] == ["x = func()"]
+
+
+def test_get_notebook_string_invalid_content() -> None:
+    """Test get_notebook_string with content that cannot be tokenized."""
+    with pytest.raises(ValueError):
+        get_notebook_string('x = """\n')
+
+
+def test_notebook_same_as_jupytext(tmp_path: Path) -> None:
+    """Test that the generated notebook has the same cells as jupytext's.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    # Given
+    exporter = WaldiezExporter(Waldiez(flow=get_flow()))
+    native_path = tmp_path / "native.ipynb"
+    jupytext_path = tmp_path / "jupytext.ipynb"
+    # When
+    exporter.to_ipynb(native_path)
+    exporter.to_ipynb(jupytext_path, use_jupytext=True)
+    # Then
+    with open(native_path, "r", encoding="utf-8") as file:
+        native = json.load(file)
+    with open(jupytext_path, "r", encoding="utf-8") as file:
+        jupytext = json.load(file)
+    assert native["nbformat"] == jupytext["nbformat"]
+    assert [
+        (cell["cell_type"], cell["source"]) for cell in native["cells"]
+    ] == [(cell["cell_type"], cell["source"]) for cell in jupytext["cells"]]
@@ -1,5 +1,7 @@
 """Test waldiez.models.agents.rag_user.retrieve_config.*."""
 
+import os
+
 import pytest
 
 from waldiez.models.agents.rag_user.retrieve_config import (
@@ -146,3 +148,69 @@ def custom_text_split_function(text, max_tokens, chunk_mode, must_break_at_empty
             use_custom_text_split=True,
             custom_text_split_function="def something():\n    return []",
         )
+
+
+def test_waldiez_rag_user_retrieve_config_ingestion_manifest() -> None:
+    """Test WaldiezRagUserRetrieveConfig with an ingestion manifest."""
+    retrieve_config = WaldiezRagUserRetrieveConfig(  # type: ignore
+        collection_name="docs",
+        use_ingestion_manifest=True,
+        db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+            use_local_storage=True,
+            local_storage_path=os.path.join(os.getcwd(), "db"),
+        ),
+    )
+    assert retrieve_config.ingestion_manifest_path == os.path.join(
+        os.getcwd(), "db", "docs.manifest.json"
+    )
+    retrieve_config.use_ingestion_manifest = False
+    assert retrieve_config.ingestion_manifest_path is None
+    assert not retrieve_config.use_ingestion_pipeline
+    retrieve_config.docs_path = "docs"
+    retrieve_config.ingestion_workers = 4
+    assert retrieve_config.use_ingestion_pipeline
+
+    with pytest.raises(ValueError):
+        WaldiezRagUserRetrieveConfig(  # type: ignore
+            use_ingestion_manifest=True,
+        )
+    with pytest.raises(ValueError):
+        WaldiezRagUserRetrieveConfig(  # type: ignore
+            ingestion_batch_size=0,
+        )
+
+
+def test_waldiez_rag_user_retrieve_config_index_options() -> None:
+    """Test WaldiezRagUserRetrieveConfig with index options."""
+    retrieve_config = WaldiezRagUserRetrieveConfig(  # type: ignore
+        vector_db="qdrant",
+        db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+            hnsw_m=32,
+            quantization="scalar",
+        ),
+    )
+    assert retrieve_config.db_config.quantization == "scalar"
+
+    # not supported by the vector db
+    with pytest.raises(ValueError):
+        WaldiezRagUserRetrieveConfig(  # type: ignore
+            vector_db="chroma",
+            db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                quantization="scalar",
+            ),
+        )
+    # not supported value
+    with pytest.raises(ValueError):
+        WaldiezRagUserRetrieveConfig(  # type: ignore
+            vector_db="qdrant",
+            db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                distance_metric="l2",
+            ),
+        )
+    with pytest.raises(ValueError):
+        WaldiezRagUserRetrieveConfig(  # type: ignore
+            vector_db="mongodb",
+            db_config=WaldiezRagUserVectorDbConfig(  # type: ignore
+                quantization="product",
+            ),
+        )
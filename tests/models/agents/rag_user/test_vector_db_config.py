@@ -65,3 +65,56 @@ def test_waldiez_rag_user_vector_db_config_local_storage() -> None:
             wait_until_document_ready=None,
             metadata={},
         )
+
+
+def test_waldiez_rag_user_vector_db_config_embedding_cache() -> None:
+    """Test WaldiezRagUserVectorDbConfig with the embedding cache."""
+    vector_db_config = WaldiezRagUserVectorDbConfig(  # type: ignore
+        use_embedding_cache=True,
+        embedding_cache_path="embeddings.sqlite3",
+    )
+    assert vector_db_config.embedding_cache_path == os.path.join(
+        os.getcwd(), "embeddings.sqlite3"
+    )
+    assert vector_db_config.embedding_cache_max_size == 1024 * 1024 * 1024
+    assert WaldiezRagUserVectorDbConfig().embedding_cache_path is None
+
+    with pytest.raises(ValueError):
+        WaldiezRagUserVectorDbConfig(  # type: ignore
+            embedding_cache_max_size=-1,
+        )
+
+
+def test_waldiez_rag_user_vector_db_config_index_options() -> None:
+    """Test WaldiezRagUserVectorDbConfig with index options."""
+    vector_db_config = WaldiezRagUserVectorDbConfig(  # type: ignore
+        distance_metric="cosine",
+        hnsw_m=32,
+        hnsw_ef_construction=200,
+    )
+    assert vector_db_config.index_options == {
+        "distance_metric": "cosine",
+        "hnsw_m": 32,
+        "hnsw_ef_construction": 200,
+    }
+    assert not WaldiezRagUserVectorDbConfig().index_options
+    vector_db_config = WaldiezRagUserVectorDbConfig(  # type: ignore
+        index_type="ivfflat",
+        ivfflat_lists=100,
+        ivfflat_probes=10,
+    )
+    assert vector_db_config.ivfflat_lists == 100
+
+    with pytest.raises(ValueError):
+        WaldiezRagUserVectorDbConfig(  # type: ignore
+            hnsw_m=0,
+        )
+    with pytest.raises(ValueError):
+        WaldiezRagUserVectorDbConfig(  # type: ignore
+            index_type="ivfflat",
+            hnsw_ef_search=100,
+        )
+    with pytest.raises(ValueError):
+        WaldiezRagUserVectorDbConfig(  # type: ignore
+            ivfflat_probes=10,
+        )
@@ -5,6 +5,8 @@ import ast
 from waldiez.models.common.method_utils import (
     WaldiezMethodName,
     check_function,
+    clear_check_function_cache,
+    get_check_function_cache_info,
     parse_code_string,
 )
 
@@ -122,3 +124,47 @@ def nested_chat_reply_(recipient, messages, sender, config):
     # Then
     assert not valid
     assert "No function with name" in body
+
+
+def test_check_function_cache() -> None:
+    """Test the check_function cache."""
+    # Given
+    clear_check_function_cache()
+    code_string = """
+def is_termination_message(message):
+    def is_termination_message(other):
+        return False
+    return True
+    """
+    function_name: WaldiezMethodName = "is_termination_message"
+    # When
+    valid, body = check_function(code_string, function_name)
+    valid_again, body_again = check_function(code_string, function_name)
+    # Then
+    assert valid and valid_again
+    assert body == body_again
+    cache_info = get_check_function_cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 1
+    # When
+    valid, body = check_function(
+        code_string, function_name, skip_type_hints=True
+    )
+    # Then
+    assert valid
+    assert body.startswith("    def is_termination_message(other):")
+    assert get_check_function_cache_info().misses == 2
+
+    # Given
+    code_string = """
+class Nested:
+    def is_termination_message(message):
+        return True
+    """
+    # When
+    valid, body = check_function(code_string, function_name)
+    # Then
+    assert not valid
+    assert "No function with name" in body
+    clear_check_function_cache()
+    assert get_check_function_cache_info().currsize == 0
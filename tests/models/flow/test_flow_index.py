@@ -0,0 +1,203 @@
+"""Test waldiez.models.flow.flow_index.*."""
+
+import os
+import sys
+from types import FrameType
+from typing import Any, List
+
+import pytest
+
+import waldiez
+from waldiez.models import (
+    WaldiezAgents,
+    WaldiezAssistant,
+    WaldiezAssistantData,
+    WaldiezChat,
+    WaldiezChatData,
+    WaldiezFlow,
+    WaldiezFlowData,
+    WaldiezFlowIndex,
+    WaldiezGroupManager,
+    WaldiezGroupManagerData,
+    WaldiezUserProxy,
+    WaldiezUserProxyData,
+)
+
+
+def _get_chat(
+    chat_id: str, source: str, target: str, order: int
+) -> WaldiezChat:
+    """Get a chat between two agents.
+
+    Parameters
+    ----------
+    chat_id : str
+        The chat id.
+    source : str
+        The source agent id.
+    target : str
+        The target agent id.
+    order : int
+        The chat order.
+
+    Returns
+    -------
+    WaldiezChat
+        The chat.
+    """
+    return WaldiezChat(
+        id=chat_id,
+        data=WaldiezChatData(
+            name=chat_id,
+            description=chat_id,
+            source=source,
+            target=target,
+            order=order,
+        ),
+    )
+
+
+def _get_chain_flow(agents_count: int) -> WaldiezFlow:
+    """Get a flow with agents connected in a chain.
+
+    Parameters
+    ----------
+    agents_count : int
+        The number of agents.
+
+    Returns
+    -------
+    WaldiezFlow
+        The flow.
+    """
+    assistants = [
+        WaldiezAssistant(
+            id=f"wa-{index}",
+            name=f"assistant_{index}",
+            agent_type="assistant",
+            description="Assistant",
+            data=WaldiezAssistantData(),
+        )
+        for index in range(agents_count)
+    ]
+    chats: List[WaldiezChat] = [
+        _get_chat(f"wc-{index}", f"wa-{index}", f"wa-{index + 1}", index)
+        for index in range(agents_count - 1)
+    ]
+    return WaldiezFlow(
+        name="flow",
+        description="flow",
+        data=WaldiezFlowData(
+            agents=WaldiezAgents(assistants=assistants),
+            chats=chats,
+        ),
+    )
+
+
+def test_flow_index() -> None:
+    """Test the flow index lookups."""
+    # Given
+    user = WaldiezUserProxy(
+        id="wa-1",
+        name="user",
+        agent_type="user",
+        description="User",
+        data=WaldiezUserProxyData(),
+    )
+    assistant = WaldiezAssistant(
+        id="wa-2",
+        name="assistant",
+        agent_type="assistant",
+        description="Assistant",
+        data=WaldiezAssistantData(),
+    )
+    manager = WaldiezGroupManager(
+        id="wa-3",
+        name="manager",
+        agent_type="manager",
+        description="Manager",
+        data=WaldiezGroupManagerData(),
+    )
+    chats = [
+        _get_chat("wc-1", "wa-1", "wa-3", 0),
+        _get_chat("wc-2", "wa-3", "wa-2", -1),
+        _get_chat("wc-3", "wa-2", "wa-2", -1),
+    ]
+    agents = WaldiezAgents(
+        users=[user], assistants=[assistant], managers=[manager]
+    )
+    # When
+    index = WaldiezFlowIndex.build(agents=agents, chats=chats)
+    # Then
+    assert list(index.agents) == ["wa-1", "wa-2", "wa-3"]
+    assert list(index.chats) == ["wc-1", "wc-2", "wc-3"]
+    assert index.get_agent("wa-3") is manager
+    assert index.get_connections("wa-1") == ("wa-3",)
+    assert index.get_connections("wa-2") == ("wa-3", "wa-2", "wa-2")
+    assert index.get_connections("wa-3") == ("wa-1", "wa-2")
+    assert index.get_connections("wa-4") == ()
+    assert index.group_members == {"wa-3": ("wa-1", "wa-2")}
+    with pytest.raises(ValueError):
+        index.get_agent("wa-4")
+    with pytest.raises(TypeError):
+        index.agents["wa-4"] = user  # type: ignore
+
+
+def test_flow_uses_index() -> None:
+    """Test the flow's lookups through its index."""
+    # Given
+    flow = _get_chain_flow(4)
+    # Then
+    assert isinstance(flow.index, WaldiezFlowIndex)
+    assert flow.index is flow.index
+    assert flow.get_agent_by_id("wa-2").name == "assistant_2"
+    assert flow.get_agent_connections("wa-1") == ["wa-0", "wa-2"]
+    assert flow.get_agent_connections("wa-3", all_chats=False) == ["wa-2"]
+    assert not flow.get_group_chat_members("wa-1")
+    with pytest.raises(ValueError):
+        flow.get_agent_by_id("wa-4")
+
+
+def _count_lookup_calls(flow: WaldiezFlow) -> int:
+    """Count the (waldiez) calls to build the index and do all the lookups.
+
+    Parameters
+    ----------
+    flow : WaldiezFlow
+        The flow.
+
+    Returns
+    -------
+    int
+        The number of function calls in the waldiez package.
+    """
+    package_dir = os.path.dirname(waldiez.__file__)
+    calls = 0
+
+    def _profile(frame: FrameType, event: str, _: Any) -> None:
+        nonlocal calls
+        if event == "call" and frame.f_code.co_filename.startswith(package_dir):
+            calls += 1
+
+    sys.setprofile(_profile)
+    try:
+        index = WaldiezFlowIndex.build(
+            agents=flow.data.agents, chats=flow.data.chats
+        )
+        for agent_id in index.agents:
+            index.get_agent(agent_id)
+            index.get_connections(agent_id)
+        for agent in flow.data.agents.members:
+            flow.get_agent_by_id(agent.id)
+            flow.get_agent_connections(agent.id)
+    finally:
+        sys.setprofile(None)
+    return calls
+
+
+def test_flow_index_scales_linearly() -> None:
+    """Test the index' cost on flows with an increasing number of agents."""
+    small = _count_lookup_calls(_get_chain_flow(50))
+    large = _count_lookup_calls(_get_chain_flow(400))
+    # 8x the agents and chats: linear, not the 64x of (agents x chats) scans
+    assert 0 < large <= small * 8
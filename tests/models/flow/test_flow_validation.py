@@ -0,0 +1,212 @@
+"""Test waldiez.models.flow.flow_validation.*."""
+
+import os
+import sys
+from types import FrameType
+from typing import Any, List
+
+import pytest
+from pydantic import ValidationError
+
+import waldiez
+from waldiez.models import (
+    WaldiezAgentLinkedSkill,
+    WaldiezAgents,
+    WaldiezAssistant,
+    WaldiezAssistantData,
+    WaldiezChat,
+    WaldiezChatData,
+    WaldiezFlow,
+    WaldiezFlowData,
+    WaldiezFlowIndex,
+    WaldiezFlowValidationError,
+    WaldiezModel,
+    WaldiezModelData,
+    WaldiezSkill,
+    WaldiezSkillData,
+)
+from waldiez.models.flow import get_flow_issues
+
+
+def _get_flow_data(
+    agents_count: int,
+    chats_count: int,
+    models_count: int = 20,
+    skills_count: int = 20,
+) -> WaldiezFlowData:
+    """Get a flow's data, with every agent linking models and skills.
+
+    Parameters
+    ----------
+    agents_count : int
+        The number of agents.
+    chats_count : int
+        The number of chats (at least agents_count - 1).
+    models_count : int, optional
+        The number of models, by default 20.
+    skills_count : int, optional
+        The number of skills, by default 20.
+
+    Returns
+    -------
+    WaldiezFlowData
+        The flow's data.
+    """
+    models = [
+        WaldiezModel(
+            id=f"wm-{index}",
+            name=f"model_{index}",
+            description="Model",
+            data=WaldiezModelData(),
+        )
+        for index in range(models_count)
+    ]
+    skills = [
+        WaldiezSkill(
+            id=f"ws-{index}",
+            name=f"skill_{index}",
+            description="Skill",
+            data=WaldiezSkillData(
+                content=f"def skill_{index}():\n    return {index}"
+            ),
+        )
+        for index in range(skills_count)
+    ]
+    assistants = [
+        WaldiezAssistant(
+            id=f"wa-{index}",
+            name=f"assistant_{index}",
+            agent_type="assistant",
+            description="Assistant",
+            data=WaldiezAssistantData(
+                model_ids=[f"wm-{index % models_count}"],
+                skills=[
+                    WaldiezAgentLinkedSkill(
+                        id=f"ws-{index % skills_count}",
+                        executor_id=f"wa-{(index + 1) % agents_count}",
+                    )
+                ],
+            ),
+        )
+        for index in range(agents_count)
+    ]
+    chats: List[WaldiezChat] = [
+        WaldiezChat(
+            id=f"wc-{index}",
+            data=WaldiezChatData(
+                name=f"chat_{index}",
+                description="Chat",
+                source=f"wa-{index % agents_count}",
+                target=f"wa-{(index + 1) % agents_count}",
+                order=index,
+            ),
+        )
+        for index in range(chats_count)
+    ]
+    return WaldiezFlowData(
+        agents=WaldiezAgents(assistants=assistants),
+        models=models,
+        skills=skills,
+        chats=chats,
+    )
+
+
+def test_flow_issues_are_collected() -> None:
+    """Test collecting all the issues of a flow (not only the first)."""
+    # Given
+    data = _get_flow_data(agents_count=4, chats_count=2)
+    data.agents.assistants[0].data.model_ids.append("wm-missing")
+    data.agents.assistants[1].data.skills.append(
+        WaldiezAgentLinkedSkill(id="ws-missing", executor_id="wa-missing")
+    )
+    data.chats.append(
+        WaldiezChat(
+            id="wc-missing",
+            data=WaldiezChatData(
+                name="chat_missing",
+                description="Chat",
+                source="wa-0",
+                target="wa-missing",
+                order=-1,
+            ),
+        )
+    )
+    index = WaldiezFlowIndex.build(agents=data.agents, chats=data.chats)
+    # When
+    issues = get_flow_issues(data, index)
+    # Then
+    assert [(issue.entity_id, issue.message) for issue in issues] == [
+        (
+            "wc-missing",
+            "Agent with ID wa-missing not found (in chat wc-missing).",
+        ),
+        ("wa-0", "Model 'wm-missing' not found in agent's wa-0 models"),
+        ("wa-1", "Skill 'ws-missing' not found in agent's wa-1 skills"),
+        ("wa-1", "Agent 'wa-missing' not found in agents"),
+        (
+            "wa-3",
+            "Agent wa-3 (assistant_3) does not connect to any other node.",
+        ),
+    ]
+    # When
+    with pytest.raises(ValidationError) as exc_info:
+        WaldiezFlow(name="flow", description="flow", data=data)
+    # Then
+    error = exc_info.value.errors()[0]["ctx"]["error"]
+    assert isinstance(error, WaldiezFlowValidationError)
+    assert len(error.issues) == 5
+    assert "5 issues found in the flow" in str(error)
+
+
+def test_flow_issues_duplicate_ids() -> None:
+    """Test the issues for non unique model and skill IDs."""
+    # Given
+    data = _get_flow_data(agents_count=2, chats_count=1)
+    data.models.append(data.models[0])
+    index = WaldiezFlowIndex.build(agents=data.agents, chats=data.chats)
+    # When
+    issues = get_flow_issues(data, index)
+    # Then
+    assert len(issues) == 1
+    assert issues[0].entity_id == "wm-0"
+    with pytest.raises(ValueError, match="Model IDs must be unique"):
+        WaldiezFlow(name="flow", description="flow", data=data)
+
+
+def _count_validation_calls(data: WaldiezFlowData) -> int:
+    """Count the (waldiez) calls to build the index and check the references.
+
+    Parameters
+    ----------
+    data : WaldiezFlowData
+        The flow's data.
+
+    Returns
+    -------
+    int
+        The number of function calls in the waldiez package.
+    """
+    package_dir = os.path.dirname(waldiez.__file__)
+    calls = 0
+
+    def _profile(frame: FrameType, event: str, _: Any) -> None:
+        nonlocal calls
+        if event == "call" and frame.f_code.co_filename.startswith(package_dir):
+            calls += 1
+
+    sys.setprofile(_profile)
+    try:
+        index = WaldiezFlowIndex.build(agents=data.agents, chats=data.chats)
+        issues = get_flow_issues(data, index)
+    finally:
+        sys.setprofile(None)
+    assert not issues
+    return calls
+
+
+def test_flow_validation_scales_linearly() -> None:
+    """Test the validation's cost up to a 1k agents / 5k chats flow."""
+    small = _count_validation_calls(_get_flow_data(125, 625))
+    large = _count_validation_calls(_get_flow_data(1000, 5000))
+    # 8x the agents and chats: linear, not (agents x agents)
+    assert 0 < large <= small * 8
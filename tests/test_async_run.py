@@ -0,0 +1,78 @@
+"""Test waldiez.async_run.*."""
+
+import asyncio
+import threading
+from typing import Callable, List
+
+import pytest
+
+from waldiez.async_run import WaldiezAsyncRun
+
+
+def test_async_run_stream() -> None:
+    """Test iterating over a run's output lines."""
+    done: List[bool] = []
+
+    def _target(on_print: Callable[[str], None]) -> int:
+        on_print("first ")
+        on_print("line\nsecond line\n")
+        on_print("last")
+        return 42
+
+    async def _main() -> None:
+        run = WaldiezAsyncRun(
+            _target, cancel=lambda: None, on_done=lambda: done.append(True)
+        )
+        lines = [line async for line in run]
+        assert lines == ["first line", "second line", "last"]
+        # nothing more after the end
+        assert [line async for line in run] == []
+        assert await run == 42
+        assert run.done
+
+    asyncio.run(_main())
+    assert done == [True]
+
+
+def test_async_run_printer() -> None:
+    """Test passing a run's output to a printer."""
+    printed: List[str] = []
+
+    def _target(on_print: Callable[[str], None]) -> str:
+        on_print("printed\n")
+        return "result"
+
+    async def _main() -> None:
+        run = WaldiezAsyncRun(
+            _target, cancel=lambda: None, printer=printed.append
+        )
+        assert await run == "result"
+        assert [line async for line in run] == []
+
+    asyncio.run(_main())
+    assert printed == ["printed\n"]
+
+
+def test_async_run_cancel() -> None:
+    """Test cancelling a run (and the flow)."""
+    cancelled = threading.Event()
+    done: List[bool] = []
+
+    def _target(on_print: Callable[[str], None]) -> None:
+        on_print("started\n")
+        if not cancelled.wait(timeout=10):  # pragma: no cover
+            raise AssertionError("Not cancelled")
+
+    async def _main() -> None:
+        run = WaldiezAsyncRun(
+            _target, cancel=cancelled.set, on_done=lambda: done.append(True)
+        )
+        assert await run.__anext__() == "started"
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        assert [line async for line in run] == []
+
+    asyncio.run(_main())
+    assert cancelled.is_set()
+    assert done == [True]
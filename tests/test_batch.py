@@ -0,0 +1,156 @@
+"""Test waldiez.batch.*."""
+
+from pathlib import Path
+
+import pytest
+
+from waldiez.batch import export_batch, get_batch_files
+from waldiez.models import WaldiezFlow
+
+
+def _write_flows(directory: Path, waldiez_flow: WaldiezFlow) -> None:
+    """Write a few flows (and an invalid one) in a directory.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    for name in ("one", "two"):
+        sub_dir = directory / name
+        sub_dir.mkdir(parents=True)
+        with open(sub_dir / f"{name}.waldiez", "w", encoding="utf-8") as file:
+            file.write(waldiez_flow.model_dump_json(by_alias=True))
+    with open(directory / "invalid.waldiez", "w", encoding="utf-8") as file:
+        file.write("{not json")
+    checkpoints = directory / ".ipynb_checkpoints"
+    checkpoints.mkdir()
+    (checkpoints / "one.waldiez").touch()
+
+
+def test_get_batch_files(tmp_path: Path, waldiez_flow: WaldiezFlow) -> None:
+    """Test getting the files from directories, files and globs.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    _write_flows(tmp_path, waldiez_flow)
+    files = get_batch_files([tmp_path])
+    assert [file.name for file in files] == [
+        "invalid.waldiez",
+        "one.waldiez",
+        "two.waldiez",
+    ]
+    files = get_batch_files(
+        [tmp_path / "one" / "one.waldiez", f"{tmp_path}/**/t*.waldiez"]
+    )
+    assert [file.name for file in files] == ["one.waldiez", "two.waldiez"]
+    assert not get_batch_files([tmp_path / "missing"])
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_export_batch(
+    tmp_path: Path, waldiez_flow: WaldiezFlow, max_workers: int
+) -> None:
+    """Test exporting multiple files.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    max_workers : int
+        The number of worker processes.
+    """
+    _write_flows(tmp_path, waldiez_flow)
+    results = export_batch(
+        [tmp_path], formats=["py", ".ipynb"], max_workers=max_workers
+    )
+    assert [result.ok for result in results] == [False, True, True]
+    assert results[0].error and "Invalid JSON" in results[0].error
+    for result in results[1:]:
+        assert result.duration > 0
+        assert [output.suffix for output in result.outputs] == [
+            ".py",
+            ".ipynb",
+        ]
+        assert all(output.exists() for output in result.outputs)
+    # outputs exist
+    results = export_batch([tmp_path / "one"], formats=["py"])
+    assert not results[0].ok
+    results = export_batch([tmp_path / "one"], formats=["py"], force=True)
+    assert results[0].ok
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_export_batch_output_dir(
+    tmp_path: Path, waldiez_flow: WaldiezFlow, max_workers: int
+) -> None:
+    """Test exporting multiple files to an output directory.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    max_workers : int
+        The number of worker processes.
+    """
+    _write_flows(tmp_path / "flows", waldiez_flow)
+    output_dir = tmp_path / "output"
+    results = export_batch(
+        [tmp_path / "flows" / "one", tmp_path / "flows" / "two"],
+        formats=["py"],
+        output_dir=output_dir,
+        max_workers=max_workers,
+    )
+    assert all(result.ok for result in results)
+    assert (output_dir / "one.py").exists()
+    assert (output_dir / "two.py").exists()
+    # the shared files are replaced atomically (no temporary files left)
+    assert (output_dir / "waldiez_api_keys.py").exists()
+    assert not list(output_dir.glob(".*.tmp"))
+    with pytest.raises(ValueError):
+        export_batch([tmp_path], formats=["invalid"])
+
+
+def test_export_batch_output_collision(
+    tmp_path: Path, waldiez_flow: WaldiezFlow
+) -> None:
+    """Test exporting files with the same name to an output directory.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    _write_flows(tmp_path / "flows", waldiez_flow)
+    other = tmp_path / "flows" / "two" / "one.waldiez"
+    other.write_text(
+        waldiez_flow.model_dump_json(by_alias=True), encoding="utf-8"
+    )
+    output_dir = tmp_path / "output"
+    results = export_batch(
+        [tmp_path / "flows" / "one", tmp_path / "flows" / "two"],
+        formats=["py"],
+        output_dir=output_dir,
+        max_workers=2,
+    )
+    assert [result.file.name for result in results] == [
+        "one.waldiez",
+        "one.waldiez",
+        "two.waldiez",
+    ]
+    assert [result.ok for result in results] == [True, False, True]
+    assert results[1].error and "OutputCollision" in results[1].error
+    assert results[1].file == other.resolve()
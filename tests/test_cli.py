@@ -1,13 +1,17 @@
 """Test the CLI."""
 
 import re
+import subprocess
 import sys
 from pathlib import Path
 
+import click
 import pytest
+import typer
 
 from waldiez import __version__
 from waldiez.__main__ import app as waldiez_main  # type: ignore
+from waldiez.batch import DEFAULT_FORMATS, SUPPORTED_FORMATS
 from waldiez.cli import app
 from waldiez.models import WaldiezFlow
 
@@ -59,6 +63,29 @@ def test_help(capsys: pytest.CaptureFixture[str]) -> None:
     assert "Usage: waldiez" in escape_ansi(captured.out)
 
 
+def test_convert_batch_help() -> None:
+    """Test the formats in the convert-batch help message."""
+    command = typer.main.get_command(app)
+    assert isinstance(command, click.Group)
+    convert_batch = command.commands["convert-batch"]
+    formats = next(
+        param for param in convert_batch.params if param.name == "formats"
+    )
+    assert isinstance(formats, click.Option) and formats.help
+    assert f"({', '.join(SUPPORTED_FORMATS)})" in formats.help
+    assert f"Default: {' and '.join(DEFAULT_FORMATS)}." in formats.help
+
+
+def test_cli_does_not_import_the_exporter() -> None:
+    """Test that the CLI (and the batch formats) do not load the exporter."""
+    code = (
+        "import sys\n"
+        "import waldiez.cli\n"
+        "assert 'waldiez.exporter' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 def test_empty_cli(capsys: pytest.CaptureFixture[str]) -> None:
     """Test the CLI with no arguments.
 
@@ -110,6 +137,45 @@ def test_cli_export(
     output_file.unlink(missing_ok=True)
 
 
+def test_cli_convert_batch(
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+    waldiez_flow: WaldiezFlow,
+) -> None:
+    """Test converting multiple WaldiezFlows using the CLI.
+
+    Parameters
+    ----------
+    capsys : pytest.CaptureFixture[str]
+        Pytest fixture to capture stdout and stderr.
+    tmp_path : Path
+        Pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    for name in ("flow1", "flow2"):
+        with open(tmp_path / f"{name}.waldiez", "w", encoding="utf-8") as file:
+            file.write(waldiez_flow.model_dump_json(by_alias=True))
+    output_dir = tmp_path / "output"
+    sys.argv = [
+        "waldiez",
+        "convert-batch",
+        str(tmp_path),
+        "--format",
+        "py",
+        "--output-dir",
+        str(output_dir),
+        "--workers",
+        "1",
+    ]
+    with pytest.raises(SystemExit):
+        waldiez_main()
+    captured = capsys.readouterr()
+    assert "Converted 2/2 file(s)" in escape_ansi(captured.out)
+    assert (output_dir / "flow1.py").exists()
+    assert (output_dir / "flow2.py").exists()
+
+
 def test_cli_run(
     caplog: pytest.LogCaptureFixture,
     tmp_path: Path,
@@ -159,3 +225,43 @@ def test_cli_check(
         waldiez_main()
     captured = capsys.readouterr()
     assert "Waldiez flow is valid" in escape_ansi(captured.out)
+
+
+def test_cli_export_no_cache(
+    tmp_path: Path,
+    waldiez_flow: WaldiezFlow,
+    waldiez_cache_dir: Path,
+) -> None:
+    """Test exporting with and without the export cache.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    waldiez_cache_dir : Path
+        The (temporary) cache directory.
+    """
+    input_file = tmp_path / f"{waldiez_flow.name}.waldiez"
+    with open(input_file, "w", encoding="utf-8") as file:
+        file.write(waldiez_flow.model_dump_json(by_alias=True))
+    output_file = tmp_path / f"{waldiez_flow.name}.py"
+    cache_root = waldiez_cache_dir / "exports"
+    sys.argv = [
+        "waldiez",
+        "convert",
+        "--output",
+        str(output_file),
+        "--file",
+        str(input_file),
+        "--no-cache",
+    ]
+    with pytest.raises(SystemExit):
+        waldiez_main()
+    assert output_file.exists()
+    assert not cache_root.exists()
+    sys.argv = sys.argv[:-1] + ["--force"]
+    with pytest.raises(SystemExit):
+        waldiez_main()
+    assert len(list(cache_root.iterdir())) == 1
@@ -0,0 +1,146 @@
+"""Test waldiez.export_cache.*."""
+
+import os
+from pathlib import Path
+
+from waldiez import Waldiez, WaldiezExporter
+from waldiez.export_cache import (
+    WaldiezExportCache,
+    get_default_cache_dir,
+    get_flow_hash,
+)
+from waldiez.models import WaldiezFlow
+
+from .exporting.flow_helpers import get_flow
+
+
+def _write_entry(cache: WaldiezExportCache, key: str, source: Path) -> None:
+    """Store a dummy entry in the cache.
+
+    Parameters
+    ----------
+    cache : WaldiezExportCache
+        The cache.
+    key : str
+        The cache key.
+    source : Path
+        A (new) directory to write the entry's files to.
+    """
+    source.mkdir()
+    (source / "flow.py").write_text(key * 10, encoding="utf-8")
+    cache.store(key, source, "flow.py")
+
+
+def test_default_cache_dir(waldiez_cache_dir: Path) -> None:
+    """Test the default cache directory (set in conftest).
+
+    Parameters
+    ----------
+    waldiez_cache_dir : Path
+        The cache directory fixture.
+    """
+    assert get_default_cache_dir() == waldiez_cache_dir
+    assert WaldiezExportCache().root == waldiez_cache_dir / "exports"
+
+
+def test_export_with_cache(tmp_path: Path) -> None:
+    """Test a cache miss and a cache hit (with the side files).
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    # Given
+    waldiez = Waldiez(flow=get_flow())
+    cache = WaldiezExportCache(tmp_path / "cache")
+    first_dir = tmp_path / "first"
+    second_dir = tmp_path / "second"
+    first_dir.mkdir()
+    second_dir.mkdir()
+    # When
+    WaldiezExporter(waldiez, cache=cache).export(first_dir / "flow.py")
+    key = cache.get_key(waldiez, ".py")
+    # Then
+    assert (cache.root / key / "flow.py").is_file()
+    # When
+    WaldiezExporter(waldiez, cache=cache).export(second_dir / "flow.py")
+    # Then
+    first_files = sorted(item.name for item in first_dir.iterdir())
+    second_files = sorted(item.name for item in second_dir.iterdir())
+    assert first_files == second_files
+    assert "waldiez_api_keys.py" in second_files
+    for file_name in first_files:
+        assert (first_dir / file_name).read_bytes() == (
+            second_dir / file_name
+        ).read_bytes()
+    # a different flow or extension gets a different key
+    assert key != cache.get_key(waldiez, ".ipynb")
+    other = Waldiez(flow=get_flow().model_copy(update={"name": "other"}))
+    assert get_flow_hash(other) != get_flow_hash(waldiez)
+
+
+def test_export_cache_restore_miss(tmp_path: Path) -> None:
+    """Test restoring a missing entry.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    cache = WaldiezExportCache(tmp_path / "cache")
+    assert not cache.restore("missing", tmp_path / "flow.py")
+    assert not (tmp_path / "flow.py").exists()
+
+
+def test_export_cache_evict_by_entries(tmp_path: Path) -> None:
+    """Test evicting the least recently used entries.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    cache = WaldiezExportCache(tmp_path / "cache", max_entries=2)
+    _write_entry(cache, "a", tmp_path / "a")
+    _write_entry(cache, "b", tmp_path / "b")
+    os.utime(cache.root / "a", (1, 1))
+    os.utime(cache.root / "b", (2, 2))
+    # use "a", "b" is now the least recently used
+    assert cache.restore("a", tmp_path / "restored.py")
+    _write_entry(cache, "c", tmp_path / "c")
+    assert sorted(item.name for item in cache.root.iterdir()) == ["a", "c"]
+
+
+def test_export_cache_evict_by_size(tmp_path: Path) -> None:
+    """Test evicting entries to respect the maximum size.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    cache = WaldiezExportCache(tmp_path / "cache", max_size=150)
+    _write_entry(cache, "a" * 8, tmp_path / "a")
+    os.utime(cache.root / ("a" * 8), (1, 1))
+    _write_entry(cache, "b" * 8, tmp_path / "b")
+    assert [item.name for item in cache.root.iterdir()] == ["b" * 8]
+
+
+def test_export_cache_clear(tmp_path: Path, waldiez_flow: WaldiezFlow) -> None:
+    """Test clearing the cache.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    cache = WaldiezExportCache(tmp_path / "cache")
+    exporter = WaldiezExporter(Waldiez(flow=waldiez_flow), cache=cache)
+    exporter.export(tmp_path / "flow.ipynb")
+    assert (tmp_path / "flow.ipynb").is_file()
+    assert list(cache.root.iterdir())
+    cache.clear()
+    assert not list(cache.root.iterdir())
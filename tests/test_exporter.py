@@ -1,5 +1,7 @@
 """Test WaldiezExporter."""
 
+import io
+import os
 import uuid
 from pathlib import Path
 
@@ -190,3 +192,62 @@ def test_export_complex_flow(tmp_path: Path) -> None:
     skill_file = tmp_path / "skill_name.py"
     assert skill_file.exists()
     skill_file.unlink(missing_ok=True)
+
+
+def test_write_py_to_stream(tmp_path: Path) -> None:
+    """Test writing the python script to a text stream.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    flow = get_flow()
+    waldiez = Waldiez(flow=flow)
+    exporter = WaldiezExporter(waldiez)
+    output_file = tmp_path / f"{uuid.uuid4().hex}.py"
+    exporter.export(output_file)
+    stream = io.StringIO()
+    exporter.write_py(stream, output_dir=tmp_path)
+    assert stream.getvalue() == output_file.read_text(encoding="utf-8")
+    output_file.unlink()
+
+
+def test_incremental_export(tmp_path: Path) -> None:
+    """Test re-exporting a flow after changing one agent.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    # Given
+    flow = get_flow()
+    exporter = WaldiezExporter(Waldiez(flow=flow), incremental=True)
+    fragments = exporter.fragments
+    assert fragments is not None
+    output_file = tmp_path / "flow.py"
+    exporter.export(output_file)
+    api_keys_file = tmp_path / "waldiez_api_keys.py"
+    skill_file = tmp_path / "skill_name.py"
+    os.utime(api_keys_file, (1, 1))
+    os.utime(skill_file, (1, 1))
+    first_misses = fragments.misses
+    assert fragments.hits == 0
+    # When
+    flow_dict = flow.model_dump(by_alias=True)
+    assistant = flow_dict["data"]["agents"]["assistants"][0]
+    assistant["data"]["systemMessage"] = "Changed system message"
+    updated = Waldiez(flow=WaldiezFlow.model_validate(flow_dict))
+    exporter.update(updated)
+    exporter.export(output_file, force=True)
+    # Then
+    # only the changed agent (and its nested chats) are regenerated
+    assert fragments.misses == first_misses + 2
+    assert fragments.hits == first_misses - 2
+    assert api_keys_file.stat().st_mtime == 1
+    assert skill_file.stat().st_mtime == 1
+    stream = io.StringIO()
+    WaldiezExporter(updated).write_py(stream, output_dir=tmp_path)
+    assert output_file.read_text(encoding="utf-8") == stream.getvalue()
+    assert "Changed system message" in stream.getvalue()
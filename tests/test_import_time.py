@@ -0,0 +1,87 @@
+"""Test what importing the waldiez package imports (for its import time)."""
+
+import logging
+import subprocess  # nosemgrep # nosec
+import sys
+from typing import List
+
+import pytest
+
+import waldiez
+from waldiez.models import Waldiez
+
+# not to be imported on `import waldiez`
+HEAVY_MODULES = ("pydantic", "waldiez.models", "waldiez.runner", "autogen")
+
+
+def _get_imported_modules(module: str) -> List[str]:
+    """Get the modules that importing a module imports, in a new process.
+
+    Parameters
+    ----------
+    module : str
+        The module to import.
+
+    Returns
+    -------
+    List[str]
+        The names of the newly imported modules.
+    """
+    code = (
+        "import sys; before = set(sys.modules); "
+        f"import {module}; "
+        "print('\\n'.join(sorted(set(sys.modules) - before)))"
+    )
+    completed = subprocess.run(  # nosemgrep # nosec
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.split()
+
+
+def test_import_only_stdlib() -> None:
+    """Test that importing the package only imports the standard library."""
+    # (the import time is dominated by third-party packages)
+    imported = _get_imported_modules("waldiez")
+    assert "waldiez" in imported
+    third_party = [
+        name
+        for name in imported
+        if name.split(".")[0] not in sys.stdlib_module_names
+        and name not in ("waldiez", "waldiez._version")
+    ]
+    assert not third_party
+
+
+def test_import_is_lazy() -> None:
+    """Test that the heavy modules are not imported with the package."""
+    code = (
+        "import sys, waldiez; "
+        f"print([name for name in {HEAVY_MODULES!r} if name in sys.modules])"
+    )
+    completed = subprocess.run(  # nosemgrep # nosec
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert completed.stdout.strip() == "[]"
+
+
+def test_flaml_logging_filter() -> None:
+    """Test that the flaml log filter is installed on import."""
+    assert any(
+        isinstance(log_filter, waldiez.FlamlFilter)
+        for log_filter in logging.getLogger("flaml").filters
+    )
+
+
+def test_lazy_attributes() -> None:
+    """Test accessing the public classes of the package."""
+    assert waldiez.Waldiez is Waldiez
+    assert "WaldiezRunner" in dir(waldiez)
+    assert waldiez.WaldiezRunner.__name__ == "WaldiezRunner"
+    with pytest.raises(AttributeError):
+        getattr(waldiez, "NotAnAttribute")
@@ -0,0 +1,79 @@
+"""Test waldiez.process.*."""
+
+import asyncio
+import re
+import sys
+import time
+from typing import List
+
+import pytest
+
+from waldiez.process import a_run_process, run_process
+
+# more than a pipe's buffer on stderr, before anything on stdout
+CHATTY = (
+    "import sys\n"
+    "for i in range(5000):\n"
+    "    sys.stderr.write('err %d ' % i + 'x' * 80 + '\\n')\n"
+    "sys.stderr.flush()\n"
+    "print('out')\n"
+    "sys.exit(3)\n"
+)
+
+
+def test_run_process() -> None:
+    """Test streaming both pipes of a (chatty) process."""
+    lines: List[str] = []
+    result = run_process(
+        [sys.executable, "-c", CHATTY], on_line=lines.append, timeout=60
+    )
+    assert result.returncode == 3
+    assert not result.ok
+    assert result.stdout == ["out"]
+    assert len(result.stderr) == 5000
+    assert result.stderr[0].startswith("err 0 ")
+    assert len(lines) == 5001
+    assert re.match(r"^\[\d{2}:\d{2}:\d{2}\] err 0 ", lines[0])
+
+
+def test_run_process_without_timestamps() -> None:
+    """Test streaming the lines without timestamps."""
+    lines: List[str] = []
+    result = run_process(
+        [sys.executable, "-c", "print('one'); print('two')"],
+        on_line=lines.append,
+        timestamps=False,
+    )
+    assert result.ok
+    assert lines == ["one", "two"]
+
+
+def test_run_process_timeout() -> None:
+    """Test killing a process that does not finish in time."""
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        run_process(
+            [sys.executable, "-c", "import time; time.sleep(30)"], timeout=1
+        )
+    assert time.monotonic() - start < 15
+
+
+def test_a_run_process() -> None:
+    """Test streaming both pipes of a process in the event loop."""
+    lines: List[str] = []
+
+    async def _main() -> None:
+        result = await a_run_process(
+            [sys.executable, "-c", CHATTY], on_line=lines.append, timeout=60
+        )
+        assert result.returncode == 3
+        assert result.stdout == ["out"]
+        assert len(result.stderr) == 5000
+        with pytest.raises(TimeoutError):
+            await a_run_process(
+                [sys.executable, "-c", "import time; time.sleep(30)"],
+                timeout=1,
+            )
+
+    asyncio.run(_main())
+    assert len(lines) == 5001
@@ -0,0 +1,69 @@
+"""Test waldiez.requirements.*."""
+
+# pylint: disable=protected-access
+
+import importlib.metadata
+from unittest.mock import patch
+
+from autogen.version import __version__ as ag2_version  # type: ignore
+from packaging.requirements import Requirement
+
+from waldiez.requirements import (
+    _get_extra_dependencies,
+    clear_requirements_cache,
+    get_unsatisfied_requirements,
+    is_requirement_satisfied,
+)
+
+
+def test_is_requirement_satisfied() -> None:
+    """Test checking requirements against the installed distributions."""
+    assert is_requirement_satisfied("pydantic>=2.0")
+    assert is_requirement_satisfied(f"pyautogen=={ag2_version}")
+    assert is_requirement_satisfied("Pydantic_Core")
+    assert not is_requirement_satisfied("pydantic<2.0")
+    assert not is_requirement_satisfied("not-an-installed-package-waldiez")
+    # not for this environment
+    assert is_requirement_satisfied(
+        "not-an-installed-package-waldiez; python_version < '3.0'"
+    )
+    # not a valid specifier, pip will report it
+    assert not is_requirement_satisfied("invalid requirement ==")
+
+
+def test_is_requirement_with_extras_satisfied() -> None:
+    """Test checking the dependencies of a requirement's extras."""
+    distribution = importlib.metadata.distribution("pyautogen")
+    extra_dependencies = _get_extra_dependencies(distribution, "retrievechat")
+    assert "chromadb" in [dependency.name for dependency in extra_dependencies]
+    requirement = f"pyautogen[retrievechat]=={ag2_version}"
+    with patch(
+        "waldiez.requirements._get_extra_dependencies",
+        return_value=[Requirement("pydantic>=2.0")],
+    ):
+        assert is_requirement_satisfied(requirement)
+    with patch(
+        "waldiez.requirements._get_extra_dependencies",
+        return_value=[Requirement("not-an-installed-package-waldiez")],
+    ):
+        assert not is_requirement_satisfied(requirement)
+    # an extra that the distribution does not have, adds nothing
+    assert is_requirement_satisfied("pydantic[not-an-extra]")
+
+
+def test_get_unsatisfied_requirements() -> None:
+    """Test getting the requirements to install (cached if satisfied)."""
+    clear_requirements_cache()
+    requirements = ["pydantic>=2.0", "jupytext"]
+    assert not get_unsatisfied_requirements(requirements)
+    # warm: the installed distributions are not checked again
+    with patch(
+        "waldiez.requirements.is_requirement_satisfied",
+        side_effect=AssertionError("not cached"),
+    ):
+        assert not get_unsatisfied_requirements(requirements)
+    assert get_unsatisfied_requirements(
+        requirements + ["not-an-installed-package-waldiez"]
+    ) == ["not-an-installed-package-waldiez"]
+    assert not get_unsatisfied_requirements([])
+    clear_requirements_cache()
@@ -2,7 +2,11 @@
 
 # pylint: disable=protected-access
 
+import asyncio
+import os
 import shutil
+import sys
+import time
 from pathlib import Path
 from typing import Any
 from unittest.mock import patch
@@ -11,7 +15,13 @@ import pytest
 from autogen.io import IOStream  # type: ignore
 
 from waldiez.models import Waldiez, WaldiezFlow
-from waldiez.runner import WaldiezRunner, get_printer
+from waldiez.runner import (
+    WaldiezRunner,
+    get_printer,
+    make_run_dir,
+    publish_results,
+)
+from waldiez.venv_pool import WaldiezVenvPool
 
 
 class CustomIOStream(IOStream):
@@ -164,3 +174,307 @@ def test_get_printer(capsys: pytest.CaptureFixture[str]) -> None:
         printer1 = get_printer()
         printer1(invalid_str)
     IOStream.set_global_default(CustomIOStream())
+
+
+def test_waldiez_runner_isolated(
+    waldiez_flow: WaldiezFlow,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test WaldiezRunner in a worker process.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    capsys : pytest.CaptureFixture[Optional[str]]
+        Pytest fixture to capture stdout and stderr.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    output_path = tmp_path / "output.py"
+    with WaldiezRunner(waldiez, isolated=True) as runner:
+        runner.warm_up()
+        with IOStream.set_default(CustomIOStream()):
+            results = runner.run(output_path=output_path)
+        worker = runner._worker
+        assert worker is not None and worker.alive
+    assert not worker.alive
+    std_out = capsys.readouterr().out
+    assert "Starting workflow" in std_out
+    # the flow's output is forwarded from the worker
+    assert "User Input" in std_out
+    # (the legacy runs reload autogen, so not an isinstance check)
+    assert type(results).__name__ == "ChatResult"
+    assert results.chat_history
+    assert (tmp_path / "waldiez_out").exists()
+    shutil.rmtree(tmp_path / "waldiez_out")
+
+
+def test_waldiez_runner_a_run(
+    waldiez_flow: WaldiezFlow,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test running a flow without blocking the event loop.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    capsys : pytest.CaptureFixture[Optional[str]]
+        Pytest fixture to capture stdout and stderr.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    output_path = tmp_path / "output.py"
+
+    async def _main() -> None:
+        with WaldiezRunner(waldiez) as runner:
+            results = await runner.a_run(output_path=output_path)
+            assert not runner.running
+            assert type(results).__name__ == "ChatResult"
+            run = runner.a_stream()
+            assert runner.running
+            with pytest.raises(RuntimeError):
+                runner.a_stream()
+            lines = [line async for line in run]
+            assert "<Waldiez> - Starting workflow..." in lines
+            assert any("User Input" in line for line in lines)
+            assert type(await run).__name__ == "ChatResult"
+            assert not runner.running
+
+    with IOStream.set_default(CustomIOStream()):
+        asyncio.run(_main())
+    std_out = capsys.readouterr().out
+    assert "Starting workflow" in std_out
+    assert (tmp_path / "waldiez_out").exists()
+    shutil.rmtree(tmp_path / "waldiez_out")
+
+
+def test_waldiez_runner_a_run_timeout(waldiez_flow: WaldiezFlow) -> None:
+    """Test a flow's run timing out (and cancelled) in the event loop.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+
+    def _slow_input(*args: Any, **kwargs: Any) -> str:
+        time.sleep(2)
+        return "exit"
+
+    async def _main() -> None:
+        with WaldiezRunner(waldiez) as runner:
+            await runner.a_install_requirements()
+            with pytest.raises(TimeoutError):
+                await runner.a_run(timeout=1)
+            assert not runner.running
+            run = runner.a_stream()
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(run, timeout=1)
+            assert not runner.running
+            worker = runner._worker
+            assert worker is not None
+            # the worker process is terminated
+            for _ in range(50):
+                if not worker.alive:
+                    break
+                await asyncio.sleep(0.1)
+            assert not worker.alive
+
+    with patch.object(CustomIOStream, "input", _slow_input):
+        asyncio.run(_main())
+
+
+def test_install_requirements_if_needed(waldiez_flow: WaldiezFlow) -> None:
+    """Test that pip only runs for the requirements not installed.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    runner = WaldiezRunner(waldiez)
+    with (
+        patch("waldiez.runner.get_unsatisfied_requirements", return_value=[]),
+        patch("subprocess.Popen", side_effect=AssertionError("pip called")),
+    ):
+        runner.install_requirements()
+    with (
+        patch(
+            "waldiez.runner.get_unsatisfied_requirements",
+            return_value=["invalid_requirement"],
+        ),
+        patch("waldiez.runner.refresh_environment") as refresh,
+    ):
+        runner.install_requirements()
+        refresh.assert_called_once()
+
+
+def test_waldiez_runner_venv_pool(
+    waldiez_flow: WaldiezFlow,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test WaldiezRunner with a venv pool.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    capsys : pytest.CaptureFixture[Optional[str]]
+        Pytest fixture to capture stdout and stderr.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    output_path = tmp_path / "output.py"
+    # (the requirements are already installed in the base environment)
+    pool = WaldiezVenvPool(root=tmp_path / "venvs", system_site_packages=True)
+    with pytest.raises(ValueError):
+        WaldiezRunner(waldiez, isolated=True, venv_pool=pool)
+    runner = WaldiezRunner(waldiez, venv_pool=pool)
+    with (
+        patch.object(WaldiezVenvPool, "_install") as install,
+        patch(
+            "waldiez.runner.get_unsatisfied_requirements",
+            side_effect=AssertionError("installing in this environment"),
+        ),
+        IOStream.set_default(CustomIOStream()),
+    ):
+        results = runner.run(output_path=output_path)
+        install.assert_called_once()
+        assert sorted(install.call_args.args[1]) == sorted(waldiez.requirements)
+    std_out = capsys.readouterr().out
+    assert "Starting workflow" in std_out
+    # the flow's input requests are answered with the IOStream
+    assert "User Input" in std_out
+    assert not isinstance(results, list)
+    assert type(results).__name__ == "ChatResult"
+    assert results.chat_history
+    assert (tmp_path / "waldiez_out").exists()
+    shutil.rmtree(tmp_path / "waldiez_out")
+
+
+def test_publish_results(tmp_path: Path) -> None:
+    """Test moving (or copying, across filesystems) a run's results.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    for name, replace in (("moved", os.replace), ("copied", None)):
+        run_dir = make_run_dir(tmp_path / "flow.py")
+        assert run_dir.parent == tmp_path / "waldiez_out"
+        (run_dir / "flow.db").write_bytes(b"db")
+        (run_dir / "coding").mkdir()
+        (run_dir / "coding" / "script.py").write_text("print(1)")
+        (run_dir / "__pycache__").mkdir()
+        destination = tmp_path / name
+        destination.mkdir()
+        inode = (run_dir / "flow.db").stat().st_ino
+        with patch(
+            "waldiez.runner.os.replace",
+            side_effect=replace or OSError("cross-device link"),
+        ):
+            publish_results(run_dir, destination)
+        assert (destination / "flow.db").read_bytes() == b"db"
+        assert (destination / "coding" / "script.py").read_text() == "print(1)"
+        assert not (destination / "__pycache__").exists()
+        # renamed, not copied (on the same filesystem)
+        assert ((destination / "flow.db").stat().st_ino == inode) is (
+            replace is not None
+        )
+        shutil.rmtree(run_dir)
+
+
+def test_waldiez_runner_in_output_dir(
+    waldiez_flow: WaldiezFlow,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test running the flow directly in its results directory.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    capsys : pytest.CaptureFixture[Optional[str]]
+        Pytest fixture to capture stdout and stderr.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    output_path = tmp_path / "output.py"
+    runner = WaldiezRunner(waldiez, in_output_dir=True)
+    with (
+        IOStream.set_default(CustomIOStream()),
+        patch(
+            "waldiez.runner.publish_results",
+            side_effect=AssertionError("results moved"),
+        ),
+    ):
+        runner.run(output_path=output_path)
+    results_dirs = list((tmp_path / "waldiez_out").iterdir())
+    assert len(results_dirs) == 1
+    assert (results_dirs[0] / "output.py").is_file()
+    assert f"The results are in {results_dirs[0]}" in capsys.readouterr().out
+    shutil.rmtree(tmp_path / "waldiez_out")
+
+
+def test_waldiez_runner_cleans_up_on_error(
+    waldiez_flow: WaldiezFlow,
+    tmp_path: Path,
+) -> None:
+    """Test that a failed (in-process) run cleans up after itself.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    output_path = tmp_path / "output.py"
+    runner = WaldiezRunner(waldiez)
+    runner._called_install_requirements = True
+    old_sys_path = list(sys.path)
+
+    def _export(path: Path) -> None:
+        path.write_text(
+            "def main():\n    raise RuntimeError('the flow failed')\n",
+            encoding="utf-8",
+        )
+
+    with (
+        patch.object(runner._exporter, "export", side_effect=_export),
+        patch.object(
+            Waldiez,
+            "get_flow_env_vars",
+            return_value=[("WALDIEZ_TEST_RUN_VAR", "value")],
+        ),
+    ):
+        with pytest.raises(RuntimeError, match="the flow failed"):
+            runner.run(output_path=output_path)
+    assert sys.path == old_sys_path
+    assert "WALDIEZ_TEST_RUN_VAR" not in os.environ
+    # the results are published, no hidden run directory is left
+    out_dir = tmp_path / "waldiez_out"
+    assert not list(out_dir.glob(".run-*"))
+    results_dirs = list(out_dir.iterdir())
+    assert len(results_dirs) == 1
+    assert (results_dirs[0] / "output.py").is_file()
+    with patch.object(
+        runner._exporter, "export", side_effect=ValueError("export failed")
+    ):
+        with pytest.raises(ValueError):
+            runner.run(output_path=output_path)
+    assert not list(out_dir.glob(".run-*"))
@@ -0,0 +1,89 @@
+"""Test waldiez.runner_pool.*."""
+
+# pylint: disable=protected-access
+
+import os
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from waldiez import WaldiezExporter, WaldiezRunnerPool
+from waldiez.models import Waldiez, WaldiezFlow
+
+
+def test_runner_pool(waldiez_flow: WaldiezFlow, tmp_path: Path) -> None:
+    """Test running flows concurrently in a pool.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    output: List[str] = []
+    cwd = os.getcwd()
+
+    def _on_input(prompt: str, password: bool) -> str:
+        return "User Input"
+
+    with WaldiezRunnerPool(size=2, max_tasks_per_worker=1) as pool:
+        originals = list(pool._workers)
+        assert all(worker.alive for worker in originals)
+        futures = [
+            pool.submit(
+                waldiez,
+                output_path=tmp_path / "flow.py",
+                on_print=output.append,
+                on_input=_on_input,
+            )
+            for _ in range(3)
+        ]
+        results = [future.result(timeout=120) for future in futures]
+        # the workers are replaced after each run
+        assert not any(worker in originals for worker in pool._workers)
+    assert [type(result).__name__ for result in results] == ["ChatResult"] * 3
+    assert any("User Input" in text for text in output)
+    # one directory per run
+    assert len(list((tmp_path / "waldiez_out").iterdir())) == 3
+    assert not any(worker.alive for worker in pool._workers)
+    assert os.getcwd() == cwd
+    with pytest.raises(RuntimeError):
+        pool.submit(waldiez)
+
+
+def test_runner_pool_invalid_size() -> None:
+    """Test creating a pool with an invalid size."""
+    with pytest.raises(ValueError):
+        WaldiezRunnerPool(size=-1, warm_up=False)
+    with pytest.raises(ValueError):
+        WaldiezRunnerPool(size=1, max_tasks_per_worker=0, warm_up=False)
+
+
+def test_runner_pool_export_error(
+    waldiez_flow: WaldiezFlow, tmp_path: Path
+) -> None:
+    """Test that a failed export cleans up its run directory.
+
+    Parameters
+    ----------
+    waldiez_flow : WaldiezFlow
+        A WaldiezFlow instance.
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    waldiez = Waldiez.from_dict(data=waldiez_flow.model_dump(by_alias=True))
+    with WaldiezRunnerPool(size=1, warm_up=False) as pool:
+        with patch.object(
+            WaldiezExporter, "export", side_effect=ValueError("export failed")
+        ):
+            future = pool.submit(waldiez, output_path=tmp_path / "flow.py")
+            with pytest.raises(ValueError, match="export failed"):
+                future.result(timeout=30)
+        # no worker was acquired (or lost)
+        assert pool._idle.qsize() == 1
+    # no hidden run directory is left
+    assert not list((tmp_path / "waldiez_out").glob(".run-*"))
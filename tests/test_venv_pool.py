@@ -0,0 +1,188 @@
+"""Test waldiez.venv_pool.*."""
+
+# pylint: disable=protected-access
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+
+from waldiez.process import WaldiezProcessResult, run_process
+from waldiez.venv_pool import (
+    INPUT_REQUEST_PREFIX,
+    MARKER_FILE,
+    WaldiezVenvPool,
+    WaldiezVenvPoolError,
+    get_requirements_fingerprint,
+    get_run_flow_command,
+    parse_input_request,
+)
+
+
+def test_requirements_fingerprint() -> None:
+    """Test the key of a requirement set."""
+    assert get_requirements_fingerprint(
+        ["a==1", "b[x]>2"]
+    ) == get_requirements_fingerprint(["b[x]>2", "a==1", "a==1"])
+    assert get_requirements_fingerprint(
+        ["a==1"]
+    ) != get_requirements_fingerprint(["a==2"])
+
+
+def test_default_root(waldiez_cache_dir: Path) -> None:
+    """Test the default directory of the environments.
+
+    Parameters
+    ----------
+    waldiez_cache_dir : Path
+        The cache directory fixture.
+    """
+    assert WaldiezVenvPool().root == waldiez_cache_dir / "venvs"
+    with pytest.raises(ValueError):
+        WaldiezVenvPool(offline=True)
+
+
+def test_venv_pool_get(tmp_path: Path) -> None:
+    """Test building and reusing an environment.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    pool = WaldiezVenvPool(root=tmp_path / "venvs")
+    python = pool.get([])
+    assert python.exists()
+    assert (python.parent.parent / MARKER_FILE).is_file()
+    output = subprocess.run(
+        [str(python), "-c", "import sys; print(sys.prefix)"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    assert Path(output.strip()) == python.parent.parent
+    with patch.object(
+        WaldiezVenvPool, "_build", side_effect=AssertionError("rebuilt")
+    ):
+        assert pool.get([]) == python
+    # no leftovers of the (temporary) build directory
+    assert [item.name for item in pool.root.iterdir()] == [
+        python.parent.parent.name
+    ]
+    pool.clear()
+    assert not python.exists()
+
+
+def test_venv_pool_evict(tmp_path: Path) -> None:
+    """Test removing the least recently used environments.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    pool = WaldiezVenvPool(root=tmp_path / "venvs", max_size=0)
+    # (not creating real environments)
+    with (
+        patch("waldiez.venv_pool.venv.EnvBuilder") as builder,
+        patch.object(WaldiezVenvPool, "_install"),
+    ):
+        builder.return_value.create.side_effect = lambda path: (
+            Path(path) / "lib"
+        ).write_text("x" * 100, encoding="utf-8")
+        first = pool.get(["first"])
+        second = pool.get(["second"])
+    # the one in use is kept, even if over the budget
+    assert (second.parent.parent / MARKER_FILE).is_file()
+    assert not first.parent.parent.exists()
+
+
+def test_venv_pool_install(tmp_path: Path) -> None:
+    """Test the pip commands (with and without a wheel directory).
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    commands: List[List[str]] = []
+
+    def _run_process(cmd: List[str], **_: Any) -> WaldiezProcessResult:
+        commands.append(cmd)
+        return WaldiezProcessResult(returncode=0)
+
+    python = Path(sys.executable)
+    wheel_dir = tmp_path / "wheels"
+    with patch("waldiez.venv_pool.run_process", side_effect=_run_process):
+        WaldiezVenvPool(root=tmp_path)._install(python, ["a"], None)
+        assert commands[-1][4:] == ["install", "a"]
+        commands.clear()
+        WaldiezVenvPool(root=tmp_path, wheel_dir=wheel_dir)._install(
+            python, ["a"], None
+        )
+        assert commands[0][4:] == ["wheel", "--wheel-dir", str(wheel_dir), "a"]
+        assert commands[1][4:] == [
+            "install",
+            "--no-index",
+            "--find-links",
+            str(wheel_dir),
+            "a",
+        ]
+        commands.clear()
+        WaldiezVenvPool(
+            root=tmp_path, wheel_dir=wheel_dir, offline=True
+        )._install(python, ["a"], None)
+        assert len(commands) == 1 and "--no-index" in commands[0]
+    with (
+        patch(
+            "waldiez.venv_pool.run_process",
+            return_value=WaldiezProcessResult(
+                returncode=1, stderr=["No matching distribution"]
+            ),
+        ),
+        pytest.raises(WaldiezVenvPoolError, match="No matching distribution"),
+    ):
+        WaldiezVenvPool(root=tmp_path)._install(python, ["a"], None)
+
+
+def test_run_flow_command(tmp_path: Path) -> None:
+    """Test running a flow file (with user input) and reading its results.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    (tmp_path / "flow.py").write_text(
+        "def main():\n    return [input('name? '), input('again? ')]\n",
+        encoding="utf-8",
+    )
+    prompts: List[str] = []
+
+    def _on_input(line: str) -> Any:
+        request = parse_input_request(line)
+        if request is None:
+            return None
+        prompts.append(request[0])
+        return "waldiez"
+
+    results_file = tmp_path / "results.json"
+    result = run_process(
+        get_run_flow_command(sys.executable) + ["flow.py", str(results_file)],
+        cwd=tmp_path,
+        env=os.environ.copy(),
+        on_input=_on_input,
+    )
+    assert result.ok, result.stderr
+    assert prompts == ["name? ", "again? "]
+    assert not any(
+        line.startswith(INPUT_REQUEST_PREFIX) for line in result.stdout
+    )
+    assert results_file.read_text(encoding="utf-8") == (
+        '{"many": true, "results": ["waldiez", "waldiez"]}'
+    )
+    assert parse_input_request("name?") is None
@@ -2,11 +2,15 @@
 
 import os
 import tempfile
+import time
+from pathlib import Path
 
 import pytest
 from autogen.version import __version__ as ag2_version  # type: ignore
 
-from waldiez import Waldiez
+from waldiez import Waldiez, WaldiezExporter
+from waldiez.models import clear_load_cache, get_load_cache_info
+from waldiez.models.common.json_utils import get_json_backend, loads_json
 
 from .exporting.flow_helpers import get_flow
 
@@ -65,6 +69,30 @@ def test_waldiez_without_rag() -> None:
     assert not waldiez.has_rag_agents
     assert f"pyautogen[retrievechat]=={ag2_version}" not in waldiez.requirements
     assert f"pyautogen=={ag2_version}" in waldiez.requirements
+    assert "pyarrow" not in waldiez.requirements
+
+
+def test_waldiez_logs_format(tmp_path: Path) -> None:
+    """Test exporting the runtime logs in another format.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Pytest fixture to create temporary directory.
+    """
+    flow_dict = get_flow().model_dump(by_alias=True)
+    assert flow_dict["logsFormat"] == "csv"
+    flow_dict["logsFormat"] = "parquet"
+    waldiez = Waldiez.from_dict(data=flow_dict)
+    assert waldiez.flow.logs_format == "parquet"
+    assert "pyarrow" in waldiez.requirements
+    output = tmp_path / "flow.py"
+    WaldiezExporter(waldiez).export(output)
+    content = output.read_text(encoding="utf-8")
+    assert "import pyarrow.parquet as pq" in content
+    assert "def sqlite_to_parquet(" in content
+    assert "def sqlite_to_csv(" not in content
+    assert "import csv\n" not in content
 
 
 def test_waldiez_errors() -> None:
@@ -100,3 +128,48 @@ def test_waldiez_errors() -> None:
     with pytest.raises(ValueError):
         Waldiez.load(file_path)
     os.remove(file_path)
+
+
+def test_waldiez_load_cache(tmp_path: Path) -> None:
+    """Test loading the same flow file (cached).
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    clear_load_cache()
+    flow_dump = Waldiez(flow=get_flow()).model_dump_json(by_alias=True)
+    file_path = tmp_path / "flow.waldiez"
+    file_path.write_text(flow_dump, encoding="utf-8")
+    # not a recently modified file
+    old = time.time_ns() - 10_000_000_000
+    os.utime(file_path, ns=(old, old))
+    waldiez = Waldiez.load(file_path)
+    assert Waldiez.load(file_path) is waldiez
+    assert get_load_cache_info().hits == 1
+    # different overrides
+    renamed = Waldiez.load(file_path, name="renamed")
+    assert renamed is not waldiez
+    assert renamed.name == "renamed"
+    # same content (a copy)
+    copy_path = tmp_path / "copy.waldiez"
+    copy_path.write_text(flow_dump, encoding="utf-8")
+    assert Waldiez.load(copy_path) is waldiez
+    # changed content
+    changed = flow_dump.replace(waldiez.name, "changed", 1)
+    file_path.write_text(changed, encoding="utf-8")
+    assert Waldiez.load(file_path).name == "changed"
+    # without the cache
+    assert Waldiez.load(copy_path, use_cache=False) is not waldiez
+    clear_load_cache()
+    assert get_load_cache_info().currsize == 0
+
+
+def test_loads_json() -> None:
+    """Test parsing JSON (with orjson if installed)."""
+    assert get_json_backend() in ("json", "orjson")
+    assert loads_json('{"a": [1, "b"]}') == {"a": [1, "b"]}
+    assert loads_json(b'{"a": null}') == {"a": None}
+    with pytest.raises(ValueError):
+        loads_json("invalid json")
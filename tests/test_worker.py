@@ -0,0 +1,137 @@
+"""Test waldiez.worker.*."""
+
+from pathlib import Path
+from typing import List
+
+import pytest
+from autogen import ChatResult  # type: ignore
+
+from waldiez.worker import (
+    WaldiezWorker,
+    WaldiezWorkerError,
+    WaldiezWorkerTask,
+    deserialize_results,
+    serialize_results,
+)
+
+FLOW_CONTENT = '''
+import os
+import time
+
+from autogen import ChatResult
+from autogen.io import IOStream
+
+from helper import get_summary
+
+
+def main():
+    if os.environ.get("SLEEP"):
+        time.sleep(30)
+    if os.environ.get("FAIL"):
+        raise ValueError("Failing on purpose")
+    print("from print")
+    reply = IOStream.get_default().input("Your input: ")
+    IOStream.get_default().print("reply:", reply)
+    return [ChatResult(chat_id=1, summary=get_summary(), human_input=[reply])]
+'''
+
+
+def _write_flow(directory: Path, summary: str) -> None:
+    """Write a small flow (and a local module it imports).
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to write the flow to.
+    summary : str
+        The summary to return from the local module.
+    """
+    directory.mkdir()
+    (directory / "flow.py").write_text(FLOW_CONTENT, encoding="utf-8")
+    (directory / "helper.py").write_text(
+        f"def get_summary():\n    return {summary!r}\n", encoding="utf-8"
+    )
+
+
+def test_serialize_results() -> None:
+    """Test serializing and deserializing chat results."""
+    result = ChatResult(
+        chat_id=1,
+        chat_history=[{"role": "user", "content": "Hi"}],
+        summary="Summary",
+        cost={"usage_including_cached_inference": {"total_cost": 0}},
+        human_input=[],
+    )
+    loaded = deserialize_results(serialize_results(result))
+    assert not isinstance(loaded, list)
+    assert loaded.summary == "Summary"
+    assert loaded.chat_history == result.chat_history
+    loaded_many = deserialize_results(serialize_results([result, result]))
+    assert isinstance(loaded_many, list) and len(loaded_many) == 2
+
+
+def test_worker(tmp_path: Path) -> None:
+    """Test running flows in a worker.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        A pytest fixture to provide a temporary directory.
+    """
+    _write_flow(tmp_path / "first", "first")
+    _write_flow(tmp_path / "second", "second")
+    output: List[str] = []
+    prompts: List[str] = []
+
+    def _on_input(prompt: str, password: bool) -> str:
+        prompts.append(prompt)
+        return "yes"
+
+    with WaldiezWorker() as worker:
+        pid = worker.pid
+        results = worker.run(
+            WaldiezWorkerTask(
+                flow_dir=str(tmp_path / "first"), file_name="flow.py"
+            ),
+            on_print=output.append,
+            on_input=_on_input,
+        )
+        assert isinstance(results, list)
+        assert results[0].summary == "first"
+        assert results[0].human_input == ["yes"]
+        assert prompts == ["Your input: "]
+        assert "from print\n" in output
+        assert "reply: yes\n" in output
+        # the local modules of the previous run are not reused
+        results = worker.run(
+            WaldiezWorkerTask(
+                flow_dir=str(tmp_path / "second"), file_name="flow.py"
+            ),
+            on_print=output.append,
+            on_input=_on_input,
+        )
+        assert isinstance(results, list)
+        assert results[0].summary == "second"
+        assert worker.pid == pid
+        assert worker.tasks == 2
+        with pytest.raises(WaldiezWorkerError, match="Failing on purpose"):
+            worker.run(
+                WaldiezWorkerTask(
+                    flow_dir=str(tmp_path / "first"),
+                    file_name="flow.py",
+                    env={"FAIL": "1"},
+                ),
+                on_print=output.append,
+                on_input=_on_input,
+            )
+        with pytest.raises(TimeoutError):
+            worker.run(
+                WaldiezWorkerTask(
+                    flow_dir=str(tmp_path / "first"),
+                    file_name="flow.py",
+                    env={"SLEEP": "1"},
+                ),
+                timeout=1,
+            )
+        assert not worker.alive
+    assert not worker.alive
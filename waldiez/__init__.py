@@ -1,16 +1,32 @@
-"""Waldiez package."""
+"""Waldiez package.
 
+The public classes are imported on first access (not when the package
+is imported), so that `import waldiez` (and the CLI) stays fast.
+"""
+
+import importlib
 import logging
 import warnings
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from ._version import __version__
-from .conflict_checker import check_conflicts
-from .exporter import WaldiezExporter
-from .models import Waldiez
-from .runner import WaldiezRunner
+
+if TYPE_CHECKING:
+    from .exporter import WaldiezExporter
+    from .models import Waldiez
+    from .runner import WaldiezRunner
+    from .runner_pool import WaldiezRunnerPool
 
 warnings.filterwarnings("ignore", "flaml.automl is not available")
 
+# the module to import each (lazy) attribute from
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "Waldiez": ".models",
+    "WaldiezExporter": ".exporter",
+    "WaldiezRunner": ".runner",
+    "WaldiezRunnerPool": ".runner_pool",
+}
+
 
 # pylint: disable=too-few-public-methods
 class FlamlFilter(logging.Filter):
@@ -39,23 +55,11 @@ class FlamlFilter(logging.Filter):
         return "flaml.automl is not available" not in record.getMessage()
 
 
-# flag to check if ag2 and autogen-agentchat
-# are installed at the same time
-__WALDIEZ_CHECKED_FOR_CONFLICTS = False
 # flag to handle flaml logging
 # suppress the annoying message about flaml.automl
 __WALDIEZ_HANDLED_FLAML_LOGGING = False
 
 
-def _check_conflicts() -> None:
-    """Check for conflicts once."""
-    # pylint: disable=global-statement
-    global __WALDIEZ_CHECKED_FOR_CONFLICTS
-    if __WALDIEZ_CHECKED_FOR_CONFLICTS is False:
-        check_conflicts()
-        __WALDIEZ_CHECKED_FOR_CONFLICTS = True
-
-
 def _handle_flaml_logging() -> None:
     """Handle flaml logging once."""
     # pylint: disable=global-statement
@@ -66,12 +70,52 @@ def _handle_flaml_logging() -> None:
         flam_logger.addFilter(FlamlFilter())
 
 
-_check_conflicts()
+# only touches logging (autogen/flaml are imported lazily, later)
 _handle_flaml_logging()
 
+
+def __getattr__(name: str) -> Any:
+    """Import a public class on first access.
+
+    Parameters
+    ----------
+    name : str
+        The attribute's name.
+
+    Returns
+    -------
+    Any
+        The attribute.
+
+    Raises
+    ------
+    AttributeError
+        If the attribute is not found.
+    """
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # cache it, not to go through __getattr__ again
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """Get the module's attributes (including the lazy ones).
+
+    Returns
+    -------
+    List[str]
+        The attributes.
+    """
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 __all__ = [
     "Waldiez",
     "WaldiezExporter",
     "WaldiezRunner",
+    "WaldiezRunnerPool",
     "__version__",
 ]
@@ -0,0 +1,141 @@
+"""A flow running (in a thread/worker) without blocking the event loop.
+
+The run's output is available (line by line) as an async iterator
+while the flow runs and the run itself can be awaited for the results.
+Cancelling the run (or the task awaiting it) also cancels the flow
+(for example, by terminating its worker process).
+
+Example
+-------
+```python
+>>> run = runner.a_stream()
+>>> async for line in run:
+...     print(line)
+>>> results = await run
+```
+"""
+
+import asyncio
+from typing import Any, Callable, Generator, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class WaldiezAsyncRun(Generic[T]):
+    """A flow running without blocking the event loop."""
+
+    def __init__(
+        self,
+        target: Callable[[Callable[[str], None]], T],
+        cancel: Callable[[], None],
+        on_done: Optional[Callable[[], None]] = None,
+        printer: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """Start the run (in a thread).
+
+        Must be called from a running event loop.
+
+        Parameters
+        ----------
+        target : Callable[[Callable[[str], None]], T]
+            The (blocking) function that runs the flow. It is called
+            (in a thread) with a function to forward the flow's output to.
+        cancel : Callable[[], None]
+            The function to cancel the flow (from any thread).
+        on_done : Optional[Callable[[], None]], optional
+            Called when the run finishes, by default None.
+        printer : Optional[Callable[[str], None]], optional
+            If provided, the output is passed to the printer
+            instead of being collected for iteration, by default None.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._target = target
+        self._cancel = cancel
+        self._on_done = on_done
+        self._printer = printer
+        self._lines: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+        self._partial = ""
+        self._task: "asyncio.Task[T]" = self._loop.create_task(self._run())
+
+    async def _run(self) -> T:
+        """Run the target in a thread.
+
+        Returns
+        -------
+        T
+            The target's result.
+        """
+        try:
+            return await asyncio.to_thread(self._target, self._on_output)
+        except asyncio.CancelledError:
+            self._cancel()
+            raise
+        finally:
+            if self._partial:
+                self._lines.put_nowait(self._partial)
+                self._partial = ""
+            self._lines.put_nowait(None)
+            if self._on_done is not None:
+                self._on_done()
+
+    def _on_output(self, text: str) -> None:
+        """Forward the flow's output (called from the run's thread).
+
+        Parameters
+        ----------
+        text : str
+            The output.
+        """
+        if self._printer is not None:
+            self._printer(text)
+            return
+        self._loop.call_soon_threadsafe(self._feed, text)
+
+    def _feed(self, text: str) -> None:
+        """Split the output into lines (in the event loop).
+
+        Parameters
+        ----------
+        text : str
+            The output.
+        """
+        *lines, self._partial = (self._partial + text).split("\n")
+        for line in lines:
+            self._lines.put_nowait(line)
+
+    def __aiter__(self) -> "WaldiezAsyncRun[T]":
+        """Iterate over the output lines."""
+        return self
+
+    async def __anext__(self) -> str:
+        """Get the next output line.
+
+        Returns
+        -------
+        str
+            The line (without the trailing newline).
+
+        Raises
+        ------
+        StopAsyncIteration
+            If the run has finished and all the lines are consumed.
+        """
+        line = await self._lines.get()
+        if line is None:
+            # for any other iterations
+            self._lines.put_nowait(None)
+            raise StopAsyncIteration
+        return line
+
+    def __await__(self) -> Generator[Any, None, T]:
+        """Wait for the run's results."""
+        return self._task.__await__()
+
+    @property
+    def done(self) -> bool:
+        """Check if the run has finished."""
+        return self._task.done()
+
+    def cancel(self) -> None:
+        """Cancel the run."""
+        self._task.cancel()
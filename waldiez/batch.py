@@ -0,0 +1,277 @@
+"""Convert multiple Waldiez flows at once.
+
+Each `.waldiez` file is parsed once and all the requested formats
+are exported from the same `WaldiezExporter`. The files are spread
+across a pool of processes (one task per file). Files that are exported
+to the same directory might write the same additional files (e.g.
+`waldiez_api_keys.py`): these are replaced atomically, so concurrent
+exports never leave a partially written one. Files whose outputs would
+overwrite each other's (the same name, exported to the same directory)
+are reported as failed.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+SUPPORTED_FORMATS = ("py", "ipynb", "waldiez")
+DEFAULT_FORMATS = ("py", "ipynb")
+
+
+@dataclass(frozen=True, slots=True)
+class WaldiezBatchResult:
+    """The result of converting one Waldiez file.
+
+    Attributes
+    ----------
+    file : Path
+        The `.waldiez` file.
+    outputs : List[Path]
+        The generated files (one per requested format).
+    duration : float
+        The time (in seconds) it took to load and export the file.
+    error : Optional[str]
+        The error message, if the conversion failed.
+    """
+
+    file: Path
+    outputs: List[Path] = field(default_factory=list)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Check if the conversion succeeded."""
+        return self.error is None
+
+
+def get_batch_files(paths: Iterable[Union[str, Path]]) -> List[Path]:
+    """Get the `.waldiez` files from directories, files or glob patterns.
+
+    Directories are searched recursively.
+
+    Parameters
+    ----------
+    paths : Iterable[Union[str, Path]]
+        The directories, files or glob patterns.
+
+    Returns
+    -------
+    List[Path]
+        The (resolved, unique) `.waldiez` files.
+    """
+    files: Dict[Path, None] = {}
+    for entry in paths:
+        path = Path(entry)
+        if path.is_dir():
+            matches = sorted(path.rglob("*.waldiez"))
+        elif path.is_file():
+            matches = [path]
+        else:
+            matches = sorted(
+                Path(match) for match in glob.glob(str(entry), recursive=True)
+            )
+        for match in matches:
+            # do not check in .ipynb_checkpoints directories
+            if ".ipynb_checkpoints" in match.parts or not match.is_file():
+                continue
+            files.setdefault(match.resolve(), None)
+    return list(files)
+
+
+def _get_output_path(
+    file: Path, extension: str, output_dir: Optional[Path]
+) -> Path:
+    """Get the output path of a file for a format.
+
+    Parameters
+    ----------
+    file : Path
+        The `.waldiez` file.
+    extension : str
+        The output format (file extension).
+    output_dir : Optional[Path]
+        The output directory (the file's directory if not provided).
+
+    Returns
+    -------
+    Path
+        The output path.
+    """
+    directory = output_dir if output_dir is not None else file.parent
+    return directory / f"{file.stem}.{extension}"
+
+
+def export_file(
+    file: Path,
+    formats: Sequence[str],
+    output_dir: Optional[Path] = None,
+    force: bool = False,
+    use_cache: bool = False,
+) -> WaldiezBatchResult:
+    """Load a `.waldiez` file and export it to all the requested formats.
+
+    Any error is caught and reported in the result.
+
+    Parameters
+    ----------
+    file : Path
+        The `.waldiez` file.
+    formats : Sequence[str]
+        The formats (file extensions) to export to.
+    output_dir : Optional[Path], optional
+        The output directory, by default None (the file's directory).
+    force : bool, optional
+        Override the output files if they already exist, by default False.
+    use_cache : bool, optional
+        Whether to use the (default) export cache, by default False.
+
+    Returns
+    -------
+    WaldiezBatchResult
+        The result.
+    """
+    # the exporter is imported here (not when the module is imported),
+    # so that the CLI can use the formats without slowing down `--help`
+    # pylint: disable=import-outside-toplevel
+    from .export_cache import WaldiezExportCache
+    from .exporter import WaldiezExporter
+
+    start = time.perf_counter()
+    outputs: List[Path] = []
+    # pylint: disable=broad-except
+    try:
+        cache = WaldiezExportCache() if use_cache else None
+        exporter = WaldiezExporter.load(file, cache=cache)
+        for extension in formats:
+            output_path = _get_output_path(file, extension, output_dir)
+            if output_path.resolve() == file.resolve():
+                continue
+            exporter.export(output_path, force=force)
+            outputs.append(output_path)
+    except Exception as error:
+        return WaldiezBatchResult(
+            file=file,
+            outputs=outputs,
+            duration=time.perf_counter() - start,
+            error=f"{type(error).__name__}: {error}",
+        )
+    return WaldiezBatchResult(
+        file=file,
+        outputs=outputs,
+        duration=time.perf_counter() - start,
+    )
+
+
+def _get_collisions(
+    files: List[Path], formats: Sequence[str], output_dir: Optional[Path]
+) -> Dict[Path, str]:
+    """Get the files whose outputs would overwrite another file's outputs.
+
+    Parameters
+    ----------
+    files : List[Path]
+        The files (the first one of each output is kept).
+    formats : Sequence[str]
+        The formats to export to.
+    output_dir : Optional[Path]
+        The output directory.
+
+    Returns
+    -------
+    Dict[Path, str]
+        The colliding files and their error message.
+    """
+    owners: Dict[Path, Path] = {}
+    collisions: Dict[Path, str] = {}
+    for file in files:
+        for extension in formats:
+            output_path = _get_output_path(file, extension, output_dir)
+            owner = owners.setdefault(output_path, file)
+            if owner != file:
+                collisions[file] = (
+                    f"OutputCollision: {output_path} is also exported "
+                    f"from {owner}"
+                )
+                break
+    return collisions
+
+
+def export_batch(
+    paths: Iterable[Union[str, Path]],
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    output_dir: Optional[Union[str, Path]] = None,
+    force: bool = False,
+    max_workers: Optional[int] = None,
+    use_cache: bool = False,
+) -> List[WaldiezBatchResult]:
+    """Convert multiple Waldiez flows.
+
+    Parameters
+    ----------
+    paths : Iterable[Union[str, Path]]
+        Directories, files or glob patterns with the `.waldiez` files.
+    formats : Sequence[str], optional
+        The formats (file extensions) to export to, by default py and ipynb.
+    output_dir : Optional[Union[str, Path]], optional
+        The directory to write all the outputs, by default None
+        (each output is written next to its `.waldiez` file).
+    force : bool, optional
+        Override the output files if they already exist, by default False.
+    max_workers : Optional[int], optional
+        The number of worker processes, by default None (the number of CPUs).
+        With 1, the files are exported in the current process.
+    use_cache : bool, optional
+        Whether to use the (default) export cache, by default False.
+
+    Returns
+    -------
+    List[WaldiezBatchResult]
+        The results (in the order of the files).
+
+    Raises
+    ------
+    ValueError
+        If a format is not supported.
+    """
+    extensions = [extension.lstrip(".") for extension in formats]
+    for extension in extensions:
+        if extension not in SUPPORTED_FORMATS:
+            raise ValueError(f"Invalid format: {extension}")
+    resolved_output_dir = Path(output_dir).resolve() if output_dir else None
+    if resolved_output_dir is not None:
+        resolved_output_dir.mkdir(parents=True, exist_ok=True)
+    files = get_batch_files(paths)
+    collisions = _get_collisions(files, extensions, resolved_output_dir)
+    results: List[WaldiezBatchResult] = [
+        WaldiezBatchResult(file=file, error=error)
+        for file, error in collisions.items()
+    ]
+    to_export = [file for file in files if file not in collisions]
+    workers = max_workers or os.cpu_count() or 1
+    workers = min(workers, len(to_export))
+    if workers <= 1:
+        results.extend(
+            export_file(file, extensions, resolved_output_dir, force, use_cache)
+            for file in to_export
+        )
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    export_file,
+                    file,
+                    extensions,
+                    resolved_output_dir,
+                    force,
+                    use_cache,
+                )
+                for file in to_export
+            ]
+            results.extend(future.result() for future in futures)
+    order: Dict[Path, int] = {file: index for index, file in enumerate(files)}
+    return sorted(results, key=lambda result: order[result.file])
@@ -6,18 +6,23 @@ import logging
 import os
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 import typer
 from typing_extensions import Annotated
 
-from . import Waldiez, __version__
-from .exporter import WaldiezExporter
-from .runner import WaldiezRunner
+from ._version import __version__
+from .batch import DEFAULT_FORMATS, SUPPORTED_FORMATS
 
 if TYPE_CHECKING:
     from autogen import ChatResult  # type: ignore[import-untyped]
 
+    from .models import Waldiez
+
+# the models, the exporter and the runner are imported in the commands
+# that use them, not to slow down `--help`, `--version` (and the others)
+# pylint: disable=import-outside-toplevel
+
 
 app = typer.Typer(
     name="waldiez",
@@ -79,18 +84,54 @@ def run(
         False,
         help="Override the output file if it already exists.",
     ),
+    isolated: bool = typer.Option(
+        False,
+        help="Run the flow in a separate (worker) process.",
+    ),
+    venv: bool = typer.Option(
+        False,
+        help=(
+            "Run the flow in a (cached) virtual environment "
+            "with its requirements, instead of installing them."
+        ),
+    ),
+    wheel_dir: Optional[Path] = typer.Option(
+        None,
+        help="A wheel directory to build the virtual environment from.",
+        file_okay=False,
+        resolve_path=True,
+    ),
+    offline: bool = typer.Option(
+        False,
+        help="Only use the wheel directory's wheels (no downloads).",
+    ),
+    in_output_dir: bool = typer.Option(
+        False,
+        help=(
+            "Run the flow directly in its results directory "
+            "(waldiez_out/<timestamp> next to the output)."
+        ),
+    ),
 ) -> None:
     """Run a Waldiez flow."""
+    if offline and wheel_dir is None:
+        typer.echo("--offline requires a --wheel-dir.")
+        raise typer.Exit(code=1)
     output_path = _get_output_path(output, force)
-    with file.open("r", encoding="utf-8") as _file:
-        try:
-            data = json.load(_file)
-        except json.decoder.JSONDecodeError as error:
-            typer.echo("Invalid .waldiez file. Not a valid json?")
-            raise typer.Exit(code=1) from error
-    waldiez = Waldiez.from_dict(data)
-    runner = WaldiezRunner(waldiez)
-    results = runner.run(output_path=output_path)
+    from .runner import WaldiezRunner
+    from .venv_pool import WaldiezVenvPool
+
+    waldiez = _load_flow(file)
+    venv_pool = (
+        WaldiezVenvPool(wheel_dir=wheel_dir, offline=offline) if venv else None
+    )
+    with WaldiezRunner(
+        waldiez,
+        isolated=isolated,
+        venv_pool=venv_pool,
+        in_output_dir=in_output_dir,
+    ) as runner:
+        results = runner.run(output_path=output_path)
     logger = _get_logger()
     if isinstance(results, list):
         logger.info("Results:")
@@ -134,22 +175,110 @@ def convert(
         False,
         help="Override the output file if it already exists.",
     ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Do not use (or update) the export cache.",
+    ),
 ) -> None:
     """Convert a Waldiez flow to a Python script or a Jupyter notebook."""
     _get_output_path(output, force)
-    with file.open("r", encoding="utf-8") as _file:
-        try:
-            data = json.load(_file)
-        except json.decoder.JSONDecodeError as error:
-            typer.echo("Invalid .waldiez file. Not a valid json?")
-            raise typer.Exit(code=1) from error
-    waldiez = Waldiez.from_dict(data)
-    exporter = WaldiezExporter(waldiez)
+    from .export_cache import WaldiezExportCache
+    from .exporter import WaldiezExporter
+
+    waldiez = _load_flow(file)
+    cache = None if no_cache else WaldiezExportCache()
+    exporter = WaldiezExporter(waldiez, cache=cache)
     exporter.export(output, force=force)
     generated = str(output).replace(os.getcwd(), ".")
     typer.echo(f"Generated: {generated}")
 
 
+@app.command(name="convert-batch")
+def convert_batch(
+    paths: Annotated[
+        List[str],
+        typer.Argument(
+            ...,
+            help=(
+                "Directories (searched recursively), *.waldiez files "
+                "or glob patterns."
+            ),
+        ),
+    ],
+    formats: Annotated[
+        Optional[List[str]],
+        typer.Option(
+            "--format",
+            "-f",
+            help=(
+                "The format(s) to export to "
+                f"({', '.join(SUPPORTED_FORMATS)}). "
+                "Can be used multiple times. "
+                f"Default: {' and '.join(DEFAULT_FORMATS)}."
+            ),
+        ),
+    ] = None,
+    output_dir: Optional[Path] = typer.Option(
+        None,
+        help=(
+            "Directory to write all the outputs. "
+            "If not provided, each output is written next to its input."
+        ),
+        file_okay=False,
+        dir_okay=True,
+        resolve_path=True,
+    ),
+    workers: Optional[int] = typer.Option(
+        None,
+        min=1,
+        help="The number of worker processes. Default: the number of CPUs.",
+    ),
+    force: bool = typer.Option(
+        False,
+        help="Override the output files if they already exist.",
+    ),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Do not use (or update) the export cache.",
+    ),
+) -> None:
+    """Convert multiple Waldiez flows to Python scripts and/or notebooks."""
+    from .batch import export_batch
+
+    try:
+        results = export_batch(
+            paths,
+            formats=formats or DEFAULT_FORMATS,
+            output_dir=output_dir,
+            force=force,
+            max_workers=workers,
+            use_cache=not no_cache,
+        )
+    except ValueError as error:
+        typer.echo(str(error))
+        raise typer.Exit(code=1) from error
+    if not results:
+        typer.echo("No .waldiez files found.")
+        raise typer.Exit(code=1)
+    failed = 0
+    for result in results:
+        file_name = str(result.file).replace(os.getcwd(), ".")
+        if result.ok:
+            typer.echo(f"{file_name}: {result.duration:.2f}s")
+        else:
+            failed += 1
+            typer.echo(f"{file_name}: FAILED ({result.error})")
+    total_time = sum(result.duration for result in results)
+    typer.echo(
+        f"Converted {len(results) - failed}/{len(results)} file(s), "
+        f"{failed} failed ({total_time:.2f}s)."
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def check(
     file: Annotated[
@@ -166,12 +295,22 @@ def check(
     ],
 ) -> None:
     """Validate a Waldiez flow."""
-    with file.open("r", encoding="utf-8") as _file:
-        data = json.load(_file)
-    Waldiez.from_dict(data)
+    _load_flow(file)
     typer.echo("Waldiez flow is valid.")
 
 
+def _load_flow(file: Path) -> "Waldiez":
+    from .models import Waldiez
+
+    try:
+        return Waldiez.load(file)
+    except ValueError as error:
+        if isinstance(error.__cause__, json.JSONDecodeError):
+            typer.echo("Invalid .waldiez file. Not a valid json?")
+            raise typer.Exit(code=1) from error
+        raise
+
+
 def _get_output_path(output: Optional[Path], force: bool) -> Optional[Path]:
     if output is not None:
         output = Path(output).resolve()
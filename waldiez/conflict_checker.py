@@ -1,4 +1,8 @@
-"""Check for conflicts with 'autogen-agentchat' package."""
+"""Check for conflicts with 'autogen-agentchat' package.
+
+The check is not done on `import waldiez`, but (once)
+before a flow is run (see `ensure_no_conflicts`).
+"""
 
 # pylint: disable=line-too-long
 
@@ -25,3 +29,17 @@ def check_conflicts() -> None:  # pragma: no cover
         pass
 
 # fmt: on
+
+
+# flag to check if ag2 and autogen-agentchat
+# are installed at the same time
+__WALDIEZ_CHECKED_FOR_CONFLICTS = False
+
+
+def ensure_no_conflicts() -> None:
+    """Check for conflicts once (per process)."""
+    # pylint: disable=global-statement
+    global __WALDIEZ_CHECKED_FOR_CONFLICTS
+    if __WALDIEZ_CHECKED_FOR_CONFLICTS is False:
+        check_conflicts()
+        __WALDIEZ_CHECKED_FOR_CONFLICTS = True
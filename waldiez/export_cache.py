@@ -0,0 +1,297 @@
+"""On-disk cache of exported flows.
+
+An entry is keyed by a hash of the canonical flow JSON, the target
+extension, the waldiez and autogen versions and the current working
+directory (local paths in the flow are resolved relative to it).
+It contains the generated file (`flow.py` / `flow.ipynb`) and any
+side files (skill modules, `*_secrets.py`, `waldiez_api_keys.py`).
+
+The least recently used entries are evicted when the cache has more
+than `max_entries` entries or is larger than `max_size` bytes.
+"""
+
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+from ._version import __version__
+from .models.waldiez import Waldiez, _get_autogen_version
+
+MANIFEST_FILE = "manifest.json"
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+
+def get_default_cache_dir() -> Path:
+    """Get the default cache directory.
+
+    `WALDIEZ_CACHE_DIR` if set, else `$XDG_CACHE_HOME/waldiez`
+    (or `~/.cache/waldiez`).
+
+    Returns
+    -------
+    Path
+        The cache directory.
+    """
+    from_env = os.environ.get("WALDIEZ_CACHE_DIR", "")
+    if from_env:
+        return Path(from_env)
+    cache_home = os.environ.get("XDG_CACHE_HOME", "")
+    if cache_home:
+        return Path(cache_home) / "waldiez"
+    return Path.home() / ".cache" / "waldiez"
+
+
+def get_flow_hash(waldiez: Waldiez) -> str:
+    """Get the hash of the canonical flow JSON.
+
+    Parameters
+    ----------
+    waldiez : Waldiez
+        The Waldiez instance.
+
+    Returns
+    -------
+    str
+        The (sha256) hex digest.
+    """
+    canonical = json.dumps(
+        waldiez.flow.model_dump(by_alias=True, mode="json"),
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _copy_files(
+    source_dir: Path, files: List[str], main_file: str, path: Path
+) -> None:
+    """Copy an export's files to the output path's directory.
+
+    Parameters
+    ----------
+    source_dir : Path
+        The directory with the files.
+    files : List[str]
+        The names of the files to copy.
+    main_file : str
+        The name of the generated flow file (copied as `path`).
+    path : Path
+        The output path.
+    """
+    for file_name in files:
+        if file_name == main_file:
+            shutil.copyfile(source_dir / file_name, path)
+            continue
+        destination = path.parent / file_name
+        # keep the side files' mtimes if they did not change
+        if destination.is_file() and filecmp.cmp(
+            source_dir / file_name, destination, shallow=False
+        ):
+            continue
+        shutil.copyfile(source_dir / file_name, destination)
+
+
+class WaldiezExportCache:
+    """On-disk, LRU export cache."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        """Initialize the cache.
+
+        Parameters
+        ----------
+        cache_dir : Optional[Union[str, Path]], optional
+            The cache directory, by default None
+            (an `exports` directory in `get_default_cache_dir()`).
+        max_entries : int, optional
+            The maximum number of entries, by default 128.
+        max_size : int, optional
+            The maximum total size in bytes, by default 256 MiB.
+        """
+        if cache_dir is None:
+            cache_dir = get_default_cache_dir() / "exports"
+        self._root = Path(cache_dir)
+        self._max_entries = max_entries
+        self._max_size = max_size
+
+    @property
+    def root(self) -> Path:
+        """Get the cache directory."""
+        return self._root
+
+    @staticmethod
+    def get_key(waldiez: Waldiez, extension: str) -> str:
+        """Get the cache key of a flow's export.
+
+        Parameters
+        ----------
+        waldiez : Waldiez
+            The Waldiez instance.
+        extension : str
+            The target extension (e.g. `.py`).
+
+        Returns
+        -------
+        str
+            The cache key.
+        """
+        parts = [
+            get_flow_hash(waldiez),
+            extension,
+            __version__,
+            _get_autogen_version(),
+            os.getcwd(),
+        ]
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def restore(self, key: str, path: Path) -> bool:
+        """Copy a cached export to the output path.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        path : Path
+            The output path (the side files are copied to its directory).
+
+        Returns
+        -------
+        bool
+            True on a cache hit, False otherwise.
+        """
+        entry = self._root / key
+        # pylint: disable=broad-except
+        try:
+            with open(entry / MANIFEST_FILE, "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+            _copy_files(entry, manifest["files"], manifest["main"], path)
+        except Exception:
+            return False
+        # mark as recently used
+        os.utime(entry)
+        return True
+
+    def store(self, key: str, source_dir: Path, main_file: str) -> None:
+        """Store an export in the cache.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        source_dir : Path
+            The directory with (only) the export's files.
+        main_file : str
+            The name of the generated flow file in `source_dir`.
+        """
+        entry = self._root / key
+        if entry.exists():
+            return
+        files = sorted(
+            item.name
+            for item in source_dir.iterdir()
+            if item.is_file() and not item.name.endswith(".pyc")
+        )
+        self._root.mkdir(parents=True, exist_ok=True)
+        tmp_entry = Path(tempfile.mkdtemp(dir=self._root, prefix=".tmp-"))
+        for file_name in files:
+            shutil.copyfile(source_dir / file_name, tmp_entry / file_name)
+        with open(tmp_entry / MANIFEST_FILE, "w", encoding="utf-8") as file:
+            json.dump({"main": main_file, "files": files}, file)
+        try:
+            # atomic: another process might have stored the same entry
+            tmp_entry.rename(entry)
+        except OSError:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            return
+        self.evict()
+
+    def _get_entries(self) -> List[Tuple[float, int, Path]]:
+        """Get the cache entries, least recently used first.
+
+        Returns
+        -------
+        List[Tuple[float, int, Path]]
+            The last access time, the size and the path of each entry.
+        """
+        entries: List[Tuple[float, int, Path]] = []
+        if not self._root.is_dir():
+            return entries
+        for entry in self._root.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            try:
+                size = sum(item.stat().st_size for item in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:  # pragma: no cover
+                continue
+        entries.sort(key=lambda item: item[0])
+        return entries
+
+    def evict(self) -> None:
+        """Remove the least recently used entries, to respect the limits."""
+        entries = self._get_entries()
+        total_size = sum(size for _, size, _ in entries)
+        while entries and (
+            len(entries) > self._max_entries or total_size > self._max_size
+        ):
+            _, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        for _, _, entry in self._get_entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def export_with_cache(
+    cache: WaldiezExportCache,
+    key: str,
+    path: Path,
+    export: Callable[[Path], None],
+) -> bool:
+    """Export using the cache.
+
+    On a miss, the flow is exported to a temporary directory,
+    stored in the cache and then copied to the output path.
+
+    Parameters
+    ----------
+    cache : WaldiezExportCache
+        The cache.
+    key : str
+        The cache key.
+    path : Path
+        The output path.
+    export : Callable[[Path], None]
+        The function to export the flow to a path.
+
+    Returns
+    -------
+    bool
+        True on a cache hit, False otherwise.
+    """
+    if cache.restore(key, path):
+        return True
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir) / path.name
+        export(tmp_path)
+        files = [
+            item.name
+            for item in Path(tmp_dir).iterdir()
+            if item.is_file() and not item.name.endswith(".pyc")
+        ]
+        _copy_files(Path(tmp_dir), files, path.name, path)
+        cache.store(key, Path(tmp_dir), path.name)
+    return False
@@ -16,12 +16,20 @@ the `flow.py` file. So the `flow.py` could have entries like:
 
 import os
 import shutil
-import subprocess
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, TextIO, Union
 
-from .exporting import comment, export_flow, get_valid_instance_name
+from .export_cache import WaldiezExportCache, export_with_cache
+from .exporting import (
+    ContentWriter,
+    ExportFragments,
+    NameAllocator,
+    comment,
+    export_flow,
+    get_notebook_string,
+    write_flow,
+)
 from .models import (
     Waldiez,
     WaldiezAgent,
@@ -29,6 +37,7 @@ from .models import (
     WaldiezModel,
     WaldiezSkill,
 )
+from .process import run_process
 
 
 class WaldiezExporter:
@@ -47,23 +56,60 @@ class WaldiezExporter:
     _models: List[WaldiezModel]
     _agents: List[WaldiezAgent]
 
-    def __init__(self, waldiez: Waldiez) -> None:
+    def __init__(
+        self,
+        waldiez: Waldiez,
+        cache: Optional[WaldiezExportCache] = None,
+        incremental: bool = False,
+    ) -> None:
         """Initialize the Waldiez exporter.
 
         Parameters:
             waldiez (Waldiez): The Waldiez instance.
+            cache (Optional[WaldiezExportCache]): The (optional) cache
+                to reuse previous exports of the same flow.
+            incremental (bool): Whether to remember the generated
+                fragments, to only regenerate the changed ones
+                on the next export (after `update`).
         """
         self.waldiez = waldiez
+        self._cache = cache
+        self._fragments = ExportFragments() if incremental else None
         self._initialize()
 
+    def update(self, waldiez: Waldiez) -> None:
+        """Update the flow to export.
+
+        In incremental mode, the next export only regenerates the
+        agents, models and chats that changed since the previous one.
+
+        Parameters
+        ----------
+        waldiez : Waldiez
+            The (updated) Waldiez instance.
+        """
+        self.waldiez = waldiez
+        self._initialize()
+
+    @property
+    def fragments(self) -> Optional[ExportFragments]:
+        """Get the remembered export fragments, if incremental."""
+        return self._fragments
+
     @classmethod
-    def load(cls, file_path: Path) -> "WaldiezExporter":
+    def load(
+        cls,
+        file_path: Path,
+        cache: Optional[WaldiezExportCache] = None,
+    ) -> "WaldiezExporter":
         """Load the Waldiez instance from a file.
 
         Parameters
         ----------
         file_path : Path
             The file path.
+        cache : Optional[WaldiezExportCache], optional
+            The export cache to use, by default None (no caching).
 
         Returns
         -------
@@ -71,7 +117,7 @@ class WaldiezExporter:
             The Waldiez exporter.
         """
         waldiez = Waldiez.load(file_path)
-        return cls(waldiez)
+        return cls(waldiez, cache=cache)
 
     def _initialize(
         self,
@@ -81,39 +127,24 @@ class WaldiezExporter:
         We need to make sure that no duplicate names are used,
         and that the names can be used as python variables.
         """
-        all_names: Dict[str, str] = {}
-        agent_names: Dict[str, str] = {}
-        model_names: Dict[str, str] = {}
-        skill_names: Dict[str, str] = {}
-        chat_names: Dict[str, str] = {}
-        chats: List[WaldiezChat] = []
-        skills: List[WaldiezSkill] = []
-        models: List[WaldiezModel] = []
-        agents: List[WaldiezAgent] = []
-        for agent in self.waldiez.agents:
-            all_names = get_valid_instance_name(
-                (agent.id, agent.name), all_names, prefix="wa"
-            )
-            agent_names[agent.id] = all_names[agent.id]
-            agents.append(agent)
-        for model in self.waldiez.models:
-            all_names = get_valid_instance_name(
-                (model.id, model.name), all_names, prefix="wm"
-            )
-            model_names[model.id] = all_names[model.id]
-            models.append(model)
-        for skill in self.waldiez.skills:
-            all_names = get_valid_instance_name(
-                (skill.id, skill.name), all_names, prefix="ws"
-            )
-            skill_names[skill.id] = all_names[skill.id]
-            skills.append(skill)
-        for chat in self.waldiez.flow.data.chats:
-            all_names = get_valid_instance_name(
-                (chat.id, chat.name), all_names, prefix="wc"
-            )
-            chat_names[chat.id] = all_names[chat.id]
-            chats.append(chat)
+        flow_index = self.waldiez.flow.index
+        agents: List[WaldiezAgent] = list(flow_index.agents.values())
+        models: List[WaldiezModel] = list(self.waldiez.models)
+        skills: List[WaldiezSkill] = list(self.waldiez.skills)
+        chats: List[WaldiezChat] = list(flow_index.chats.values())
+        allocator = NameAllocator()
+        agent_names = allocator.allocate_all(
+            ((agent.id, agent.name) for agent in agents), prefix="wa"
+        )
+        model_names = allocator.allocate_all(
+            ((model.id, model.name) for model in models), prefix="wm"
+        )
+        skill_names = allocator.allocate_all(
+            ((skill.id, skill.name) for skill in skills), prefix="ws"
+        )
+        chat_names = allocator.allocate_all(
+            ((chat.id, chat.name) for chat in chats), prefix="wc"
+        )
         self._agent_names = agent_names
         self._model_names = model_names
         self._skill_names = skill_names
@@ -153,6 +184,26 @@ class WaldiezExporter:
             path.unlink(missing_ok=True)
         path.parent.mkdir(parents=True, exist_ok=True)
         extension = path.suffix
+        if self._cache is not None and extension in (".py", ".ipynb"):
+            key = self._cache.get_key(self.waldiez, extension)
+            export_with_cache(self._cache, key, path, self._export)
+        else:
+            self._export(path)
+
+    def _export(self, path: Path) -> None:
+        """Export the Waldiez instance, depending on the path's extension.
+
+        Parameters
+        ----------
+        path : Path
+            The path to export to.
+
+        Raises
+        ------
+        ValueError
+            If the file extension is invalid.
+        """
+        extension = path.suffix
         if extension == ".waldiez":
             self.to_waldiez(path)
         elif extension == ".py":
@@ -162,18 +213,46 @@ class WaldiezExporter:
         else:
             raise ValueError(f"Invalid extension: {extension}")
 
-    def to_ipynb(self, path: Path) -> None:
+    def to_ipynb(self, path: Path, use_jupytext: bool = False) -> None:
         """Export flow to jupyter notebook.
 
+        The notebook is generated in memory from the exported content.
+        If that fails (or if `use_jupytext` is True),
+        jupytext is used to convert the content to a notebook.
+
         Parameters
         ----------
         path : Path
             The path to export to.
+        use_jupytext : bool, optional
+            Whether to (only) use jupytext for the conversion,
+            by default False.
+        """
+        content = self.get_ipynb_content(output_dir=path.parent)
+        if not use_jupytext:
+            try:
+                notebook = get_notebook_string(content)
+            except ValueError:  # pragma: no cover
+                pass
+            else:
+                with open(path, "w", encoding="utf-8", newline="\n") as file:
+                    file.write(notebook + "\n")
+                return
+        _jupytext_to_notebook(content, path)
 
-        Raises
-        ------
-        RuntimeError
-            If the notebook could not be generated.
+    def get_ipynb_content(self, output_dir: Optional[Path]) -> str:
+        """Get the flow's content to convert to a notebook.
+
+        Parameters
+        ----------
+        output_dir : Optional[Path]
+            The directory to also write any additional files to
+            (skills, the api keys module), if any.
+
+        Returns
+        -------
+        str
+            The python content with the notebook's cells and headings.
         """
         content = f"{comment(True)}{self.waldiez.name}" + "\n\n"
         content += f"{comment(True, 2)}Dependencies" + "\n\n"
@@ -189,28 +268,11 @@ class WaldiezExporter:
             chats=(self._chats, self._chat_names),
             models=(self._models, self._model_names),
             skills=(self._skills, self._skill_names),
-            output_dir=path.parent,
+            output_dir=output_dir,
             notebook=True,
+            fragments=self._fragments,
         )
-        # we first create a .py file with the content
-        # and then convert it to a notebook using jupytext
-        py_path = path.with_suffix(".tmp.py")
-        with open(py_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        if not shutil.which("jupytext"):  # pragma: no cover
-            run_command(
-                [sys.executable, "-m", "pip", "install", "jupytext"],
-                allow_error=False,
-            )
-        run_command(
-            ["jupytext", "--to", "notebook", str(py_path)],
-            allow_error=False,
-        )
-        ipynb_path = str(py_path).replace(".tmp.py", ".tmp.ipynb")
-        if not os.path.exists(ipynb_path):  # pragma: no cover
-            raise RuntimeError("Could not generate notebook")
-        Path(ipynb_path).rename(ipynb_path.replace(".tmp.ipynb", ".ipynb"))
-        py_path.unlink(missing_ok=True)
+        return content
 
     def to_py(self, path: Path) -> None:
         """Export waldiez flow to python script.
@@ -220,27 +282,47 @@ class WaldiezExporter:
         path : Path
             The path to export to.
         """
-        content = "#!/usr/bin/env python\n"
-        content += f'"""{self.waldiez.name}\n\n'
-        content += f"{self.waldiez.description}\n\n"
-        content += f"Tags: {', '.join(self.waldiez.tags)}\n\n"
-        content += f"Requirements: {', '.join(self.waldiez.requirements)}\n\n"
-        content += '"""\n\n'
-        content += "# cspell: disable\n"
-        content += "# flake8: noqa\n\n"
-        content += export_flow(
+        with open(path, "w", encoding="utf-8") as file:
+            self.write_py(file, output_dir=path.parent)
+
+    def write_py(self, stream: TextIO, output_dir: Optional[Path]) -> None:
+        """Write the waldiez flow as a python script to a text stream.
+
+        The generated content is streamed (not first built in memory).
+
+        Parameters
+        ----------
+        stream : TextIO
+            The text stream to write to (e.g. an open file).
+        output_dir : Optional[Path]
+            The directory to also write any additional files to
+            (skills, the api keys module), if any.
+        """
+        stream.write("#!/usr/bin/env python\n")
+        stream.write(f'"""{self.waldiez.name}\n\n')
+        stream.write(f"{self.waldiez.description}\n\n")
+        stream.write(f"Tags: {', '.join(self.waldiez.tags)}\n\n")
+        stream.write(
+            f"Requirements: {', '.join(self.waldiez.requirements)}\n\n"
+        )
+        stream.write('"""\n\n')
+        stream.write("# cspell: disable\n")
+        stream.write("# flake8: noqa\n\n")
+        writer = ContentWriter(stream)
+        write_flow(
+            writer,
             waldiez=self.waldiez,
             agents=(self._agents, self._agent_names),
             chats=(self._chats, self._chat_names),
             models=(self._models, self._model_names),
             skills=(self._skills, self._skill_names),
-            output_dir=path.parent,
+            output_dir=output_dir,
             notebook=False,
+            fragments=self._fragments,
         )
-        content += '\n\nif __name__ == "__main__":\n'
-        content += "    print(main())\n"
-        with open(path, "w", encoding="utf-8") as file:
-            file.write(content)
+        writer.close()
+        stream.write('\n\nif __name__ == "__main__":\n')
+        stream.write("    print(main())\n")
 
     def to_waldiez(self, file_path: Path) -> None:
         """Export the Waldiez instance.
@@ -254,13 +336,52 @@ class WaldiezExporter:
             file.write(self.waldiez.model_dump_json())
 
 
+def _jupytext_to_notebook(content: str, path: Path) -> None:
+    """Convert the content to a notebook using jupytext.
+
+    Parameters
+    ----------
+    content : str
+        The python content with the notebook's cells and headings.
+    path : Path
+        The notebook's path.
+
+    Raises
+    ------
+    RuntimeError
+        If the notebook could not be generated.
+    """
+    # we first create a .py file with the content
+    # and then convert it to a notebook using jupytext
+    py_path = path.with_suffix(".tmp.py")
+    with open(py_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    if not shutil.which("jupytext"):  # pragma: no cover
+        run_command(
+            [sys.executable, "-m", "pip", "install", "jupytext"],
+            allow_error=False,
+        )
+    run_command(
+        ["jupytext", "--to", "notebook", str(py_path)],
+        allow_error=False,
+    )
+    ipynb_path = str(py_path).replace(".tmp.py", ".tmp.ipynb")
+    if not os.path.exists(ipynb_path):  # pragma: no cover
+        raise RuntimeError("Could not generate notebook")
+    Path(ipynb_path).rename(ipynb_path.replace(".tmp.ipynb", ".ipynb"))
+    py_path.unlink(missing_ok=True)
+
+
 def run_command(
     cmd: List[str],
     cwd: Optional[Path] = None,
     allow_error: bool = True,
+    timeout: Optional[float] = None,
 ) -> None:
     """Run a command.
 
+    Both its stdout and stderr are read while it runs (see `run_process`).
+
     Parameters
     ----------
     cmd : List[str]
@@ -269,6 +390,8 @@ def run_command(
         The working directory, by default None (current working directory).
     allow_error : bool, optional
         Whether to allow errors, by default True.
+    timeout : Optional[float], optional
+        The maximum time (in seconds) for the command, by default None.
 
     Raises
     ------
@@ -279,15 +402,14 @@ def run_command(
         cwd = Path.cwd()
     # pylint: disable=broad-except
     try:
-        subprocess.run(
-            cmd,
-            check=True,
-            cwd=cwd,
-            env=os.environ,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )  # nosemgrep # nosec
+        result = run_process(cmd, cwd=cwd, timeout=timeout)
     except BaseException as error:  # pragma: no cover
         if allow_error:
             return
         raise RuntimeError(f"Error running command: {error}") from error
+    if not result.ok and not allow_error:  # pragma: no cover
+        details = "\n".join(result.stderr[-20:])
+        raise RuntimeError(
+            f"Error running command: {' '.join(cmd)} "
+            f"(exit code {result.returncode})\n{details}"
+        )
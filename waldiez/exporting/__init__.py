@@ -1,13 +1,25 @@
 """Tools for exporting agents, models, skills and chats to strings."""
 
-from .flow import export_flow
+from .flow import export_flow, write_flow
 from .models import export_models
 from .skills import export_skills
-from .utils import comment, get_valid_instance_name
+from .utils import (
+    ContentWriter,
+    ExportFragments,
+    NameAllocator,
+    comment,
+    get_notebook_string,
+    get_valid_instance_name,
+)
 
 __all__ = [
+    "ContentWriter",
+    "ExportFragments",
+    "NameAllocator",
     "export_flow",
+    "write_flow",
     "comment",
+    "get_notebook_string",
     "get_valid_instance_name",
     "export_models",
     "export_skills",
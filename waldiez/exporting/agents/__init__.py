@@ -1,5 +1,27 @@
 """Agent related string generation functions."""
 
 from .agent import export_agent
+from .rag_user import (
+    get_embedding_cache_imports,
+    get_embedding_cache_string,
+    get_ingest_docs_function_string,
+    get_ingest_docs_imports,
+    get_vector_db_classes_string,
+    get_vector_db_client_names,
+    get_vector_db_clients_string,
+    uses_embedding_cache,
+    uses_ingestion_pipeline,
+)
 
-__all__ = ["export_agent"]
+__all__ = [
+    "export_agent",
+    "get_embedding_cache_imports",
+    "get_embedding_cache_string",
+    "uses_embedding_cache",
+    "get_ingest_docs_function_string",
+    "get_ingest_docs_imports",
+    "uses_ingestion_pipeline",
+    "get_vector_db_client_names",
+    "get_vector_db_clients_string",
+    "get_vector_db_classes_string",
+]
@@ -1,6 +1,6 @@
 """Agent strings generation.."""
 
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from waldiez.models import WaldiezAgent, WaldiezModel, WaldiezSkill
 
@@ -103,6 +103,7 @@ def export_agent(
     all_models: List[WaldiezModel],
     all_skills: List[WaldiezSkill],
     group_chat_members: List[WaldiezAgent],
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, str, Set[str]]:
     """Export the agent to a string.
 
@@ -159,6 +160,9 @@ def export_agent(
         All the skills in the flow.
     group_chat_members : List[WaldiezAgent]
         The group chat members.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the (RAG user) vector db clients that are shared
+        by more than one agent (by their definition), by default None.
 
     Returns
     -------
@@ -178,7 +182,7 @@ def export_agent(
     if before_manager:
         before_agent_string += before_manager
     before_rag, retrieve_arg, rag_imports = get_rag_user_extras(
-        agent, agent_name, model_names
+        agent, agent_name, model_names, client_names
     )
     if before_rag:
         before_agent_string += before_rag
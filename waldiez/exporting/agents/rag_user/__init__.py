@@ -1,5 +1,32 @@
 """RAG User Agent related string generation."""
 
+from .embedding_cache_utils import (
+    get_embedding_cache_imports,
+    get_embedding_cache_string,
+    uses_embedding_cache,
+)
+from .ingestion_utils import (
+    get_ingest_docs_function_string,
+    get_ingest_docs_imports,
+    uses_ingestion_pipeline,
+)
 from .rag_user import get_rag_user_extras, get_rag_user_retrieve_config_str
+from .vector_db import (
+    get_vector_db_classes_string,
+    get_vector_db_client_names,
+    get_vector_db_clients_string,
+)
 
-__all__ = ["get_rag_user_retrieve_config_str", "get_rag_user_extras"]
+__all__ = [
+    "get_rag_user_retrieve_config_str",
+    "get_rag_user_extras",
+    "get_embedding_cache_imports",
+    "get_embedding_cache_string",
+    "uses_embedding_cache",
+    "get_ingest_docs_function_string",
+    "get_ingest_docs_imports",
+    "uses_ingestion_pipeline",
+    "get_vector_db_client_names",
+    "get_vector_db_clients_string",
+    "get_vector_db_classes_string",
+]
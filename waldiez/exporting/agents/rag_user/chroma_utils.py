@@ -1,20 +1,23 @@
 """Get chroma db related imports and content."""
 
 from pathlib import Path
-from typing import Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 
 from waldiez.models import WaldiezRagUser
 
+from ...utils import get_object_string
+from .client_utils import get_client_arg
+from .embedding_cache_utils import get_cached_embedding_function_arg
+from .index_utils import get_collection_metadata
 
-def _get_chroma_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
+
+def get_chroma_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
     """Get the ChromaVectorDB client string.
 
     Parameters
     ----------
     agent : WaldiezRagUser
         The agent.
-    agent_name : str
-        The agent's name.
 
     Returns
     -------
@@ -69,6 +72,9 @@ def _get_chroma_embedding_function_string(
         )
         embedding_function_arg = "SentenceTransformerEmbeddingFunction("
         embedding_function_arg += f'model_name="{vector_db_model}")'
+        embedding_function_arg = get_cached_embedding_function_arg(
+            agent, embedding_function_arg
+        )
     else:
         embedding_function_arg = f"custom_embedding_function_{agent_name}"
         embedding_function_body = (
@@ -80,7 +86,9 @@ def _get_chroma_embedding_function_string(
 
 
 def get_chroma_db_args(
-    agent: WaldiezRagUser, agent_name: str
+    agent: WaldiezRagUser,
+    agent_name: str,
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, Set[str], str, str]:
     """Get the 'kwargs to use for ChromaVectorDB.
 
@@ -90,6 +98,8 @@ def get_chroma_db_args(
         The agent.
     agent_name : str
         The agent's name.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared clients by their definition, by default None.
 
     Returns
     -------
@@ -100,7 +110,7 @@ def get_chroma_db_args(
         - The custom embedding function.
         - Any additional content to be used before the `kwargs` string.
     """
-    client_str, client_to_import = _get_chroma_client_string(agent)
+    client_str, client_to_import = get_chroma_client_string(agent)
     embedding_function_arg, to_import_embedding, embedding_function_body = (
         _get_chroma_embedding_function_string(agent, agent_name)
     )
@@ -118,21 +128,34 @@ def get_chroma_db_args(
     # https://github.com/microsoft/autogen/issues/3551#issuecomment-2366930994
     # manually initializing the collection before running the flow,
     # might be a workaround.
-    content_before = f"{agent_name}_client = {client_str}\n"
+    # the client might be shared by the agents with the same storage
+    # (defined once, before the agents)
+    client_arg = get_client_arg(client_str, client_names)
+    content_before = f"{agent_name}_client = {client_arg}\n"
     collection_name = agent.retrieve_config.collection_name
     get_or_create = agent.retrieve_config.get_or_create
+    # the collection's (index) metadata is only used when it is created
+    metadata = get_collection_metadata(agent)
     if collection_name:
         if get_or_create:
+            metadata_arg = (
+                f", metadata={get_object_string(metadata, 0)}"
+                if metadata
+                else ""
+            )
             content_before += (
                 f"{agent_name}_client.get_or_create_collection("
-                f'"{collection_name}")\n'
+                f'"{collection_name}"{metadata_arg})\n'
             )
         else:
+            metadata_arg = (
+                f", metadata={get_object_string(metadata)}" if metadata else ""
+            )
             content_before += (
                 "try:\n"
                 f'    {agent_name}_client.get_collection("{collection_name}")\n'
                 "except ValueError:\n"
                 f"    {agent_name}_client.create_collection("
-                f'"{collection_name}")\n'
+                f'"{collection_name}"{metadata_arg})\n'
             )
     return kwarg_string, to_import, embedding_function_body, content_before
@@ -0,0 +1,34 @@
+"""Shared vector db clients for RAG user agents.
+
+The RAG user agents of a flow that use the same vector db at the same
+location (chroma's local storage path, qdrant's location, pgvector's
+connection url) share a single client (defined once, before the agents),
+instead of each one opening its own (for example, chroma's sqlite
+handles and in-memory indexes). Each agent still uses its own collection.
+An agent that does not share its location defines its own client
+(as if no other agent was there).
+"""
+
+from typing import Dict, Optional
+
+
+def get_client_arg(
+    client_str: str, client_names: Optional[Dict[str, str]] = None
+) -> str:
+    """Get the client to use: the shared client's name or its definition.
+
+    Parameters
+    ----------
+    client_str : str
+        The client's definition (with its location).
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared clients by their definition, by default None.
+
+    Returns
+    -------
+    str
+        The shared client's name if any, else the client's definition.
+    """
+    if not client_names:
+        return client_str
+    return client_names.get(client_str, client_str)
@@ -0,0 +1,266 @@
+"""Disk-backed embedding cache for RAG user agents.
+
+If a vector db config's `use_embedding_cache` is set, the default
+embedding function (chroma's `SentenceTransformerEmbeddingFunction`,
+qdrant's `FastEmbedEmbeddingFunction`, or `SentenceTransformer.encode`
+for mongodb and pgvector) is wrapped by a (generated) cache: the
+embeddings are kept in an sqlite database, keyed on (model, text hash),
+and only the texts that are not in it are embedded. The cache and the
+wrapped embedding functions are shared by all the agents of the flow
+(so the same model is only loaded once, and only if needed), and the
+least recently used embeddings are removed if the cached vectors
+exceed the size limit.
+"""
+
+from typing import Set
+
+from waldiez.models import WaldiezAgent, WaldiezRagUser
+
+# pylint: disable=line-too-long
+EMBEDDING_CACHE_CLASSES = '''
+class WaldiezEmbeddingCache:
+    """A disk-backed (sqlite) cache of embeddings, keyed on (model, text hash).
+
+    The least recently used embeddings are removed if the cached
+    vectors exceed `max_size` bytes.
+    """
+
+    _caches = {}
+    _functions = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path, max_size):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (model TEXT, key TEXT, "
+            "vector BLOB, last_used REAL, PRIMARY KEY (model, key))"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used "
+            "ON embeddings (last_used)"
+        )
+        self.connection.commit()
+        self.size = self.connection.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    @classmethod
+    def get_embedding_function(
+        cls, model, factory, path=None, max_size=1073741824, encode=False
+    ):
+        """Get the (shared) cached embedding function of a model."""
+        if not path:
+            cache_dir = os.environ.get("WALDIEZ_CACHE_DIR", "") or os.path.join(
+                os.environ.get("XDG_CACHE_HOME", "")
+                or os.path.join(os.path.expanduser("~"), ".cache"),
+                "waldiez",
+            )
+            path = os.path.join(cache_dir, "embeddings.sqlite3")
+        with cls._lock:
+            if path not in cls._caches:
+                cls._caches[path] = cls(path, max_size)
+            key = (path, model, encode)
+            if key not in cls._functions:
+                function_class = (
+                    WaldiezCachedEncode
+                    if encode
+                    else WaldiezCachedEmbeddingFunction
+                )
+                cls._functions[key] = function_class(
+                    cls._caches[path], model, factory
+                )
+            return cls._functions[key]
+
+    def embed(self, model, texts, embed):
+        """Get the (float32) vectors of texts, embedding only the missing ones."""
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        vectors = {}
+        with self.lock:
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start : start + 500]
+                placeholders = ", ".join("?" * len(batch))
+                vectors.update(
+                    self.connection.execute(
+                        "SELECT key, vector FROM embeddings WHERE model = ? "
+                        f"AND key IN ({placeholders})",
+                        [model, *batch],
+                    )
+                )
+        missing = [key for key in unique_keys if key not in vectors]
+        if missing:
+            texts_by_key = dict(zip(keys, texts))
+            embedded = embed([texts_by_key[key] for key in missing])
+            for key, vector in zip(missing, embedded):
+                vectors[key] = np.asarray(vector, dtype=np.float32).tobytes()
+        now = time.time()
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                [(model, key, vectors[key], now) for key in missing],
+            )
+            self.connection.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                [(now, model, key) for key in unique_keys if key not in missing],
+            )
+            self.size += sum(len(vectors[key]) for key in missing)
+            if self.size > self.max_size:
+                self._evict()
+            self.connection.commit()
+        return [vectors[key] for key in keys]
+
+    def _evict(self):
+        """Remove the least recently used embeddings (down to 90% of max_size)."""
+        to_remove = []
+        cursor = self.connection.execute(
+            "SELECT model, key, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        )
+        while self.size > self.max_size * 0.9:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            for model, key, size in rows:
+                if self.size <= self.max_size * 0.9:
+                    break
+                to_remove.append((model, key))
+                self.size -= size
+        cursor.close()
+        self.connection.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND key = ?", to_remove
+        )
+
+
+class WaldiezCachedEmbeddingFunction:
+    """A (chroma/qdrant) embedding function, using the embedding cache.
+
+    The wrapped embedding function is only created on the first cache miss.
+    """
+
+    def __init__(self, cache, model, factory):
+        self.cache = cache
+        self.model = model
+        self.factory = factory
+        self.function = None
+
+    def embed(self, texts):
+        """Embed texts with the wrapped embedding function."""
+        if self.function is None:
+            self.function = self.factory()
+        return self.function(texts)
+
+    def __call__(self, input):  # pylint: disable=redefined-builtin
+        vectors = self.cache.embed(self.model, list(input), self.embed)
+        return [np.frombuffer(vector, dtype=np.float32).tolist() for vector in vectors]
+
+
+class WaldiezCachedEncode(WaldiezCachedEmbeddingFunction):
+    """A `SentenceTransformer.encode` (mongodb/pgvector), using the embedding cache."""
+
+    def __call__(self, input, **kwargs):  # pylint: disable=redefined-builtin
+        texts = [input] if isinstance(input, str) else list(input)
+        vectors = np.array(
+            [
+                np.frombuffer(vector, dtype=np.float32)
+                for vector in self.cache.embed(self.model, texts, self.embed)
+            ]
+        )
+        return vectors[0] if isinstance(input, str) else vectors
+'''
+
+
+def uses_embedding_cache(agent: WaldiezAgent) -> bool:
+    """Check if an agent's embeddings are to be cached.
+
+    Parameters
+    ----------
+    agent : WaldiezAgent
+        The agent.
+
+    Returns
+    -------
+    bool
+        True if the agent is a RAG user with the embedding cache enabled
+        (and not using a custom embedding function).
+    """
+    return (
+        isinstance(agent, WaldiezRagUser)
+        and agent.retrieve_config.db_config.use_embedding_cache
+        and not agent.retrieve_config.use_custom_embedding
+    )
+
+
+def get_embedding_cache_string() -> str:
+    """Get the embedding cache classes (once per flow, before the agents).
+
+    Returns
+    -------
+    str
+        The `WaldiezEmbeddingCache` and cached embedding function classes.
+    """
+    return EMBEDDING_CACHE_CLASSES
+
+
+def get_embedding_cache_imports() -> Set[str]:
+    """Get the imports of the embedding cache classes.
+
+    Returns
+    -------
+    Set[str]
+        The imports.
+    """
+    return {
+        "import hashlib",
+        "import os",
+        "import sqlite3",
+        "import threading",
+        "import time",
+        "import numpy as np",
+    }
+
+
+def get_cached_embedding_function_arg(
+    agent: WaldiezRagUser,
+    embedding_function_arg: str,
+    encode: bool = False,
+) -> str:
+    """Get the 'embedding_function' arg, wrapped by the cache if enabled.
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+    embedding_function_arg : str
+        The (default) embedding function arg.
+    encode : bool, optional
+        Whether the embedding function is a `SentenceTransformer.encode`
+        (for mongodb and pgvector), by default False.
+
+    Returns
+    -------
+    str
+        The embedding function arg (the cached one if enabled).
+    """
+    if not uses_embedding_cache(agent):
+        return embedding_function_arg
+    db_config = agent.retrieve_config.db_config
+    # the embedder depends on the vector db (not only on the model)
+    model_key = f"{agent.retrieve_config.vector_db}:{db_config.model}"
+    path_arg = (
+        f'r"{db_config.embedding_cache_path}"'
+        if db_config.embedding_cache_path
+        else "None"
+    )
+    return (
+        "WaldiezEmbeddingCache.get_embedding_function("
+        f'"{model_key}", '
+        f"lambda: {embedding_function_arg}, "
+        f"path={path_arg}, "
+        f"max_size={db_config.embedding_cache_max_size}, "
+        f"encode={encode})"
+    )
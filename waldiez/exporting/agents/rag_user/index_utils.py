@@ -0,0 +1,84 @@
+"""Collection metadata (with the index options) for RAG user agents.
+
+autogen's chroma and pgvector vector dbs use the same ("hnsw:") metadata
+for their HNSW indexes: the typed index options of the vector db config
+(`distance_metric`, `hnsw_m`, `hnsw_ef_construction` and, for chroma,
+`hnsw_ef_search`) override the (free-form) metadata's keys, and the keys
+that are not set get autogen's defaults (the ones used if no metadata
+is given), so that setting one option does not reset the others.
+"""
+
+from typing import Any, Dict
+
+from waldiez.models import WaldiezRagUser
+
+# the index options (field name) that map to "hnsw:" metadata
+HNSW_METADATA_KEYS: Dict[str, Dict[str, str]] = {
+    "chroma": {
+        "distance_metric": "hnsw:space",
+        "hnsw_m": "hnsw:M",
+        "hnsw_ef_construction": "hnsw:construction_ef",
+        "hnsw_ef_search": "hnsw:search_ef",
+    },
+    # the distance is (only) used in pgvector's queries (and search ef
+    # is a connection setting), not in the metadata
+    "pgvector": {
+        "hnsw_m": "hnsw:M",
+        "hnsw_ef_construction": "hnsw:construction_ef",
+    },
+}
+# autogen's metadata if none is given
+DEFAULT_HNSW_METADATA: Dict[str, Dict[str, Any]] = {
+    "chroma": {"hnsw:space": "ip", "hnsw:construction_ef": 30, "hnsw:M": 32},
+    "pgvector": {"hnsw:space": "ip", "hnsw:construction_ef": 32, "hnsw:M": 16},
+}
+
+
+def _get_metadata_value(value: Any) -> Any:
+    """Get a (free-form) metadata value, as int or float if it looks like one.
+
+    Parameters
+    ----------
+    value : Any
+        The value.
+
+    Returns
+    -------
+    Any
+        The value (int, float or str).
+    """
+    if str(value).isdigit():
+        return int(value)
+    if str(value).replace(".", "").isdigit():
+        return float(value)
+    return str(value)
+
+
+def get_collection_metadata(agent: WaldiezRagUser) -> Dict[str, Any]:
+    """Get the collection's metadata (with the index options).
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The metadata (empty if neither metadata nor index options are set).
+    """
+    db_config = agent.retrieve_config.db_config
+    metadata = {
+        key: _get_metadata_value(value)
+        for key, value in (db_config.metadata or {}).items()
+    }
+    vector_db = agent.retrieve_config.vector_db
+    metadata_keys = HNSW_METADATA_KEYS.get(vector_db, {})
+    index_metadata = {
+        metadata_keys[option]: value
+        for option, value in db_config.index_options.items()
+        if option in metadata_keys
+    }
+    if not index_metadata:
+        return metadata
+    return {**DEFAULT_HNSW_METADATA[vector_db], **metadata, **index_metadata}
@@ -0,0 +1,341 @@
+"""Docs ingestion (before the agent is created) for RAG user agents.
+
+Instead of letting `RetrieveUserProxyAgent` read, chunk and embed all
+the docs in `docs_path` in a single thread (when `new_docs`/`overwrite`
+force it), if the retrieve config uses an ingestion manifest, a batch
+size or workers (`use_ingestion_pipeline`), the generated code ingests
+the docs itself before the agent is created, with an `ingest_docs`
+function that is defined once per flow (before the agents):
+
+- the files are parsed and chunked in a process pool (`ingestion_workers`,
+  forked, so the flow's module is not imported again in the workers),
+  unless a custom text split function (of the flow's module, that
+  cannot be pickled) is used,
+  while the chunks are embedded and inserted in the vector db in
+  fixed-size batches (`ingestion_batch_size`);
+- with `use_ingestion_manifest`, a manifest (next to the vector db's
+  local storage) keeps the size, the mtime, the content hash and the
+  chunk ids of each ingested doc, so only the new or modified docs are
+  chunked and embedded and the vectors of the modified or removed ones
+  are deleted.
+
+The agent then uses the (existing) collection.
+"""
+
+from typing import Any, Dict, Set, Tuple
+
+from waldiez.models import WaldiezAgent, WaldiezRagUser
+
+from ...utils import get_object_string, get_path_string
+
+# pylint: disable=line-too-long
+INGEST_DOCS_FUNCTION = '''
+def ingest_docs(
+    vector_db,
+    docs_path,
+    manifest_path,
+    collection_name,
+    overwrite,
+    custom_text_types,
+    recursive,
+    batch_size=None,
+    workers=None,
+    **split_kwargs,
+):
+    """Chunk (in worker processes) and embed (in batches) the docs.
+
+    If a manifest is used, it keeps (by source) the size, the mtime, the
+    content hash and the chunk ids of each ingested doc: only the new or
+    modified docs are chunked and embedded, and the chunks of the
+    modified or removed docs are deleted from the collection.
+    """
+    started = time.perf_counter()
+    manifest = {}
+    if manifest_path and os.path.isfile(manifest_path) and not overwrite:
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+    vector_db.create_collection(
+        collection_name, overwrite=overwrite, get_or_create=True
+    )
+    entries = {}
+    to_ingest = []
+    # (get_files_from_dir might return the same file more than once)
+    files = get_files_from_dir(docs_path, custom_text_types, recursive)
+    for item in dict.fromkeys(files):
+        # urls are downloaded: (file_path, url)
+        if isinstance(item, tuple):
+            file_path, source = item
+        else:
+            file_path = source = item = os.path.abspath(item)
+        if source in entries:
+            continue
+        stat = os.stat(file_path)
+        entry = manifest.get(source)
+        if (
+            entry
+            and entry["size"] == stat.st_size
+            and entry["mtime"] == stat.st_mtime
+        ):
+            entries[source] = entry
+            continue
+        new_entry = {"size": stat.st_size, "mtime": stat.st_mtime, "ids": []}
+        if manifest_path:
+            content_hash = hashlib.sha256()
+            with open(file_path, "rb") as file:
+                while block := file.read(1024 * 1024):
+                    content_hash.update(block)
+            new_entry["hash"] = content_hash.hexdigest()
+            if entry and entry["hash"] == new_entry["hash"]:
+                new_entry["ids"] = entry["ids"]
+                entries[source] = new_entry
+                continue
+        to_ingest.append(item)
+        entries[source] = new_entry
+    workers = max(1, min(workers or 1, len(to_ingest)))
+    group_size = max(1, -(-len(to_ingest) // (workers * 4)))
+    groups = [
+        to_ingest[start : start + group_size]
+        for start in range(0, len(to_ingest), group_size)
+    ]
+    split = functools.partial(split_files_to_chunks, **split_kwargs)
+    executor = None
+    # a custom split function (of the flow's module, which is not in
+    # sys.modules when loaded by a runner) cannot be pickled: chunk in-process
+    if (
+        workers > 1
+        and "fork" in multiprocessing.get_all_start_methods()
+        and not split_kwargs.get("custom_text_split_function")
+    ):
+        executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("fork")
+        )
+    docs = []
+    seen_ids = set()
+    inserted = 0
+    try:
+        # the chunks of each group are embedded while the next ones are chunked
+        for chunks, sources in (executor.map if executor else map)(split, groups):
+            for chunk, metadata in zip(chunks, sources):
+                encoded = chunk.encode("utf-8")
+                if getattr(vector_db, "type", None) == "qdrant":
+                    doc_id = str(uuid.UUID(hex=hashlib.md5(encoded).hexdigest()))
+                else:
+                    doc_id = hashlib.blake2b(encoded).hexdigest()[:HASH_LENGTH]
+                doc_ids = entries[metadata["source"]]["ids"]
+                if doc_id not in doc_ids:
+                    doc_ids.append(doc_id)
+                if doc_id in seen_ids:
+                    continue
+                seen_ids.add(doc_id)
+                docs.append({"id": doc_id, "content": chunk, "metadata": metadata})
+                if batch_size and len(docs) >= batch_size:
+                    vector_db.insert_docs(
+                        docs=docs, collection_name=collection_name, upsert=True
+                    )
+                    inserted += len(docs)
+                    docs = []
+        if docs:
+            vector_db.insert_docs(
+                docs=docs, collection_name=collection_name, upsert=True
+            )
+            inserted += len(docs)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    # a chunk might also be in other (kept) docs
+    kept_ids = {doc_id for entry in entries.values() for doc_id in entry["ids"]}
+    stale_ids = {
+        doc_id
+        for entry in manifest.values()
+        for doc_id in entry["ids"]
+        if doc_id not in kept_ids
+    }
+    if stale_ids:
+        vector_db.delete_docs(ids=sorted(stale_ids), collection_name=collection_name)
+    if manifest_path:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(manifest_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(entries, file)
+        os.replace(manifest_path + ".tmp", manifest_path)
+    removed = len(set(manifest) - set(entries))
+    elapsed = time.perf_counter() - started
+    print(
+        f"Ingested {len(to_ingest)} docs ({inserted} chunks) "
+        f"in {elapsed:.2f} seconds, removed {removed} docs."
+    )
+'''
+
+
+def uses_ingestion_pipeline(agent: WaldiezAgent) -> bool:
+    """Check if an agent's docs are ingested before the agent is created.
+
+    Parameters
+    ----------
+    agent : WaldiezAgent
+        The agent.
+
+    Returns
+    -------
+    bool
+        True if the agent is a RAG user that uses the ingestion pipeline.
+    """
+    return (
+        isinstance(agent, WaldiezRagUser)
+        and agent.retrieve_config.use_ingestion_pipeline
+    )
+
+
+def get_ingest_docs_function_string() -> str:
+    """Get the function that ingests the docs (once per flow).
+
+    Returns
+    -------
+    str
+        The `ingest_docs` function's definition.
+    """
+    return INGEST_DOCS_FUNCTION
+
+
+def get_ingest_docs_imports() -> Set[str]:
+    """Get the imports of the ingestion function.
+
+    Returns
+    -------
+    Set[str]
+        The imports.
+    """
+    return {
+        "import functools",
+        "import hashlib",
+        "import json",
+        "import multiprocessing",
+        "import os",
+        "import time",
+        "import uuid",
+        "from concurrent.futures import ProcessPoolExecutor",
+        "from autogen.agentchat.contrib.retrieve_user_proxy_agent "
+        "import HASH_LENGTH",
+        "from autogen.retrieve_utils import TEXT_FORMATS",
+        "from autogen.retrieve_utils import get_files_from_dir",
+        "from autogen.retrieve_utils import split_files_to_chunks",
+    }
+
+
+def get_ingest_docs_call_string(
+    agent: WaldiezRagUser,
+    agent_name: str,
+    model_arg: str,
+    split_function_arg: str,
+) -> str:
+    """Get the call of the ingestion function (for the agent's docs).
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+    agent_name : str
+        The agent's name.
+    model_arg : str
+        The model of the retrieve config (to get the default chunk size,
+        like `RetrieveUserProxyAgent` does).
+    split_function_arg : str
+        The name of the custom text split function if used.
+
+    Returns
+    -------
+    str
+        The call.
+    """
+    retrieve_config = agent.retrieve_config
+    docs_path = retrieve_config.docs_path or []
+    if not isinstance(docs_path, list):
+        docs_path = [docs_path]
+    max_tokens = (
+        str(retrieve_config.chunk_token_size)
+        if retrieve_config.chunk_token_size is not None
+        else (
+            "int(RetrieveUserProxyAgent.get_max_tokens("
+            f'"{model_arg}") * 0.4)'
+        )
+    )
+    kwargs: Dict[str, Any] = {
+        "docs_path": get_object_string(
+            [get_path_string(path) for path in docs_path]
+        ),
+        "manifest_path": (
+            f'r"{retrieve_config.ingestion_manifest_path}"'
+            if retrieve_config.ingestion_manifest_path
+            else "None"
+        ),
+        "collection_name": f'"{retrieve_config.collection_name}"',
+        "overwrite": retrieve_config.overwrite,
+        "custom_text_types": (
+            get_object_string(retrieve_config.custom_text_types)
+            if retrieve_config.custom_text_types
+            else "TEXT_FORMATS"
+        ),
+        "recursive": retrieve_config.recursive,
+    }
+    if retrieve_config.ingestion_batch_size is not None:
+        kwargs["batch_size"] = retrieve_config.ingestion_batch_size
+    if retrieve_config.ingestion_workers is not None:
+        kwargs["workers"] = retrieve_config.ingestion_workers
+    if split_function_arg:
+        kwargs["custom_text_split_function"] = split_function_arg
+    else:
+        kwargs["max_tokens"] = max_tokens
+        kwargs["chunk_mode"] = f'"{retrieve_config.chunk_mode}"'
+        kwargs["must_break_at_empty_line"] = (
+            retrieve_config.must_break_at_empty_line
+        )
+    call = f"ingest_docs(\n    {agent_name}_vector_db,\n"
+    for key, value in kwargs.items():
+        call += f"    {key}={value},\n"
+    call += ")\n"
+    return call
+
+
+def get_rag_user_ingestion_string(
+    agent: WaldiezRagUser,
+    agent_name: str,
+    vector_db_arg: str,
+    model_arg: str,
+    split_function_arg: str,
+) -> Tuple[str, str, Set[str]]:
+    """Get the content to ingest the agent's docs before the agent.
+
+    The `ingest_docs` function itself is defined once per flow
+    (before the agents).
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+    agent_name : str
+        The agent's name.
+    vector_db_arg : str
+        The vector db (as in the retrieve config's "vector_db" arg).
+    model_arg : str
+        The model of the retrieve config.
+    split_function_arg : str
+        The name of the custom text split function if used.
+
+    Returns
+    -------
+    Tuple[str, str, Set[str]]
+        The content before the agent, the new "vector_db" arg
+        (the vector db's variable) and the imports.
+    """
+    # the arg is indented for the retrieve config's dict
+    vector_db_lines = [
+        line[8:] if line.startswith(" " * 8) else line
+        for line in vector_db_arg.split("\n")
+    ]
+    content = f"{agent_name}_vector_db = " + "\n".join(vector_db_lines) + "\n"
+    content += get_ingest_docs_call_string(
+        agent, agent_name, model_arg, split_function_arg
+    )
+    imports: Set[str] = set()
+    if not agent.retrieve_config.custom_text_types:
+        imports.add("from autogen.retrieve_utils import TEXT_FORMATS")
+    return content, f"{agent_name}_vector_db", imports
@@ -1,9 +1,115 @@
 """Get mongodb related content and imports."""
 
-from typing import Set, Tuple
+from typing import Dict, Set, Tuple
 
 from waldiez.models import WaldiezRagUser
 
+from .embedding_cache_utils import get_cached_embedding_function_arg
+
+# pylint: disable=line-too-long
+MONGODB_INDEX_CLASS = '''
+class WaldiezMongoDBAtlasVectorDB(MongoDBAtlasVectorDB):
+    """A MongoDBAtlasVectorDB with a configurable vector search index."""
+
+    def __init__(
+        self, *, similarity="cosine", quantization=None, hnsw_options=None, **kwargs
+    ):
+        self.similarity = similarity
+        self.quantization = quantization
+        self.hnsw_options = hnsw_options
+        super().__init__(**kwargs)
+
+    def create_vector_search_index(
+        self, collection, index_name="vector_index", similarity=None
+    ):
+        field = {
+            "type": "vector",
+            "numDimensions": self.dimensions,
+            "path": "embedding",
+            "similarity": similarity or self.similarity,
+        }
+        if self.quantization:
+            field["quantization"] = self.quantization
+        if self.hnsw_options:
+            field["hnswOptions"] = self.hnsw_options
+        search_index_model = SearchIndexModel(
+            definition={"fields": [field]},
+            name=index_name,
+            type="vectorSearch",
+        )
+        collection.create_search_index(model=search_index_model)
+        if self._wait_until_index_ready:
+            self._wait_for_index(collection, index_name, "create")
+'''
+# the distance metric (as in chroma) to atlas' similarity
+MONGODB_SIMILARITIES: Dict[str, str] = {
+    "cosine": "cosine",
+    "l2": "euclidean",
+    "ip": "dotProduct",
+}
+
+
+def uses_mongodb_index_options(agent: WaldiezRagUser) -> bool:
+    """Check if an agent's (mongodb) vector search index has options.
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+
+    Returns
+    -------
+    bool
+        True if mongodb is used with any index option.
+    """
+    return agent.retrieve_config.vector_db == "mongodb" and bool(
+        agent.retrieve_config.db_config.index_options
+    )
+
+
+def get_mongodb_index_class_string() -> str:
+    """Get the MongoDBAtlasVectorDB subclass with the index options.
+
+    Returns
+    -------
+    str
+        The `WaldiezMongoDBAtlasVectorDB` class.
+    """
+    return MONGODB_INDEX_CLASS
+
+
+def _get_mongodb_index_args(agent: WaldiezRagUser) -> str:
+    """Get the index kwargs of WaldiezMongoDBAtlasVectorDB.
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+
+    Returns
+    -------
+    str
+        The 'similarity', 'quantization' and 'hnsw_options' kwargs if set.
+    """
+    tab = " " * 12
+    db_config = agent.retrieve_config.db_config
+    kwarg_string = ""
+    if db_config.distance_metric is not None:
+        similarity = MONGODB_SIMILARITIES[db_config.distance_metric]
+        kwarg_string += f'{tab}similarity="{similarity}",\n'
+    if db_config.quantization is not None:
+        kwarg_string += f'{tab}quantization="{db_config.quantization}",\n'
+    hnsw_options = []
+    if db_config.hnsw_m is not None:
+        hnsw_options.append(f'"maxEdges": {db_config.hnsw_m}')
+    if db_config.hnsw_ef_construction is not None:
+        hnsw_options.append(
+            f'"numEdgeCandidates": {db_config.hnsw_ef_construction}'
+        )
+    if hnsw_options:
+        kwarg_string += f"{tab}hnsw_options={{{', '.join(hnsw_options)}}},\n"
+    return kwarg_string
+
 
 def _get_mongodb_embedding_function_string(
     agent: WaldiezRagUser, agent_name: str
@@ -32,6 +138,9 @@ def _get_mongodb_embedding_function_string(
             f'"{agent.retrieve_config.db_config.model}"'
             ").encode"
         )
+        embedding_function_arg = get_cached_embedding_function_arg(
+            agent, embedding_function_arg, encode=True
+        )
     else:
         embedding_function_arg = f"custom_embedding_function_{agent_name}"
         embedding_function_body = (
@@ -80,4 +189,6 @@ def get_mongodb_db_args(
         kwarg_string += (
             f"{tab}wait_until_index_ready={wait_until_index_ready},\n"
         )
+    if uses_mongodb_index_options(agent):
+        kwarg_string += _get_mongodb_index_args(agent)
     return kwarg_string, to_import, embedding_function_body
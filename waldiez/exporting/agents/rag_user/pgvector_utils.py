@@ -1,11 +1,92 @@
 """Get pgvector related content and imports."""
 
-from typing import Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 
 from waldiez.models import WaldiezRagUser
 
+from .client_utils import get_client_arg
+from .embedding_cache_utils import get_cached_embedding_function_arg
 
-def _get_pgvector_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
+# pylint: disable=line-too-long
+PGVECTOR_IVFFLAT_CLASS = '''
+class WaldiezPGVectorDB(PGVectorDB):
+    """A PGVectorDB with an ivfflat (instead of the hnsw) index.
+
+    ivfflat trains its lists when the index is built, so the index is
+    built after the docs are inserted (not with the empty table), and
+    rebuilt whenever the collection has doubled since the last build.
+    """
+
+    def __init__(self, *, lists=100, **kwargs):
+        self.lists = lists
+        self.indexed_rows = {}
+        super().__init__(**kwargs)
+
+    def insert_docs(self, docs, collection_name=None, upsert=False):
+        super().insert_docs(docs, collection_name=collection_name, upsert=upsert)
+        name = self.get_collection(collection_name).name
+        with self.client.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {name}")
+            rows = cursor.fetchone()[0]
+            if not rows:
+                return
+            cursor.execute(
+                "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s",
+                (name.lower(),),
+            )
+            indexes = cursor.fetchall()
+            ivfflat = [index for index, definition in indexes if "USING ivfflat" in definition]
+            if ivfflat:
+                # (built by a previous run if not known)
+                indexed_rows = self.indexed_rows.setdefault(name, rows)
+                if rows < 2 * indexed_rows:
+                    return
+            for index, definition in indexes:
+                if "USING hnsw" in definition:
+                    cursor.execute(f'DROP INDEX IF EXISTS "{index}"')
+            # (pgvector's queries use the euclidean distance)
+            if ivfflat:
+                cursor.execute(f'REINDEX INDEX "{ivfflat[0]}"')
+            else:
+                cursor.execute(
+                    f"CREATE INDEX {name}_embedding_ivfflat ON {name} "
+                    f"USING ivfflat (embedding vector_l2_ops) WITH (lists = {self.lists})"
+                )
+            self.indexed_rows[name] = rows
+'''
+
+
+def uses_ivfflat_index(agent: WaldiezRagUser) -> bool:
+    """Check if an agent's (pgvector) collection uses an ivfflat index.
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+
+    Returns
+    -------
+    bool
+        True if pgvector is used with an ivfflat index.
+    """
+    return (
+        agent.retrieve_config.vector_db == "pgvector"
+        and agent.retrieve_config.db_config.index_type == "ivfflat"
+    )
+
+
+def get_pgvector_ivfflat_class_string() -> str:
+    """Get the PGVectorDB subclass that uses an ivfflat index.
+
+    Returns
+    -------
+    str
+        The `WaldiezPGVectorDB` class.
+    """
+    return PGVECTOR_IVFFLAT_CLASS
+
+
+def get_pgvector_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
     """Get the PGVectorDB client string.
 
     Parameters
@@ -18,10 +99,20 @@ def _get_pgvector_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
     Tuple[str, str]
         The 'client' and what to import.
     """
+    db_config = agent.retrieve_config.db_config
     to_import = "psycopg"
     client_str = "psycopg."
-    connection_url = agent.retrieve_config.db_config.connection_url
-    client_str += f'connect("{connection_url}")'
+    client_str += f'connect("{db_config.connection_url}", autocommit=True'
+    # the search's candidates are session settings
+    options = []
+    if db_config.hnsw_ef_search is not None:
+        options.append(f"-c hnsw.ef_search={db_config.hnsw_ef_search}")
+    if db_config.ivfflat_probes is not None:
+        options.append(f"-c ivfflat.probes={db_config.ivfflat_probes}")
+    if options:
+        options_arg = " ".join(options)
+        client_str += f', options="{options_arg}"'
+    client_str += ")"
     return client_str, to_import
 
 
@@ -57,11 +148,16 @@ def _get_pgvector_embedding_function_string(
         embedding_function_arg += (
             f'"{agent.retrieve_config.db_config.model}").encode'
         )
+        embedding_function_arg = get_cached_embedding_function_arg(
+            agent, embedding_function_arg, encode=True
+        )
     return embedding_function_arg, to_import, embedding_function_body
 
 
 def get_pgvector_db_args(
-    agent: WaldiezRagUser, agent_name: str
+    agent: WaldiezRagUser,
+    agent_name: str,
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, Set[str], str]:
     """Get the kwargs to use for PGVectorDB.
 
@@ -71,13 +167,18 @@ def get_pgvector_db_args(
         The agent.
     agent_name : str
         The agent's name.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared clients by their definition, by default None.
 
     Returns
     -------
     Tuple[str, Set[str], str]
         The kwargs to use, what to import and the custom_embedding_function.
     """
-    client_str, to_import_client = _get_pgvector_client_string(agent)
+    client_str, to_import_client = get_pgvector_client_string(agent)
+    # the connection might be shared by the agents with the same url
+    # (defined once, before the agents)
+    client_arg = get_client_arg(client_str, client_names)
     embedding_function_arg, to_import_embedding, embedding_function_body = (
         _get_pgvector_embedding_function_string(agent, agent_name)
     )
@@ -87,7 +188,10 @@ def get_pgvector_db_args(
         else {to_import_client}
     )
     kwarg_str = (
-        f"            client={client_str},\n"
+        f"            conn={client_arg},\n"
         f"            embedding_function={embedding_function_arg},\n"
     )
+    if uses_ivfflat_index(agent):
+        lists = agent.retrieve_config.db_config.ivfflat_lists or 100
+        kwarg_str += f"            lists={lists},\n"
     return kwarg_str, to_import, embedding_function_body
@@ -1,24 +1,41 @@
 """Get qdrant db related imports and content."""
 
 from pathlib import Path
-from typing import Set, Tuple
+from typing import Dict, Optional, Set, Tuple
 
 from waldiez.models import WaldiezRagUser
 
+from .client_utils import get_client_arg
+from .embedding_cache_utils import get_cached_embedding_function_arg
 
-def _get_qdrant_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
+# (autogen's qdrant collections always use the cosine distance)
+QDRANT_QUANTIZATION_CONFIGS: Dict[str, str] = {
+    "scalar": (
+        "models.ScalarQuantization(scalar=models.ScalarQuantizationConfig("
+        "type=models.ScalarType.INT8, always_ram=True))"
+    ),
+    "binary": (
+        "models.BinaryQuantization(binary=models.BinaryQuantizationConfig("
+        "always_ram=True))"
+    ),
+    "product": (
+        "models.ProductQuantization(product=models.ProductQuantizationConfig("
+        "compression=models.CompressionRatio.X16, always_ram=True))"
+    ),
+}
+
+
+def get_qdrant_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
     """Get the QdrantVectorDB client string.
 
     Parameters
     ----------
     agent : WaldiezRagUser
         The agent.
-    agent_name : str
-        The agent's name.
 
     Returns
     -------
-    Tuple[str, str, str]
+    Tuple[str, str]
         The 'client' argument, and the module to import.
     """
     to_import: str = "from qdrant_client import QdrantClient"
@@ -41,6 +58,45 @@ def _get_qdrant_client_string(agent: WaldiezRagUser) -> Tuple[str, str]:
     return client_str, to_import
 
 
+def _get_qdrant_collection_options_arg(agent: WaldiezRagUser) -> str:
+    """Get the QdrantVectorDB 'collection_options' (the index options).
+
+    Parameters
+    ----------
+    agent : WaldiezRagUser
+        The agent.
+
+    Returns
+    -------
+    str
+        The 'collection_options' kwarg if any index option is set.
+    """
+    db_config = agent.retrieve_config.db_config
+    hnsw_args = []
+    if db_config.hnsw_m is not None:
+        hnsw_args.append(f"m={db_config.hnsw_m}")
+    if db_config.hnsw_ef_construction is not None:
+        hnsw_args.append(f"ef_construct={db_config.hnsw_ef_construction}")
+    options = []
+    if hnsw_args:
+        options.append(
+            f'"hnsw_config": models.HnswConfigDiff({", ".join(hnsw_args)})'
+        )
+    if db_config.quantization is not None:
+        options.append(
+            '"quantization_config": '
+            f"{QDRANT_QUANTIZATION_CONFIGS[db_config.quantization]}"
+        )
+    if not options:
+        return ""
+    tab = " " * 12
+    kwarg_string = f"{tab}collection_options={{\n"
+    for option in options:
+        kwarg_string += f"{tab}    {option},\n"
+    kwarg_string += f"{tab}}},\n"
+    return kwarg_string
+
+
 def _get_qdrant_embedding_function_string(
     agent: WaldiezRagUser, agent_name: str
 ) -> Tuple[str, str, str]:
@@ -70,6 +126,9 @@ def _get_qdrant_embedding_function_string(
         )
         embedding_function_arg = "FastEmbedEmbeddingFunction("
         embedding_function_arg += f'model_name="{vector_db_model}")'
+        embedding_function_arg = get_cached_embedding_function_arg(
+            agent, embedding_function_arg
+        )
     else:
         embedding_function_arg = f"custom_embedding_function_{agent_name}"
         embedding_function_body = (
@@ -80,7 +139,9 @@ def _get_qdrant_embedding_function_string(
 
 
 def get_qdrant_db_args(
-    agent: WaldiezRagUser, agent_name: str
+    agent: WaldiezRagUser,
+    agent_name: str,
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, Set[str], str]:
     """Get the kwargs to use for QdrantVectorDB.
 
@@ -90,13 +151,18 @@ def get_qdrant_db_args(
         The agent.
     agent_name : str
         The agent's name.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared clients by their definition, by default None.
 
     Returns
     -------
     Tuple[str, Set[str], str]
         The kwargs to use, the imports and the embedding function body if used.
     """
-    client_str, to_import_client = _get_qdrant_client_string(agent)
+    client_str, to_import_client = get_qdrant_client_string(agent)
+    # the client might be shared by the agents with the same location
+    # (defined once, before the agents)
+    client_arg = get_client_arg(client_str, client_names)
     embedding_function_arg, to_import_embedding, embedding_function_body = (
         _get_qdrant_embedding_function_string(agent, agent_name)
     )
@@ -106,7 +172,11 @@ def get_qdrant_db_args(
         else {to_import_client}
     )
     kwarg_string = (
-        f"            client={client_str},\n"
+        f"            client={client_arg},\n"
         f"            embedding_function={embedding_function_arg},\n"
     )
+    collection_options_arg = _get_qdrant_collection_options_arg(agent)
+    if collection_options_arg:
+        kwarg_string += collection_options_arg
+        to_import.add("from qdrant_client import models")
     return kwarg_string, to_import, embedding_function_body
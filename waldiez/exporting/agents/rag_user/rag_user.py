@@ -1,6 +1,6 @@
 """RAG User related exporting utils."""
 
-from typing import Dict, List, Set, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from waldiez.models import (
     WaldiezAgent,
@@ -10,6 +10,7 @@ from waldiez.models import (
 )
 
 from ...utils import get_object_string, get_path_string
+from .ingestion_utils import get_rag_user_ingestion_string
 from .vector_db import get_rag_user_vector_db_string
 
 
@@ -17,6 +18,7 @@ def get_rag_user_retrieve_config_str(
     agent: WaldiezRagUser,
     agent_name: str,
     model_names: Dict[str, str],
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, str, Set[str]]:
     """Get the RAG user retrieve config string.
 
@@ -28,6 +30,8 @@ def get_rag_user_retrieve_config_str(
         The agent's name.
     model_names : Dict[str, str]
         A mapping from model id to model name.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared vector db clients by their definition.
     Returns
     -------
     Tuple[str, str, Set[str]]
@@ -41,6 +45,7 @@ def get_rag_user_retrieve_config_str(
     before_the_args, vector_db_arg, db_imports = get_rag_user_vector_db_string(
         agent=agent,
         agent_name=agent_name,
+        client_names=client_names,
     )
     imports.update(db_imports)
     args_dict = _get_args_dict(agent, retrieve_config, model_names)
@@ -60,6 +65,23 @@ def get_rag_user_retrieve_config_str(
             "\n\n"
         )
         args_dict["custom_text_split_function"] = text_split_arg_name
+    if retrieve_config.use_ingestion_pipeline:
+        # the docs are ingested before the agent, the agent
+        # only uses the collection
+        ingestion_content, vector_db_arg, ingestion_imports = (
+            get_rag_user_ingestion_string(
+                agent=agent,
+                agent_name=agent_name,
+                vector_db_arg=vector_db_arg,
+                model_arg=str(args_dict["model"]),
+                split_function_arg=str(
+                    args_dict.get("custom_text_split_function", "")
+                ),
+            )
+        )
+        before_the_args += f"\n{ingestion_content}"
+        imports.update(ingestion_imports)
+        args_dict["docs_path"] = None
     # docs_path = args_dict.pop("docs_path", [])
     args_content = get_object_string(args_dict)
     # get the last line (where the dict ends)
@@ -86,6 +108,7 @@ def get_rag_user_extras(
     agent: WaldiezAgent,
     agent_name: str,
     model_names: Dict[str, str],
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, str, Set[str]]:
     """Get the RAG user extra argument, imports and content before the agent.
 
@@ -97,6 +120,8 @@ def get_rag_user_extras(
         The agent's name.
     model_names : Dict[str, str]
         A mapping from model id to model name.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared vector db clients by their definition.
 
     Returns
     -------
@@ -109,7 +134,10 @@ def get_rag_user_extras(
     if agent.agent_type == "rag_user" and isinstance(agent, WaldiezRagUser):
         rag_content_before_agent, retrieve_arg, db_imports = (
             get_rag_user_retrieve_config_str(
-                agent=agent, agent_name=agent_name, model_names=model_names
+                agent=agent,
+                agent_name=agent_name,
+                model_names=model_names,
+                client_names=client_names,
             )
         )
         if retrieve_arg:
@@ -141,9 +169,9 @@ def _get_args_dict(
     agent: WaldiezRagUser,
     retrieve_config: WaldiezRagUserRetrieveConfig,
     model_names: Dict[str, str],
-) -> Dict[str, Union[str, List[str]]]:
+) -> Dict[str, Any]:
     model_arg = _get_model_arg(agent, retrieve_config, model_names)
-    args_dict: Dict[str, Union[str, List[str]]] = {
+    args_dict: Dict[str, Any] = {
         "task": retrieve_config.task,
         "model": model_arg,
     }
@@ -152,6 +180,8 @@ def _get_args_dict(
         "context_max_tokens",
         "customized_prompt",
         "customized_answer_prefix",
+        "ingestion_batch_size",
+        "ingestion_workers",
     ]
     for arg in optional_args:
         arg_value = getattr(retrieve_config, arg)
@@ -1,14 +1,24 @@
 """Vector DB exporting utils for RAG user agents."""
 
 # pylint: disable=line-too-long
-from typing import Any, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
-from waldiez.models import WaldiezRagUser
+from waldiez.models import WaldiezAgent, WaldiezRagUser
 
-from .chroma_utils import get_chroma_db_args
-from .mongo_utils import get_mongodb_db_args
-from .pgvector_utils import get_pgvector_db_args
-from .qdrant_utils import get_qdrant_db_args
+from .chroma_utils import get_chroma_client_string, get_chroma_db_args
+from .index_utils import get_collection_metadata
+from .mongo_utils import (
+    get_mongodb_db_args,
+    get_mongodb_index_class_string,
+    uses_mongodb_index_options,
+)
+from .pgvector_utils import (
+    get_pgvector_client_string,
+    get_pgvector_db_args,
+    get_pgvector_ivfflat_class_string,
+    uses_ivfflat_index,
+)
+from .qdrant_utils import get_qdrant_client_string, get_qdrant_db_args
 
 
 def _get_metadata_arg(
@@ -27,16 +37,13 @@ def _get_metadata_arg(
         The metadata arg.
     """
     metadata_arg = ""
-    if agent.retrieve_config.db_config.metadata:
+    metadata = get_collection_metadata(agent)
+    if metadata:
         tab = "    "
         indent = tab * 3
         metadata_arg += f"{indent}metadata={{\n"
-        for key, value in agent.retrieve_config.db_config.metadata.items():
-            value_string: Any = f'"{value}"'
-            if str(value).isdigit():
-                value_string = int(value)
-            elif str(value).replace(".", "").isdigit():
-                value_string = float(value)
+        for key, value in metadata.items():
+            value_string = f'"{value}"' if isinstance(value, str) else value
             metadata_arg += f'{indent}    "{key}": {value_string},\n'
         metadata_arg += f"{indent}}},\n"
     return metadata_arg
@@ -45,6 +52,7 @@ def _get_metadata_arg(
 def get_rag_user_vector_db_string(
     agent: WaldiezRagUser,
     agent_name: str,
+    client_names: Optional[Dict[str, str]] = None,
 ) -> Tuple[str, str, Set[str]]:
     """Get the RAG user vector db string.
 
@@ -63,6 +71,8 @@ def get_rag_user_vector_db_string(
         The agent.
     agent_name : str
         The agent's name.
+    client_names : Optional[Dict[str, str]], optional
+        The names of the shared clients by their definition, by default None.
 
     Returns
     -------
@@ -81,7 +91,7 @@ def get_rag_user_vector_db_string(
             "from autogen.agentchat.contrib.vectordb.chromadb import ChromaVectorDB"
         )
         kwarg_string, db_imports, ef_body, content_before = get_chroma_db_args(
-            agent, agent_name
+            agent, agent_name, client_names
         )
     if agent.retrieve_config.vector_db == "qdrant":
         vdb_class = "QdrantVectorDB"
@@ -89,7 +99,7 @@ def get_rag_user_vector_db_string(
             "from autogen.agentchat.contrib.vectordb.qdrant import QdrantVectorDB"
         )
         kwarg_string, db_imports, ef_body = get_qdrant_db_args(
-            agent, agent_name
+            agent, agent_name, client_names
         )
     if agent.retrieve_config.vector_db == "mongodb":
         vdb_class = "MongoDBAtlasVectorDB"
@@ -99,14 +109,20 @@ def get_rag_user_vector_db_string(
         kwarg_string, db_imports, ef_body = get_mongodb_db_args(
             agent, agent_name
         )
+        if uses_mongodb_index_options(agent):
+            # defined once, before the agents
+            vdb_class = "WaldiezMongoDBAtlasVectorDB"
     if agent.retrieve_config.vector_db == "pgvector":
         imports.add(
             "from autogen.agentchat.contrib.vectordb.pgvector import PGVectorDB"
         )
         vdb_class = "PGVectorDB"
         kwarg_string, db_imports, ef_body = get_pgvector_db_args(
-            agent, agent_name
+            agent, agent_name, client_names
         )
+        if uses_ivfflat_index(agent):
+            # defined once, before the agents
+            vdb_class = "WaldiezPGVectorDB"
     if content_before:
         before += f"\n{content_before}"
     if ef_body:
@@ -117,3 +133,141 @@ def get_rag_user_vector_db_string(
     vdb_arg = f"{vdb_class}(\n"
     vdb_arg += kwarg_string + "        )"
     return before, vdb_arg, imports
+
+
+def _get_client_string(agent: WaldiezAgent) -> Tuple[str, Set[str]]:
+    """Get the vector db client's definition of a RAG user agent.
+
+    Parameters
+    ----------
+    agent : WaldiezAgent
+        The agent.
+
+    Returns
+    -------
+    Tuple[str, Set[str]]
+        The client's definition (empty if it cannot be shared)
+        and its imports.
+    """
+    if not isinstance(agent, WaldiezRagUser):
+        return "", set()
+    vector_db = agent.retrieve_config.vector_db
+    if vector_db == "chroma":
+        client_str, to_import = get_chroma_client_string(agent)
+        return client_str, {to_import, "from chromadb.config import Settings"}
+    if vector_db == "qdrant":
+        client_str, to_import = get_qdrant_client_string(agent)
+        return client_str, {to_import}
+    if vector_db == "pgvector":
+        client_str, to_import = get_pgvector_client_string(agent)
+        return client_str, {to_import}
+    return "", set()
+
+
+def get_vector_db_client_names(agents: List[WaldiezAgent]) -> Dict[str, str]:
+    """Get the names of the vector db clients that are shared.
+
+    The RAG user agents are grouped by vector db and location (chroma's
+    local storage path, qdrant's location, pgvector's connection url).
+    A group with more than one agent gets a shared client, named
+    `{vector_db}_client_{n}` (in the order the groups appear).
+    MongoDBAtlasVectorDB only accepts a connection string, so it is
+    not included.
+
+    Parameters
+    ----------
+    agents : List[WaldiezAgent]
+        The flow's agents.
+
+    Returns
+    -------
+    Dict[str, str]
+        The shared clients' names by their definition.
+    """
+    counts: Dict[str, int] = {}
+    vector_dbs: Dict[str, str] = {}
+    for agent in agents:
+        client_str, _ = _get_client_string(agent)
+        if client_str and isinstance(agent, WaldiezRagUser):
+            counts[client_str] = counts.get(client_str, 0) + 1
+            vector_dbs.setdefault(client_str, agent.retrieve_config.vector_db)
+    client_names: Dict[str, str] = {}
+    indexes: Dict[str, int] = {}
+    for client_str, count in counts.items():
+        if count < 2:
+            continue
+        vector_db = vector_dbs[client_str]
+        indexes[vector_db] = indexes.get(vector_db, 0) + 1
+        client_names[client_str] = f"{vector_db}_client_{indexes[vector_db]}"
+    return client_names
+
+
+def get_vector_db_clients_string(
+    agents: List[WaldiezAgent],
+) -> Tuple[str, Set[str]]:
+    """Get the shared vector db clients (once per flow, before the agents).
+
+    Only the clients that are shared by more than one agent are defined
+    (see `get_vector_db_client_names`), the others are defined by
+    their agent.
+
+    Parameters
+    ----------
+    agents : List[WaldiezAgent]
+        The flow's agents.
+
+    Returns
+    -------
+    Tuple[str, Set[str]]
+        The clients' definitions and their imports.
+    """
+    client_names = get_vector_db_client_names(agents)
+    imports: Set[str] = set()
+    for agent in agents:
+        client_str, to_import = _get_client_string(agent)
+        if client_str in client_names:
+            imports.update(to_import)
+    content = "".join(
+        f"{client_name} = {client_str}\n"
+        for client_str, client_name in client_names.items()
+    )
+    return content, imports
+
+
+def get_vector_db_classes_string(
+    agents: List[WaldiezAgent],
+) -> Tuple[str, Set[str]]:
+    """Get the vector db subclasses (once per flow, before the agents).
+
+    The index options that autogen's PGVectorDB (an ivfflat index) and
+    MongoDBAtlasVectorDB (the vector search index's options) do not
+    support are used by (generated) subclasses.
+
+    Parameters
+    ----------
+    agents : List[WaldiezAgent]
+        The flow's agents.
+
+    Returns
+    -------
+    Tuple[str, Set[str]]
+        The classes' definitions and their imports.
+    """
+    content = ""
+    imports: Set[str] = set()
+    rag_users = [agent for agent in agents if isinstance(agent, WaldiezRagUser)]
+    if any(uses_ivfflat_index(agent) for agent in rag_users):
+        content += get_pgvector_ivfflat_class_string()
+        imports.add(
+            "from autogen.agentchat.contrib.vectordb.pgvector import PGVectorDB"
+        )
+    if any(uses_mongodb_index_options(agent) for agent in rag_users):
+        content += get_mongodb_index_class_string()
+        imports.update(
+            {
+                "from autogen.agentchat.contrib.vectordb.mongo "
+                "import MongoDBAtlasVectorDB",
+                "from pymongo.operations import SearchIndexModel",
+            }
+        )
+    return content, imports
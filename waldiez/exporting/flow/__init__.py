@@ -1,5 +1,5 @@
 """Export the entire flow to string."""
 
-from .flow import export_flow
+from .flow import export_flow, write_flow
 
-__all__ = ["export_flow"]
+__all__ = ["export_flow", "write_flow"]
@@ -1,7 +1,8 @@
 """Export the entire flow to string."""
 
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar
 
 from waldiez.models import (
     Waldiez,
@@ -11,23 +12,40 @@ from waldiez.models import (
     WaldiezSkill,
 )
 
-from ..agents import export_agent
+from ..agents import (
+    export_agent,
+    get_embedding_cache_imports,
+    get_embedding_cache_string,
+    get_ingest_docs_function_string,
+    get_ingest_docs_imports,
+    get_vector_db_classes_string,
+    get_vector_db_client_names,
+    get_vector_db_clients_string,
+    uses_embedding_cache,
+    uses_ingestion_pipeline,
+)
 from ..chats import export_chats, export_nested_chat
-from ..models import export_models
+from ..models import export_model, write_api_keys
 from ..skills import export_skills
 from ..utils import (
+    ContentWriter,
+    ExportFragments,
     get_comment,
+    get_export_runtime_logs_string,
+    get_fragment_hash,
     get_imports_string,
     get_logging_start_string,
     get_logging_stop_string,
+    get_logs_export_imports,
     get_pylint_ignore_comment,
+    get_sqlite_export_string,
     get_sqlite_to_csv_call_string,
-    get_sqlite_to_csv_string,
 )
 from .def_main import get_def_main
 
+T = TypeVar("T")
+
 
-# pylint: disable=too-many-locals
 def export_flow(
     waldiez: Waldiez,
     agents: Tuple[List[WaldiezAgent], Dict[str, str]],
@@ -36,6 +54,7 @@ def export_flow(
     skills: Tuple[List[WaldiezSkill], Dict[str, str]],
     output_dir: Optional[Path],
     notebook: bool,
+    fragments: Optional[ExportFragments] = None,
 ) -> str:
     """Export the entire flow to a string.
 
@@ -60,31 +79,90 @@ def export_flow(
         The output directory.
     notebook : bool
         Whether the export is for a jupyter notebook or a python script.
+    fragments : Optional[ExportFragments], optional
+        The fragments of a previous export to reuse, by default None.
 
     Returns
     -------
     str
         The flow string.
     """
+    writer = ContentWriter()
+    write_flow(
+        writer,
+        waldiez=waldiez,
+        agents=agents,
+        chats=chats,
+        models=models,
+        skills=skills,
+        output_dir=output_dir,
+        notebook=notebook,
+        fragments=fragments,
+    )
+    return writer.getvalue()
+
+
+# pylint: disable=too-many-locals,too-many-arguments
+def write_flow(
+    writer: ContentWriter,
+    waldiez: Waldiez,
+    agents: Tuple[List[WaldiezAgent], Dict[str, str]],
+    chats: Tuple[List[WaldiezChat], Dict[str, str]],
+    models: Tuple[List[WaldiezModel], Dict[str, str]],
+    skills: Tuple[List[WaldiezSkill], Dict[str, str]],
+    output_dir: Optional[Path],
+    notebook: bool,
+    fragments: Optional[ExportFragments] = None,
+) -> None:
+    """Write the entire flow to a content writer.
+
+    Same as `export_flow`, but the generated content is written
+    (fragment by fragment) to the writer, which can also stream it
+    to a file, instead of building the whole string.
+    The writer is not closed (more content can follow).
+
+    If `fragments` are provided, the agent, nested chat, model and chat
+    fragments whose inputs did not change since the previous export
+    are reused (and spliced in the same place) instead of being generated.
+
+    Parameters
+    ----------
+    writer : ContentWriter
+        The writer to use.
+    waldiez : Waldiez
+        The Waldiez instance.
+    agents : Tuple[List[WaldiezAgent], Dict[str, str]]
+        The agents and their names.
+    chats : Tuple[List[WaldiezChat], Dict[str, str]]
+        The chats and their names.
+    models : Tuple[List[WaldiezModel], Dict[str, str]]
+        The models and their names.
+    skills : Tuple[List[WaldiezSkill], Dict[str, str]]
+        The skills and their names.
+    output_dir : Optional[Path]
+        The output directory.
+    notebook : bool
+        Whether the export is for a jupyter notebook or a python script.
+    fragments : Optional[ExportFragments], optional
+        The fragments of a previous export to reuse, by default None.
+    """
     all_agents, agent_names = agents
     all_models, model_names = models
     all_skills, skill_names = skills
     all_chats, chat_names = chats
-    agent_strings = ""
+    agent_strings: List[str] = []
     # we need to add `skipped_agent_strings` after the other agents are defined
     # for example, a group_manager needs the group members to have been defined
-    skipped_agent_strings = ""
-    nested_chats_strings = ""
-    builtin_imports: Set[str] = {
-        "import csv",
-        "import os",
-        "import sqlite3",
-    }
+    skipped_agent_strings: List[str] = []
+    nested_chats_strings: List[str] = []
+    logs_format = waldiez.flow.logs_format
+    builtin_imports, logs_imports = get_logs_export_imports(logs_format)
     common_imports: Set[str] = {
         "from autogen import Agent",
         "from autogen import ConversableAgent",
         "from autogen import ChatResult",
         "from autogen import runtime_logging",
+        *logs_imports,
     }
     local_imports: Set[str] = {
         "from waldiez_api_keys import get_model_api_key",
@@ -96,94 +174,327 @@ def export_flow(
     )
     if len(waldiez.chats) > 1:
         common_imports.add("from autogen import initiate_chats")
+    (
+        embedding_cache_string,
+        ingest_docs_string,
+        vector_db_classes_string,
+        vector_db_clients_string,
+    ) = _get_rag_user_flow_strings(all_agents, common_imports)
+    # the vector db clients that are shared by more than one agent
+    client_names = get_vector_db_client_names(all_agents)
+    inputs = _FragmentInputs(
+        waldiez,
+        agents,
+        chats,
+        models,
+        skills,
+        fragments is not None,
+        client_names,
+    )
     for agent in all_agents:
-        agent_string, after_agent, agent_imports = export_agent(
-            agent=agent,
-            agent_names=agent_names,
-            model_names=model_names,
-            skill_names=skill_names,
-            all_models=all_models,
-            all_skills=all_skills,
-            group_chat_members=waldiez.flow.get_group_chat_members(agent.id),
+        group_chat_members = waldiez.flow.get_group_chat_members(agent.id)
+        agent_string, after_agent, agent_imports = _get_fragment(
+            fragments,
+            "agent",
+            agent.id,
+            partial(inputs.agent, agent, group_chat_members),
+            partial(
+                export_agent,
+                agent=agent,
+                agent_names=agent_names,
+                model_names=model_names,
+                skill_names=skill_names,
+                all_models=all_models,
+                all_skills=all_skills,
+                group_chat_members=group_chat_members,
+                client_names=client_names,
+            ),
         )
         common_imports.update(agent_imports)
         if after_agent:
-            skipped_agent_strings += after_agent
+            skipped_agent_strings.append(after_agent)
         if agent.agent_type == "manager":
-            skipped_agent_strings += agent_string
+            skipped_agent_strings.append(agent_string)
         else:
-            agent_strings += agent_string
-        agent_nested_chats_string = export_nested_chat(
-            agent=agent,
-            agent_names=agent_names,
-            all_chats=all_chats,
-            chat_names=chat_names,
+            agent_strings.append(agent_string)
+        agent_nested_chats_string = _get_fragment(
+            fragments,
+            "nested_chats",
+            agent.id,
+            partial(inputs.nested_chats, agent),
+            partial(
+                export_nested_chat,
+                agent=agent,
+                agent_names=agent_names,
+                all_chats=all_chats,
+                chat_names=chat_names,
+            ),
         )
         if agent_nested_chats_string:
-            nested_chats_strings += "\n" + agent_nested_chats_string
-    agent_strings += skipped_agent_strings
-    models_string = export_models(
-        all_models=all_models,
-        model_names=model_names,
-        notebook=notebook,
-        output_dir=output_dir,
-    )
+            nested_chats_strings.append("\n" + agent_nested_chats_string)
+    agent_strings.extend(skipped_agent_strings)
+    models_string = get_comment("models", notebook) + "\n"
+    for model in all_models:
+        models_string += _get_fragment(
+            fragments,
+            "model",
+            model.id,
+            partial(inputs.model, model),
+            partial(export_model, model, model_names[model.id]),
+        )
+    if output_dir:
+        write_api_keys(all_models, model_names, output_dir)
     all_imports_string = get_imports_string(
         imports=common_imports,
         builtin_imports=builtin_imports,
         skill_imports=skill_imports,
         local_imports=local_imports,
     )
-    return _combine_strings(
-        waldiez=waldiez,
+    tabs = 0 if notebook else 1
+    chats_content = _get_fragment(
+        fragments,
+        # not to replace each other when exporting to both formats
+        "notebook_chats" if notebook else "chats",
+        waldiez.flow.id,
+        partial(inputs.chats, tabs),
+        partial(
+            export_chats,
+            main_chats=waldiez.chats,
+            agent_names=agent_names,
+            chat_names=chat_names,
+            tabs=tabs,
+        ),
+    )
+    _write_contents(
+        writer,
         imports_string=all_imports_string,
-        agents_string=agent_strings,
-        nested_chats_string=nested_chats_strings,
+        agent_strings=agent_strings,
+        nested_chats_strings=nested_chats_strings,
         models_string=models_string,
-        agent_names=agent_names,
-        chat_names=chat_names,
+        chats=chats_content,
         notebook=notebook,
+        logs_format=logs_format,
+        embedding_cache_string=embedding_cache_string,
+        ingest_docs_string=ingest_docs_string,
+        vector_db_classes_string=vector_db_classes_string,
+        vector_db_clients_string=vector_db_clients_string,
     )
+    if fragments is not None:
+        fragments.commit()
 
 
 # pylint: disable=too-many-arguments
-def _combine_strings(
-    waldiez: Waldiez,
+def _write_contents(
+    writer: ContentWriter,
     imports_string: str,
-    agents_string: str,
-    nested_chats_string: str,
+    agent_strings: List[str],
+    nested_chats_strings: List[str],
     models_string: str,
-    agent_names: Dict[str, str],
-    chat_names: Dict[str, str],
+    chats: Tuple[str, str],
     notebook: bool,
-) -> str:
-    content = get_pylint_ignore_comment(notebook)
-    content += imports_string
-    content += get_comment("logging", notebook) + "\n"
-    content += get_logging_start_string(tabs=0) + "\n\n"
-    content += models_string
-    content += get_comment("agents", notebook) + "\n"
-    content += agents_string
-    if nested_chats_string:
-        content += get_comment("nested", notebook) + "\n"
-    content += nested_chats_string
-    chats_content, additional_methods = export_chats(
-        main_chats=waldiez.chats,
-        agent_names=agent_names,
-        chat_names=chat_names,
-        tabs=0 if notebook else 1,
-    )
+    logs_format: str = "csv",
+    embedding_cache_string: str = "",
+    ingest_docs_string: str = "",
+    vector_db_classes_string: str = "",
+    vector_db_clients_string: str = "",
+) -> None:
+    writer.write(get_pylint_ignore_comment(notebook))
+    writer.write(imports_string)
+    writer.write(get_comment("logging", notebook) + "\n")
+    writer.write(get_logging_start_string(tabs=0) + "\n\n")
+    writer.write(models_string)
+    writer.write(get_comment("agents", notebook) + "\n")
+    if embedding_cache_string:
+        writer.write(embedding_cache_string + "\n\n")
+    if ingest_docs_string:
+        writer.write(ingest_docs_string + "\n\n")
+    if vector_db_classes_string:
+        writer.write(vector_db_classes_string + "\n\n")
+    if vector_db_clients_string:
+        writer.write(vector_db_clients_string + "\n")
+    for agent_string in agent_strings:
+        writer.write(agent_string)
+    if nested_chats_strings:
+        writer.write(get_comment("nested", notebook) + "\n")
+    for nested_chats_string in nested_chats_strings:
+        writer.write(nested_chats_string)
+    chats_content, additional_methods = chats
     if additional_methods:
-        while not content.endswith("\n\n"):  # pragma: no cover
-            content += "\n"
-        content += "\n" + additional_methods + "\n"
-    content += get_sqlite_to_csv_string()
-    content += get_comment("run", notebook) + "\n"
+        writer.ensure_newlines(2)
+        writer.write("\n" + additional_methods + "\n")
+    writer.write(get_sqlite_export_string(logs_format))
+    writer.write(get_export_runtime_logs_string(logs_format))
+    writer.write(get_comment("run", notebook) + "\n")
     if not notebook:
-        content += get_def_main(chats_content)
+        writer.write(get_def_main(chats_content))
     else:
-        content += "\n" + chats_content + "\n"
-        content += get_logging_stop_string(tabs=0) + "\n"
-        content += get_sqlite_to_csv_call_string(tabs=0) + "\n"
-    content = content.replace("\n\n\n\n", "\n\n\n")
-    return content
+        writer.write("\n" + chats_content + "\n")
+        writer.write(get_logging_stop_string(tabs=0) + "\n")
+        writer.write(get_sqlite_to_csv_call_string(tabs=0) + "\n")
+
+
+def _get_rag_user_flow_strings(
+    all_agents: List[WaldiezAgent],
+    common_imports: Set[str],
+) -> Tuple[str, str, str, str]:
+    """Get the flow level (shared by the RAG user agents) content.
+
+    Parameters
+    ----------
+    all_agents : List[WaldiezAgent]
+        The agents.
+    common_imports : Set[str]
+        The imports to update with the content's imports.
+
+    Returns
+    -------
+    Tuple[str, str, str, str]
+        The embedding cache, the ingest_docs function,
+        the vector db classes and the vector db clients content.
+    """
+    # shared by all the RAG user agents (if any uses it)
+    embedding_cache_string = ""
+    if any(uses_embedding_cache(agent) for agent in all_agents):
+        embedding_cache_string = get_embedding_cache_string()
+        common_imports.update(get_embedding_cache_imports())
+    # shared by all the RAG user agents that ingest their docs themselves
+    ingest_docs_string = ""
+    if any(uses_ingestion_pipeline(agent) for agent in all_agents):
+        ingest_docs_string = get_ingest_docs_function_string()
+        common_imports.update(get_ingest_docs_imports())
+    # one client per vector db and location (each agent its own collection)
+    vector_db_clients_string, vector_db_clients_imports = (
+        get_vector_db_clients_string(all_agents)
+    )
+    common_imports.update(vector_db_clients_imports)
+    # the vector db subclasses for the index options autogen doesn't support
+    vector_db_classes_string, vector_db_classes_imports = (
+        get_vector_db_classes_string(all_agents)
+    )
+    common_imports.update(vector_db_classes_imports)
+    return (
+        embedding_cache_string,
+        ingest_docs_string,
+        vector_db_classes_string,
+        vector_db_clients_string,
+    )
+
+
+def _get_fragment(
+    fragments: Optional[ExportFragments],
+    kind: str,
+    entity_id: str,
+    get_inputs: Callable[[], Any],
+    generate: Callable[[], T],
+) -> T:
+    """Get a fragment, reusing the previous one if its inputs did not change.
+
+    Parameters
+    ----------
+    fragments : Optional[ExportFragments]
+        The fragments of the previous export (if incremental).
+    kind : str
+        The kind of the fragment.
+    entity_id : str
+        The id of the entity the fragment is for.
+    get_inputs : Callable[[], Any]
+        The function to get the fragment's inputs (only if incremental).
+    generate : Callable[[], T]
+        The function to generate the fragment.
+
+    Returns
+    -------
+    T
+        The fragment.
+    """
+    if fragments is None:
+        return generate()
+    return fragments.get(kind, entity_id, get_inputs(), generate)
+
+
+# pylint: disable=too-few-public-methods
+class _FragmentInputs:
+    """The inputs of the flow's fragments (to check if they changed).
+
+    The names of all the entities are included (as a single hash)
+    in every fragment's inputs: adding, removing or renaming an entity
+    can change the names that are used in any other fragment.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        waldiez: Waldiez,
+        agents: Tuple[List[WaldiezAgent], Dict[str, str]],
+        chats: Tuple[List[WaldiezChat], Dict[str, str]],
+        models: Tuple[List[WaldiezModel], Dict[str, str]],
+        skills: Tuple[List[WaldiezSkill], Dict[str, str]],
+        enabled: bool,
+        client_names: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._waldiez = waldiez
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._skills: Dict[str, Dict[str, Any]] = {}
+        self._names = ""
+        self._chats = ""
+        self._clients = ""
+        if not enabled:
+            return
+        # a RAG user's client is shared or not, depending on the others
+        self._clients = get_fragment_hash(client_names or {})
+        self._names = get_fragment_hash(
+            [agents[1], chats[1], models[1], skills[1]]
+        )
+        self._chats = get_fragment_hash(
+            [chat.model_dump(mode="json") for chat in chats[0]]
+        )
+        self._models = {
+            model.id: model.model_dump(mode="json") for model in models[0]
+        }
+        self._skills = {
+            skill.id: skill.model_dump(mode="json") for skill in skills[0]
+        }
+
+    def agent(
+        self, agent: WaldiezAgent, group_chat_members: List[WaldiezAgent]
+    ) -> Dict[str, Any]:
+        """Get the inputs of an agent's fragment."""
+        return {
+            "agent": agent.model_dump(mode="json"),
+            "members": [member.id for member in group_chat_members],
+            "models": [
+                self._models.get(model_id) for model_id in agent.data.model_ids
+            ],
+            "skills": [
+                self._skills.get(skill.id) for skill in agent.data.skills
+            ],
+            "clients": self._clients if agent.agent_type == "rag_user" else "",
+            "names": self._names,
+        }
+
+    def nested_chats(self, agent: WaldiezAgent) -> Dict[str, Any]:
+        """Get the inputs of an agent's nested chats fragment."""
+        return {
+            "agent": agent.model_dump(mode="json"),
+            "chats": self._chats,
+            "names": self._names,
+        }
+
+    def model(self, model: WaldiezModel) -> Dict[str, Any]:
+        """Get the inputs of a model's fragment."""
+        return {
+            "model": model.model_dump(mode="json"),
+            "names": self._names,
+        }
+
+    def chats(self, tabs: int) -> Dict[str, Any]:
+        """Get the inputs of the (main) chats' fragment."""
+        return {
+            "chats": [
+                [chat.id, sender.agent_type, recipient.agent_type]
+                for chat, sender, recipient in self._waldiez.chats
+            ],
+            "all_chats": self._chats,
+            "names": self._names,
+            "tabs": tabs,
+        }
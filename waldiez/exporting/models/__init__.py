@@ -4,6 +4,8 @@ Functions
 ---------
 export_models
     Get the string representations of the LLM configs.
+export_model
+    Get the string representation of a model's LLM config.
 """
 
 from pathlib import Path
@@ -11,7 +13,7 @@ from typing import Dict, List, Optional
 
 from waldiez.models import WaldiezModel
 
-from ..utils import get_comment, get_object_string
+from ..utils import get_comment, get_object_string, write_if_changed
 
 
 def export_models(
@@ -77,24 +79,42 @@ def export_models(
     """
     content = get_comment("models", notebook) + "\n"
     for model in all_models:
-        model_name = model_names[model.id]
-        llm_config = model.get_llm_config()
-        llm_config["api_key"] = f'get_model_api_key("{model_name}")'
-        model_dict_str = get_object_string(llm_config, tabs=2)
-        model_dict_str = model_dict_str.replace(
-            f'"get_model_api_key("{model_name}")"',
-            f'get_model_api_key("{model_name}")',
-        )
-        content += f"{model_name}_llm_config = " + "{\n"
-        content += '    "config_list": [\n'
-        content += f"        {model_dict_str}\n"
-        content += "    ]\n"
-        content += "}\n"
+        content += export_model(model, model_names[model.id])
     if output_dir:
         write_api_keys(all_models, model_names, output_dir)
     return content
 
 
+def export_model(model: WaldiezModel, model_name: str) -> str:
+    """Get the string representation of a model's LLM config.
+
+    Parameters
+    ----------
+    model : WaldiezModel
+        The model.
+    model_name : str
+        The model's name (to use in the generated code).
+
+    Returns
+    -------
+    str
+        The model's llm config string.
+    """
+    llm_config = model.get_llm_config()
+    llm_config["api_key"] = f'get_model_api_key("{model_name}")'
+    model_dict_str = get_object_string(llm_config, tabs=2)
+    model_dict_str = model_dict_str.replace(
+        f'"get_model_api_key("{model_name}")"',
+        f'get_model_api_key("{model_name}")',
+    )
+    content = f"{model_name}_llm_config = " + "{\n"
+    content += '    "config_list": [\n'
+    content += f"        {model_dict_str}\n"
+    content += "    ]\n"
+    content += "}\n"
+    return content
+
+
 def export_agent_models(
     agent_model_ids: List[str],
     all_models: List[WaldiezModel],
@@ -198,7 +218,7 @@ def write_api_keys(
     model_names: Dict[str, str],
     output_dir: Path,
 ) -> None:
-    """Write the api keys to a separate file.
+    """Write the api keys to a separate file (if changed).
 
     Parameters
     ----------
@@ -238,5 +258,4 @@ def get_model_api_key(model_name: str) -> str:
     return __ALL_MODEL_API_KEYS__.get(model_name, "")
 '''
 
-    with open(output_dir / "waldiez_api_keys.py", "w", encoding="utf-8") as f:
-        f.write(api_keys_content)
+    write_if_changed(output_dir / "waldiez_api_keys.py", api_keys_content)
@@ -13,7 +13,7 @@ from typing import Dict, List, Optional, Set, Tuple, Union
 
 from waldiez.models import WaldiezSkill
 
-from ..utils import get_escaped_string
+from ..utils import get_escaped_string, write_if_changed
 
 
 def get_agent_skill_registration(
@@ -74,7 +74,7 @@ def _write_skill_secrets(
     skill_name: str,
     output_dir: Path,
 ) -> None:
-    """Write the skill secrets to a file.
+    """Write the skill secrets to a file (if changed).
 
     Parameters
     ----------
@@ -87,12 +87,11 @@ def _write_skill_secrets(
     """
     if not skill.secrets:
         return
-    secrets_file = output_dir / f"{skill_name}_secrets.py"
-    with secrets_file.open("w", encoding="utf-8") as f:
-        f.write('"""Secrets for the skill."""\n')
-        f.write("from os import environ\n\n")
-        for key, value in skill.secrets.items():
-            f.write(f'environ["{key}"] = "{value}"\n')
+    content = '"""Secrets for the skill."""\n'
+    content += "from os import environ\n\n"
+    for key, value in skill.secrets.items():
+        content += f'environ["{key}"] = "{value}"\n'
+    write_if_changed(output_dir / f"{skill_name}_secrets.py", content)
 
 
 def export_skills(
@@ -102,7 +101,8 @@ def export_skills(
 ) -> Tuple[Set[str], Set[Tuple[str, str]]]:
     """Get the skills' contents and secrets.
 
-    If `output_dir` is provided, the contents are saved to that directory.
+    If `output_dir` is provided, the contents are saved to that directory
+    (the files are only rewritten if their contents changed).
 
     Parameters
     ----------
@@ -157,7 +157,5 @@ def export_skills(
                 f"from {skill_name} import {skill_name}"
             )
         _write_skill_secrets(skill, skill_name, output_dir)
-        skill_file = output_dir / f"{skill_name}.py"
-        with skill_file.open("w", encoding="utf-8") as f:
-            f.write(skill.content)
+        write_if_changed(output_dir / f"{skill_name}.py", skill.content)
     return skill_imports, skill_secrets
@@ -1,27 +1,41 @@
 """Generic utils to be used for exporting."""
 
 from .comments import comment, get_comment, get_pylint_ignore_comment
+from .content_writer import ContentWriter
+from .file_utils import write_if_changed
+from .fragments import ExportFragments, get_fragment_hash
 from .importing import add_autogen_dot_import, get_imports_string
 from .logging_utils import (
+    get_export_runtime_logs_string,
     get_logging_start_string,
     get_logging_stop_string,
+    get_logs_export_imports,
+    get_sqlite_export_string,
     get_sqlite_to_csv_call_string,
     get_sqlite_to_csv_string,
 )
 from .method_utils import get_method_string
 from .naming import (
+    NameAllocator,
     get_escaped_string,
     get_valid_instance_name,
     get_valid_python_variable_name,
 )
+from .notebook import get_notebook_cells, get_notebook_string
 from .object_string import get_object_string
 from .path_check import get_path_string
 
 __all__ = [
+    "ContentWriter",
+    "ExportFragments",
+    "NameAllocator",
     "add_autogen_dot_import",
     "comment",
+    "get_export_runtime_logs_string",
     "get_logging_start_string",
     "get_logging_stop_string",
+    "get_logs_export_imports",
+    "get_sqlite_export_string",
     "get_path_string",
     "get_pylint_ignore_comment",
     "get_sqlite_to_csv_string",
@@ -29,8 +43,12 @@ __all__ = [
     "get_imports_string",
     "get_comment",
     "get_escaped_string",
+    "get_fragment_hash",
     "get_method_string",
+    "get_notebook_cells",
+    "get_notebook_string",
     "get_object_string",
     "get_valid_instance_name",
     "get_valid_python_variable_name",
+    "write_if_changed",
 ]
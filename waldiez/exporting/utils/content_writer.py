@@ -0,0 +1,107 @@
+"""Buffered/streamed writing of the generated content.
+
+Classes
+-------
+ContentWriter
+    Collect (or stream) string fragments, normalizing blank lines.
+"""
+
+from typing import List, Optional, TextIO
+
+
+class ContentWriter:
+    """Collect (or stream) string fragments, normalizing blank lines.
+
+    The fragments are kept in a list (or written to a text stream)
+    instead of being concatenated. Every four consecutive newlines are
+    replaced with three (as `str.replace` would do on the whole content),
+    while writing: the newlines at the end of what is written so far are
+    held back until we know how long the run of newlines is.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """Initialize the writer.
+
+        Parameters
+        ----------
+        stream : Optional[TextIO], optional
+            The text stream to write to, by default None
+            (keep the fragments in memory, use `getvalue` to get them).
+        """
+        self._stream = stream
+        self._fragments: List[str] = []
+        self._pending_newlines = 0
+
+    @staticmethod
+    def _newlines(count: int) -> str:
+        """Get a run of newlines, with every four newlines replaced by three.
+
+        Parameters
+        ----------
+        count : int
+            The number of newlines in the run.
+
+        Returns
+        -------
+        str
+            The (normalized) newlines.
+        """
+        return "\n" * (3 * (count // 4) + count % 4)
+
+    def _emit(self, fragment: str) -> None:
+        """Emit a fragment, without any processing.
+
+        Parameters
+        ----------
+        fragment : str
+            The fragment.
+        """
+        if not fragment:
+            return
+        if self._stream is not None:
+            self._stream.write(fragment)
+        else:
+            self._fragments.append(fragment)
+
+    def write(self, fragment: str) -> None:
+        """Write a fragment.
+
+        Parameters
+        ----------
+        fragment : str
+            The fragment to write.
+        """
+        stripped = fragment.strip("\n")
+        if not stripped:
+            self._pending_newlines += len(fragment)
+            return
+        leading = len(fragment) - len(fragment.lstrip("\n"))
+        trailing = len(fragment) - len(fragment.rstrip("\n"))
+        self._emit(self._newlines(self._pending_newlines + leading))
+        self._emit(stripped.replace("\n\n\n\n", "\n\n\n"))
+        self._pending_newlines = trailing
+
+    def ensure_newlines(self, count: int) -> None:
+        """Make sure that the content so far ends with (at least) n newlines.
+
+        Parameters
+        ----------
+        count : int
+            The number of newlines.
+        """
+        self._pending_newlines = max(self._pending_newlines, count)
+
+    def close(self) -> None:
+        """Write any pending newlines (no more fragments will follow)."""
+        self._emit(self._newlines(self._pending_newlines))
+        self._pending_newlines = 0
+
+    def getvalue(self) -> str:
+        """Get the content written so far (if not using a stream).
+
+        Returns
+        -------
+        str
+            The content.
+        """
+        return "".join(self._fragments) + self._newlines(self._pending_newlines)
@@ -0,0 +1,57 @@
+"""File writing utilities.
+
+Functions
+---------
+write_if_changed
+    Write a file, only if its content is different.
+"""
+
+import os
+import secrets
+import stat
+from pathlib import Path
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write a file, only if its content is different.
+
+    Keeps the file's modification time if the content is the same,
+    so that anything depending on it is not invalidated. The file is
+    replaced atomically, so that flows exported concurrently to the same
+    directory (sharing e.g. `waldiez_api_keys.py`) never read or leave
+    a partially written one. A new file's mode follows the umask (like
+    a plain `open`), an existing file keeps its mode.
+
+    Parameters
+    ----------
+    path : Path
+        The file's path.
+    content : str
+        The content to write.
+
+    Returns
+    -------
+    bool
+        True if the file was written, False if it was up to date.
+    """
+    if path.is_file():
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                if file.read() == content:
+                    return False
+        except (OSError, UnicodeDecodeError):  # pragma: no cover
+            pass
+    mode = stat.S_IMODE(path.stat().st_mode) if path.is_file() else None
+    tmp_path = path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp"
+    # (0o666 & ~umask, like open)
+    handle = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(handle, "w", encoding="utf-8") as file:
+            file.write(content)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
@@ -0,0 +1,117 @@
+"""Per-entity fragments of the generated content, for incremental exports.
+
+Classes
+-------
+ExportFragments
+    Remember the generated fragments (and the hashes of their inputs).
+
+Functions
+---------
+get_fragment_hash
+    Get the hash of a fragment's inputs.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def get_fragment_hash(inputs: Any) -> str:
+    """Get the hash of a fragment's inputs.
+
+    Parameters
+    ----------
+    inputs : Any
+        The (JSON serializable) inputs.
+
+    Returns
+    -------
+    str
+        The (sha256) hex digest.
+    """
+    canonical = json.dumps(
+        inputs,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ExportFragments:
+    """Remember the generated fragments (and the hashes of their inputs).
+
+    A fragment is identified by its kind (e.g. `agent`, `model`) and
+    the id of the entity it was generated for. If the hash of
+    its inputs has not changed since the last export, the previously
+    generated fragment is reused instead of being generated again.
+    After each export, `commit` drops the fragments of the entities
+    that are no longer in the flow.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the fragments."""
+        self._entries: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        self._used: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """Get the number of remembered fragments."""
+        return len(self._entries)
+
+    def get(
+        self,
+        kind: str,
+        entity_id: str,
+        inputs: Any,
+        generate: Callable[[], T],
+    ) -> T:
+        """Get a fragment, generating it only if its inputs changed.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of the fragment.
+        entity_id : str
+            The id of the entity the fragment is for.
+        inputs : Any
+            The (JSON serializable) inputs the fragment depends on.
+        generate : Callable[[], T]
+            The function to generate the fragment.
+
+        Returns
+        -------
+        T
+            The (new or remembered) fragment.
+        """
+        key = (kind, entity_id)
+        digest = get_fragment_hash(inputs)
+        self._used.add(entity_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == digest:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        fragment = generate()
+        self._entries[key] = (digest, fragment)
+        return fragment
+
+    def commit(self) -> None:
+        """Drop the fragments of entities not used in the last export."""
+        self._entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if key[1] in self._used
+        }
+        self._used = set()
+
+    def clear(self) -> None:
+        """Forget all the fragments."""
+        self._entries = {}
+        self._used = set()
+        self.hits = 0
+        self.misses = 0
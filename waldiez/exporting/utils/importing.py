@@ -8,6 +8,7 @@ get_imports_string
     Get the imports for the whole file/flow.
 """
 
+import sys
 from typing import Dict, List, Optional, Set, Tuple
 
 DEFAULT_TYPING_IMPORTS = {
@@ -105,8 +106,11 @@ def get_imports_string(
     """
     if not typing_imports:
         typing_imports = DEFAULT_TYPING_IMPORTS
-    if not builtin_imports:
-        builtin_imports = set()
+    # (stdlib) imports of the agents/db configs go with the builtin ones
+    builtin_imports = set(builtin_imports or set()) | {
+        imp for imp in imports if _is_builtin_import(imp)
+    }
+    imports = {imp for imp in imports if imp not in builtin_imports}
     if not local_imports:
         local_imports = set()
     string = _get_builtin_imports_string(builtin_imports, typing_imports)
@@ -120,6 +124,15 @@ def get_imports_string(
     return string
 
 
+def _is_builtin_import(import_string: str) -> bool:
+    """Check if an import is of a standard library module."""
+    parts = import_string.split()
+    if not parts:  # pragma: no cover
+        return False
+    module = parts[1] if parts[0] in ("from", "import") else parts[0]
+    return module.split(".")[0] in sys.stdlib_module_names
+
+
 # pylint: disable=line-too-long
 def _get_builtin_imports_string(
     builtin_imports: Set[str],
@@ -153,7 +166,9 @@ def _get_builtin_imports_string(
         if include_annotations:
             from_imports.append("from typing_extensions import Annotated")
     string = (
-        "\n".join(sorted(imports)) + "\n\n" + "\n".join(sorted(from_imports))
+        "\n".join(sorted(set(imports)))
+        + "\n\n"
+        + "\n".join(sorted(from_imports))
     )
     return string
 
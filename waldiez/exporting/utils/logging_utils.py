@@ -8,10 +8,36 @@ get_logging_stop_string
     Get the string to stop logging.
 get_sqlite_to_csv_string
     Get the sqlite to csv conversion code string.
+get_sqlite_to_jsonl_string
+    Get the sqlite to jsonl conversion code string.
+get_sqlite_to_parquet_string
+    Get the sqlite to parquet conversion code string.
+get_sqlite_export_string
+    Get the sqlite conversion code string for a logs format.
+get_logs_export_imports
+    Get the imports needed to export the logs (in a format).
+get_export_runtime_logs_string
+    Get the code string to export all the runtime logging tables.
 get_sqlite_to_csv_call_string
-    Get the string to call the sqlite to csv conversion.
+    Get the string to export the runtime logs.
 """
 
+from typing import Set, Tuple
+
+# the rows to fetch (and write) at a time, when exporting the logs
+LOGS_BATCH_SIZE = 1000
+# the maximum number of tables to export concurrently
+LOGS_EXPORT_WORKERS = 4
+RUNTIME_LOGGING_TABLES = (
+    "chat_completions",
+    "agents",
+    "oai_wrappers",
+    "oai_clients",
+    "version",
+    "events",
+    "function_calls",
+)
+
 
 # Check issue:
 # Also check if in ag2 this still applies
@@ -78,6 +104,9 @@ def get_logging_stop_string(tabs: int = 0) -> str:
 def get_sqlite_to_csv_string() -> str:
     """Get the sqlite to csv conversion code string.
 
+    The rows are fetched (and written) in batches, so the memory
+    used does not grow with the size of the table.
+
     Returns
     -------
     str
@@ -99,59 +128,440 @@ def get_sqlite_to_csv_string() -> str:
         csv_file : str
             The csv file name.
         \"\"\"
-        conn = sqlite3.connect(dbname)
+        try:
+            conn = sqlite3.connect(f"file:{dbname}?mode=ro", uri=True)
+        except sqlite3.OperationalError:
+            return
         query = f"SELECT * FROM {table}"  # nosec
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
+        try:
+            cursor = conn.execute(query)
+        except sqlite3.OperationalError:
+            conn.close()
+            return
         column_names = [description[0] for description in cursor.description]
-        data = [dict(zip(column_names, row)) for row in rows]
-        conn.close()
         with open(csv_file, "w", newline="", encoding="utf-8") as file:
-            _csv_writer = csv.DictWriter(file, fieldnames=column_names)
-            _csv_writer.writeheader()
-            _csv_writer.writerows(data)
+            _csv_writer = csv.writer(file)
+            _csv_writer.writerow(column_names)
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                _csv_writer.writerows(rows)
+        conn.close()
     ```
     """
+    content = _get_sqlite_export_start("csv")
+    content += (
+        '    with open(csv_file, "w", newline="", encoding="utf-8") as file:\n'
+    )
+    content += "        _csv_writer = csv.writer(file)\n"
+    content += "        _csv_writer.writerow(column_names)\n"
+    content += _get_fetch_loop(tabs=2)
+    content += "            _csv_writer.writerows(rows)\n"
+    content += "    conn.close()\n"
+    content += "\n\n"
+    return content
+
+
+def get_sqlite_to_jsonl_string() -> str:
+    r"""Get the sqlite to jsonl (JSON lines) conversion code string.
+
+    Returns
+    -------
+    str
+        The sqlite to jsonl conversion code string.
+
+    Example
+    -------
+    ```python
+    >>> get_sqlite_to_jsonl_string()
+    def sqlite_to_jsonl(dbname: str, table: str, jsonl_file: str) -> None:
+        ...
+        with open(jsonl_file, "w", encoding="utf-8") as file:
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                for row in rows:
+                    item = dict(zip(column_names, row))
+                    file.write(json.dumps(item, default=str) + "\n")
+        conn.close()
+    ```
+    """
+    content = _get_sqlite_export_start("jsonl")
+    content += '    with open(jsonl_file, "w", encoding="utf-8") as file:\n'
+    content += _get_fetch_loop(tabs=2)
+    content += "            for row in rows:\n"
+    content += "                item = dict(zip(column_names, row))\n"
+    content += (
+        '                file.write(json.dumps(item, default=str) + "\\n")\n'
+    )
+    content += "    conn.close()\n"
+    content += "\n\n"
+    return content
+
+
+def get_sqlite_to_parquet_string() -> str:
+    """Get the sqlite to parquet conversion code string.
+
+    The parquet schema is derived from the columns' declared types
+    and each batch of rows is written as a row group (using pyarrow).
+
+    Returns
+    -------
+    str
+        The sqlite to parquet conversion code string.
+
+    Example
+    -------
+    ```python
+    >>> get_sqlite_to_parquet_string()
+    def sqlite_to_parquet(dbname: str, table: str, parquet_file: str) -> None:
+        ...
+        declared = {
+            info[1]: info[2].upper()
+            for info in conn.execute(f"PRAGMA table_info({table})")  # nosec
+        }
+        fields = []
+        for name in column_names:
+            column_type = declared.get(name, "")
+            if "INT" in column_type:
+                fields.append(pa.field(name, pa.int64()))
+            elif any(part in column_type for part in ("REAL", "FLOA", "DOUB")):
+                fields.append(pa.field(name, pa.float64()))
+            elif "BLOB" in column_type:
+                fields.append(pa.field(name, pa.binary()))
+            else:
+                fields.append(pa.field(name, pa.string()))
+        schema = pa.schema(fields)
+        with pq.ParquetWriter(parquet_file, schema) as writer:
+            while True:
+                rows = cursor.fetchmany(1000)
+                if not rows:
+                    break
+                columns = []
+                for field, values in zip(schema, zip(*rows)):
+                    if field.type == pa.string():
+                        values = [
+                            value if value is None else str(value)
+                            for value in values
+                        ]
+                    columns.append(pa.array(values, type=field.type))
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+        conn.close()
+    ```
+    """
+    content = _get_sqlite_export_start("parquet")
+    content += "    declared = {\n"
+    content += "        info[1]: info[2].upper()\n"
+    content += (
+        '        for info in conn.execute(f"PRAGMA table_info({table})")'
+        "  # nosec\n"
+    )
+    content += "    }\n"
+    content += "    fields = []\n"
+    content += "    for name in column_names:\n"
+    content += '        column_type = declared.get(name, "")\n'
+    content += '        if "INT" in column_type:\n'
+    content += "            fields.append(pa.field(name, pa.int64()))\n"
+    content += (
+        "        elif any(part in column_type "
+        'for part in ("REAL", "FLOA", "DOUB")):\n'
+    )
+    content += "            fields.append(pa.field(name, pa.float64()))\n"
+    content += '        elif "BLOB" in column_type:\n'
+    content += "            fields.append(pa.field(name, pa.binary()))\n"
+    content += "        else:\n"
+    content += "            fields.append(pa.field(name, pa.string()))\n"
+    content += "    schema = pa.schema(fields)\n"
+    content += "    with pq.ParquetWriter(parquet_file, schema) as writer:\n"
+    content += _get_fetch_loop(tabs=2)
+    content += "            columns = []\n"
+    content += "            for field, values in zip(schema, zip(*rows)):\n"
+    content += "                if field.type == pa.string():\n"
+    content += "                    values = [\n"
+    content += (
+        "                        value if value is None else str(value)\n"
+    )
+    content += "                        for value in values\n"
+    content += "                    ]\n"
+    content += (
+        "                columns.append(pa.array(values, type=field.type))\n"
+    )
+    content += (
+        "            writer.write_table("
+        "pa.Table.from_arrays(columns, schema=schema))\n"
+    )
+    content += "    conn.close()\n"
+    content += "\n\n"
+    return content
+
+
+def get_sqlite_export_string(logs_format: str = "csv") -> str:
+    """Get the code string to convert a sqlite table to the logs format.
+
+    Parameters
+    ----------
+    logs_format : str, optional
+        The logs format (csv, jsonl or parquet), by default "csv".
+
+    Returns
+    -------
+    str
+        The `sqlite_to_{logs_format}` function's code string.
+
+    Raises
+    ------
+    ValueError
+        If the logs format is not supported.
+    """
+    if logs_format == "csv":
+        return get_sqlite_to_csv_string()
+    if logs_format == "jsonl":
+        return get_sqlite_to_jsonl_string()
+    if logs_format == "parquet":
+        return get_sqlite_to_parquet_string()
+    raise ValueError(f"Unsupported logs format: {logs_format}")
+
+
+def get_logs_export_imports(
+    logs_format: str = "csv",
+) -> Tuple[Set[str], Set[str]]:
+    """Get the imports needed to export the logs.
+
+    Parameters
+    ----------
+    logs_format : str, optional
+        The logs format (csv, jsonl or parquet), by default "csv".
+
+    Returns
+    -------
+    Tuple[Set[str], Set[str]]
+        The builtin and the third party imports.
+    """
+    builtin_imports = {
+        "import os",
+        "import sqlite3",
+        "import time",
+        "from concurrent.futures import ThreadPoolExecutor",
+    }
+    third_party_imports: Set[str] = set()
+    if logs_format == "csv":
+        builtin_imports.add("import csv")
+    elif logs_format == "jsonl":
+        builtin_imports.add("import json")
+    elif logs_format == "parquet":
+        third_party_imports.update(
+            {"import pyarrow as pa", "import pyarrow.parquet as pq"}
+        )
+    return builtin_imports, third_party_imports
+
+
+def _get_sqlite_export_start(logs_format: str) -> str:
+    """Get the start of a `sqlite_to_{logs_format}` function.
+
+    The definition, the docstring and the query, up to getting
+    the column names.
+
+    Parameters
+    ----------
+    logs_format : str
+        The logs format.
+
+    Returns
+    -------
+    str
+        The start of the function.
+    """
+    file_arg = f"{logs_format}_file"
     content = "\n\n"
     content += (
-        "def sqlite_to_csv(dbname: str, table: str, csv_file: str) -> None:\n"
+        f"def sqlite_to_{logs_format}"
+        f"(dbname: str, table: str, {file_arg}: str) -> None:\n"
     )
-    content += '    """Convert a sqlite table to a csv file.\n\n'
+    content += f'    """Convert a sqlite table to a {logs_format} file.\n\n'
     content += "    Parameters\n"
     content += "    ----------\n"
     content += "    dbname : str\n"
     content += "        The sqlite database name.\n"
     content += "    table : str\n"
     content += "        The table name.\n"
-    content += "    csv_file : str\n"
-    content += "        The csv file name.\n"
+    content += f"    {file_arg} : str\n"
+    content += f"        The {logs_format} file name.\n"
     content += '    """\n'
-    content += "    conn = sqlite3.connect(dbname)\n"
+    # read-only (like the tables' listing), it never creates the db
+    content += "    try:\n"
+    content += (
+        '        conn = sqlite3.connect(f"file:{dbname}?mode=ro", uri=True)\n'
+    )
+    content += "    except sqlite3.OperationalError:\n"
+    content += "        return\n"
     content += '    query = f"SELECT * FROM {table}"  # nosec\n'
     content += "    try:\n"
     content += "        cursor = conn.execute(query)\n"
     content += "    except sqlite3.OperationalError:\n"
     content += "        conn.close()\n"
     content += "        return\n"
-    content += "    rows = cursor.fetchall()\n"
     content += "    column_names = [description[0] for description "
     content += "in cursor.description]\n"
-    content += "    data = [dict(zip(column_names, row)) for row in rows]\n"
-    content += "    conn.close()\n"
+    return content
+
+
+def _get_fetch_loop(tabs: int) -> str:
+    """Get the loop over the query's rows, in batches.
+
+    Parameters
+    ----------
+    tabs : int
+        The number of tabs to use for indentation.
+
+    Returns
+    -------
+    str
+        The loop's start (the body, using `rows`, is to follow).
+    """
+    tab = "    " * tabs
+    content = tab + "while True:\n"
+    content += tab + f"    rows = cursor.fetchmany({LOGS_BATCH_SIZE})\n"
+    content += tab + "    if not rows:\n"
+    content += tab + "        break\n"
+    return content
+
+
+def get_export_runtime_logs_string(logs_format: str = "csv") -> str:
+    """Get the code string to export all the runtime logging tables.
+
+    The generated `export_runtime_logs` function lists the (existing and
+    non-empty) tables with a single read-only connection, exports them
+    concurrently (each table with its own connection, in a small thread
+    pool) and prints how long the export took.
+
+    Parameters
+    ----------
+    logs_format : str, optional
+        The logs format (csv, jsonl or parquet), by default "csv".
+
+    Returns
+    -------
+    str
+        The `export_runtime_logs` function's code string.
+
+    Example
+    -------
+    ```python
+    >>> get_export_runtime_logs_string()
+    def export_runtime_logs(dbname: str, logs_dir: str) -> None:
+        ...
+        if not os.path.exists(dbname):
+            return
+        started = time.perf_counter()
+        conn = sqlite3.connect(f"file:{dbname}?mode=ro", uri=True)
+        try:
+            existing = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            }
+            tables = [
+                table
+                for table in [
+                    "chat_completions",
+                    "agents",
+                    "oai_wrappers",
+                    "oai_clients",
+                    "version",
+                    "events",
+                    "function_calls",
+                ]
+                if table in existing
+                and conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()  # nosec
+            ]
+        finally:
+            conn.close()
+        os.makedirs(logs_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=min(4, len(tables) or 1)) as executor:
+            futures = [
+                executor.submit(
+                    sqlite_to_csv,
+                    dbname,
+                    table,
+                    os.path.join(logs_dir, f"{table}.csv"),
+                )
+                for table in tables
+            ]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - started
+        print(f"Exported {len(tables)} log tables to {logs_dir} in {elapsed:.2f}s")
+    ```
+    """
+    content = "def export_runtime_logs(dbname: str, logs_dir: str) -> None:\n"
+    content += '    """Export the runtime logging tables (concurrently).\n\n'
+    content += "    Parameters\n"
+    content += "    ----------\n"
+    content += "    dbname : str\n"
+    content += "        The sqlite database name.\n"
+    content += "    logs_dir : str\n"
+    content += "        The directory to export the tables to.\n"
+    content += '    """\n'
+    content += "    if not os.path.exists(dbname):\n"
+    content += "        return\n"
+    content += "    started = time.perf_counter()\n"
     content += (
-        '    with open(csv_file, "w", newline="", encoding="utf-8") as file:\n'
+        '    conn = sqlite3.connect(f"file:{dbname}?mode=ro", uri=True)\n'
     )
+    content += "    try:\n"
+    content += "        existing = {\n"
+    content += "            row[0]\n"
+    content += "            for row in conn.execute(\n"
+    content += "                \"SELECT name FROM sqlite_master WHERE type = 'table'\"\n"
+    content += "            )\n"
+    content += "        }\n"
+    content += "        tables = [\n"
+    content += "            table\n"
+    content += "            for table in [\n"
+    for table in RUNTIME_LOGGING_TABLES:
+        content += f'                "{table}",\n'
+    content += "            ]\n"
+    content += "            if table in existing\n"
     content += (
-        "        _csv_writer = csv.DictWriter(file, fieldnames=column_names)\n"
+        '            and conn.execute(f"SELECT 1 FROM {table} LIMIT 1")'
+        ".fetchone()  # nosec\n"
+    )
+    content += "        ]\n"
+    content += "    finally:\n"
+    content += "        conn.close()\n"
+    content += "    os.makedirs(logs_dir, exist_ok=True)\n"
+    content += (
+        "    with ThreadPoolExecutor("
+        f"max_workers=min({LOGS_EXPORT_WORKERS}, len(tables) or 1)"
+        ") as executor:\n"
+    )
+    content += "        futures = [\n"
+    content += "            executor.submit(\n"
+    content += f"                sqlite_to_{logs_format},\n"
+    content += "                dbname,\n"
+    content += "                table,\n"
+    content += (
+        f'                os.path.join(logs_dir, f"{{table}}.{logs_format}"),\n'
+    )
+    content += "            )\n"
+    content += "            for table in tables\n"
+    content += "        ]\n"
+    content += "        for future in futures:\n"
+    content += "            future.result()\n"
+    content += "    elapsed = time.perf_counter() - started\n"
+    content += (
+        '    print(f"Exported {len(tables)} log tables to {logs_dir} '
+        'in {elapsed:.2f}s")\n'
     )
-    content += "        _csv_writer.writeheader()\n"
-    content += "        _csv_writer.writerows(data)\n"
     content += "\n\n"
     return content
 
 
 def get_sqlite_to_csv_call_string(tabs: int = 0) -> str:
-    """Get the sqlite to csv conversion call string.
+    """Get the call string to export the runtime logs.
 
     Parameters
     ----------
@@ -161,44 +571,14 @@ def get_sqlite_to_csv_call_string(tabs: int = 0) -> str:
     Returns
     -------
     str
-        The sqlite to csv conversion call string.
+        The runtime logs export call string.
 
     Example
     -------
     ```python
     >>> get_sqlite_to_csv_call_string()
-    if not os.path.exists("logs"):
-        os.makedirs("logs")
-    for table in [
-        "chat_completions",
-        "agents",
-        "oai_wrappers",
-        "oai_clients",
-        "version",
-        "events",
-        "function_calls",
-    ]:
-        dest = os.path.join("logs", f"{table}.csv")
-        sqlite_to_csv("flow.db", table, dest)
+    export_runtime_logs("flow.db", "logs")
     ```
     """
-    table_names = [
-        "chat_completions",
-        "agents",
-        "oai_wrappers",
-        "oai_clients",
-        "version",
-        "events",
-        "function_calls",
-    ]
     tab = "    " * tabs
-    content = ""
-    content += tab + 'if not os.path.exists("logs"):\n'
-    content += tab + '    os.makedirs("logs")\n'
-    content += tab + "for table in [\n"
-    for table in table_names:
-        content += tab + f'    "{table}",\n'
-    content += tab + "]:\n"
-    content += tab + '    dest = os.path.join("logs", f"{table}.csv")\n'
-    content += tab + '    sqlite_to_csv("flow.db", table, dest)\n'
-    return content
+    return tab + 'export_runtime_logs("flow.db", "logs")\n'
@@ -1,5 +1,10 @@
 """Naming related string generation functions.
 
+Classes
+-------
+NameAllocator
+    Allocate unique, valid instance names.
+
 Functions
 ---------
 get_valid_python_variable_name
@@ -11,7 +16,7 @@ get_escaped_string
 """
 
 import re
-from typing import Dict, Tuple
+from typing import Dict, Iterable, Set, Tuple
 
 
 def get_valid_python_variable_name(
@@ -94,6 +99,11 @@ def get_valid_instance_name(
     -------
     Dict[str, str]
         The updated names.
+
+    Notes
+    -----
+    This copies and scans `current_names` on every call.
+    To name many instances, use a `NameAllocator` instead.
     """
     instance_id, possible_name = instance
     if instance_id in current_names:
@@ -111,6 +121,91 @@ def get_valid_instance_name(
     return new_names
 
 
+class NameAllocator:
+    """Allocate unique, valid instance names.
+
+    It produces the same names as successive calls to
+    `get_valid_instance_name`, but it keeps the taken names in a set
+    and the next index suffix to try per name, so naming n instances
+    takes O(n) instead of O(n^2).
+    """
+
+    def __init__(self) -> None:
+        """Initialize the allocator."""
+        self._names: Dict[str, str] = {}
+        self._taken: Set[str] = set()
+        self._next_index: Dict[str, int] = {}
+
+    @property
+    def names(self) -> Dict[str, str]:
+        """Get the allocated names by instance id."""
+        return self._names
+
+    def allocate(
+        self,
+        instance_id: str,
+        possible_name: str,
+        prefix: str = "w",
+    ) -> str:
+        """Get a unique valid name for an instance.
+
+        If the instance id already has a name, the same name is returned.
+
+        Parameters
+        ----------
+        instance_id : str
+            The instance id.
+        possible_name : str
+            The possible name.
+        prefix : str, optional
+            The prefix to use if the name starts with a digit,
+            or if the name is already taken.
+
+        Returns
+        -------
+        str
+            The allocated name.
+        """
+        if instance_id in self._names:
+            return self._names[instance_id]
+        name = get_valid_python_variable_name(possible_name, prefix)
+        if name in self._taken:
+            name = f"{prefix}_{name}"
+        if name in self._taken:
+            index = self._next_index.get(name, 1)
+            while f"{name}_{index}" in self._taken:
+                index += 1
+            self._next_index[name] = index + 1
+            name = f"{name}_{index}"
+        self._names[instance_id] = name
+        self._taken.add(name)
+        return name
+
+    def allocate_all(
+        self,
+        instances: Iterable[Tuple[str, str]],
+        prefix: str = "w",
+    ) -> Dict[str, str]:
+        """Allocate names for multiple instances in one pass.
+
+        Parameters
+        ----------
+        instances : Iterable[Tuple[str, str]]
+            The instance ids and possible names.
+        prefix : str, optional
+            The prefix to use (see `allocate`).
+
+        Returns
+        -------
+        Dict[str, str]
+            The names of the given instances (instance id to name).
+        """
+        return {
+            instance_id: self.allocate(instance_id, possible_name, prefix)
+            for instance_id, possible_name in instances
+        }
+
+
 def get_escaped_string(string: str) -> str:
     """Get a string with escaped quotes and newlines.
 
@@ -0,0 +1,168 @@
+"""Notebook (.ipynb) generation from the exported python content.
+
+The flow is exported for notebooks as python content with the cells
+separated by blank lines and the headings as comment blocks
+(jupytext's "light" format). We convert it to the notebook's
+(nbformat v4) JSON in memory, without calling jupytext.
+
+Functions
+---------
+get_notebook_cells
+    Split the exported content into notebook cells.
+get_notebook_string
+    Get the notebook's JSON string from the exported content.
+"""
+
+import io
+import json
+import re
+import tokenize
+import uuid
+from typing import Any, Dict, List, Set
+
+NOTEBOOK_METADATA: Dict[str, Any] = {
+    "kernelspec": {
+        "display_name": "Python 3",
+        "language": "python",
+        "name": "python3",
+    },
+    "language_info": {
+        "name": "python",
+    },
+}
+COMMENTED_MAGIC_REGEX = re.compile(r"^# ?([!%].*)$")
+
+
+def _get_continuation_lines(content: str) -> Set[int]:
+    """Get the (1-based) line numbers that continue a statement.
+
+    These are the lines inside multi-line strings
+    or inside open brackets.
+
+    Parameters
+    ----------
+    content : str
+        The python content.
+
+    Returns
+    -------
+    Set[int]
+        The line numbers.
+
+    Raises
+    ------
+    ValueError
+        If the content cannot be tokenized.
+    """
+    lines: Set[int] = set()
+    depth = 0
+    readline = io.StringIO(content).readline
+    try:
+        for token in tokenize.generate_tokens(readline):
+            start_line, end_line = token.start[0], token.end[0]
+            lines.update(range(start_line + 1, end_line + 1))
+            if token.type == tokenize.OP and token.string in ("(", "[", "{"):
+                depth += 1
+            elif token.type == tokenize.OP and token.string in (")", "]", "}"):
+                depth = max(depth - 1, 0)
+            elif token.type == tokenize.NL and depth > 0:
+                lines.add(start_line)
+    except (tokenize.TokenError, SyntaxError) as error:
+        raise ValueError(f"Could not tokenize the content: {error}") from error
+    return lines
+
+
+def _get_cell(lines: List[str]) -> Dict[str, Any]:
+    """Get a notebook cell from its lines.
+
+    A block of only comment lines is a markdown cell (the leading `#`
+    is removed), unless it is a commented magic (`# !pip ...`).
+    Any commented magics in a code cell are uncommented.
+
+    Parameters
+    ----------
+    lines : List[str]
+        The lines of the cell (without the trailing newlines).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The cell.
+    """
+    is_markdown = all(line.startswith("#") for line in lines) and not all(
+        COMMENTED_MAGIC_REGEX.match(line) for line in lines
+    )
+    if is_markdown:
+        source = [re.sub(r"^# ?", "", line, count=1) for line in lines]
+        cell: Dict[str, Any] = {"cell_type": "markdown"}
+    else:
+        source = [COMMENTED_MAGIC_REGEX.sub(r"\1", line) for line in lines]
+        cell = {
+            "cell_type": "code",
+            "execution_count": None,
+            "outputs": [],
+        }
+    cell["id"] = uuid.uuid4().hex[:8]
+    cell["metadata"] = {}
+    cell["source"] = [line + "\n" for line in source[:-1]] + source[-1:]
+    return cell
+
+
+def get_notebook_cells(content: str) -> List[Dict[str, Any]]:
+    """Split the exported content into notebook cells.
+
+    A new cell starts after one or more blank lines that are not part
+    of a statement (in a multi-line string or in brackets) and are
+    followed by a non-indented line.
+
+    Parameters
+    ----------
+    content : str
+        The python content (exported for a notebook).
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        The notebook cells.
+    """
+    continuation_lines = _get_continuation_lines(content)
+    lines = content.splitlines()
+    cells: List[Dict[str, Any]] = []
+    current: List[str] = []
+    blank_lines: List[str] = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip() and line_number not in continuation_lines:
+            blank_lines.append(line)
+            continue
+        if blank_lines and current and not line.startswith((" ", "\t")):
+            cells.append(_get_cell(current))
+            current = []
+        elif current:
+            current.extend(blank_lines)
+        blank_lines = []
+        current.append(line)
+    if current:
+        cells.append(_get_cell(current))
+    return cells
+
+
+def get_notebook_string(content: str) -> str:
+    """Get the notebook's JSON string from the exported content.
+
+    Parameters
+    ----------
+    content : str
+        The python content (exported for a notebook).
+
+    Returns
+    -------
+    str
+        The notebook (nbformat v4) JSON string.
+    """
+    notebook = {
+        "cells": get_notebook_cells(content),
+        "metadata": NOTEBOOK_METADATA,
+        "nbformat": 4,
+        "nbformat_minor": 5,
+    }
+    return json.dumps(notebook, indent=1, sort_keys=True, ensure_ascii=False)
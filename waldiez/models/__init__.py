@@ -29,7 +29,11 @@ from .agents import (
     WaldiezRagUser,
     WaldiezRagUserChunkMode,
     WaldiezRagUserData,
+    WaldiezRagUserDistanceMetric,
+    WaldiezRagUserIndexOptions,
+    WaldiezRagUserIndexType,
     WaldiezRagUserModels,
+    WaldiezRagUserQuantization,
     WaldiezRagUserRetrieveConfig,
     WaldiezRagUserTask,
     WaldiezRagUserVectorDb,
@@ -46,7 +50,14 @@ from .chat import (
     WaldiezChatSummaryMethod,
 )
 from .common import METHOD_ARGS, METHOD_TYPE_HINTS, WaldiezMethodName
-from .flow import WaldiezFlow, WaldiezFlowData
+from .flow import (
+    WaldiezFlow,
+    WaldiezFlowData,
+    WaldiezFlowIndex,
+    WaldiezFlowIssue,
+    WaldiezFlowLogsFormat,
+    WaldiezFlowValidationError,
+)
 from .model import (
     WaldiezModel,
     WaldiezModelAPIType,
@@ -54,7 +65,12 @@ from .model import (
     WaldiezModelPrice,
 )
 from .skill import WaldiezSkill, WaldiezSkillData
-from .waldiez import Waldiez
+from .waldiez import (
+    Waldiez,
+    WaldiezLoadCacheInfo,
+    clear_load_cache,
+    get_load_cache_info,
+)
 
 # pylint: disable=duplicate-code
 __all__ = [
@@ -62,6 +78,9 @@ __all__ = [
     "METHOD_TYPE_HINTS",
     "WaldiezMethodName",
     "Waldiez",
+    "WaldiezLoadCacheInfo",
+    "clear_load_cache",
+    "get_load_cache_info",
     "WaldiezAgent",
     "WaldiezAgentCodeExecutionConfig",
     "WaldiezAgentData",
@@ -81,6 +100,10 @@ __all__ = [
     "WaldiezChatSummaryMethod",
     "WaldiezFlow",
     "WaldiezFlowData",
+    "WaldiezFlowIndex",
+    "WaldiezFlowIssue",
+    "WaldiezFlowLogsFormat",
+    "WaldiezFlowValidationError",
     "WaldiezGroupManager",
     "WaldiezGroupManagerData",
     "WaldiezGroupManagerSpeakers",
@@ -103,5 +126,9 @@ __all__ = [
     "WaldiezRagUserChunkMode",
     "WaldiezRagUserVectorDb",
     "WaldiezRagUserVectorDbConfig",
+    "WaldiezRagUserDistanceMetric",
+    "WaldiezRagUserIndexOptions",
+    "WaldiezRagUserIndexType",
+    "WaldiezRagUserQuantization",
     "WaldiezRagUserModels",
 ]
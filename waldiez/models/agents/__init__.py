@@ -25,7 +25,11 @@ from .rag_user import (
     WaldiezRagUser,
     WaldiezRagUserChunkMode,
     WaldiezRagUserData,
+    WaldiezRagUserDistanceMetric,
+    WaldiezRagUserIndexOptions,
+    WaldiezRagUserIndexType,
     WaldiezRagUserModels,
+    WaldiezRagUserQuantization,
     WaldiezRagUserRetrieveConfig,
     WaldiezRagUserTask,
     WaldiezRagUserVectorDb,
@@ -62,4 +66,8 @@ __all__ = [
     "WaldiezRagUserChunkMode",
     "WaldiezRagUserVectorDb",
     "WaldiezRagUserVectorDbConfig",
+    "WaldiezRagUserDistanceMetric",
+    "WaldiezRagUserIndexOptions",
+    "WaldiezRagUserIndexType",
+    "WaldiezRagUserQuantization",
 ]
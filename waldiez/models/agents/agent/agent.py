@@ -1,6 +1,6 @@
 """Base agent class to be inherited by all agents."""
 
-from typing import List
+from typing import Collection, Iterator, List
 
 from pydantic import Field
 from typing_extensions import Annotated, Literal
@@ -45,6 +45,8 @@ class WaldiezAgent(WaldiezBase):
         Validate the skills linked to the agent.
     validate_linked_models(model_ids: List[str])
         Validate the models linked to the agent.
+    get_flow_errors(model_ids, skill_ids, agent_ids)
+        Get all the invalid references of the agent.
     """
 
     id: Annotated[
@@ -119,72 +121,109 @@ class WaldiezAgent(WaldiezBase):
     ]
 
     def validate_linked_skills(
-        self, skill_ids: List[str], agent_ids: List[str]
+        self, skill_ids: Collection[str], agent_ids: Collection[str]
     ) -> None:
         """Validate the skills.
 
         Parameters
         ----------
-        skill_ids : List[str]
-            The list of skill IDs.
-        agent_ids : List[str]
-            The list of agent IDs.
+        skill_ids : Collection[str]
+            The skill IDs (preferably a set).
+        agent_ids : Collection[str]
+            The agent IDs (preferably a set).
 
         Raises
         ------
         ValueError
             If a skill or agent is not found
         """
-        # if the config dict has skills, make sure they can be found
-        for skill in self.data.skills:
-            if skill.id not in skill_ids:
-                raise ValueError(
-                    f"Skill '{skill.id}' not found in agent's {self.id} skills"
-                )
-            if skill.executor_id not in agent_ids:
-                raise ValueError(
-                    f"Agent '{skill.executor_id}' not found in agents"
-                )
+        for error in self._get_linked_skills_errors(skill_ids, agent_ids):
+            raise ValueError(error)
 
-    def validate_linked_models(self, model_ids: List[str]) -> None:
+    def validate_linked_models(self, model_ids: Collection[str]) -> None:
         """Validate the models.
 
         Parameters
         ----------
-        model_ids : List[str]
-            The list of model IDs.
+        model_ids : Collection[str]
+            The model IDs (preferably a set).
 
         Raises
         ------
         ValueError
             If a model is not found
         """
-        # if the config dict has models, make sure they can be found
-        for model in self.data.model_ids:
-            if model not in model_ids:
-                raise ValueError(
-                    f"Model '{model}' not found in agent's {self.id} models"
-                )
+        for error in self._get_linked_models_errors(model_ids):
+            raise ValueError(error)
 
-    def validate_code_execution(self, skill_ids: List[str]) -> None:
+    def validate_code_execution(self, skill_ids: Collection[str]) -> None:
         """Validate the code execution config.
 
         Parameters
         ----------
-        skill_ids : List[str]
-            The list of skill IDs.
+        skill_ids : Collection[str]
+            The skill IDs (preferably a set).
 
         Raises
         ------
         ValueError
             If a function is not found
         """
+        for error in self._get_code_execution_errors(skill_ids):
+            raise ValueError(error)
+
+    def get_flow_errors(
+        self,
+        model_ids: Collection[str],
+        skill_ids: Collection[str],
+        agent_ids: Collection[str],
+    ) -> List[str]:
+        """Get all the invalid references (models, skills, functions).
+
+        Parameters
+        ----------
+        model_ids : Collection[str]
+            The model IDs (preferably a set).
+        skill_ids : Collection[str]
+            The skill IDs (preferably a set).
+        agent_ids : Collection[str]
+            The agent IDs (preferably a set).
+
+        Returns
+        -------
+        List[str]
+            The error messages (empty if all the references are valid).
+        """
+        errors = list(self._get_linked_models_errors(model_ids))
+        errors.extend(self._get_linked_skills_errors(skill_ids, agent_ids))
+        errors.extend(self._get_code_execution_errors(skill_ids))
+        return errors
+
+    def _get_linked_skills_errors(
+        self, skill_ids: Collection[str], agent_ids: Collection[str]
+    ) -> Iterator[str]:
+        # if the config dict has skills, make sure they can be found
+        for skill in self.data.skills:
+            if skill.id not in skill_ids:
+                yield f"Skill '{skill.id}' not found in agent's {self.id} skills"
+            if skill.executor_id not in agent_ids:
+                yield f"Agent '{skill.executor_id}' not found in agents"
+
+    def _get_linked_models_errors(
+        self, model_ids: Collection[str]
+    ) -> Iterator[str]:
+        # if the config dict has models, make sure they can be found
+        for model in self.data.model_ids:
+            if model not in model_ids:
+                yield f"Model '{model}' not found in agent's {self.id} models"
+
+    def _get_code_execution_errors(
+        self, skill_ids: Collection[str]
+    ) -> Iterator[str]:
         # if the config dict has functions, make sure they can be found
         if isinstance(
             self.data.code_execution_config, WaldiezAgentCodeExecutionConfig
         ):
             for function in self.data.code_execution_config.functions:
                 if function not in skill_ids:
-                    raise ValueError(
-                        f"Function '{function}' not found in skills"
-                    )
+                    yield f"Function '{function}' not found in skills"
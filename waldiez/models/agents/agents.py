@@ -1,6 +1,6 @@
 """Waldiez agents model."""
 
-from typing import Iterator, List
+from typing import Collection, Iterator, List, Tuple
 
 from pydantic import Field, model_validator
 from typing_extensions import Annotated, Self
@@ -99,7 +99,9 @@ class WaldiezAgents(WaldiezBase):
             raise ValueError("Agent IDs must be unique.")
         return self
 
-    def validate_flow(self, model_ids: List[str], skill_ids: List[str]) -> None:
+    def validate_flow(
+        self, model_ids: Collection[str], skill_ids: Collection[str]
+    ) -> None:
         """Validate the flow of the agents.
 
         - Validate the linked models (the referenced model ids must exist).
@@ -108,22 +110,46 @@ class WaldiezAgents(WaldiezBase):
 
         Parameters
         ----------
-        model_ids : List[str]
-            The list of model IDs.
-        skill_ids : List[str]
-            The list of skill IDs.
+        model_ids : Collection[str]
+            The model IDs.
+        skill_ids : Collection[str]
+            The skill IDs.
 
         Raises
         ------
         ValueError
             If the flow is invalid.
         """
-        all_agent_ids = [agent.id for agent in self.members]
-        for agent in self.members:
-            agent.validate_linked_models(model_ids)
-            agent.validate_linked_skills(skill_ids, agent_ids=all_agent_ids)
-            agent.validate_code_execution(skill_ids=skill_ids)
-            if agent.agent_type == "manager" and isinstance(
-                agent, WaldiezGroupManager
-            ):
-                agent.validate_transitions(agent_ids=all_agent_ids)
+        for _, error in self.get_flow_errors(model_ids, skill_ids):
+            raise ValueError(error)
+
+    def get_flow_errors(
+        self, model_ids: Collection[str], skill_ids: Collection[str]
+    ) -> List[Tuple[str, str]]:
+        """Get all the invalid references of the agents.
+
+        The ids are checked against sets, so that the total cost
+        is linear in the number of references.
+
+        Parameters
+        ----------
+        model_ids : Collection[str]
+            The model IDs.
+        skill_ids : Collection[str]
+            The skill IDs.
+
+        Returns
+        -------
+        List[Tuple[str, str]]
+            The agent ID and the error message of each invalid reference.
+        """
+        model_id_set = set(model_ids)
+        skill_id_set = set(skill_ids)
+        agent_id_set = {agent.id for agent in self.members}
+        return [
+            (agent.id, error)
+            for agent in self.members
+            for error in agent.get_flow_errors(
+                model_id_set, skill_id_set, agent_id_set
+            )
+        ]
@@ -1,6 +1,6 @@
 """Group chat manager agent."""
 
-from typing import List, Literal
+from typing import Collection, Iterator, List, Literal
 
 from pydantic import Field
 from typing_extensions import Annotated
@@ -28,6 +28,8 @@ class WaldiezGroupManager(WaldiezAgent):
     ---------
     validate_transitions(agent_ids: List[str])
         Validate the transitions.
+    get_flow_errors(model_ids, skill_ids, agent_ids)
+        Get all the invalid references of the agent.
     """
 
     agent_type: Annotated[
@@ -48,7 +50,7 @@ class WaldiezGroupManager(WaldiezAgent):
         ),
     ]
 
-    def validate_transitions(self, agent_ids: List[str]) -> None:
+    def validate_transitions(self, agent_ids: Collection[str]) -> None:
         """Validate the transitions.
 
         If the selection mode is `transition`:
@@ -60,14 +62,46 @@ class WaldiezGroupManager(WaldiezAgent):
 
         Parameters
         ----------
-        agent_ids : List[str]
-            The list of agent IDs.
+        agent_ids : Collection[str]
+            The agent IDs (preferably a set).
 
         Raises
         ------
         ValueError
             If the transitions are invalid.
         """
+        for error in self._get_transitions_errors(agent_ids):
+            raise ValueError(error)
+
+    def get_flow_errors(
+        self,
+        model_ids: Collection[str],
+        skill_ids: Collection[str],
+        agent_ids: Collection[str],
+    ) -> List[str]:
+        """Get all the invalid references (including the transitions).
+
+        Parameters
+        ----------
+        model_ids : Collection[str]
+            The model IDs (preferably a set).
+        skill_ids : Collection[str]
+            The skill IDs (preferably a set).
+        agent_ids : Collection[str]
+            The agent IDs (preferably a set).
+
+        Returns
+        -------
+        List[str]
+            The error messages (empty if all the references are valid).
+        """
+        errors = super().get_flow_errors(model_ids, skill_ids, agent_ids)
+        errors.extend(self._get_transitions_errors(agent_ids))
+        return errors
+
+    def _get_transitions_errors(
+        self, agent_ids: Collection[str]
+    ) -> Iterator[str]:
         speakers: WaldiezGroupManagerSpeakers = self.data.speakers
         if speakers.selection_mode != "transition":
             return
@@ -75,13 +109,13 @@ class WaldiezGroupManager(WaldiezAgent):
         if isinstance(allow_repeat, list):
             for agent_id in allow_repeat:
                 if agent_id not in agent_ids:
-                    raise ValueError(f"Invalid agent id: {agent_id}")
+                    yield f"Invalid agent id: {agent_id}"
         for (
             agent_id,
             transitions,
         ) in speakers.allowed_or_disallowed_transitions.items():
             if agent_id not in agent_ids:
-                raise ValueError(f"Invalid agent id: {agent_id}")
-            for agent_id in transitions:
-                if agent_id not in agent_ids:
-                    raise ValueError(f"Invalid agent id: {agent_id}")
+                yield f"Invalid agent id: {agent_id}"
+            for target_id in transitions:
+                if target_id not in agent_ids:
+                    yield f"Invalid agent id: {target_id}"
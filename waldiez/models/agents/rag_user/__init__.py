@@ -7,12 +7,18 @@ from .rag_user import WaldiezRagUser
 from .rag_user_data import WaldiezRagUserData
 from .retrieve_config import (
     WaldiezRagUserChunkMode,
+    WaldiezRagUserIndexOptions,
     WaldiezRagUserModels,
     WaldiezRagUserRetrieveConfig,
     WaldiezRagUserTask,
     WaldiezRagUserVectorDb,
 )
-from .vector_db_config import WaldiezRagUserVectorDbConfig
+from .vector_db_config import (
+    WaldiezRagUserDistanceMetric,
+    WaldiezRagUserIndexType,
+    WaldiezRagUserQuantization,
+    WaldiezRagUserVectorDbConfig,
+)
 
 __all__ = [
     "WaldiezRagUser",
@@ -23,4 +29,8 @@ __all__ = [
     "WaldiezRagUserRetrieveConfig",
     "WaldiezRagUserTask",
     "WaldiezRagUserVectorDbConfig",
+    "WaldiezRagUserDistanceMetric",
+    "WaldiezRagUserIndexOptions",
+    "WaldiezRagUserIndexType",
+    "WaldiezRagUserQuantization",
 ]
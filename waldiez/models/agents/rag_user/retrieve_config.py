@@ -1,6 +1,7 @@
 """RAG user agent retrieve config."""
 
-from typing import Dict, List, Optional, Union
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
 from pydantic import ConfigDict, Field, model_validator
 from pydantic.alias_generators import to_camel
@@ -18,6 +19,41 @@ WaldiezRagUserModels: Dict[WaldiezRagUserVectorDb, str] = {
     "pgvector": "all-MiniLM-L6-v2",
     "qdrant": "BAAI/bge-small-en-v1.5",
 }
+# the index options each vector db supports (and their allowed values,
+# None for any): autogen's qdrant collections always use the cosine
+# distance (and search with ef = ef_construction), pgvector's queries
+# the euclidean one and mongodb's search uses numCandidates = 10 * n_results
+WaldiezRagUserIndexOptions: Dict[
+    WaldiezRagUserVectorDb, Dict[str, Optional[Tuple[str, ...]]]
+] = {
+    "chroma": {
+        "distance_metric": None,
+        "hnsw_m": None,
+        "hnsw_ef_construction": None,
+        "hnsw_ef_search": None,
+    },
+    "mongodb": {
+        "distance_metric": None,
+        "hnsw_m": None,
+        "hnsw_ef_construction": None,
+        "quantization": ("scalar", "binary"),
+    },
+    "pgvector": {
+        "distance_metric": ("l2",),
+        "hnsw_m": None,
+        "hnsw_ef_construction": None,
+        "hnsw_ef_search": None,
+        "index_type": None,
+        "ivfflat_lists": None,
+        "ivfflat_probes": None,
+    },
+    "qdrant": {
+        "distance_metric": ("cosine",),
+        "hnsw_m": None,
+        "hnsw_ef_construction": None,
+        "quantization": None,
+    },
+}
 
 
 class WaldiezRagUserRetrieveConfig(WaldiezBase):
@@ -127,6 +163,21 @@ class WaldiezRagUserRetrieveConfig(WaldiezBase):
         The text split function string (if use_custom_text_split is True).
     n_results: Optional[int]
         The number of results to return. Default is None, which will return all
+    use_ingestion_manifest : bool
+        Whether to keep a manifest of the ingested docs (path, size, mtime
+        and content hash) next to the local storage of the vector db, to
+        only chunk and embed the new or modified docs (and remove the
+        vectors of the removed ones) on each run. Default is False.
+        Requires `db_config.local_storage_path`.
+    ingestion_batch_size : Optional[int]
+        The number of chunks to embed and insert in the vector db at a time
+        (if the docs are ingested before the agent is created, with an
+        ingestion manifest or workers). Default is None (all at once).
+    ingestion_workers : Optional[int]
+        The number of processes to parse and chunk the docs in, while the
+        chunks are embedded (in batches). If set (or if a batch size or an
+        ingestion manifest is used), the docs are ingested before the agent
+        is created. Default is None (no worker processes).
 
     Functions
     ---------
@@ -136,6 +187,8 @@ class WaldiezRagUserRetrieveConfig(WaldiezBase):
         Validate the custom token count function.
     validate_custom_text_split_function
         Validate the custom text split function.
+    validate_index_options
+        Validate the vector db's index options.
     validate_rag_user_data
         Validate the RAG user data.
     """
@@ -463,6 +516,45 @@ class WaldiezRagUserRetrieveConfig(WaldiezBase):
             ),
         ),
     ]
+    use_ingestion_manifest: Annotated[
+        bool,
+        Field(
+            default=False,
+            title="Use Ingestion Manifest",
+            description=(
+                "Whether to keep a manifest of the ingested docs (path, size, "
+                "mtime and content hash) next to the local storage of the "
+                "vector db, to only chunk and embed the new or modified docs "
+                "(and remove the vectors of the removed ones) on each run. "
+                "Default is False. Requires a local storage path."
+            ),
+        ),
+    ]
+    ingestion_batch_size: Annotated[
+        Optional[int],
+        Field(
+            default=None,
+            title="Ingestion Batch Size",
+            description=(
+                "The number of chunks to embed and insert in the vector db "
+                "at a time. Default is None (all at once)."
+            ),
+            gt=0,
+        ),
+    ]
+    ingestion_workers: Annotated[
+        Optional[int],
+        Field(
+            default=None,
+            title="Ingestion Workers",
+            description=(
+                "The number of processes to parse and chunk the docs in, "
+                "while the chunks are embedded (in batches). "
+                "Default is None (no worker processes)."
+            ),
+            gt=0,
+        ),
+    ]
     _embedding_function_string: Optional[str] = None
 
     _token_count_function_string: Optional[str] = None
@@ -502,6 +594,39 @@ class WaldiezRagUserRetrieveConfig(WaldiezBase):
         """
         return self._text_split_function_string
 
+    @property
+    def use_ingestion_pipeline(self) -> bool:
+        """Check if the docs are to be ingested before the agent is created.
+
+        Returns
+        -------
+        bool
+            True if there are docs and an ingestion manifest, batch size
+            or workers are used.
+        """
+        return bool(self.docs_path) and (
+            self.use_ingestion_manifest
+            or self.ingestion_batch_size is not None
+            or self.ingestion_workers is not None
+        )
+
+    @property
+    def ingestion_manifest_path(self) -> Optional[str]:
+        """Get the path of the ingestion manifest.
+
+        Returns
+        -------
+        Optional[str]
+            The manifest's path (in the local storage directory),
+            if the ingestion manifest is used.
+        """
+        local_storage_path = self.db_config.local_storage_path
+        if not self.use_ingestion_manifest or not local_storage_path:
+            return None
+        return str(
+            Path(local_storage_path) / f"{self.collection_name}.manifest.json"
+        )
+
     def validate_custom_embedding_function(self) -> None:
         """Validate the custom embedding function.
 
@@ -568,6 +693,29 @@ class WaldiezRagUserRetrieveConfig(WaldiezBase):
                 raise ValueError(error_or_content)
             self._text_split_function_string = error_or_content
 
+    def validate_index_options(self) -> None:
+        """Validate the vector db's index options.
+
+        Raises
+        ------
+        ValueError
+            If an index option (or its value) is not supported
+            by the vector db.
+        """
+        supported = WaldiezRagUserIndexOptions[self.vector_db]
+        for option, value in self.db_config.index_options.items():
+            if option not in supported:
+                raise ValueError(
+                    f"The {option} index option is not supported "
+                    f"by {self.vector_db}."
+                )
+            allowed = supported[option]
+            if allowed is not None and value not in allowed:
+                raise ValueError(
+                    f"The {option} index option of {self.vector_db} "
+                    f"must be one of: {', '.join(allowed)}."
+                )
+
     @model_validator(mode="after")
     def validate_rag_user_data(self) -> Self:
         """Validate the RAG user data.
@@ -585,8 +733,17 @@ class WaldiezRagUserRetrieveConfig(WaldiezBase):
         self.validate_custom_embedding_function()
         self.validate_custom_token_count_function()
         self.validate_custom_text_split_function()
+        self.validate_index_options()
         if not self.db_config.model:
             self.db_config.model = WaldiezRagUserModels[self.vector_db]
         if isinstance(self.n_results, int) and self.n_results < 1:
             self.n_results = None
+        if self.use_ingestion_manifest and not (
+            self.db_config.use_local_storage
+            and self.db_config.local_storage_path
+        ):
+            raise ValueError(
+                "A local storage path is required "
+                "if use_ingestion_manifest is True."
+            )
         return self
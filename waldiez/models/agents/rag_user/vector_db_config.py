@@ -5,10 +5,24 @@ from typing import Any, Dict, Optional
 
 from pydantic import ConfigDict, Field, model_validator
 from pydantic.alias_generators import to_camel
-from typing_extensions import Annotated, Self
+from typing_extensions import Annotated, Literal, Self
 
 from ...common import WaldiezBase
 
+WaldiezRagUserDistanceMetric = Literal["cosine", "l2", "ip"]
+WaldiezRagUserQuantization = Literal["scalar", "binary", "product"]
+WaldiezRagUserIndexType = Literal["hnsw", "ivfflat"]
+WALDIEZ_RAG_USER_INDEX_OPTIONS = (
+    "distance_metric",
+    "hnsw_m",
+    "hnsw_ef_construction",
+    "hnsw_ef_search",
+    "quantization",
+    "index_type",
+    "ivfflat_lists",
+    "ivfflat_probes",
+)
+
 
 # pylint: disable=line-too-long
 class WaldiezRagUserVectorDbConfig(WaldiezBase):
@@ -35,6 +49,36 @@ class WaldiezRagUserVectorDbConfig(WaldiezBase):
     metadata : Optional[Dict[str, Any]]
         The metadata to use for the vector db.
         Example: {"hnsw:space": "ip", "hnsw:construction_ef": 30, "hnsw:M": 32}
+    use_embedding_cache : bool
+        Whether to cache the embeddings (of the default embedding function) on disk,
+        keyed on (model, text hash) and shared by the agents using the same model.
+    embedding_cache_path : Optional[str]
+        The path of the (sqlite) embedding cache.
+        None, the default, means `<cache_dir>/embeddings.sqlite3` (when the flow runs).
+    embedding_cache_max_size : int
+        The size limit (in bytes) of the cached embeddings; the least recently
+        used ones are removed when exceeded. Default is 1 GiB.
+    distance_metric : Optional[Literal["cosine", "l2", "ip"]]
+        The distance metric of the (ANN) index (if `chroma` or `mongodb` is used,
+        `qdrant` only supports "cosine" and `pgvector` only "l2").
+    hnsw_m : Optional[int]
+        The number of bi-directional links per node of the HNSW graph
+        (if `chroma`, `qdrant`, `pgvector` or `mongodb` is used).
+    hnsw_ef_construction : Optional[int]
+        The size of the candidates list when building the HNSW graph
+        (if `chroma`, `qdrant`, `pgvector` or `mongodb` is used).
+    hnsw_ef_search : Optional[int]
+        The size of the candidates list when searching the HNSW graph
+        (if `chroma` or `pgvector` is used).
+    quantization : Optional[Literal["scalar", "binary", "product"]]
+        The quantization of the stored vectors (if `qdrant` or `mongodb` is used,
+        `mongodb` does not support "product").
+    index_type : Optional[Literal["hnsw", "ivfflat"]]
+        The index type (if `pgvector` is used). Default (None) is "hnsw".
+    ivfflat_lists : Optional[int]
+        The number of lists of the ivfflat index (if `pgvector` is used).
+    ivfflat_probes : Optional[int]
+        The number of lists to search in the ivfflat index (if `pgvector` is used).
 
     Functions
     ---------
@@ -134,12 +178,142 @@ class WaldiezRagUserVectorDbConfig(WaldiezBase):
         ),
     ]
 
+    use_embedding_cache: Annotated[
+        bool,
+        Field(
+            False,
+            title="Use Embedding Cache",
+            description=(
+                "Whether to cache the embeddings (of the default embedding "
+                "function) on disk, keyed on (model, text hash) and shared "
+                "by the agents using the same model."
+            ),
+        ),
+    ]
+    embedding_cache_path: Annotated[
+        Optional[str],
+        Field(
+            None,
+            title="Embedding Cache Path",
+            description=(
+                "The path of the (sqlite) embedding cache. None, the default, "
+                "means `<cache_dir>/embeddings.sqlite3` (when the flow runs)."
+            ),
+        ),
+    ]
+    embedding_cache_max_size: Annotated[
+        int,
+        Field(
+            1024 * 1024 * 1024,
+            title="Embedding Cache Max Size",
+            description=(
+                "The size limit (in bytes) of the cached embeddings; "
+                "the least recently used ones are removed when exceeded."
+            ),
+            ge=0,
+        ),
+    ]
+
+    distance_metric: Annotated[
+        Optional[WaldiezRagUserDistanceMetric],
+        Field(
+            None,
+            title="Distance Metric",
+            description="The distance metric of the (ANN) index.",
+        ),
+    ]
+    hnsw_m: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="HNSW M",
+            description=(
+                "The number of bi-directional links per node "
+                "of the HNSW graph."
+            ),
+            gt=0,
+        ),
+    ]
+    hnsw_ef_construction: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="HNSW ef construction",
+            description=(
+                "The size of the candidates list when building the HNSW graph."
+            ),
+            gt=0,
+        ),
+    ]
+    hnsw_ef_search: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="HNSW ef search",
+            description=(
+                "The size of the candidates list when searching the HNSW graph."
+            ),
+            gt=0,
+        ),
+    ]
+    quantization: Annotated[
+        Optional[WaldiezRagUserQuantization],
+        Field(
+            None,
+            title="Quantization",
+            description="The quantization of the stored vectors.",
+        ),
+    ]
+    index_type: Annotated[
+        Optional[WaldiezRagUserIndexType],
+        Field(
+            None,
+            title="Index Type",
+            description="The index type (if pgvector is used).",
+        ),
+    ]
+    ivfflat_lists: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="IVFFlat Lists",
+            description="The number of lists of the ivfflat index.",
+            gt=0,
+        ),
+    ]
+    ivfflat_probes: Annotated[
+        Optional[int],
+        Field(
+            None,
+            title="IVFFlat Probes",
+            description=("The number of lists to search in the ivfflat index."),
+            gt=0,
+        ),
+    ]
+
+    @property
+    def index_options(self) -> Dict[str, Any]:
+        """Get the (ANN) index options that are set.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The index options (by field name) that are not None.
+        """
+        return {
+            option: getattr(self, option)
+            for option in WALDIEZ_RAG_USER_INDEX_OPTIONS
+            if getattr(self, option) is not None
+        }
+
     @model_validator(mode="after")
     def validate_vector_db_config(self) -> Self:
         """Validate the vector db config.
 
         if local storage is used, make sure the path is provided,
-        and make it absolute if not already.
+        and make it absolute if not already (the same for the path
+        of the embedding cache). Also check that the index options
+        match the index type.
 
         Returns
         -------
@@ -159,4 +333,31 @@ class WaldiezRagUserVectorDbConfig(WaldiezBase):
             as_path = Path(self.local_storage_path)
             if not as_path.is_absolute():
                 self.local_storage_path = str(as_path.resolve())
+        if self.embedding_cache_path is not None:
+            as_path = Path(self.embedding_cache_path).expanduser()
+            self.embedding_cache_path = str(as_path.resolve())
+        self._validate_index_options()
         return self
+
+    def _validate_index_options(self) -> None:
+        """Validate the index options (for the index type).
+
+        Raises
+        ------
+        ValueError
+            If hnsw options are used with an ivfflat index or vice versa.
+        """
+        options = self.index_options
+        if self.index_type == "ivfflat":
+            invalid = [
+                option for option in options if option.startswith("hnsw_")
+            ]
+        else:
+            invalid = [
+                option for option in options if option.startswith("ivfflat_")
+            ]
+        if invalid:
+            raise ValueError(
+                f"The index options {', '.join(invalid)} cannot be used "
+                f"with the {self.index_type or 'hnsw'} index type."
+            )
@@ -8,6 +8,8 @@ from .method_utils import (
     METHOD_TYPE_HINTS,
     WaldiezMethodName,
     check_function,
+    clear_check_function_cache,
+    get_check_function_cache_info,
     parse_code_string,
 )
 
@@ -34,5 +36,7 @@ __all__ = [
     "WaldiezMethodName",
     "now",
     "check_function",
+    "clear_check_function_cache",
+    "get_check_function_cache_info",
     "parse_code_string",
 ]
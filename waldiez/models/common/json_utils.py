@@ -0,0 +1,68 @@
+"""JSON loading, using orjson if it is installed (stdlib json otherwise)."""
+
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional, Union
+
+orjson: Optional[ModuleType]
+try:
+    import orjson  # type: ignore[no-redef,unused-ignore]
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def get_json_backend() -> str:
+    """Get the name of the JSON backend used.
+
+    Returns
+    -------
+    str
+        `orjson` if it is installed, `json` otherwise.
+    """
+    return "json" if orjson is None else "orjson"
+
+
+def loads_json(content: Union[str, bytes]) -> Any:
+    """Parse a JSON document.
+
+    Parameters
+    ----------
+    content : Union[str, bytes]
+        The JSON document.
+
+    Returns
+    -------
+    Any
+        The parsed document.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the content is not valid JSON
+        (orjson's decode error is a subclass of it).
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def load_json_file(file_path: Union[str, Path]) -> Any:
+    """Load a JSON file.
+
+    Parameters
+    ----------
+    file_path : Union[str, Path]
+        The file's path.
+
+    Returns
+    -------
+    Any
+        The parsed document.
+
+    Raises
+    ------
+    json.JSONDecodeError
+        If the file's content is not valid JSON.
+    """
+    return loads_json(Path(file_path).read_bytes())
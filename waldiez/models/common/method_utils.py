@@ -1,8 +1,11 @@
 """Function related utilities."""
 
 import ast
+import functools
 from typing import Dict, List, Literal, Optional, Tuple
 
+CHECK_FUNCTION_CACHE_SIZE = 512
+
 WaldiezMethodName = Literal[
     "callable_message",  # Chat
     "is_termination_message",  # Agent
@@ -86,6 +89,36 @@ def check_function(
     skip_type_hints : bool, optional
         Whether to skip type hints in the function body, by default False.
 
+    Returns
+    -------
+    Tuple[bool, str]
+        If valid, True and the function body (only), no extra lines.
+        If invalid, False and the error message.
+    """
+    # the same methods are checked on every (re-)validation of a flow
+    return _check_function(code_string, function_name, skip_type_hints)
+
+
+@functools.lru_cache(maxsize=CHECK_FUNCTION_CACHE_SIZE)
+def _check_function(
+    code_string: str,
+    function_name: WaldiezMethodName,
+    skip_type_hints: bool,
+) -> Tuple[bool, str]:
+    """Check the function (the results are cached).
+
+    The cache key is the (hash of the) code string,
+    the function name and whether to skip the type hints.
+
+    Parameters
+    ----------
+    code_string : str
+        The code string.
+    function_name : WaldiezMethodName
+        The expected function name.
+    skip_type_hints : bool
+        Whether to skip type hints in the function body.
+
     Returns
     -------
     Tuple[bool, str]
@@ -133,7 +166,8 @@ def _get_function_body(
         If valid, True and the function body (only), no extra lines.
         If invalid, False and the error message.
     """
-    for node in ast.walk(tree):
+    # only the top-level functions
+    for node in tree.body:
         if isinstance(node, ast.FunctionDef):
             if node.name != function_name:
                 continue
@@ -163,3 +197,19 @@ def _get_function_body(
         f" and arguments `{method_args}` found"
     )
     return False, error_msg
+
+
+def get_check_function_cache_info() -> "functools._CacheInfo":
+    """Get the statistics of the `check_function` cache.
+
+    Returns
+    -------
+    functools._CacheInfo
+        The hits, misses, max size and current size of the cache.
+    """
+    return _check_function.cache_info()
+
+
+def clear_check_function_cache() -> None:
+    """Clear the `check_function` cache (and its statistics)."""
+    _check_function.cache_clear()
@@ -1,9 +1,20 @@
 """Waldiez flow related models."""
 
-from .flow import WaldiezFlow
+from .flow import WaldiezFlow, WaldiezFlowLogsFormat
 from .flow_data import WaldiezFlowData
+from .flow_index import WaldiezFlowIndex
+from .flow_validation import (
+    WaldiezFlowIssue,
+    WaldiezFlowValidationError,
+    get_flow_issues,
+)
 
 __all__ = [
     "WaldiezFlow",
     "WaldiezFlowData",
+    "WaldiezFlowIndex",
+    "WaldiezFlowIssue",
+    "WaldiezFlowLogsFormat",
+    "WaldiezFlowValidationError",
+    "get_flow_issues",
 ]
@@ -11,6 +11,15 @@ from ..agents import WaldiezAgent
 from ..chat import WaldiezChat
 from ..common import WaldiezBase, now
 from .flow_data import WaldiezFlowData
+from .flow_index import WaldiezFlowIndex
+from .flow_validation import (
+    WaldiezFlowIssue,
+    WaldiezFlowValidationError,
+    get_flow_issues,
+)
+
+WaldiezFlowLogsFormat = Literal["csv", "jsonl", "parquet"]
+"""The possible formats of the (exported) runtime logs."""
 
 
 def id_factory() -> str:
@@ -43,6 +52,9 @@ class WaldiezFlow(WaldiezBase):
         The tags of the flow.
     requirements : List[str]
         The requirements of the flow.
+    logs_format : WaldiezFlowLogsFormat
+        The format to export the runtime logs (tables) to, after the run:
+        csv, jsonl or parquet.
     storage_id : str
         The storage ID of the flow (ignored, UI related).
     created_at : str
@@ -101,6 +113,14 @@ class WaldiezFlow(WaldiezBase):
             default_factory=list,
         ),
     ]
+    logs_format: Annotated[
+        WaldiezFlowLogsFormat,
+        Field(
+            "csv",
+            description="The format to export the runtime logs to",
+            title="Logs format",
+        ),
+    ]
     data: Annotated[
         WaldiezFlowData,
         Field(
@@ -137,6 +157,17 @@ class WaldiezFlow(WaldiezBase):
     _ordered_flow: Optional[
         List[Tuple[WaldiezChat, WaldiezAgent, WaldiezAgent]]
     ] = None
+    _index: Optional[WaldiezFlowIndex] = None
+
+    @property
+    def index(self) -> WaldiezFlowIndex:
+        """Get the (precomputed) agents and chats index of the flow."""
+        if self._index is None:
+            self._index = WaldiezFlowIndex.build(
+                agents=self.data.agents,
+                chats=self.data.chats,
+            )
+        return self._index
 
     @property
     def ordered_flow(
@@ -165,19 +196,7 @@ class WaldiezFlow(WaldiezBase):
         ValueError
             If the agent with the given ID is not found.
         """
-        for user in self.data.agents.users:
-            if user.id == agent_id:
-                return user
-        for assistant in self.data.agents.assistants:
-            if assistant.id == agent_id:
-                return assistant
-        for manager in self.data.agents.managers:
-            if manager.id == agent_id:
-                return manager
-        for rag_user in self.data.agents.rag_users:
-            if rag_user.id == agent_id:
-                return rag_user
-        raise ValueError(f"Agent with ID {agent_id} not found.")
+        return self.index.get_agent(agent_id)
 
     def _get_flow_order(
         self,
@@ -222,19 +241,14 @@ class WaldiezFlow(WaldiezBase):
         List[str]
             The list of agent ids that the agent with the given ID connects to.
         """
-        connections = []
         if all_chats:
-            for chat in self.data.chats:
-                if chat.source == agent_id:
-                    connections.append(chat.target)
-                if chat.target == agent_id:
-                    connections.append(chat.source)
-        else:
-            for _, source, target in self.ordered_flow:
-                if source.id == agent_id:
-                    connections.append(target.id)
-                if target.id == agent_id:
-                    connections.append(source.id)
+            return list(self.index.get_connections(agent_id))
+        connections = []
+        for _, source, target in self.ordered_flow:
+            if source.id == agent_id:
+                connections.append(target.id)
+            if target.id == agent_id:
+                connections.append(source.id)
         return connections
 
     def get_group_chat_members(
@@ -255,26 +269,8 @@ class WaldiezFlow(WaldiezBase):
         agent = self.get_agent_by_id(group_manager_id)
         if agent.agent_type != "manager":
             return []
-        connections = self.get_agent_connections(group_manager_id)
-        return [self.get_agent_by_id(member_id) for member_id in connections]
-
-    def _validate_agent_connections(self) -> None:
-        for agent in self.data.agents.members:
-            if not any(
-                agent.id in (chat.source, chat.target)
-                for chat in self.data.chats
-            ):
-                raise ValueError(
-                    f"Agent {agent.id} ({agent.name}) "
-                    "does not connect to any other node."
-                )
-            # already covered above
-            # if agent.agent_type == "manager":
-            #     chat_member_ids = self.get_agent_connections(agent.id)
-            #     if not chat_member_ids:
-            #         raise ValueError(
-            #             f"Manager's {agent.id} group chat has no members."
-            #         )
+        member_ids = self.index.group_members.get(group_manager_id, ())
+        return [self.get_agent_by_id(member_id) for member_id in member_ids]
 
     @model_validator(mode="after")
     def validate_flow(self) -> Self:
@@ -296,21 +292,29 @@ class WaldiezFlow(WaldiezBase):
 
         Raises
         ------
-        ValueError
-            If the ordered flow is empty.
-            If the model IDs are not unique.
-            If the skill IDs are not unique.
-            If the agents do not connect to any other node.
-            If the manager's group chat has no members.
+        WaldiezFlowValidationError
+            With all the issues found, if:
+            the ordered flow is empty,
+            the model or the skill IDs are not unique,
+            any referenced agent, model, skill or function is not found,
+            any agent does not connect to any other node
+            (or a manager's group chat has no members).
         """
-        if not self.ordered_flow:
-            raise ValueError("The ordered flow is empty.")
-        model_ids = [model.id for model in self.data.models]
-        if len(model_ids) != len(set(model_ids)):
-            raise ValueError("Model IDs must be unique.")
-        skills_ids = [skill.id for skill in self.data.skills]
-        if len(skills_ids) != len(set(skills_ids)):
-            raise ValueError("Skill IDs must be unique.")
-        self.data.agents.validate_flow(model_ids, skills_ids)
-        self._validate_agent_connections()
+        # build the agents/chats index once, the checks below use it
+        self._index = WaldiezFlowIndex.build(
+            agents=self.data.agents,
+            chats=self.data.chats,
+        )
+        # collect all the issues (not only the first one)
+        issues = get_flow_issues(self.data, self._index)
+        try:
+            if not self.ordered_flow:
+                issues.insert(
+                    0, WaldiezFlowIssue(self.id, "The ordered flow is empty.")
+                )
+        except ValueError:
+            # a chat's agent is not found, already in the issues
+            pass
+        if issues:
+            raise WaldiezFlowValidationError(issues)
         return self
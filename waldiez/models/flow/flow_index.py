@@ -0,0 +1,118 @@
+"""Waldiez flow index.
+
+Precomputed lookups over a flow's agents and chats, so that
+getting an agent by its id or finding its connections does not
+need to scan all the agents and chats of the flow every time.
+"""
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple
+
+from ..agents import WaldiezAgent, WaldiezAgents
+from ..chat import WaldiezChat
+
+
+@dataclass(frozen=True, slots=True)
+class WaldiezFlowIndex:
+    """Waldiez flow index.
+
+    Attributes
+    ----------
+    agents : Mapping[str, WaldiezAgent]
+        The agents by their id.
+    chats : Mapping[str, WaldiezChat]
+        The chats by their id.
+    connections : Mapping[str, Tuple[str, ...]]
+        The ids of the agents that each agent connects to (in all the chats).
+    group_members : Mapping[str, Tuple[str, ...]]
+        The ids of the group chat members of each group manager.
+    """
+
+    agents: Mapping[str, WaldiezAgent]
+    chats: Mapping[str, WaldiezChat]
+    connections: Mapping[str, Tuple[str, ...]]
+    group_members: Mapping[str, Tuple[str, ...]]
+
+    @classmethod
+    def build(
+        cls,
+        agents: WaldiezAgents,
+        chats: List[WaldiezChat],
+    ) -> "WaldiezFlowIndex":
+        """Build the index in a single pass over the agents and the chats.
+
+        Parameters
+        ----------
+        agents : WaldiezAgents
+            The flow's agents.
+        chats : List[WaldiezChat]
+            The flow's chats.
+
+        Returns
+        -------
+        WaldiezFlowIndex
+            The flow index.
+        """
+        agents_by_id: Dict[str, WaldiezAgent] = {}
+        for agent in agents.members:
+            agents_by_id.setdefault(agent.id, agent)
+        chats_by_id: Dict[str, WaldiezChat] = {}
+        adjacency: Dict[str, List[str]] = {}
+        for chat in chats:
+            chats_by_id.setdefault(chat.id, chat)
+            adjacency.setdefault(chat.source, []).append(chat.target)
+            adjacency.setdefault(chat.target, []).append(chat.source)
+        connections = {
+            agent_id: tuple(agent_ids)
+            for agent_id, agent_ids in adjacency.items()
+        }
+        group_members = {
+            agent_id: connections.get(agent_id, ())
+            for agent_id, agent in agents_by_id.items()
+            if agent.agent_type == "manager"
+        }
+        return cls(
+            agents=MappingProxyType(agents_by_id),
+            chats=MappingProxyType(chats_by_id),
+            connections=MappingProxyType(connections),
+            group_members=MappingProxyType(group_members),
+        )
+
+    def get_agent(self, agent_id: str) -> WaldiezAgent:
+        """Get an agent by its id.
+
+        Parameters
+        ----------
+        agent_id : str
+            The ID of the agent.
+
+        Returns
+        -------
+        WaldiezAgent
+            The agent.
+
+        Raises
+        ------
+        ValueError
+            If the agent with the given ID is not found.
+        """
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            raise ValueError(f"Agent with ID {agent_id} not found.")
+        return agent
+
+    def get_connections(self, agent_id: str) -> Tuple[str, ...]:
+        """Get the ids of the agents that an agent connects to.
+
+        Parameters
+        ----------
+        agent_id : str
+            The ID of the agent.
+
+        Returns
+        -------
+        Tuple[str, ...]
+            The connected agent ids (one entry per chat).
+        """
+        return self.connections.get(agent_id, ())
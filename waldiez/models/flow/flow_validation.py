@@ -0,0 +1,142 @@
+"""Waldiez flow validation.
+
+All the cross-references of a flow (models, skills, agents, chats)
+are checked in a single pass, using sets of the ids (and the flow
+index for the agents' connections), so the cost is linear in the
+number of references. All the invalid references are collected
+(instead of stopping on the first one) and reported together.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Iterable, List, Sequence, Tuple
+
+from .flow_data import WaldiezFlowData
+from .flow_index import WaldiezFlowIndex
+
+
+@dataclass(frozen=True, slots=True)
+class WaldiezFlowIssue:
+    """An invalid reference (or entry) in a flow.
+
+    Attributes
+    ----------
+    entity_id : str
+        The ID of the entity (agent, chat, model, skill) with the issue.
+    message : str
+        The description of the issue.
+    """
+
+    entity_id: str
+    message: str
+
+
+class WaldiezFlowValidationError(ValueError):
+    """All the issues found in a flow.
+
+    Attributes
+    ----------
+    issues : Tuple[WaldiezFlowIssue, ...]
+        The issues.
+    """
+
+    def __init__(self, issues: Sequence[WaldiezFlowIssue]) -> None:
+        """Initialize the error.
+
+        Parameters
+        ----------
+        issues : Sequence[WaldiezFlowIssue]
+            The issues (at least one).
+        """
+        self.issues = tuple(issues)
+        if len(self.issues) == 1:
+            message = self.issues[0].message
+        else:
+            message = f"{len(self.issues)} issues found in the flow:\n" + (
+                "\n".join(f"- {issue.message}" for issue in self.issues)
+            )
+        super().__init__(message)
+
+
+def get_flow_issues(
+    data: WaldiezFlowData, index: WaldiezFlowIndex
+) -> List[WaldiezFlowIssue]:
+    """Check all the cross-references of a flow.
+
+    - the model and the skill IDs are unique
+    - the chats' sources and targets are agents of the flow
+    - the agents' models, skills, code execution functions
+      and (group manager) transitions are found in the flow
+    - all the agents connect to at least one other agent
+
+    Parameters
+    ----------
+    data : WaldiezFlowData
+        The flow's data.
+    index : WaldiezFlowIndex
+        The flow's index.
+
+    Returns
+    -------
+    List[WaldiezFlowIssue]
+        The issues found (empty if the flow is valid).
+    """
+    issues: List[WaldiezFlowIssue] = []
+    model_ids = [model.id for model in data.models]
+    skill_ids = [skill.id for skill in data.skills]
+    issues.extend(_get_duplicate_issues("Model", model_ids))
+    issues.extend(_get_duplicate_issues("Skill", skill_ids))
+    for chat in data.chats:
+        for agent_id in (chat.source, chat.target):
+            if agent_id not in index.agents:
+                issues.append(
+                    WaldiezFlowIssue(
+                        chat.id,
+                        f"Agent with ID {agent_id} not found "
+                        f"(in chat {chat.id}).",
+                    )
+                )
+    issues.extend(
+        WaldiezFlowIssue(agent_id, error)
+        for agent_id, error in data.agents.get_flow_errors(model_ids, skill_ids)
+    )
+    for agent in index.agents.values():
+        if not index.get_connections(agent.id):
+            issues.append(
+                WaldiezFlowIssue(
+                    agent.id,
+                    f"Agent {agent.id} ({agent.name}) "
+                    "does not connect to any other node.",
+                )
+            )
+    return issues
+
+
+def _get_duplicate_issues(
+    kind: str, entity_ids: Iterable[str]
+) -> List[WaldiezFlowIssue]:
+    """Get the issues for the non unique IDs.
+
+    Parameters
+    ----------
+    kind : str
+        The kind of the entities (e.g. `Model`).
+    entity_ids : Iterable[str]
+        The IDs.
+
+    Returns
+    -------
+    List[WaldiezFlowIssue]
+        An issue for each ID that is used more than once.
+    """
+    counts: "Counter[str]" = Counter(entity_ids)
+    duplicates: List[Tuple[str, int]] = [
+        (entity_id, count) for entity_id, count in counts.items() if count > 1
+    ]
+    return [
+        WaldiezFlowIssue(
+            entity_id,
+            f"{kind} IDs must be unique ({entity_id} is used {count} times).",
+        )
+        for entity_id, count in duplicates
+    ]
@@ -5,14 +5,31 @@ and run an autogen workflow. It has the model/LLM configurations, the agent
 definitions and their optional additional skills to be used.
 """
 
+import hashlib
 import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import cache
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from .agents import WaldiezAgent
 from .chat import WaldiezChat
+from .common.json_utils import loads_json
 from .flow import WaldiezFlow
 from .model import WaldiezModel
 from .skill import WaldiezSkill
@@ -77,9 +94,15 @@ class Waldiez:
         description: Optional[str] = None,
         tags: Optional[List[str]] = None,
         requirements: Optional[List[str]] = None,
+        use_cache: bool = True,
     ) -> "Waldiez":
         """Load a Waldiez from a file.
 
+        The loaded (and validated) flows are cached (in this process),
+        by the file's path, modification time and size, or its content.
+        Loading the same (unchanged) file again returns the same
+        (immutable) instance.
+
         Parameters
         ----------
         waldiez_file : Union[str, Path]
@@ -92,6 +115,8 @@ class Waldiez:
             The tags, by default None.
         requirements : Optional[List[str]], optional
             The requirements, by default None.
+        use_cache : bool, optional
+            Whether to use (and update) the cache, by default True.
 
         Returns
         -------
@@ -103,21 +128,34 @@ class Waldiez:
         ValueError
             If the file is not found or invalid JSON.
         """
-        data: Dict[str, Any] = {}
-        if not Path(waldiez_file).exists():
-            raise ValueError(f"File not found: {waldiez_file}")
-        with open(waldiez_file, "r", encoding="utf-8") as file:
+        path = Path(waldiez_file)
+        try:
+            stat = path.stat()
+        except OSError as error:
+            raise ValueError(f"File not found: {waldiez_file}") from error
+
+        def _create(content: bytes) -> "Waldiez":
             try:
-                data = json.load(file)
-            except json.decoder.JSONDecodeError as error:
+                data: Dict[str, Any] = loads_json(content)
+            except json.JSONDecodeError as error:
                 raise ValueError(f"Invalid JSON: {waldiez_file}") from error
-        return cls.from_dict(
-            data,
-            name=name,
-            description=description,
-            tags=tags,
-            requirements=requirements,
+            return cls.from_dict(
+                data,
+                name=name,
+                description=description,
+                tags=tags,
+                requirements=requirements,
+            )
+
+        if not use_cache:
+            return _create(path.read_bytes())
+        overrides = (
+            name,
+            description,
+            tuple(tags) if tags else None,
+            tuple(requirements) if requirements else None,
         )
+        return _LOAD_CACHE.load(path, stat, overrides, _create)
 
     def model_dump_json(
         self, by_alias: bool = True, indent: Optional[int] = None
@@ -222,6 +260,8 @@ class Waldiez:
             requirements.add(f"pyautogen=={autogen_version}")
         if self.has_multimodal_agents:
             requirements.add(f"pyautogen[lmm]=={autogen_version}")
+        if self.flow.logs_format == "parquet":
+            requirements.add("pyarrow")
         # ref: https://github.com/ag2ai/ag2/blob/main/setup.py
         models_with_additional_requirements = [
             "together",
@@ -271,6 +311,108 @@ class Waldiez:
         return self.flow.get_group_chat_members(agent.id)
 
 
+class WaldiezLoadCacheInfo(NamedTuple):
+    """The statistics of the loaded flows' cache."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _LoadCache:
+    """A (thread-safe) LRU cache of the loaded flows."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Waldiez]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Waldiez]:
+        with self._lock:
+            waldiez = self._entries.get(key)
+            if waldiez is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return waldiez
+
+    def put(self, key: Hashable, waldiez: Waldiez) -> None:
+        with self._lock:
+            self._entries[key] = waldiez
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def load(
+        self,
+        path: Path,
+        stat: os.stat_result,
+        overrides: Hashable,
+        create: Callable[[bytes], Waldiez],
+    ) -> Waldiez:
+        file_key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        # a (same size) change right after the last one might not
+        # update the modification time: use the content for recent files
+        racy = time.time_ns() - stat.st_mtime_ns < _RACY_NS
+        if not racy:
+            waldiez = self.get((file_key, overrides))
+            if waldiez is not None:
+                return waldiez
+        content = path.read_bytes()
+        content_key = (hashlib.sha256(content).hexdigest(), overrides)
+        # the content might be unchanged (e.g. touched or copied)
+        waldiez = self.get(content_key)
+        if waldiez is None:
+            waldiez = create(content)
+            self.put(content_key, waldiez)
+        if not racy:
+            self.put((file_key, overrides), waldiez)
+        return waldiez
+
+    def info(self) -> WaldiezLoadCacheInfo:
+        with self._lock:
+            return WaldiezLoadCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self._maxsize,
+                currsize=len(self._entries),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+LOAD_CACHE_SIZE = 256
+_RACY_NS = 2_000_000_000
+_LOAD_CACHE = _LoadCache(maxsize=LOAD_CACHE_SIZE)
+
+
+def get_load_cache_info() -> WaldiezLoadCacheInfo:
+    """Get the statistics of the `Waldiez.load` cache.
+
+    A lookup by the file's stats that misses, is followed by
+    a lookup by the file's content, so a new file counts two misses.
+
+    Returns
+    -------
+    WaldiezLoadCacheInfo
+        The hits, misses, max size and current size of the cache.
+    """
+    return _LOAD_CACHE.info()
+
+
+def clear_load_cache() -> None:
+    """Clear the `Waldiez.load` cache (and its statistics)."""
+    _LOAD_CACHE.clear()
+
+
 def _get_flow(
     data: Dict[str, Any],
     flow_id: Optional[str] = None,
@@ -0,0 +1,289 @@
+"""Run subprocesses, streaming their output while they run.
+
+Both the stdout and the stderr pipes are read concurrently (a reader
+thread per pipe, or asyncio tasks), so a process that writes a lot to
+one of them cannot block on a full pipe while the other one is read.
+Each line is passed (optionally prefixed with the time it was read)
+to a callback (e.g. the runner's IOStream printer) as soon as it
+arrives, and the process is killed if it does not finish in time.
+
+Example
+-------
+```python
+>>> result = run_process(["pip", "install", "x"], on_line=print)
+>>> result.returncode
+0
+```
+"""
+
+import asyncio
+import datetime
+import os
+import subprocess  # nosemgrep # nosec
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Optional, Sequence, Union
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+
+@dataclass(frozen=True, slots=True)
+class WaldiezProcessResult:
+    """The result of a (finished) process.
+
+    Attributes
+    ----------
+    returncode : int
+        The exit code of the process.
+    stdout : List[str]
+        The lines written to stdout (without the line endings).
+    stderr : List[str]
+        The lines written to stderr (without the line endings).
+    """
+
+    returncode: int
+    stdout: List[str] = field(default_factory=list)
+    stderr: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Check if the process exited successfully."""
+        return self.returncode == 0
+
+
+class _LineHandler:
+    """Collect the lines of both streams and forward them (in order)."""
+
+    def __init__(
+        self,
+        on_line: Optional[Callable[[str], None]],
+        timestamps: bool,
+        on_input: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
+        self._on_line = on_line
+        self._timestamps = timestamps
+        self._on_input = on_input
+        self._lock = threading.Lock()
+        self.lines: Dict[str, List[str]] = {STDOUT: [], STDERR: []}
+        self.stdin: Optional[IO[bytes]] = None
+
+    def __call__(self, stream: str, raw: bytes) -> None:
+        line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        if stream == STDOUT and self._on_input is not None:
+            answer = self._on_input(line)
+            if answer is not None:
+                self._answer(answer)
+                return
+        with self._lock:
+            self.lines[stream].append(line)
+            if self._on_line is None:
+                return
+            if self._timestamps:
+                now = datetime.datetime.now().strftime("%H:%M:%S")
+                line = f"[{now}] {line}"
+            self._on_line(line)
+
+    def _answer(self, answer: str) -> None:
+        """Write an answer (line) to the process' stdin.
+
+        Parameters
+        ----------
+        answer : str
+            The answer.
+        """
+        if self.stdin is None:  # pragma: no cover
+            return
+        try:
+            self.stdin.write(answer.encode("utf-8") + b"\n")
+            self.stdin.flush()
+        except (BrokenPipeError, ValueError):  # pragma: no cover
+            # the process has exited (or is exiting)
+            pass
+
+
+def _read_pipe(pipe: IO[bytes], stream: str, handler: _LineHandler) -> None:
+    """Read a pipe line by line (in a reader thread).
+
+    Parameters
+    ----------
+    pipe : IO[bytes]
+        The pipe.
+    stream : str
+        The stream's name (stdout or stderr).
+    handler : _LineHandler
+        The lines' handler.
+    """
+    with pipe:
+        for raw in iter(pipe.readline, b""):
+            handler(stream, raw)
+
+
+def run_process(
+    cmd: Sequence[str],
+    on_line: Optional[Callable[[str], None]] = None,
+    cwd: Optional[Union[str, Path]] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    timestamps: bool = True,
+    on_input: Optional[Callable[[str], Optional[str]]] = None,
+) -> WaldiezProcessResult:
+    """Run a process, streaming its stdout and stderr lines.
+
+    Parameters
+    ----------
+    cmd : Sequence[str]
+        The command to run.
+    on_line : Optional[Callable[[str], None]], optional
+        Called with each line of stdout or stderr (as soon as it is read),
+        by default None (the lines are only collected).
+    cwd : Optional[Union[str, Path]], optional
+        The working directory, by default None (the current one).
+    env : Optional[Dict[str, str]], optional
+        The environment, by default None (`os.environ`).
+    timeout : Optional[float], optional
+        The maximum time (in seconds) for the process, by default None.
+    timestamps : bool, optional
+        Whether to prefix the lines passed to `on_line` with the time,
+        by default True.
+    on_input : Optional[Callable[[str], Optional[str]]], optional
+        Called with each line of stdout (before `on_line`). If it returns
+        a string (e.g. the line was a request for user input), the string
+        is written (as a line) to the process' stdin instead of passing the
+        line to `on_line`, by default None (the process gets no input).
+
+    Returns
+    -------
+    WaldiezProcessResult
+        The exit code and the output lines of the process.
+
+    Raises
+    ------
+    TimeoutError
+        If the process did not finish in time (it is killed).
+    """
+    handler = _LineHandler(on_line, timestamps, on_input)
+    # pylint: disable=consider-using-with
+    process = subprocess.Popen(  # nosemgrep # nosec
+        list(cmd),
+        cwd=cwd,
+        env=env if env is not None else os.environ.copy(),
+        stdin=subprocess.PIPE if on_input else subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    handler.stdin = process.stdin
+    readers = [
+        threading.Thread(
+            target=_read_pipe,
+            args=(pipe, stream, handler),
+            daemon=True,
+            name=f"waldiez-process-{stream}",
+        )
+        for pipe, stream in (
+            (process.stdout, STDOUT),
+            (process.stderr, STDERR),
+        )
+        if pipe is not None
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired as error:
+        process.kill()
+        process.wait()
+        # its own subprocesses (if any) might still hold the pipes
+        for reader in readers:
+            reader.join(timeout=1)
+        raise TimeoutError(
+            f"The command did not finish in {timeout}s: {' '.join(cmd)}"
+        ) from error
+    for reader in readers:
+        reader.join()
+    if process.stdin is not None:
+        process.stdin.close()
+    return WaldiezProcessResult(
+        returncode=returncode,
+        stdout=handler.lines[STDOUT],
+        stderr=handler.lines[STDERR],
+    )
+
+
+async def a_run_process(
+    cmd: Sequence[str],
+    on_line: Optional[Callable[[str], None]] = None,
+    cwd: Optional[Union[str, Path]] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+    timestamps: bool = True,
+) -> WaldiezProcessResult:
+    """Run a process (without blocking), streaming its stdout and stderr.
+
+    Parameters
+    ----------
+    cmd : Sequence[str]
+        The command to run.
+    on_line : Optional[Callable[[str], None]], optional
+        Called with each line of stdout or stderr (as soon as it is read),
+        by default None (the lines are only collected).
+    cwd : Optional[Union[str, Path]], optional
+        The working directory, by default None (the current one).
+    env : Optional[Dict[str, str]], optional
+        The environment, by default None (`os.environ`).
+    timeout : Optional[float], optional
+        The maximum time (in seconds) for the process, by default None.
+    timestamps : bool, optional
+        Whether to prefix the lines passed to `on_line` with the time,
+        by default True.
+
+    Returns
+    -------
+    WaldiezProcessResult
+        The exit code and the output lines of the process.
+
+    Raises
+    ------
+    TimeoutError
+        If the process did not finish in time (it is killed).
+    """
+    handler = _LineHandler(on_line, timestamps)
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        env=env if env is not None else os.environ.copy(),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def _read(pipe: Optional[asyncio.StreamReader], stream: str) -> None:
+        if pipe is None:  # pragma: no cover
+            return
+        async for raw in pipe:
+            handler(stream, raw)
+
+    async def _communicate() -> int:
+        await asyncio.gather(
+            _read(process.stdout, STDOUT), _read(process.stderr, STDERR)
+        )
+        return await process.wait()
+
+    try:
+        returncode = await asyncio.wait_for(_communicate(), timeout=timeout)
+    except asyncio.TimeoutError as error:
+        process.kill()
+        await process.wait()
+        raise TimeoutError(
+            f"The command did not finish in {timeout}s: {' '.join(cmd)}"
+        ) from error
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+    return WaldiezProcessResult(
+        returncode=returncode,
+        stdout=handler.lines[STDOUT],
+        stderr=handler.lines[STDERR],
+    )
@@ -0,0 +1,226 @@
+"""Check which of a flow's requirements are not already installed.
+
+The requirements (pip specifiers, e.g. `pyautogen[retrievechat]==0.5.3`)
+are checked against the installed distributions (`importlib.metadata`),
+including the requirements of any extras and the environment markers.
+The satisfied requirement sets are remembered (per environment), so
+checking them again (e.g. on every run) does not need to look at the
+installed distributions again, unless the environment changed.
+"""
+
+import importlib.metadata
+import os
+import sys
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from packaging.markers import UndefinedEnvironmentName
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+REQUIREMENTS_CACHE_SIZE = 32
+
+_EnvironmentKey = Tuple[str, Tuple[Tuple[str, int], ...]]
+_CACHE: Dict[Tuple[_EnvironmentKey, FrozenSet[str]], bool] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def get_environment_key() -> _EnvironmentKey:
+    """Get a key for the current environment (and its state).
+
+    Installing or removing packages (in any of the `sys.path` directories)
+    updates the modification time of the directory, so the key changes.
+
+    Returns
+    -------
+    Tuple[str, Tuple[Tuple[str, int], ...]]
+        The interpreter and the modification times of the `sys.path` dirs.
+    """
+    stamps: List[Tuple[str, int]] = []
+    for entry in sys.path:
+        try:
+            stamps.append((entry, os.stat(entry or ".").st_mtime_ns))
+        except OSError:
+            continue
+    return sys.executable, tuple(stamps)
+
+
+def is_requirement_satisfied(requirement: str) -> bool:
+    """Check if a requirement is satisfied by the installed distributions.
+
+    Parameters
+    ----------
+    requirement : str
+        The requirement (pip specifier).
+
+    Returns
+    -------
+    bool
+        True if it is satisfied (or it does not apply to this environment),
+        False if not (or if it cannot be parsed).
+    """
+    try:
+        parsed = Requirement(requirement)
+    except InvalidRequirement:
+        # let pip handle (and report) it
+        return False
+    return _is_satisfied(parsed, extra=None, seen=set())
+
+
+def _is_satisfied(
+    requirement: Requirement,
+    extra: Optional[str],
+    seen: Set[Tuple[str, str]],
+) -> bool:
+    """Check if a (parsed) requirement is satisfied.
+
+    Parameters
+    ----------
+    requirement : Requirement
+        The requirement.
+    extra : Optional[str]
+        The extra of the requiring distribution (for its markers).
+    seen : Set[Tuple[str, str]]
+        The (distribution, extra) pairs already checked (for cycles).
+
+    Returns
+    -------
+    bool
+        Whether the requirement is satisfied.
+    """
+    if not _applies(requirement, extra):
+        return True
+    distribution = _get_installed(requirement)
+    if distribution is None:
+        return False
+    name = canonicalize_name(requirement.name)
+    for requirement_extra in requirement.extras:
+        key = (name, canonicalize_name(requirement_extra))
+        if key in seen:
+            continue
+        seen.add(key)
+        for dependency in _get_extra_dependencies(
+            distribution, requirement_extra
+        ):
+            if not _is_satisfied(dependency, requirement_extra, seen):
+                return False
+    return True
+
+
+def _applies(requirement: Requirement, extra: Optional[str]) -> bool:
+    """Check if a requirement applies to this environment (its marker).
+
+    Parameters
+    ----------
+    requirement : Requirement
+        The requirement.
+    extra : Optional[str]
+        The extra of the requiring distribution.
+
+    Returns
+    -------
+    bool
+        Whether the requirement applies.
+    """
+    if requirement.marker is None:
+        return True
+    try:
+        return requirement.marker.evaluate({"extra": extra or ""})
+    except UndefinedEnvironmentName:  # pragma: no cover
+        return True
+
+
+def _get_installed(
+    requirement: Requirement,
+) -> Optional[importlib.metadata.Distribution]:
+    """Get the installed distribution, if it matches the requirement.
+
+    Parameters
+    ----------
+    requirement : Requirement
+        The requirement.
+
+    Returns
+    -------
+    Optional[importlib.metadata.Distribution]
+        The distribution, if installed and its version is in the specifier.
+    """
+    try:
+        distribution = importlib.metadata.distribution(requirement.name)
+        installed = Version(distribution.version)
+    except (importlib.metadata.PackageNotFoundError, InvalidVersion):
+        return None
+    if not requirement.specifier.contains(installed, prereleases=True):
+        return None
+    return distribution
+
+
+def _get_extra_dependencies(
+    distribution: importlib.metadata.Distribution, extra: str
+) -> List[Requirement]:
+    """Get the dependencies that a distribution's extra adds.
+
+    Parameters
+    ----------
+    distribution : importlib.metadata.Distribution
+        The distribution.
+    extra : str
+        The extra.
+
+    Returns
+    -------
+    List[Requirement]
+        The dependencies (only) needed for the extra.
+    """
+    dependencies: List[Requirement] = []
+    for entry in distribution.requires or []:
+        try:
+            dependency = Requirement(entry)
+        except InvalidRequirement:  # pragma: no cover
+            continue
+        if dependency.marker is None or "extra" not in str(dependency.marker):
+            continue
+        if dependency.marker.evaluate({"extra": extra}):
+            dependencies.append(dependency)
+    return dependencies
+
+
+def get_unsatisfied_requirements(requirements: Iterable[str]) -> List[str]:
+    """Get the requirements that are not satisfied in this environment.
+
+    Parameters
+    ----------
+    requirements : Iterable[str]
+        The requirements (pip specifiers).
+
+    Returns
+    -------
+    List[str]
+        The (sorted) requirements that need to be installed.
+    """
+    requirement_set = frozenset(requirements)
+    if not requirement_set:
+        return []
+    key = (get_environment_key(), requirement_set)
+    with _CACHE_LOCK:
+        if _CACHE.get(key) is True:
+            return []
+    unsatisfied = sorted(
+        requirement
+        for requirement in requirement_set
+        if not is_requirement_satisfied(requirement)
+    )
+    if not unsatisfied:
+        with _CACHE_LOCK:
+            if len(_CACHE) >= REQUIREMENTS_CACHE_SIZE:
+                # drop the oldest entry
+                _CACHE.pop(next(iter(_CACHE)))
+            _CACHE[key] = True
+    return unsatisfied
+
+
+def clear_requirements_cache() -> None:
+    """Forget the satisfied requirement sets."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
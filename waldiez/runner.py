@@ -5,10 +5,19 @@ The flow is first converted to an autogen flow with agents, chats and skills.
 We then chown to temporary directory, call the flow's `main()` and
 return the results. Before running the flow, any additional environment
 variables specified in the waldiez file are set.
+
+In the (default) legacy mode, the flow runs in the current process
+(and autogen is reloaded before each run, to use any newly installed
+packages). In the isolated mode, the flow runs in a pre-warmed worker
+process (with autogen already imported) and the results are sent back.
+With a venv pool, the flow runs with the interpreter of a (prebuilt)
+virtual environment that has the flow's requirements installed, so
+nothing is installed in the current environment.
 """
 
 # pylint: disable=import-outside-toplevel,reimported
 
+import asyncio
 import datetime
 import importlib.util
 import io
@@ -26,16 +35,28 @@ from typing import (
     TYPE_CHECKING,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
+    Set,
     Tuple,
     Type,
     Union,
 )
 
+from .async_run import WaldiezAsyncRun
+from .conflict_checker import ensure_no_conflicts
 from .exporter import WaldiezExporter
 from .models.waldiez import Waldiez
+from .process import a_run_process, run_process
+from .requirements import get_unsatisfied_requirements
+from .venv_pool import (
+    WaldiezVenvPool,
+    get_run_flow_command,
+    parse_input_request,
+)
+from .worker import WaldiezWorker, WaldiezWorkerTask, deserialize_results
 
 if TYPE_CHECKING:
     from autogen import ChatResult  # type: ignore
@@ -67,14 +88,55 @@ class WaldiezRunner:
     """Waldiez runner class."""
 
     def __init__(
-        self, waldiez: Waldiez, file_path: Optional[Union[str, Path]] = None
+        self,
+        waldiez: Waldiez,
+        file_path: Optional[Union[str, Path]] = None,
+        isolated: bool = False,
+        worker: Optional[WaldiezWorker] = None,
+        venv_pool: Optional[WaldiezVenvPool] = None,
+        in_output_dir: bool = False,
     ) -> None:
-        """Initialize the Waldiez manager."""
+        """Initialize the Waldiez manager.
+
+        Parameters
+        ----------
+        waldiez : Waldiez
+            The Waldiez instance.
+        file_path : Optional[Union[str, Path]], optional
+            The flow's file path, by default None.
+        isolated : bool, optional
+            Whether to run the flow in a (pre-warmed) worker process
+            instead of the current one, by default False.
+        worker : Optional[WaldiezWorker], optional
+            A (shared) worker to use in the isolated mode, by default None
+            (the runner starts its own worker, if isolated).
+        venv_pool : Optional[WaldiezVenvPool], optional
+            If provided, `run` runs the flow with the interpreter of the
+            pool's environment for the flow's requirements, by default
+            None. The async methods still use a worker process.
+        in_output_dir : bool, optional
+            Whether to run the flow directly in its results directory
+            (`waldiez_out/<timestamp>` next to the output path), so that
+            nothing is moved after the run, by default False.
+
+        Raises
+        ------
+        ValueError
+            If both a worker (isolated) and a venv pool are provided.
+        """
+        if venv_pool is not None and (isolated or worker is not None):
+            raise ValueError("A venv pool cannot be used in isolated mode")
+        ensure_no_conflicts()
         self._waldiez = waldiez
         self._running = False
         self._file_path = file_path
         self._exporter = WaldiezExporter(waldiez)
         self._called_install_requirements = False
+        self._isolated = isolated or worker is not None
+        self._worker = worker
+        self._owns_worker = worker is None
+        self._venv_pool = venv_pool
+        self._in_output_dir = in_output_dir
 
     @classmethod
     def load(
@@ -136,6 +198,7 @@ class WaldiezRunner:
         """Exit the context manager."""
         if self._running:
             self._running = False
+        self.close()
 
     @property
     def waldiez(self) -> Waldiez:
@@ -147,61 +210,133 @@ class WaldiezRunner:
         """Get the running status."""
         return self._running
 
-    def install_requirements(self) -> None:
-        """Install the requirements for the flow."""
+    @property
+    def isolated(self) -> bool:
+        """Check if the flow runs in a worker process."""
+        return self._isolated
+
+    def warm_up(self) -> None:
+        """Start the worker process (if isolated) before the first run."""
+        if self._isolated:
+            self._get_worker().start()
+
+    def close(self) -> None:
+        """Stop the runner's own worker process (if any)."""
+        if self._worker is not None and self._owns_worker:
+            self._worker.stop()
+            self._worker = None
+
+    def _get_worker(self) -> WaldiezWorker:
+        """Get the worker to run the flow in.
+
+        Returns
+        -------
+        WaldiezWorker
+            The worker.
+        """
+        if self._worker is None:
+            self._worker = WaldiezWorker()
+        return self._worker
+
+    def _get_extra_requirements(self) -> List[str]:
+        """Get the flow's requirements that are not already installed.
+
+        Returns
+        -------
+        List[str]
+            The requirements to install.
+        """
+        return get_unsatisfied_requirements(self.waldiez.requirements)
+
+    def _after_install(self, in_process: bool) -> None:
+        """Make the newly installed packages available.
+
+        Parameters
+        ----------
+        in_process : bool
+            Whether the flow runs in the current process (legacy mode).
+        """
+        if in_process:
+            refresh_environment()
+        elif self._worker is not None and self._worker.alive:
+            # a new process will import the new packages
+            self._worker.restart()
+
+    def install_requirements(self, timeout: Optional[float] = None) -> None:
+        """Install the requirements for the flow.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for pip, by default None.
+        """
+        self._install_requirements(
+            in_process=not self._isolated, timeout=timeout
+        )
+
+    def _install_requirements(
+        self, in_process: bool, timeout: Optional[float] = None
+    ) -> None:
+        """Install the requirements for the flow.
+
+        Parameters
+        ----------
+        in_process : bool
+            Whether the flow runs in the current process (legacy mode).
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for pip, by default None.
+        """
         self._called_install_requirements = True
         printer = get_printer()
-        extra_requirements = set(
-            req for req in self.waldiez.requirements if req not in sys.modules
-        )
+        if self._venv_pool is not None and in_process:
+            # build (or reuse) the flow's environment instead
+            self._venv_pool.get(self.waldiez.requirements, on_line=printer)
+            return
+        extra_requirements = self._get_extra_requirements()
         if extra_requirements:
             printer(f"Installing requirements: {', '.join(extra_requirements)}")
-            pip_install = [sys.executable, "-m", "pip", "install"]
-            if not in_virtualenv():
-                pip_install.append("--user")
-            pip_install.extend(extra_requirements)
-            with subprocess.Popen(
-                pip_install,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            ) as proc:
-                if proc.stdout:
-                    for line in io.TextIOWrapper(proc.stdout, encoding="utf-8"):
-                        printer(line.strip())
-                if proc.stderr:
-                    for line in io.TextIOWrapper(proc.stderr, encoding="utf-8"):
-                        printer(line.strip())
-            refresh_environment()
+            run_process(
+                get_pip_install_command(extra_requirements),
+                on_line=printer,
+                timeout=timeout,
+            )
+            self._after_install(in_process)
+
+    async def a_install_requirements(
+        self, timeout: Optional[float] = None
+    ) -> None:
+        """Install the requirements for the flow, without blocking.
+
+        The flow is expected to run in a worker process (`a_run`),
+        so the environment of the current process is not refreshed.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for pip, by default None.
+        """
+        self._called_install_requirements = True
+        printer = get_printer()
+        extra_requirements = self._get_extra_requirements()
+        if not extra_requirements:
+            return
+        printer(f"Installing requirements: {', '.join(extra_requirements)}")
+        await a_run_process(
+            get_pip_install_command(extra_requirements),
+            on_line=printer,
+            timeout=timeout,
+        )
+        await asyncio.to_thread(self._after_install, False)
 
-    @staticmethod
     def _after_run(
+        self,
         temp_dir: Path,
         output_path: Optional[Union[str, Path]],
         printer: Callable[..., None],
     ) -> None:
-        if output_path:
-            destination_dir = Path(output_path).parent
-            destination_dir = (
-                destination_dir
-                / "waldiez_out"
-                / datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            )
-            destination_dir.mkdir(parents=True, exist_ok=True)
-            # copy the contents of the temp dir to the destination dir
-            printer(f"Copying the results to {destination_dir}")
-            for item in temp_dir.iterdir():
-                # skip cache files
-                if (
-                    item.name.startswith("__pycache__")
-                    or item.name.endswith(".pyc")
-                    or item == ".cache"
-                ):
-                    continue
-                if item.is_file():
-                    shutil.copy(item, destination_dir)
-                else:
-                    shutil.copytree(item, destination_dir / item.name)
-        shutil.rmtree(temp_dir)
+        after_run(
+            temp_dir, output_path, printer, in_output_dir=self._in_output_dir
+        )
 
     def _set_env_vars(self) -> Dict[str, str]:
         """Set environment variables and return the old ones (if any)."""
@@ -241,6 +376,10 @@ class WaldiezRunner:
         Union[ChatResult, List[ChatResult]]
             The result(s) of the chat(s).
         """
+        if self._isolated:
+            return self._run_isolated(output_path, uploads_root)
+        if self._venv_pool is not None:
+            return self._run_in_venv(self._venv_pool, output_path, uploads_root)
         if not self._called_install_requirements:
             self.install_requirements()
         else:
@@ -252,38 +391,148 @@ class WaldiezRunner:
             "you might need to restart the kernel."
         )
         results: Union["ChatResult", List["ChatResult"]] = []
-        if not uploads_root:
-            uploads_root = Path(tempfile.mkdtemp())
-        else:
-            uploads_root = Path(uploads_root)
-        if not uploads_root.exists():
-            uploads_root.mkdir(parents=True)
-        temp_dir = Path(tempfile.mkdtemp())
-        file_name = "flow.py" if not output_path else Path(output_path).name
-        if file_name.endswith((".json", ".waldiez")):
-            file_name = file_name.replace(".json", ".py").replace(
-                ".waldiez", ".py"
-            )
-        if not file_name.endswith(".py"):
-            file_name += ".py"
+        temp_dir, file_name = _prepare_run(
+            output_path, uploads_root, self._in_output_dir
+        )
         module_name = file_name.replace(".py", "")
-        with _chdir(to=temp_dir):
-            self._exporter.export(Path(file_name))
-            spec = importlib.util.spec_from_file_location(
-                module_name, temp_dir / file_name
+        try:
+            with _chdir(to=temp_dir):
+                self._exporter.export(Path(file_name))
+                spec = importlib.util.spec_from_file_location(
+                    module_name, temp_dir / file_name
+                )
+                if not spec or not spec.loader:
+                    raise ImportError("Could not import the flow")
+                sys.path.insert(0, str(temp_dir))
+                old_vars = self._set_env_vars()
+                try:
+                    module = importlib.util.module_from_spec(spec)
+                    spec.loader.exec_module(module)
+                    printer("<Waldiez> - Starting workflow...")
+                    results = module.main()
+                finally:
+                    if str(temp_dir) in sys.path:
+                        sys.path.remove(str(temp_dir))
+                    self._reset_env_vars(old_vars)
+        finally:
+            self._after_run(temp_dir, output_path, printer)
+        return results
+
+    def _run_isolated(
+        self,
+        output_path: Optional[Union[str, Path]],
+        uploads_root: Optional[Union[str, Path]],
+        on_print: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+    ) -> Union["ChatResult", List["ChatResult"]]:
+        """Export and run the flow in the worker process.
+
+        Parameters
+        ----------
+        output_path : Optional[Union[str, Path]]
+            The output path.
+        uploads_root : Optional[Union[str, Path]]
+            The runtime uploads root.
+        on_print : Optional[Callable[[str], None]], optional
+            Called with the flow's output, by default None (printed).
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for the run, by default None.
+
+        Returns
+        -------
+        Union[ChatResult, List[ChatResult]]
+            The result(s) of the chat(s).
+        """
+        if not self._called_install_requirements:
+            self._install_requirements(in_process=False)
+        printer = get_printer()
+
+        def _print(text: str) -> None:
+            printer(text, end="", flush=True)
+
+        temp_dir, file_name = _prepare_run(
+            output_path, uploads_root, self._in_output_dir
+        )
+        try:
+            self._exporter.export(temp_dir / file_name)
+            task = WaldiezWorkerTask(
+                flow_dir=str(temp_dir),
+                file_name=file_name,
+                env={
+                    key: value
+                    for key, value in self.waldiez.get_flow_env_vars()
+                    if key
+                },
+            )
+            (on_print or _print)("<Waldiez> - Starting workflow...\n")
+            return self._get_worker().run(
+                task, on_print=on_print or _print, timeout=timeout
             )
-            if not spec or not spec.loader:
-                raise ImportError("Could not import the flow")
-            sys.path.insert(0, str(temp_dir))
-            old_vars = self._set_env_vars()
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+        finally:
+            self._after_run(temp_dir, output_path, printer)
+
+    def _run_in_venv(
+        self,
+        venv_pool: WaldiezVenvPool,
+        output_path: Optional[Union[str, Path]],
+        uploads_root: Optional[Union[str, Path]],
+    ) -> Union["ChatResult", List["ChatResult"]]:
+        """Export and run the flow with the venv pool's interpreter.
+
+        Parameters
+        ----------
+        venv_pool : WaldiezVenvPool
+            The venv pool.
+        output_path : Optional[Union[str, Path]]
+            The output path.
+        uploads_root : Optional[Union[str, Path]]
+            The runtime uploads root.
+
+        Returns
+        -------
+        Union[ChatResult, List[ChatResult]]
+            The result(s) of the chat(s).
+
+        Raises
+        ------
+        RuntimeError
+            If the flow failed.
+        """
+        self._called_install_requirements = True
+        printer = get_printer()
+        python = venv_pool.get(self.waldiez.requirements, on_line=printer)
+        temp_dir, file_name = _prepare_run(
+            output_path, uploads_root, self._in_output_dir
+        )
+        env = os.environ.copy()
+        env.update(
+            {
+                key: value
+                for key, value in self.waldiez.get_flow_env_vars()
+                if key
+            }
+        )
+        results_fd, results_file = tempfile.mkstemp(suffix=".json")
+        os.close(results_fd)
+        try:
+            self._exporter.export(temp_dir / file_name)
             printer("<Waldiez> - Starting workflow...")
-            results = module.main()
-            sys.path.pop(0)
-            self._reset_env_vars(old_vars)
-        self._after_run(temp_dir, output_path, printer)
-        return results
+            result = run_process(
+                get_run_flow_command(python) + [file_name, results_file],
+                on_line=printer,
+                cwd=temp_dir,
+                env=env,
+                timestamps=False,
+                on_input=_get_user_input,
+            )
+            if not result.ok:
+                details = "\n".join(result.stderr[-20:])
+                raise RuntimeError(f"The flow failed: {details}")
+            with open(results_file, "r", encoding="utf-8") as file:
+                return deserialize_results(file.read())
+        finally:
+            os.remove(results_file)
+            self._after_run(temp_dir, output_path, printer)
 
     def run(
         self,
@@ -318,6 +567,362 @@ class WaldiezRunner:
         finally:
             self._running = False
 
+    async def a_run(
+        self,
+        output_path: Optional[Union[str, Path]] = None,
+        uploads_root: Optional[Union[str, Path]] = None,
+        timeout: Optional[float] = None,
+    ) -> Union["ChatResult", List["ChatResult"]]:
+        """Run the Waldiez workflow, without blocking the event loop.
+
+        The flow runs in a worker process (as in the isolated mode)
+        and its output is printed. Cancelling the call also stops the flow.
+
+        Parameters
+        ----------
+        output_path : Optional[Union[str, Path]], optional
+            The output path, by default None.
+        uploads_root : Optional[Union[str, Path]], optional
+            The uploads root, to get user-uploaded files, by default None.
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for the run, by default None.
+
+        Returns
+        -------
+        Union[ChatResult, List[ChatResult]]
+            The result(s) of the chat(s).
+        """
+        printer = get_printer()
+
+        def _print(text: str) -> None:
+            printer(text, end="", flush=True)
+
+        if not self._called_install_requirements:
+            await self.a_install_requirements()
+        return await self._a_start(output_path, uploads_root, timeout, _print)
+
+    def a_stream(
+        self,
+        output_path: Optional[Union[str, Path]] = None,
+        uploads_root: Optional[Union[str, Path]] = None,
+        timeout: Optional[float] = None,
+    ) -> WaldiezAsyncRun[Union["ChatResult", List["ChatResult"]]]:
+        """Start running the workflow, to iterate over its output lines.
+
+        Must be called from a running event loop. The flow runs in
+        a worker process (as in the isolated mode). Any requirements
+        should have been installed (`a_install_requirements`) before.
+
+        Parameters
+        ----------
+        output_path : Optional[Union[str, Path]], optional
+            The output path, by default None.
+        uploads_root : Optional[Union[str, Path]], optional
+            The uploads root, to get user-uploaded files, by default None.
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for the run, by default None.
+
+        Returns
+        -------
+        WaldiezAsyncRun[Union[ChatResult, List[ChatResult]]]
+            The run: an async iterator of the output lines,
+            that can be awaited for the result(s) of the chat(s).
+        """
+        return self._a_start(output_path, uploads_root, timeout, None)
+
+    def _a_start(
+        self,
+        output_path: Optional[Union[str, Path]],
+        uploads_root: Optional[Union[str, Path]],
+        timeout: Optional[float],
+        printer: Optional[Callable[[str], None]],
+    ) -> WaldiezAsyncRun[Union["ChatResult", List["ChatResult"]]]:
+        """Start running the workflow in the worker process.
+
+        Parameters
+        ----------
+        output_path : Optional[Union[str, Path]]
+            The output path.
+        uploads_root : Optional[Union[str, Path]]
+            The uploads root.
+        timeout : Optional[float]
+            The maximum time (in seconds) for the run.
+        printer : Optional[Callable[[str], None]]
+            The function to print the output with (if not streamed).
+
+        Returns
+        -------
+        WaldiezAsyncRun[Union[ChatResult, List[ChatResult]]]
+            The run.
+
+        Raises
+        ------
+        RuntimeError
+            If the workflow is already running.
+        """
+        if self._running is True:
+            raise RuntimeError("Workflow already running")
+        self._running = True
+        file_path = output_path or self._file_path
+        # make sure the (possibly cancelled) worker is not replaced
+        worker = self._get_worker()
+
+        def _target(
+            on_print: Callable[[str], None],
+        ) -> Union["ChatResult", List["ChatResult"]]:
+            return self._run_isolated(
+                file_path, uploads_root, on_print=on_print, timeout=timeout
+            )
+
+        def _on_done() -> None:
+            self._running = False
+
+        return WaldiezAsyncRun(
+            _target, cancel=worker.cancel, on_done=_on_done, printer=printer
+        )
+
+
+def _make_output_dir(parent: Path) -> Path:
+    """Create a new (timestamped) directory for a run's results.
+
+    Runs that finish in the same second (e.g. in a pool)
+    get different directories.
+
+    Parameters
+    ----------
+    parent : Path
+        The output path's directory.
+
+    Returns
+    -------
+    Path
+        The created directory.
+    """
+    timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    destination_dir = parent / "waldiez_out" / timestamp
+    destination_dir.parent.mkdir(parents=True, exist_ok=True)
+    index = 0
+    while True:
+        try:
+            destination_dir.mkdir()
+        except FileExistsError:
+            index += 1
+            destination_dir = parent / "waldiez_out" / f"{timestamp}_{index}"
+            continue
+        return destination_dir
+
+
+def _is_cache_file(item: Path) -> bool:
+    """Check if a file (or directory) of a run is a python cache one.
+
+    Parameters
+    ----------
+    item : Path
+        The file or directory.
+
+    Returns
+    -------
+    bool
+        Whether it is a cache (not a result) file.
+    """
+    return item.name.startswith("__pycache__") or item.name.endswith(".pyc")
+
+
+def publish_results(source_dir: Path, destination_dir: Path) -> None:
+    """Move the results of a run to their (output) directory.
+
+    Each file or directory is renamed (nothing is copied) if both
+    directories are on the same filesystem (the run's directory is
+    created next to the output for this) and copied (then removed with
+    the run's directory) only otherwise. Hard links or reflinks are not
+    an option across filesystems either.
+
+    Parameters
+    ----------
+    source_dir : Path
+        The directory the flow ran in.
+    destination_dir : Path
+        The (existing) directory to publish the results to.
+    """
+    for item in source_dir.iterdir():
+        if _is_cache_file(item):
+            continue
+        target = destination_dir / item.name
+        try:
+            os.replace(item, target)
+        except OSError:
+            # e.g. another device (EXDEV)
+            if item.is_dir() and not item.is_symlink():
+                shutil.copytree(item, target, symlinks=True)
+            else:
+                shutil.copy2(item, target, follow_symlinks=False)
+
+
+def after_run(
+    temp_dir: Path,
+    output_path: Optional[Union[str, Path]],
+    printer: Callable[..., None],
+    in_output_dir: bool = False,
+) -> None:
+    """Publish the results of a run (if needed) and remove its directory.
+
+    The results are moved to a (new) `waldiez_out/<timestamp>` directory
+    next to the output path (if any).
+
+    Parameters
+    ----------
+    temp_dir : Path
+        The directory the flow ran in.
+    output_path : Optional[Union[str, Path]]
+        The output path.
+    printer : Callable[..., None]
+        The printer function.
+    in_output_dir : bool, optional
+        Whether the flow ran in its output directory (from `make_run_dir`),
+        so the results are already there, by default False.
+    """
+    if output_path and in_output_dir:
+        for item in temp_dir.iterdir():
+            if _is_cache_file(item):
+                shutil.rmtree(item, ignore_errors=True)
+        printer(f"The results are in {temp_dir}")
+        return
+    if output_path:
+        destination_dir = _make_output_dir(Path(output_path).parent)
+        printer(f"Moving the results to {destination_dir}")
+        publish_results(temp_dir, destination_dir)
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def make_run_dir(
+    output_path: Optional[Union[str, Path]],
+    in_output_dir: bool = False,
+) -> Path:
+    """Create the directory to run a flow in.
+
+    With an output path, the directory is created (hidden) in its
+    `waldiez_out` directory, so that publishing the results (`after_run`)
+    only renames them (same filesystem), or, if `in_output_dir`, it is
+    the (timestamped) results directory itself.
+    Without an output path, it is a temporary directory.
+
+    Parameters
+    ----------
+    output_path : Optional[Union[str, Path]]
+        The output path.
+    in_output_dir : bool, optional
+        Whether to run in the results directory, by default False.
+
+    Returns
+    -------
+    Path
+        The created directory.
+    """
+    if not output_path:
+        return Path(tempfile.mkdtemp())
+    parent = Path(output_path).parent
+    if in_output_dir:
+        return _make_output_dir(parent)
+    out_dir = parent / "waldiez_out"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return Path(tempfile.mkdtemp(dir=out_dir, prefix=".run-"))
+
+
+def _prepare_run(
+    output_path: Optional[Union[str, Path]],
+    uploads_root: Optional[Union[str, Path]],
+    in_output_dir: bool = False,
+) -> Tuple[Path, str]:
+    """Create the directories for a run and get the flow's file name.
+
+    Parameters
+    ----------
+    output_path : Optional[Union[str, Path]]
+        The output path.
+    uploads_root : Optional[Union[str, Path]]
+        The runtime uploads root.
+    in_output_dir : bool, optional
+        Whether to run in the results directory, by default False.
+
+    Returns
+    -------
+    Tuple[Path, str]
+        The directory to run the flow in and the file name.
+    """
+    if not uploads_root:
+        uploads_root = Path(tempfile.mkdtemp())
+    else:
+        uploads_root = Path(uploads_root)
+    if not uploads_root.exists():
+        uploads_root.mkdir(parents=True)
+    temp_dir = make_run_dir(output_path, in_output_dir)
+    return temp_dir, get_flow_file_name(output_path)
+
+
+def _get_user_input(line: str) -> Optional[str]:
+    """Answer a user input request (if the line is one) of a venv run.
+
+    Parameters
+    ----------
+    line : str
+        A line of the flow's stdout.
+
+    Returns
+    -------
+    Optional[str]
+        The user's input, or None if the line is not an input request.
+    """
+    request = parse_input_request(line)
+    if request is None:
+        return None
+    from autogen.io import IOStream  # type: ignore
+
+    prompt, password = request
+    answer = IOStream.get_default().input(prompt, password=password)
+    # the answer is sent as a single line
+    return answer.rstrip("\r\n").replace("\n", " ")
+
+
+def get_pip_install_command(requirements: Iterable[str]) -> List[str]:
+    """Get the command to install requirements (in this environment).
+
+    Parameters
+    ----------
+    requirements : Iterable[str]
+        The requirements.
+
+    Returns
+    -------
+    List[str]
+        The pip install command.
+    """
+    pip_install = [sys.executable, "-m", "pip", "install"]
+    if not in_virtualenv():
+        pip_install.append("--user")
+    pip_install.extend(requirements)
+    return pip_install
+
+
+def get_flow_file_name(output_path: Optional[Union[str, Path]]) -> str:
+    """Get the name of the (.py) file to export the flow to.
+
+    Parameters
+    ----------
+    output_path : Optional[Union[str, Path]]
+        The output path (if any).
+
+    Returns
+    -------
+    str
+        The file name.
+    """
+    file_name = "flow.py" if not output_path else Path(output_path).name
+    if file_name.endswith((".json", ".waldiez")):
+        file_name = file_name.replace(".json", ".py").replace(".waldiez", ".py")
+    if not file_name.endswith(".py"):
+        file_name += ".py"
+    return file_name
+
 
 def in_virtualenv() -> bool:
     """Check if we are inside a virtualenv.
@@ -335,7 +940,7 @@ def in_virtualenv() -> bool:
 def refresh_environment() -> None:
     """Refresh the environment."""
     # backup the default IOStream
-    from autogen.io import IOStream  # type: ignore
+    from autogen.io import IOStream
 
     default_io_stream = IOStream.get_default()
     site.main()
@@ -0,0 +1,289 @@
+"""Run multiple Waldiez flows concurrently, in a pool of worker processes.
+
+Each worker process imports autogen once, when it starts (see
+`waldiez.worker`). A submitted flow is exported to its own (temporary)
+directory and runs in the first idle worker, with the flow's environment
+variables set only in that worker. Nothing in the current process is
+changed (no `os.chdir`, `sys.path` or `os.environ` updates), so flows can
+be submitted from any thread. A worker is replaced with a new one after
+`max_tasks_per_worker` runs, or if its run failed, timed out or was
+cancelled.
+
+Example
+-------
+```python
+>>> with WaldiezRunnerPool(size=4) as pool:
+...     futures = [pool.submit(waldiez) for waldiez in flows]
+...     results = [future.result() for future in futures]
+```
+"""
+
+import os
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Union
+
+from .conflict_checker import ensure_no_conflicts
+from .exporter import WaldiezExporter
+from .models.waldiez import Waldiez
+from .runner import after_run, get_flow_file_name, get_printer, make_run_dir
+from .worker import WaldiezWorker, WaldiezWorkerError, WaldiezWorkerTask
+
+if TYPE_CHECKING:
+    from autogen import ChatResult  # type: ignore
+
+
+class WaldiezRunnerPool:
+    """A pool of (pre-warmed) worker processes to run flows in."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_tasks_per_worker: Optional[int] = None,
+        warm_up: bool = True,
+    ) -> None:
+        """Initialize the pool.
+
+        Parameters
+        ----------
+        size : Optional[int], optional
+            The number of workers, by default None (the number of CPUs).
+        max_tasks_per_worker : Optional[int], optional
+            The number of runs after which a worker is replaced with
+            a new one, by default None (never).
+        warm_up : bool, optional
+            Whether to start all the workers now, by default True
+            (otherwise, each worker is started on its first run).
+
+        Raises
+        ------
+        ValueError
+            If the size or the max tasks per worker is not positive.
+        """
+        ensure_no_conflicts()
+        size = size or os.cpu_count() or 1
+        if size < 1:
+            raise ValueError("The pool size must be positive")
+        if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+            raise ValueError("The max tasks per worker must be positive")
+        self._size = size
+        self._max_tasks = max_tasks_per_worker
+        self._idle: "queue.Queue[WaldiezWorker]" = queue.Queue()
+        self._workers: List[WaldiezWorker] = []
+        self._replacing: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="waldiez-runner"
+        )
+        for _ in range(size):
+            worker = WaldiezWorker()
+            self._workers.append(worker)
+            self._idle.put(worker)
+        if warm_up:
+            self.warm_up()
+
+    def __enter__(self) -> "WaldiezRunnerPool":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Exit the context manager (wait for the runs and shut down)."""
+        self.shutdown(wait=True)
+
+    @property
+    def size(self) -> int:
+        """Get the number of workers."""
+        return self._size
+
+    def warm_up(self) -> None:
+        """Start all the workers (concurrently) and wait until ready."""
+        with ThreadPoolExecutor(max_workers=self._size) as executor:
+            for future in [
+                executor.submit(worker.start) for worker in self._workers
+            ]:
+                future.result()
+
+    def submit(
+        self,
+        waldiez: Waldiez,
+        output_path: Optional[Union[str, Path]] = None,
+        timeout: Optional[float] = None,
+        on_print: Optional[Callable[[str], None]] = None,
+        on_input: Optional[Callable[[str, bool], str]] = None,
+    ) -> "Future[Union[ChatResult, List[ChatResult]]]":
+        """Submit a flow to run.
+
+        Parameters
+        ----------
+        waldiez : Waldiez
+            The flow to run.
+        output_path : Optional[Union[str, Path]], optional
+            The output path, by default None. If provided, the results
+            are moved to a `waldiez_out` directory next to it.
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for the run, by default None.
+        on_print : Optional[Callable[[str], None]], optional
+            Called with the flow's output, by default None
+            (using autogen's default IOStream).
+        on_input : Optional[Callable[[str, bool], str]], optional
+            Called to get the user's input, by default None
+            (using autogen's default IOStream).
+
+        Returns
+        -------
+        Future[Union[ChatResult, List[ChatResult]]]
+            The future result(s) of the chat(s).
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is shut down.
+        """
+        if self._closed:
+            raise RuntimeError("The pool is shut down")
+        return self._executor.submit(
+            self._run, waldiez, output_path, timeout, on_print, on_input
+        )
+
+    def _run(
+        self,
+        waldiez: Waldiez,
+        output_path: Optional[Union[str, Path]],
+        timeout: Optional[float],
+        on_print: Optional[Callable[[str], None]],
+        on_input: Optional[Callable[[str, bool], str]],
+    ) -> Union["ChatResult", List["ChatResult"]]:
+        """Export and run a flow in an idle worker.
+
+        Parameters
+        ----------
+        waldiez : Waldiez
+            The flow to run.
+        output_path : Optional[Union[str, Path]]
+            The output path.
+        timeout : Optional[float]
+            The maximum time (in seconds) for the run.
+        on_print : Optional[Callable[[str], None]]
+            Called with the flow's output.
+        on_input : Optional[Callable[[str, bool], str]]
+            Called to get the user's input.
+
+        Returns
+        -------
+        Union[ChatResult, List[ChatResult]]
+            The result(s) of the chat(s).
+        """
+        printer = get_printer()
+
+        def _print(text: str) -> None:
+            printer(text, end="", flush=True)
+
+        temp_dir = make_run_dir(output_path)
+        worker: Optional[WaldiezWorker] = None
+        succeeded = False
+        try:
+            file_name = get_flow_file_name(output_path)
+            WaldiezExporter(waldiez).export(temp_dir / file_name)
+            task = WaldiezWorkerTask(
+                flow_dir=str(temp_dir),
+                file_name=file_name,
+                env={
+                    key: value
+                    for key, value in waldiez.get_flow_env_vars()
+                    if key
+                },
+            )
+            worker = self._idle.get()
+            results = worker.run(
+                task,
+                on_print=on_print or _print,
+                on_input=on_input,
+                timeout=timeout,
+            )
+            succeeded = True
+        finally:
+            # (the export might have failed before a worker was acquired)
+            if worker is not None:
+                self._release(worker, succeeded)
+            after_run(temp_dir, output_path, printer)
+        return results
+
+    def _release(self, worker: WaldiezWorker, succeeded: bool) -> None:
+        """Return a worker to the pool (replacing it if needed).
+
+        Parameters
+        ----------
+        worker : WaldiezWorker
+            The worker.
+        succeeded : bool
+            Whether the worker's last run succeeded.
+        """
+        recycle = (
+            not succeeded
+            or not worker.alive
+            or (self._max_tasks is not None and worker.tasks >= self._max_tasks)
+        )
+        if not recycle or self._closed:
+            self._idle.put(worker)
+            return
+        replacement = WaldiezWorker()
+        with self._lock:
+            self._workers[self._workers.index(worker)] = replacement
+        # not to delay the run's result
+        thread = threading.Thread(
+            target=self._replace,
+            args=(worker, replacement),
+            daemon=True,
+            name="waldiez-worker-replace",
+        )
+        with self._lock:
+            self._replacing.append(thread)
+        thread.start()
+
+    def _replace(
+        self, worker: WaldiezWorker, replacement: WaldiezWorker
+    ) -> None:
+        """Stop a worker and start its replacement, then make it available.
+
+        Parameters
+        ----------
+        worker : WaldiezWorker
+            The worker to stop.
+        replacement : WaldiezWorker
+            The worker to start.
+        """
+        worker.stop()
+        try:
+            replacement.start()
+        except WaldiezWorkerError:  # pragma: no cover
+            # it will be started (again) on its next run
+            pass
+        self._idle.put(replacement)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the pool (and stop the workers).
+
+        Parameters
+        ----------
+        wait : bool, optional
+            Whether to wait for the submitted runs to finish,
+            by default True. If False, the pending runs are cancelled
+            and the running ones are terminated.
+        """
+        self._closed = True
+        if not wait:
+            with self._lock:
+                for worker in self._workers:
+                    worker.cancel()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+        with self._lock:
+            replacing = list(self._replacing)
+            self._replacing.clear()
+        for thread in replacing:
+            thread.join()
+        with self._lock:
+            for worker in self._workers:
+                worker.stop()
@@ -0,0 +1,430 @@
+"""Run flows in prebuilt virtual environments, one per requirement set.
+
+Instead of installing a flow's requirements in the current interpreter
+(`pip install --user` if not in a virtualenv), a virtual environment is
+built once per (sorted) requirement set and reused by every flow with the
+same requirements. The environments are kept in a directory (by default,
+`<cache_dir>/venvs`, see `waldiez.export_cache.get_default_cache_dir`)
+and the least recently used ones are removed when their total size
+exceeds the disk budget.
+
+If a wheel directory is given, the requirements are installed only from
+it (`pip install --no-index --find-links <wheel_dir>`), after (if not
+offline) downloading/building any missing wheels to it. So, once the
+wheels are there, environments can be (re)built without network access.
+
+Example
+-------
+```python
+>>> pool = WaldiezVenvPool(wheel_dir="~/wheels")
+>>> runner = WaldiezRunner(waldiez, venv_pool=pool)
+>>> results = runner.run()
+```
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import venv
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from .export_cache import get_default_cache_dir
+from .process import run_process
+
+VENV_POOL_MAX_SIZE = 5 * 1024 * 1024 * 1024  # 5 GiB
+MARKER_FILE = "waldiez_venv.json"
+INPUT_REQUEST_PREFIX = "\x1e<waldiez:input>"
+
+# run (with the venv's interpreter, in the flow's directory) as:
+# python -c _RUN_FLOW <flow file name> <results file>
+# user input is requested with a (JSON) line: [prompt, password]
+# after INPUT_REQUEST_PREFIX and the answer is read from stdin
+_RUN_FLOW = """
+import builtins
+import dataclasses
+import getpass
+import importlib.util
+import json
+import sys
+
+
+def _request_input(prompt="", password=False):
+    print(PREFIX + json.dumps([str(prompt), password]), flush=True)
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\\n")
+
+
+builtins.input = _request_input
+getpass.getpass = lambda prompt="Password: ", stream=None: _request_input(
+    prompt, True
+)
+PREFIX, file_name, results_file = sys.argv[1:4]
+spec = importlib.util.spec_from_file_location(file_name[:-3], file_name)
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+results = module.main()
+many = isinstance(results, (list, tuple))
+items = [
+    dataclasses.asdict(item) if dataclasses.is_dataclass(item) else item
+    for item in (results if many else [results])
+]
+with open(results_file, "w", encoding="utf-8") as file:
+    json.dump({"many": many, "results": items}, file, default=str)
+"""
+
+
+class WaldiezVenvPoolError(RuntimeError):
+    """An error building a virtual environment."""
+
+
+def get_requirements_fingerprint(requirements: Iterable[str]) -> str:
+    """Get the key of a requirement set (for the current interpreter).
+
+    Parameters
+    ----------
+    requirements : Iterable[str]
+        The requirements (pip specifiers), in any order.
+
+    Returns
+    -------
+    str
+        The hash of the sorted requirements and the Python version.
+    """
+    parts = [
+        sys.implementation.name,
+        f"{sys.version_info.major}.{sys.version_info.minor}",
+        sys.platform,
+        *sorted(set(requirements)),
+    ]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_venv_python(venv_dir: Union[str, Path]) -> Path:
+    """Get the path of a virtual environment's interpreter.
+
+    Parameters
+    ----------
+    venv_dir : Union[str, Path]
+        The virtual environment's directory.
+
+    Returns
+    -------
+    Path
+        The interpreter's path.
+    """
+    if os.name == "nt":  # pragma: no cover
+        return Path(venv_dir) / "Scripts" / "python.exe"
+    return Path(venv_dir) / "bin" / "python"
+
+
+def get_run_flow_command(python: Union[str, Path]) -> List[str]:
+    """Get the command to run an exported flow with an interpreter.
+
+    The flow's file name and the file to write the (JSON) results to
+    are to be appended, and the command is to be run in the flow's
+    directory. The results can be read with
+    `waldiez.worker.deserialize_results` and the user input requests
+    (stdout lines) with `parse_input_request`.
+
+    Parameters
+    ----------
+    python : Union[str, Path]
+        The interpreter.
+
+    Returns
+    -------
+    List[str]
+        The command (without the two arguments).
+    """
+    return [str(python), "-u", "-c", _RUN_FLOW, INPUT_REQUEST_PREFIX]
+
+
+def parse_input_request(line: str) -> Optional[Tuple[str, bool]]:
+    """Parse a (stdout) line of a flow run with `get_run_flow_command`.
+
+    Parameters
+    ----------
+    line : str
+        The line.
+
+    Returns
+    -------
+    Optional[Tuple[str, bool]]
+        The prompt and whether a password is requested,
+        if the line is a request for user input (None otherwise).
+    """
+    if not line.startswith(INPUT_REQUEST_PREFIX):
+        return None
+    try:
+        prompt, password = json.loads(line[len(INPUT_REQUEST_PREFIX) :])
+    except ValueError:  # pragma: no cover
+        return None
+    return str(prompt), bool(password)
+
+
+def _get_dir_size(path: Path) -> int:
+    """Get the total size of the files in a directory.
+
+    Parameters
+    ----------
+    path : Path
+        The directory.
+
+    Returns
+    -------
+    int
+        The size in bytes (symlinks are not followed).
+    """
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except OSError:  # pragma: no cover
+                continue
+    return size
+
+
+class WaldiezVenvPool:
+    """Prebuilt virtual environments, keyed by their requirement set."""
+
+    def __init__(
+        self,
+        root: Optional[Union[str, Path]] = None,
+        max_size: int = VENV_POOL_MAX_SIZE,
+        wheel_dir: Optional[Union[str, Path]] = None,
+        offline: bool = False,
+        system_site_packages: bool = False,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        Parameters
+        ----------
+        root : Optional[Union[str, Path]], optional
+            The directory to keep the environments in,
+            by default None (`<cache_dir>/venvs`).
+        max_size : int, optional
+            The disk budget (in bytes) for all the environments,
+            by default 5 GiB.
+        wheel_dir : Optional[Union[str, Path]], optional
+            A (local) wheel directory to install the requirements from,
+            by default None (install from the package index).
+        offline : bool, optional
+            Whether to only use the wheel directory's contents (not
+            downloading any missing wheels to it), by default False.
+        system_site_packages : bool, optional
+            Whether the environments can use the packages of the
+            base interpreter, by default False.
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for each pip call,
+            by default None.
+
+        Raises
+        ------
+        ValueError
+            If offline without a wheel directory.
+        """
+        if offline and wheel_dir is None:
+            raise ValueError("A wheel directory is required in offline mode")
+        self._root = (
+            Path(root).expanduser()
+            if root is not None
+            else get_default_cache_dir() / "venvs"
+        )
+        self._max_size = max_size
+        self._wheel_dir = (
+            Path(wheel_dir).expanduser().resolve()
+            if wheel_dir is not None
+            else None
+        )
+        self._offline = offline
+        self._system_site_packages = system_site_packages
+        self._timeout = timeout
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        """Get the directory of the environments."""
+        return self._root
+
+    def get(
+        self,
+        requirements: Iterable[str],
+        on_line: Optional[Callable[[str], None]] = None,
+    ) -> Path:
+        """Get (building it if needed) the environment for requirements.
+
+        Parameters
+        ----------
+        requirements : Iterable[str]
+            The requirements (e.g. `Waldiez.requirements`).
+        on_line : Optional[Callable[[str], None]], optional
+            Called with pip's output lines (if building),
+            by default None.
+
+        Returns
+        -------
+        Path
+            The environment's interpreter.
+        """
+        requirement_list = sorted(set(requirements))
+        entry = self._root / get_requirements_fingerprint(requirement_list)
+        with self._lock:
+            if not (entry / MARKER_FILE).is_file():
+                self._build(entry, requirement_list, on_line)
+            # mark as recently used
+            os.utime(entry / MARKER_FILE)
+            self.evict(keep=entry)
+        return get_venv_python(entry)
+
+    def _build(
+        self,
+        entry: Path,
+        requirements: List[str],
+        on_line: Optional[Callable[[str], None]],
+    ) -> None:
+        """Build an environment (in a temporary dir, then moved to entry).
+
+        Parameters
+        ----------
+        entry : Path
+            The environment's directory.
+        requirements : List[str]
+            The (sorted) requirements.
+        on_line : Optional[Callable[[str], None]]
+            Called with pip's output lines.
+        """
+        self._root.mkdir(parents=True, exist_ok=True)
+        if entry.exists():
+            # an incomplete build (no marker)
+            shutil.rmtree(entry, ignore_errors=True)
+        tmp_entry = Path(tempfile.mkdtemp(dir=self._root, prefix=".tmp-"))
+        try:
+            venv.EnvBuilder(
+                system_site_packages=self._system_site_packages,
+                clear=True,
+                symlinks=os.name != "nt",
+                with_pip=bool(requirements),
+            ).create(tmp_entry)
+            if requirements:
+                self._install(get_venv_python(tmp_entry), requirements, on_line)
+            with open(tmp_entry / MARKER_FILE, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "requirements": requirements,
+                        "python": sys.version,
+                        "size": _get_dir_size(tmp_entry),
+                    },
+                    file,
+                )
+            # atomic: another process might have built the same entry
+            tmp_entry.rename(entry)
+        except OSError:
+            if not (entry / MARKER_FILE).is_file():
+                raise
+        finally:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def _install(
+        self,
+        python: Path,
+        requirements: List[str],
+        on_line: Optional[Callable[[str], None]],
+    ) -> None:
+        """Install the requirements in an environment.
+
+        Parameters
+        ----------
+        python : Path
+            The environment's interpreter.
+        requirements : List[str]
+            The requirements.
+        on_line : Optional[Callable[[str], None]]
+            Called with pip's output lines.
+
+        Raises
+        ------
+        WaldiezVenvPoolError
+            If the requirements could not be installed.
+        """
+        pip = [str(python), "-m", "pip", "--disable-pip-version-check"]
+        if self._wheel_dir is None:
+            command = pip + ["install", *requirements]
+        else:
+            self._wheel_dir.mkdir(parents=True, exist_ok=True)
+            wheel_dir = str(self._wheel_dir)
+            if not self._offline:
+                # if this fails (e.g. no network), the wheels that are
+                # already in the directory might still be enough
+                run_process(
+                    pip + ["wheel", "--wheel-dir", wheel_dir, *requirements],
+                    on_line=on_line,
+                    timeout=self._timeout,
+                )
+            command = pip + [
+                "install",
+                "--no-index",
+                "--find-links",
+                wheel_dir,
+                *requirements,
+            ]
+        result = run_process(command, on_line=on_line, timeout=self._timeout)
+        if not result.ok:
+            details = "\n".join(result.stderr[-20:])
+            raise WaldiezVenvPoolError(
+                f"Could not install the requirements: {details}"
+            )
+
+    def _get_entries(self) -> List[Tuple[float, int, Path]]:
+        """Get the (built) environments, least recently used first.
+
+        Returns
+        -------
+        List[Tuple[float, int, Path]]
+            The last use time, the size and the path of each environment.
+        """
+        entries: List[Tuple[float, int, Path]] = []
+        if not self._root.is_dir():
+            return entries
+        for entry in self._root.iterdir():
+            marker = entry / MARKER_FILE
+            if entry.name.startswith(".") or not marker.is_file():
+                continue
+            try:
+                with open(marker, "r", encoding="utf-8") as file:
+                    size = int(json.load(file)["size"])
+                entries.append((marker.stat().st_mtime, size, entry))
+            except (OSError, ValueError, KeyError):  # pragma: no cover
+                continue
+        entries.sort(key=lambda item: item[0])
+        return entries
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        """Remove the least recently used environments, to fit the budget.
+
+        Parameters
+        ----------
+        keep : Optional[Path], optional
+            An environment not to remove (e.g. the one about to be used),
+            by default None.
+        """
+        entries = self._get_entries()
+        total_size = sum(size for _, size, _ in entries)
+        entries = [item for item in entries if item[2] != keep]
+        while entries and total_size > self._max_size:
+            _, size, entry = entries.pop(0)
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+    def clear(self) -> None:
+        """Remove all the environments."""
+        for _, _, entry in self._get_entries():
+            shutil.rmtree(entry, ignore_errors=True)
@@ -0,0 +1,584 @@
+"""Run exported flows in a (pre-warmed) worker process.
+
+The worker process imports autogen once, when it starts, and then runs
+exported flows (one at a time) without reloading any modules.
+Each flow runs in its own directory, with its own environment variables
+(the worker's working directory, `sys.path` and environment are restored
+after each run) and the modules that were imported from the flow's
+directory (skills, `waldiez_api_keys`) are dropped after the run.
+
+Messages (tuples) are exchanged with the worker over a pipe:
+
+- from the worker: `("ready",)`, `("print", text)`,
+  `("input", prompt, password)`, `("result", data)`, `("error", message)`
+- to the worker: `("run", task)`, `("input", value)`, `("stop",)`
+
+Anything the flow prints (using autogen's `IOStream` or `print`)
+and any user input requests are forwarded to the parent process.
+The results are sent back as (JSON) serialized `ChatResult` data.
+"""
+
+# pylint: disable=import-outside-toplevel
+
+import contextlib
+import dataclasses
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+import warnings
+from concurrent.futures import CancelledError
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    from autogen import ChatResult  # type: ignore
+
+WORKER_START_TIMEOUT = 120.0
+_POLL_INTERVAL = 0.1
+
+
+class WaldiezWorkerError(RuntimeError):
+    """An error running a flow in a worker."""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class WaldiezWorkerTask:
+    """A flow to run in a worker.
+
+    Attributes
+    ----------
+    flow_dir : str
+        The directory with the exported flow (the run's working directory).
+    file_name : str
+        The name of the exported flow's (.py) file.
+    env : Dict[str, str]
+        Additional environment variables for the run.
+    """
+
+    flow_dir: str
+    file_name: str
+    env: Dict[str, str] = dataclasses.field(default_factory=dict)
+
+
+def _chat_result_to_dict(result: Any) -> Any:
+    """Get the (JSON serializable) data of a chat result.
+
+    Parameters
+    ----------
+    result : Any
+        The chat result.
+
+    Returns
+    -------
+    Any
+        The data.
+    """
+    if dataclasses.is_dataclass(result) and not isinstance(result, type):
+        return dataclasses.asdict(result)
+    return result  # pragma: no cover
+
+
+def serialize_results(results: Any) -> str:
+    """Serialize the results of a flow's `main()`.
+
+    Parameters
+    ----------
+    results : Any
+        A ChatResult or a list of ChatResults.
+
+    Returns
+    -------
+    str
+        The JSON string.
+    """
+    many = isinstance(results, (list, tuple))
+    items = list(results) if many else [results]
+    return json.dumps(
+        {
+            "many": many,
+            "results": [_chat_result_to_dict(item) for item in items],
+        },
+        default=str,
+    )
+
+
+def deserialize_results(
+    data: str,
+) -> Union["ChatResult", List["ChatResult"]]:
+    """Deserialize the results of a flow's `main()`.
+
+    Parameters
+    ----------
+    data : str
+        The JSON string (from `serialize_results`).
+
+    Returns
+    -------
+    Union[ChatResult, List[ChatResult]]
+        The result(s) of the chat(s).
+    """
+    from autogen import ChatResult
+
+    loaded = json.loads(data)
+    results = [
+        ChatResult(**item) if isinstance(item, dict) else item
+        for item in loaded["results"]
+    ]
+    if loaded["many"]:
+        return results
+    return results[0]
+
+
+class _PipeIOStream:
+    """An autogen IOStream that forwards the output/input over a pipe."""
+
+    def __init__(self, conn: Connection) -> None:
+        self._conn = conn
+
+    def print(
+        self,
+        *objects: Any,
+        sep: str = " ",
+        end: str = "\n",
+        flush: bool = False,
+    ) -> None:
+        """Forward the printed objects."""
+        self._conn.send(("print", sep.join(str(obj) for obj in objects) + end))
+
+    def input(self, prompt: str = "", *, password: bool = False) -> str:
+        """Forward an input request and wait for the reply."""
+        self._conn.send(("input", prompt, password))
+        message = self._conn.recv()
+        return str(message[1])
+
+
+class _PipeWriter:
+    """A text stream (for `sys.stdout`) that forwards lines over a pipe."""
+
+    def __init__(self, conn: Connection) -> None:
+        self._conn = conn
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        """Write (and forward any complete lines of) the text."""
+        self._buffer += text
+        if "\n" in self._buffer:
+            complete, self._buffer = self._buffer.rsplit("\n", 1)
+            self._conn.send(("print", complete + "\n"))
+        return len(text)
+
+    def flush(self) -> None:
+        """Forward anything written so far."""
+        if self._buffer:
+            self._conn.send(("print", self._buffer))
+            self._buffer = ""
+
+    def isatty(self) -> bool:
+        """Not a terminal."""
+        return False
+
+
+def _drop_flow_modules(flow_dir: Path, before: List[str]) -> None:
+    """Drop the modules that were imported from the flow's directory.
+
+    Parameters
+    ----------
+    flow_dir : Path
+        The flow's directory.
+    before : List[str]
+        The names of the modules that were imported before the run.
+    """
+    existing = set(before)
+    for name in list(sys.modules):
+        if name in existing:
+            continue
+        module_file = getattr(sys.modules[name], "__file__", None)
+        if module_file and Path(module_file).resolve().is_relative_to(flow_dir):
+            del sys.modules[name]
+
+
+def _run_task(task: WaldiezWorkerTask) -> Any:
+    """Run a flow (in the worker process).
+
+    Parameters
+    ----------
+    task : WaldiezWorkerTask
+        The flow to run.
+
+    Returns
+    -------
+    Any
+        The flow's `main()` results.
+
+    Raises
+    ------
+    ImportError
+        If the flow could not be imported.
+    """
+    flow_dir = Path(task.flow_dir).resolve()
+    old_cwd = os.getcwd()
+    old_env = {key: os.environ.get(key) for key in task.env}
+    modules_before = list(sys.modules)
+    # packages might have been installed since the worker started
+    importlib.invalidate_caches()
+    os.chdir(flow_dir)
+    sys.path.insert(0, str(flow_dir))
+    os.environ.update(task.env)
+    try:
+        spec = importlib.util.spec_from_file_location(
+            Path(task.file_name).stem, flow_dir / task.file_name
+        )
+        if not spec or not spec.loader:
+            raise ImportError("Could not import the flow")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module.main()
+    finally:
+        os.chdir(old_cwd)
+        if str(flow_dir) in sys.path:
+            sys.path.remove(str(flow_dir))
+        for key, value in old_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        _drop_flow_modules(flow_dir, modules_before)
+
+
+def _worker_main(conn: Connection) -> None:  # pragma: no cover
+    """Run the worker process' loop.
+
+    Parameters
+    ----------
+    conn : Connection
+        The worker's end of the pipe.
+    """
+    warnings.filterwarnings("ignore", "flaml.automl is not available")
+    import autogen  # noqa: F401  # pylint: disable=unused-import
+    from autogen.io import IOStream  # type: ignore
+
+    IOStream.set_global_default(_PipeIOStream(conn))
+    conn.send(("ready",))
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if message[0] != "run":
+            break
+        task = WaldiezWorkerTask(**message[1])
+        writer = _PipeWriter(conn)
+        # pylint: disable=broad-except
+        try:
+            with contextlib.redirect_stdout(writer):  # type: ignore
+                results = _run_task(task)
+            writer.flush()
+            conn.send(("result", serialize_results(results)))
+        except BaseException:  # noqa: B036
+            writer.flush()
+            conn.send(("error", traceback.format_exc()))
+    conn.close()
+
+
+def _default_input(prompt: str, password: bool) -> str:
+    """Get the user's input, using autogen's default IOStream.
+
+    Parameters
+    ----------
+    prompt : str
+        The prompt.
+    password : bool
+        Whether to read a password.
+
+    Returns
+    -------
+    str
+        The user's input.
+    """
+    from autogen.io import IOStream
+
+    return str(IOStream.get_default().input(prompt, password=password))
+
+
+class WaldiezWorker:
+    """A (pre-warmed) worker process to run exported flows in."""
+
+    def __init__(self) -> None:
+        """Initialize the worker (use `start` to start its process)."""
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._tasks = 0
+
+    def __enter__(self) -> "WaldiezWorker":
+        """Start the worker (if not already started)."""
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Stop the worker."""
+        self.stop()
+
+    @property
+    def alive(self) -> bool:
+        """Check if the worker process is running."""
+        return self._process is not None and self._process.is_alive()
+
+    @property
+    def tasks(self) -> int:
+        """Get the number of flows the worker (process) has run."""
+        return self._tasks
+
+    @property
+    def pid(self) -> Optional[int]:
+        """Get the worker process' id."""
+        return self._process.pid if self._process is not None else None
+
+    def start(self, timeout: float = WORKER_START_TIMEOUT) -> None:
+        """Start the worker process and wait until autogen is imported.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The time to wait for the worker to be ready, by default 120s.
+
+        Raises
+        ------
+        WaldiezWorkerError
+            If the worker did not start.
+        """
+        if self.alive:
+            return
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            daemon=True,
+            name="waldiez-worker",
+        )
+        process.start()
+        child_conn.close()
+        self._process = process
+        self._conn = parent_conn
+        self._cancelled = False
+        self._tasks = 0
+        # pylint: disable=too-many-try-statements
+        try:
+            if not parent_conn.poll(timeout):
+                raise WaldiezWorkerError("The worker did not start in time")
+            message = parent_conn.recv()
+        except (EOFError, OSError) as error:
+            self.stop()
+            raise WaldiezWorkerError("The worker did not start") from error
+        except WaldiezWorkerError:
+            self.stop()
+            raise
+        if message[0] != "ready":  # pragma: no cover
+            self.stop()
+            raise WaldiezWorkerError("The worker did not start")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the worker process.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The time to wait for the process to exit, by default 5s.
+        """
+        process, conn = self._process, self._conn
+        self._process = None
+        self._conn = None
+        if conn is not None:
+            with contextlib.suppress(OSError, ValueError):
+                conn.send(("stop",))
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():  # pragma: no cover
+                process.terminate()
+                process.join(timeout)
+        if conn is not None:
+            conn.close()
+
+    def restart(self) -> None:
+        """Restart the worker (e.g. to use newly installed packages)."""
+        self.stop()
+        self.start()
+
+    def cancel(self) -> None:
+        """Cancel the current run, by terminating the worker process.
+
+        The worker needs to be started again to run another flow.
+        """
+        self._cancelled = True
+        if self._process is not None:
+            self._process.terminate()
+
+    def run(
+        self,
+        task: WaldiezWorkerTask,
+        on_print: Optional[Callable[[str], None]] = None,
+        on_input: Optional[Callable[[str, bool], str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Union["ChatResult", List["ChatResult"]]:
+        """Run a flow in the worker.
+
+        Parameters
+        ----------
+        task : WaldiezWorkerTask
+            The flow to run.
+        on_print : Optional[Callable[[str], None]], optional
+            Called with the flow's output, by default None (`sys.stdout`).
+        on_input : Optional[Callable[[str, bool], str]], optional
+            Called with the prompt (and whether it is a password)
+            to get the user's input, by default None
+            (using autogen's default IOStream).
+        timeout : Optional[float], optional
+            The maximum time (in seconds) for the run, by default None.
+            On timeout, the worker process is terminated.
+
+        Returns
+        -------
+        Union[ChatResult, List[ChatResult]]
+            The result(s) of the chat(s).
+
+        Raises
+        ------
+        TimeoutError
+            If the run did not finish in time.
+        CancelledError
+            If the run was cancelled.
+        WaldiezWorkerError
+            If the flow failed or the worker exited.
+        """
+        with self._lock:
+            self.start()
+            self._tasks += 1
+            kind, payload = self._communicate(
+                task,
+                on_print or _write_stdout,
+                on_input or _default_input,
+                timeout,
+            )
+        if kind == "error":
+            raise WaldiezWorkerError(f"The flow failed:\n{payload}")
+        return deserialize_results(payload)
+
+    def _communicate(
+        self,
+        task: WaldiezWorkerTask,
+        on_print: Callable[[str], None],
+        on_input: Callable[[str, bool], str],
+        timeout: Optional[float],
+    ) -> Tuple[str, str]:
+        """Send the task and handle the messages until it finishes.
+
+        Parameters
+        ----------
+        task : WaldiezWorkerTask
+            The flow to run.
+        on_print : Callable[[str], None]
+            Called with the flow's output.
+        on_input : Callable[[str, bool], str]
+            Called to get the user's input.
+        timeout : Optional[float]
+            The maximum time (in seconds) for the run.
+
+        Returns
+        -------
+        Tuple[str, str]
+            The kind (`result` or `error`) and the payload of the last message.
+
+        Raises
+        ------
+        TimeoutError
+            If the run did not finish in time.
+        CancelledError
+            If the run was cancelled.
+        WaldiezWorkerError
+            If the worker exited.
+        """
+        conn = self._conn
+        if conn is None:  # pragma: no cover
+            raise WaldiezWorkerError("The worker is not running")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # pylint: disable=too-many-try-statements
+        try:
+            conn.send(("run", dataclasses.asdict(task)))
+            while True:
+                if deadline is not None and time.monotonic() > deadline:
+                    self.cancel()
+                    self.stop()
+                    raise TimeoutError(f"The flow did not finish in {timeout}s")
+                message = _handle_message(conn, on_print, on_input)
+                if message is not None:
+                    return message
+        except TimeoutError:
+            raise
+        except (EOFError, OSError) as error:
+            cancelled = self._cancelled
+            self.stop()
+            if cancelled:
+                raise CancelledError() from error
+            raise WaldiezWorkerError("The worker exited") from error
+
+
+def _handle_message(
+    conn: Connection,
+    on_print: Callable[[str], None],
+    on_input: Callable[[str, bool], str],
+) -> Optional[Tuple[str, str]]:
+    """Wait (a little) for a message from the worker and handle it.
+
+    Parameters
+    ----------
+    conn : Connection
+        Our end of the pipe.
+    on_print : Callable[[str], None]
+        Called with the flow's output.
+    on_input : Callable[[str, bool], str]
+        Called to get the user's input.
+
+    Returns
+    -------
+    Optional[Tuple[str, str]]
+        The kind and the payload, if the run finished.
+    """
+    if not conn.poll(_POLL_INTERVAL):
+        return None
+    message = conn.recv()
+    if message[0] == "print":
+        on_print(message[1])
+        return None
+    if message[0] == "input":
+        conn.send(("input", on_input(message[1], message[2])))
+        return None
+    return message[0], message[1]
+
+
+def _write_stdout(text: str) -> None:
+    """Write the flow's output to stdout.
+
+    Parameters
+    ----------
+    text : str
+        The text to write.
+    """
+    sys.stdout.write(text)
+    sys.stdout.flush()